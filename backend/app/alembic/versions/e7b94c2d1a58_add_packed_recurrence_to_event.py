@@ -0,0 +1,137 @@
+"""add packed recurrence to event
+
+Revision ID: e7b94c2d1a58
+Revises: 5d2e8a1f6c93
+Create Date: 2026-10-18 16:41:09.327114
+
+"""
+import json
+import uuid
+from typing import Any, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b94c2d1a58'
+down_revision: Union[str, None] = '5d2e8a1f6c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade(engine_name: str) -> None:
+    globals()["upgrade_%s" % engine_name]()
+
+
+def downgrade(engine_name: str) -> None:
+    globals()["downgrade_%s" % engine_name]()
+
+
+_INT_LIST_PARTS = ('bysecond', 'byminute', 'byhour', 'bymonthday', 'byyearday', 'byweekno', 'bymonth', 'bysetpos')
+
+
+def _load_json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _pack_recurrence(row: Any) -> str:
+    # Frozen copy of pack_recurrence in app/core/infrastructure/sqlalchemy/models/shards/event.py
+    rrule_parts = [f"FREQ={row.freq}"]
+    if row.until is not None:
+        rrule_parts.append(f"UNTIL={row.until.strftime('%Y%m%dT%H%M%S')}")
+    if row.count is not None:
+        rrule_parts.append(f"COUNT={row.count}")
+    rrule_parts.append(f"INTERVAL={row.interval}")
+    for name in _INT_LIST_PARTS:
+        values = _load_json(getattr(row, name))
+        if values is not None:
+            rrule_parts.append(f"{name.upper()}={','.join(map(str, values))}")
+    byday = _load_json(row.byday)
+    if byday is not None:
+        rrule_parts.append(f"BYDAY={','.join(f'{int(n)}{weekday}' for n, weekday in byday)}")
+    if row.wkst is not None:
+        rrule_parts.append(f"WKST={row.wkst}")
+
+    return "\n".join(
+        (
+            f"RRULE-ID:{uuid.UUID(bytes=row.rrule_id)}",
+            f"RRULE:{';'.join(rrule_parts)}",
+            f"RDATE:{','.join(_load_json(row.rdate))}",
+            f"EXDATE:{','.join(_load_json(row.exdate))}",
+        )
+    )
+
+
+def _backfill_packed_recurrence() -> None:
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT event.id AS event_id, recurrence.rrule_id, recurrence.rdate, recurrence.exdate, "
+            "recurrence_rule.freq, recurrence_rule.until, recurrence_rule.count, recurrence_rule.`interval`, "
+            "recurrence_rule.bysecond, recurrence_rule.byminute, recurrence_rule.byhour, recurrence_rule.byday, "
+            "recurrence_rule.bymonthday, recurrence_rule.byyearday, recurrence_rule.byweekno, "
+            "recurrence_rule.bymonth, recurrence_rule.bysetpos, recurrence_rule.wkst "
+            "FROM event "
+            "JOIN recurrence ON recurrence.id = event.recurrence_id "
+            "JOIN recurrence_rule ON recurrence_rule.id = recurrence.rrule_id"
+        )
+    ).all()
+    if rows:
+        # Keep updated_at, which ON UPDATE CURRENT_TIMESTAMP would otherwise bump and so invalidate every event version
+        bind.execute(
+            sa.text(
+                "UPDATE event SET packed_recurrence = :packed_recurrence, updated_at = updated_at WHERE id = :event_id"
+            ),
+            [{"event_id": row.event_id, "packed_recurrence": _pack_recurrence(row)} for row in rows],
+        )
+
+
+def upgrade_common() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    pass
+    # ### end Alembic commands ###
+
+
+def downgrade_common() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    pass
+    # ### end Alembic commands ###
+
+
+def upgrade_sequence() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    pass
+    # ### end Alembic commands ###
+
+
+def downgrade_sequence() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    pass
+    # ### end Alembic commands ###
+
+
+def upgrade_shard0() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('event', sa.Column('packed_recurrence', mysql.TEXT(), nullable=True, comment='Packed Recurrence'))
+    _backfill_packed_recurrence()
+    # ### end Alembic commands ###
+
+
+def downgrade_shard0() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column('event', 'packed_recurrence')
+    # ### end Alembic commands ###
+
+
+def upgrade_shard1() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('event', sa.Column('packed_recurrence', mysql.TEXT(), nullable=True, comment='Packed Recurrence'))
+    _backfill_packed_recurrence()
+    # ### end Alembic commands ###
+
+
+def downgrade_shard1() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column('event', 'packed_recurrence')
+    # ### end Alembic commands ###
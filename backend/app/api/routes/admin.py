@@ -3,13 +3,18 @@ from fastapi import APIRouter, Depends
 
 from app.api.deps import verify_admin_credentials
 from app.core.dtos.admin import (
+    GetMetricsResponse,
+    HitRatioMetric,
+    LatencyMetric,
     ResetAuroraResponse,
     StampRevisionRequest,
     StampRevisionResponse,
     UpgradeDbResponse,
 )
+from app.core.infrastructure.ml.client import ml_server_client
 from app.core.infrastructure.sqlalchemy.migrate_db import reset_aurora_db_async
 from app.core.utils.alembic import get_alembic_config
+from app.core.utils.metrics import ml_server_metrics, not_modified_metrics
 
 router = APIRouter()
 
@@ -48,3 +53,34 @@ def stamp_revision(req: StampRevisionRequest, _: bool = Depends(verify_admin_cre
     command.stamp(alembic_config, revision)
 
     return StampRevisionResponse(error_codes=[])
+
+
+@router.get(
+    path="/metrics",
+    name="Get Metrics",
+    response_model=GetMetricsResponse,
+)
+def get_metrics(_: bool = Depends(verify_admin_credentials)) -> GetMetricsResponse:
+    return GetMetricsResponse(
+        not_modified={
+            name: HitRatioMetric(hits=counter.hits, requests=counter.requests, hit_ratio=counter.ratio)
+            for name, counter in not_modified_metrics.snapshot().items()
+        },
+        ml_server={
+            name: LatencyMetric(
+                requests=latency.requests,
+                errors=latency.errors,
+                rejected=latency.rejected,
+                retries=latency.retries,
+                hedges=latency.hedges,
+                mean_ms=latency.mean_ms,
+                p50_ms=latency.percentile_ms(50),
+                p95_ms=latency.percentile_ms(95),
+                p99_ms=latency.percentile_ms(99),
+                max_ms=latency.max_ms,
+            )
+            for name, latency in ml_server_metrics.snapshot().items()
+        },
+        ml_server_circuit_state=ml_server_client.circuit_state.value,
+        error_codes=[],
+    )
@@ -1,28 +1,45 @@
-from datetime import datetime
-
-from fastapi import APIRouter, Depends
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.api.deps import AccessControl
 from app.core.dtos.event import (
     AttendEventRequest,
     AttendEventResponse,
+    BulkAttendEventsRequest,
+    BulkAttendEventsResponse,
+    BulkCreateEventsRequest,
+    BulkCreateEventsResponse,
+    CancelForecastJobResponse,
     CreateEventRequest,
     CreateEventResponse,
     CreateOrUpdateGoalRequest,
     CreateOrUpdateGoalResponse,
     CreateOrUpdateReviewRequest,
     CreateOrUpdateReviewResponse,
+    EnqueueForecastJobResponse,
     ForecastAttendanceTimeResponse,
     GetAttendanceHistoryResponse,
+    GetAttendanceSnapshotResponse,
     GetAttendanceTimeForecastsResponse,
     GetEventGoalsResponse,
     GetEventReviewsResponse,
     GetFollowingEventsResponse,
+    GetForecastJobResponse,
+    GetGuestAttendanceStatusesResponse,
     GetGuestAttendanceStatusResponse,
     GetGuestGoalResponse,
     GetGuestReviewResponse,
     GetMyEventsResponse,
+    ImportEventsResponse,
+    RegenerateFeedTokenResponse,
+    RevokeFeedTokenResponse,
     UpdateAttendancesRequest,
     UpdateAttendancesResponse,
     UpdateEventRequest,
@@ -32,9 +49,29 @@ from app.core.features.account import Account, Role
 from app.core.infrastructure.sqlalchemy.db import get_db_async
 from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
 from app.core.usecase.event import EventUsecase
+from app.core.usecase.forecast_job import forecast_job_worker
+from app.core.utils.etag import etag_matches
+from app.core.utils.metrics import not_modified_metrics
 
 router = APIRouter()
 
+SSE_KEEPALIVE_SECONDS = 15.0
+ICS_IMPORT_CHUNK_BYTES = 1 << 16
+
+
+def _not_modified_or_none(
+    name: str, etag: str | None, if_none_match: str | None, response: Response
+) -> Response | None:
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    not_modified = etag_matches(if_none_match, etag)
+    not_modified_metrics.record(name, hit=not_modified)
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
 
 @router.post(
     path="/create",
@@ -57,6 +94,50 @@ async def create_event(
     )
 
 
+@router.post(
+    path="/bulk",
+    name="Bulk Create Events",
+    response_model=BulkCreateEventsResponse,
+)
+async def bulk_create_events(
+    req: BulkCreateEventsRequest,
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> BulkCreateEventsResponse:
+    events = req.events
+
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.bulk_create_events_async(
+        host_id=account.account_id,
+        event_dtos=events,
+    )
+
+
+@router.post(
+    path="/import",
+    name="Import Events",
+    response_model=ImportEventsResponse,
+)
+async def import_events(
+    file: UploadFile,
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> ImportEventsResponse:
+    async def read_chunks() -> AsyncIterator[bytes]:
+        while chunk := await file.read(ICS_IMPORT_CHUNK_BYTES):
+            yield chunk
+
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.import_events_async(
+        host_id=account.account_id,
+        chunks=read_chunks(),
+    )
+
+
 @router.put(
     path="/{event_id}",
     name="Update Event",
@@ -105,6 +186,27 @@ async def attend_event(
     )
 
 
+@router.post(
+    path="/attend/bulk",
+    name="Bulk Attend Events",
+    response_model=BulkAttendEventsResponse,
+)
+async def bulk_attend_events(
+    req: BulkAttendEventsRequest,
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> BulkAttendEventsResponse:
+    check_ins = req.check_ins
+
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.bulk_attend_events_async(
+        host_id=account.account_id,
+        check_ins=check_ins,
+    )
+
+
 @router.put(
     path="/attend/{event_id}/{start}",
     name="Update Guest Attendance History",
@@ -151,18 +253,79 @@ async def get_attendance_history(
     )
 
 
+@router.get(
+    path="/attend/stream/{event_id}/{start}",
+    name="Stream Guest Attendances",
+    response_model=GetAttendanceSnapshotResponse,
+)
+async def stream_guest_attendances(
+    event_id: str,
+    start: datetime,
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> GetAttendanceSnapshotResponse | StreamingResponse:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    stack = AsyncExitStack()
+    # Subscribe before reading the snapshot so that no change committed in between is missed
+    messages = await stack.enter_async_context(usecase.subscribe_attendance(event_id_str=event_id, start=start))
+    try:
+        snapshot = await usecase.get_attendance_snapshot_async(
+            host_id=account.account_id,
+            event_id_str=event_id,
+            start=start,
+        )
+    except BaseException:
+        await stack.aclose()
+        raise
+    if snapshot.error_codes:
+        await stack.aclose()
+        return snapshot
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            yield f"event: snapshot\ndata: {snapshot.model_dump_json()}\n\n"
+            next_message = asyncio.ensure_future(anext(messages))
+            try:
+                while True:
+                    done, _ = await asyncio.wait({next_message}, timeout=SSE_KEEPALIVE_SECONDS)
+                    if not done:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield f"event: attendance\ndata: {next_message.result()}\n\n"
+                    next_message = asyncio.ensure_future(anext(messages))
+            finally:
+                next_message.cancel()
+        finally:
+            await stack.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     path="/mine",
     name="Get My Events",
     response_model=GetMyEventsResponse,
 )
 async def get_my_events(
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     session: AsyncSession = Depends(get_db_async),
     account: Account = Depends(AccessControl(permit={Role.HOST})),
-) -> GetMyEventsResponse:
+) -> GetMyEventsResponse | Response:
     uow = SqlalchemyUnitOfWork(session=session)
     usecase = EventUsecase(uow=uow)
 
+    etag = await usecase.get_my_events_etag_async(account_id=account.account_id)
+    not_modified = _not_modified_or_none("/events/mine", etag, if_none_match, response)
+    if not_modified is not None:
+        return not_modified
+
     return await usecase.get_my_events_async(account_id=account.account_id)
 
 
@@ -172,15 +335,140 @@ async def get_my_events(
     response_model=GetFollowingEventsResponse,
 )
 async def get_following_events(
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     session: AsyncSession = Depends(get_db_async),
     account: Account = Depends(AccessControl(permit={Role.GUEST})),
-) -> GetFollowingEventsResponse:
+) -> GetFollowingEventsResponse | Response:
     uow = SqlalchemyUnitOfWork(session=session)
     usecase = EventUsecase(uow=uow)
 
+    etag = await usecase.get_following_events_etag_async(follower_id=account.account_id)
+    not_modified = _not_modified_or_none("/events/following", etag, if_none_match, response)
+    if not_modified is not None:
+        return not_modified
+
     return await usecase.get_following_events_async(follower_id=account.account_id)
 
 
+def _modified_since(last_modified: datetime, if_modified_since: str) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have a resolution of one second
+    return last_modified.replace(microsecond=0) > since
+
+
+@router.post(
+    path="/feed/token",
+    name="Regenerate Feed Token",
+    response_model=RegenerateFeedTokenResponse,
+)
+async def regenerate_feed_token(
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.GUEST})),
+) -> RegenerateFeedTokenResponse:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.regenerate_feed_token_async(account_id=account.account_id)
+
+
+@router.delete(
+    path="/feed/token",
+    name="Revoke Feed Token",
+    response_model=RevokeFeedTokenResponse,
+)
+async def revoke_feed_token(
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.GUEST})),
+) -> RevokeFeedTokenResponse:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.revoke_feed_token_async(account_id=account.account_id)
+
+
+@router.get(
+    path="/{account_id}/feed.ics",
+    name="Get Event Feed",
+    response_class=StreamingResponse,
+)
+async def get_event_feed(
+    account_id: str,
+    # Calendar clients cannot send the session cookie, so the feed is authorized by the subscriber's feed token
+    token: str = Query(...),
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_db_async),
+) -> Response:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    validators = await usecase.get_ics_feed_validators_async(feed_token=token, host_id_str=account_id)
+    if validators is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event feed not found")
+
+    etag, last_modified = validators
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        # updated_at is stored in UTC without a timezone
+        last_modified = last_modified.replace(tzinfo=UTC)
+        # An HTTP date cannot tell edits within the same second apart, so it is only sent once that second is over
+        # (RFC 9110 8.8.2.2); until then the ETag alone validates the feed
+        if last_modified.replace(microsecond=0) + timedelta(seconds=1) <= datetime.now(UTC):
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        else:
+            last_modified = None
+
+    # If-Modified-Since is only consulted without If-None-Match (RFC 9110 13.1.3)
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    else:
+        not_modified = (
+            if_modified_since is not None
+            and last_modified is not None
+            and not _modified_since(last_modified, if_modified_since)
+        )
+    not_modified_metrics.record("/events/{account_id}/feed.ics", hit=not_modified)
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    feed = await usecase.get_ics_feed_async(feed_token=token, host_id_str=account_id)
+    if feed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event feed not found")
+
+    return StreamingResponse(
+        feed,
+        media_type="text/calendar",
+        headers={**headers, "Content-Disposition": 'inline; filename="feed.ics"'},
+    )
+
+
+@router.get(
+    path="/attend/status",
+    name="Get Guest Attendance Statuses",
+    response_model=GetGuestAttendanceStatusesResponse,
+)
+async def get_guest_attendance_statuses(
+    start_from: datetime = Query(..., alias="from"),
+    start_to: datetime = Query(..., alias="to"),
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.GUEST})),
+) -> GetGuestAttendanceStatusesResponse:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.get_guest_attendance_statuses_async(
+        guest_id=account.account_id,
+        start_from=start_from,
+        start_to=start_to,
+    )
+
+
 @router.get(
     path="/attend/status/{event_id}/{start}",
     name="Get Guest Attendance Status",
@@ -205,15 +493,71 @@ async def get_guest_attendance_status(
 @router.put(
     path="/attend/forecast",
     name="Forecast Attendance Time",
-    response_model=ForecastAttendanceTimeResponse,
+    response_model=ForecastAttendanceTimeResponse | EnqueueForecastJobResponse,
+    deprecated=True,
 )
 async def forecast_attendance_time(
+    response: Response,
+    session: AsyncSession = Depends(get_db_async),
+) -> ForecastAttendanceTimeResponse | EnqueueForecastJobResponse:
+    """Run a forecast job within the request and return its forecasts. When the forecast job worker runs in this
+    process, enqueue the job instead and answer 202 with it, like POST /events/attend/forecast/jobs."""
+    if not forecast_job_worker.is_running:
+        return await forecast_job_worker.run_now_async()
+
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    response.status_code = status.HTTP_202_ACCEPTED
+    return await usecase.enqueue_forecast_job_async()
+
+
+@router.post(
+    path="/attend/forecast/jobs",
+    name="Enqueue Forecast Job",
+    response_model=EnqueueForecastJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_forecast_job(
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> EnqueueForecastJobResponse:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.enqueue_forecast_job_async()
+
+
+@router.get(
+    path="/attend/forecast/jobs/{job_id}",
+    name="Get Forecast Job",
+    response_model=GetForecastJobResponse,
+)
+async def get_forecast_job(
+    job_id: str,
     session: AsyncSession = Depends(get_db_async),
-) -> ForecastAttendanceTimeResponse:
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> GetForecastJobResponse:
     uow = SqlalchemyUnitOfWork(session=session)
     usecase = EventUsecase(uow=uow)
 
-    return await usecase.forecast_attendance_time_async()
+    return await usecase.get_forecast_job_async(job_id_str=job_id)
+
+
+@router.delete(
+    path="/attend/forecast/jobs/{job_id}",
+    name="Cancel Forecast Job",
+    response_model=CancelForecastJobResponse,
+)
+async def cancel_forecast_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_db_async),
+    account: Account = Depends(AccessControl(permit={Role.HOST})),
+) -> CancelForecastJobResponse:
+    uow = SqlalchemyUnitOfWork(session=session)
+    usecase = EventUsecase(uow=uow)
+
+    return await usecase.cancel_forecast_job_async(job_id_str=job_id)
 
 
 @router.get(
@@ -222,12 +566,19 @@ async def forecast_attendance_time(
     response_model=GetAttendanceTimeForecastsResponse,
 )
 async def get_attendance_time_forecasts(
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     session: AsyncSession = Depends(get_db_async),
     account: Account = Depends(AccessControl(permit={Role.GUEST})),
-) -> GetAttendanceTimeForecastsResponse:
+) -> GetAttendanceTimeForecastsResponse | Response:
     uow = SqlalchemyUnitOfWork(session=session)
     usecase = EventUsecase(uow=uow)
 
+    etag = await usecase.get_attendance_time_forecasts_etag_async(account_id=account.account_id)
+    not_modified = _not_modified_or_none("/events/attend/forecast", etag, if_none_match, response)
+    if not_modified is not None:
+        return not_modified
+
     return await usecase.get_attendance_time_forecasts_async(
         account_id=account.account_id,
     )
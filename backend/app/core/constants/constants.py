@@ -14,5 +14,41 @@ AURORA_COMMON_DBNAME = os.getenv("AURORA_COMMON_DBNAME")
 AURORA_SEQUENCE_DBNAME = os.getenv("AURORA_SEQUENCE_DBNAME")
 AURORA_SHARD_DBNAME_PREFIX = os.getenv("AURORA_SHARD_DBNAME_PREFIX")
 ML_SERVER_URL = os.getenv("ML_SERVER_URL")
+ML_WIRE_FORMAT = os.getenv("ML_WIRE_FORMAT", "json").lower()
+ML_SERVER_HTTP2 = os.getenv("ML_SERVER_HTTP2", "false").lower() == "true"
+ML_SERVER_MAX_CONNECTIONS = int(os.getenv("ML_SERVER_MAX_CONNECTIONS", "20"))
+ML_SERVER_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ML_SERVER_MAX_KEEPALIVE_CONNECTIONS", "10"))
+ML_SERVER_KEEPALIVE_EXPIRY_MS = int(os.getenv("ML_SERVER_KEEPALIVE_EXPIRY_MS", "30000"))
+ML_SERVER_CONNECT_TIMEOUT_MS = int(os.getenv("ML_SERVER_CONNECT_TIMEOUT_MS", "5000"))
+ML_SERVER_FORECAST_DEADLINE_MS = int(os.getenv("ML_SERVER_FORECAST_DEADLINE_MS", "600000"))
+ML_SERVER_MAX_RETRIES = int(os.getenv("ML_SERVER_MAX_RETRIES", "2"))
+ML_SERVER_BACKOFF_BASE_MS = int(os.getenv("ML_SERVER_BACKOFF_BASE_MS", "500"))
+ML_SERVER_BACKOFF_MAX_MS = int(os.getenv("ML_SERVER_BACKOFF_MAX_MS", "10000"))
+ML_SERVER_HEDGE_AFTER_MS = int(os.getenv("ML_SERVER_HEDGE_AFTER_MS", "0"))
+ML_SERVER_BREAKER_FAILURE_THRESHOLD = int(os.getenv("ML_SERVER_BREAKER_FAILURE_THRESHOLD", "5"))
+ML_SERVER_BREAKER_RESET_MS = int(os.getenv("ML_SERVER_BREAKER_RESET_MS", "30000"))
+ACTION_LOG_WRITE_BEHIND = os.getenv("ACTION_LOG_WRITE_BEHIND", "false").lower() == "true"
+ACTION_LOG_QUEUE_SIZE = int(os.getenv("ACTION_LOG_QUEUE_SIZE", "10000"))
+ACTION_LOG_FLUSH_INTERVAL_MS = int(os.getenv("ACTION_LOG_FLUSH_INTERVAL_MS", "200"))
+ACTION_LOG_FLUSH_ROWS = int(os.getenv("ACTION_LOG_FLUSH_ROWS", "500"))
+ACTION_LOG_FLUSH_RETRIES = int(os.getenv("ACTION_LOG_FLUSH_RETRIES", "5"))
+ACTION_LOG_SPOOL_PATH = os.getenv("ACTION_LOG_SPOOL_PATH")
+FORECAST_JOB_WORKER = os.getenv("FORECAST_JOB_WORKER", "false").lower() == "true"
+FORECAST_JOB_POLL_INTERVAL_MS = int(os.getenv("FORECAST_JOB_POLL_INTERVAL_MS", "1000"))
+FORECAST_JOB_HEARTBEAT_INTERVAL_MS = int(os.getenv("FORECAST_JOB_HEARTBEAT_INTERVAL_MS", "5000"))
+FORECAST_JOB_LEASE_MS = int(os.getenv("FORECAST_JOB_LEASE_MS", "60000"))
+FORECAST_JOB_QUEUE_TTL_MS = int(os.getenv("FORECAST_JOB_QUEUE_TTL_MS", "600000"))
+FORECAST_DELTA_EXPORT = os.getenv("FORECAST_DELTA_EXPORT", "false").lower() == "true"
+FORECAST_CONTEXT_LEN = int(os.getenv("FORECAST_CONTEXT_LEN", "32"))
+FORECAST_EXPORT_OVERLAP_SECONDS = int(os.getenv("FORECAST_EXPORT_OVERLAP_SECONDS", "300"))
+FORECAST_INSERT_BATCH_ROWS = int(os.getenv("FORECAST_INSERT_BATCH_ROWS", "1000"))
+FORECAST_GC_BATCH_ROWS = int(os.getenv("FORECAST_GC_BATCH_ROWS", "5000"))
+FORECAST_GENERATION_STAGING_TTL_MS = int(os.getenv("FORECAST_GENERATION_STAGING_TTL_MS", "3600000"))
+FORECASTER = os.getenv("FORECASTER", "ml").lower()
+FORECAST_STATISTICAL_FALLBACK = os.getenv("FORECAST_STATISTICAL_FALLBACK", "false").lower() == "true"
+FORECAST_STATISTICAL_HORIZON_LEN = int(os.getenv("FORECAST_STATISTICAL_HORIZON_LEN", "4"))
+FORECAST_STATISTICAL_ALPHA = float(os.getenv("FORECAST_STATISTICAL_ALPHA", "0.3"))
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR")
+EVENT_PACKED_RECURRENCE_READS = os.getenv("EVENT_PACKED_RECURRENCE_READS", "true").lower() == "true"
 
 SESSION_TOKEN_NAME = "sestkn"
@@ -0,0 +1,27 @@
+from abc import ABCMeta, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.dtos.event import EventWithId as EventWithIdDto
+
+
+@dataclass(frozen=True)
+class CachedEventList:
+    # (max(updated_at), count) of the host's events, with updated_at in microseconds so that an edit within the same
+    # second as the cached read still changes it
+    version: tuple[datetime | None, int]
+    events: tuple[EventWithIdDto, ...]
+
+
+class IEventListCache(metaclass=ABCMeta):
+    @abstractmethod
+    async def get_many_async(self, user_ids: set[int]) -> dict[int, CachedEventList]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set_many_async(self, event_lists: dict[int, CachedEventList]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def invalidate_async(self, user_id: int) -> None:
+        raise NotImplementedError()
@@ -0,0 +1,15 @@
+from abc import ABCMeta, abstractmethod
+
+
+class IFollowGraphCache(metaclass=ABCMeta):
+    @abstractmethod
+    async def get_followees_async(self, user_id: int) -> frozenset[int] | None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set_followees_async(self, user_id: int, followee_user_ids: frozenset[int]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def invalidate_async(self, user_id: int) -> None:
+        raise NotImplementedError()
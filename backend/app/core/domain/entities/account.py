@@ -39,3 +39,15 @@ class UserAccount(IEntity):
         self.followees = followees
         self.follower_ids = follower_ids
         self.followers = followers
+
+
+class FeedToken(IEntity):
+    def __init__(
+        self,
+        entity_id: UUID,
+        account_id: UUID,
+        token_hash: bytes,
+    ) -> None:
+        super().__init__(entity_id)
+        self.account_id = account_id
+        self.token_hash = token_hash
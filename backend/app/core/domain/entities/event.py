@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Callable
 
 from app.core.domain.entities.base import IEntity
 from app.core.features.event import (
@@ -80,6 +81,8 @@ class Event(IEntity):
         recurrence_id: UUID | None,
         timezone: str,
         recurrence: Recurrence | None = None,
+        updated_at: datetime | None = None,
+        load_recurrence: Callable[[], Recurrence] | None = None,
     ) -> None:
         super().__init__(entity_id)
         self.user_id = user_id
@@ -90,7 +93,17 @@ class Event(IEntity):
         self.is_all_day = is_all_day
         self.recurrence_id = recurrence_id
         self.timezone = timezone
-        self.recurrence = recurrence
+        self._recurrence = recurrence
+        self._load_recurrence = load_recurrence
+        self.updated_at = updated_at
+
+    @property
+    def recurrence(self) -> Recurrence | None:
+        """The recurrence, decoded on first access when the event was read from packed storage."""
+        if self._load_recurrence is not None:
+            self._recurrence = self._load_recurrence()
+            self._load_recurrence = None
+        return self._recurrence
 
     def is_attendable(self, start: datetime, current_time: datetime) -> bool:
         zoned_current = apply_timezone(current_time, self.timezone)
@@ -175,6 +188,7 @@ class EventAttendanceForecast(IEntity):
         start: datetime,
         forecasted_attended_at: datetime,
         forecasted_duration: float,
+        generation_id: UUID,
     ) -> None:
         super().__init__(entity_id)
         self.user_id = user_id
@@ -182,6 +196,7 @@ class EventAttendanceForecast(IEntity):
         self.start = start
         self.forecasted_attended_at = forecasted_attended_at
         self.forecasted_duration = forecasted_duration
+        self.generation_id = generation_id
 
 
 class EventGoal(IEntity):
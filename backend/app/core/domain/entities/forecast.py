@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from app.core.domain.entities.base import IEntity
+from app.core.features.event import ForecastGenerationStatus, ForecastJobStage, ForecastJobStatus
+from app.core.utils.uuid import UUID
+
+
+class ForecastJob(IEntity):
+    def __init__(
+        self,
+        entity_id: UUID,
+        status: ForecastJobStatus,
+        stage: ForecastJobStage | None,
+        progress: int,
+        cancel_requested: bool,
+        error_code: int | None,
+        forecast_count: int | None,
+        enqueued_at: datetime,
+        started_at: datetime | None,
+        heartbeat_at: datetime | None,
+        finished_at: datetime | None,
+        export_watermarks: dict[str, datetime] | None,
+    ) -> None:
+        super().__init__(entity_id)
+        self.status = status
+        self.stage = stage
+        self.progress = progress
+        self.cancel_requested = cancel_requested
+        self.error_code = error_code
+        self.forecast_count = forecast_count
+        self.enqueued_at = enqueued_at
+        self.started_at = started_at
+        self.heartbeat_at = heartbeat_at
+        self.finished_at = finished_at
+        self.export_watermarks = export_watermarks
+
+
+class ForecastGeneration(IEntity):
+    def __init__(
+        self,
+        entity_id: UUID,
+        status: ForecastGenerationStatus,
+        forecast_count: int | None,
+        activated_at: datetime | None,
+        retired_at: datetime | None,
+    ) -> None:
+        super().__init__(entity_id)
+        self.status = status
+        self.forecast_count = forecast_count
+        self.activated_at = activated_at
+        self.retired_at = retired_at
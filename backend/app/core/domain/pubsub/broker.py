@@ -0,0 +1,13 @@
+from abc import ABCMeta, abstractmethod
+from contextlib import AbstractAsyncContextManager
+from typing import AsyncIterator
+
+
+class IBroker(metaclass=ABCMeta):
+    @abstractmethod
+    async def publish_async(self, channel: str, message: str) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AbstractAsyncContextManager[AsyncIterator[str]]:
+        raise NotImplementedError()
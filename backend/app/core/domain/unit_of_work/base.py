@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, Iterable
+from typing import Any, Awaitable, Callable, Iterable
 
 
 class IUnitOfWork(metaclass=ABCMeta):
@@ -27,6 +27,10 @@ class IUnitOfWork(metaclass=ABCMeta):
     async def rollback_async(self) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def on_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     async def delete_async(self, record: object) -> None:
         raise NotImplementedError()
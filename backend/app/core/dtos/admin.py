@@ -18,3 +18,28 @@ class StampRevisionRequest(BaseModel):
 
 class StampRevisionResponse(BaseModelWithErrorCodes):
     pass
+
+
+class HitRatioMetric(BaseModel):
+    hits: int = Field(..., title="Hits")
+    requests: int = Field(..., title="Requests")
+    hit_ratio: float = Field(..., title="Hit Ratio")
+
+
+class LatencyMetric(BaseModel):
+    requests: int = Field(..., title="Requests")
+    errors: int = Field(..., title="Errors")
+    rejected: int = Field(..., title="Rejected by Circuit Breaker")
+    retries: int = Field(..., title="Retries")
+    hedges: int = Field(..., title="Hedged Requests")
+    mean_ms: float = Field(..., title="Mean Latency in Milliseconds")
+    p50_ms: float = Field(..., title="Median Latency in Milliseconds")
+    p95_ms: float = Field(..., title="95th Percentile Latency in Milliseconds")
+    p99_ms: float = Field(..., title="99th Percentile Latency in Milliseconds")
+    max_ms: float = Field(..., title="Max Latency in Milliseconds")
+
+
+class GetMetricsResponse(BaseModelWithErrorCodes):
+    not_modified: dict[str, HitRatioMetric] = Field(..., title="304 Not Modified Ratio by Endpoint")
+    ml_server: dict[str, LatencyMetric] = Field(..., title="ML Server Calls by Name")
+    ml_server_circuit_state: str = Field(..., title="ML Server Circuit Breaker State")
@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from pydantic.fields import Field
 
 from app.core.dtos.base import BaseModelWithErrorCodes
-from app.core.features.event import AttendanceAction
+from app.core.features.event import AttendanceAction, AttendanceState, ForecastJobStage, ForecastJobStatus
 
 
 class Event(BaseModel):
@@ -37,6 +37,19 @@ class AttendanceTimeForecast(BaseModel):
     duration: float = Field(..., title="Attendance Duration")
 
 
+class ForecastJob(BaseModel):
+    id: str = Field(..., title="Job ID")
+    status: ForecastJobStatus = Field(..., title="Job Status")
+    stage: ForecastJobStage | None = Field(None, title="Stage")
+    progress: int = Field(..., title="Progress Percentage")
+    cancel_requested: bool = Field(..., title="Cancel Requested")
+    error_code: int | None = Field(None, title="Error Code")
+    forecast_count: int | None = Field(None, title="Stored Forecast Count")
+    enqueued_at: datetime = Field(..., title="Enqueued At")
+    started_at: datetime | None = Field(None, title="Started At")
+    finished_at: datetime | None = Field(None, title="Finished At")
+
+
 class AttendanceTimeForecastsWithUsername(BaseModel):
     username: str = Field(..., title="Username")
     attendance_time_forecasts: list[AttendanceTimeForecast] = Field(..., title="Attendance Time Forecasts")
@@ -62,6 +75,25 @@ class CreateEventResponse(BaseModelWithErrorCodes):
     pass
 
 
+class CreateEventResult(BaseModelWithErrorCodes):
+    event_id: str | None = Field(None, title="Event ID")
+
+
+class BulkCreateEventsRequest(BaseModel):
+    events: list[Event] = Field(..., title="Events", max_length=1000)
+
+
+class BulkCreateEventsResponse(BaseModelWithErrorCodes):
+    results: list[CreateEventResult] = Field(..., title="Create Event Results")
+
+
+class ImportEventsResponse(BaseModelWithErrorCodes):
+    imported_count: int = Field(..., title="Imported Event Count")
+    invalid_count: int = Field(..., title="Invalid Event Count")
+    duplicate_count: int = Field(..., title="Duplicate Event Count")
+    events_per_second: float = Field(..., title="Imported Events per Second")
+
+
 class UpdateEventRequest(BaseModel):
     event: Event = Field(..., title="Event")
 
@@ -78,6 +110,25 @@ class AttendEventResponse(BaseModelWithErrorCodes):
     pass
 
 
+class CheckIn(BaseModel):
+    guest_id: str = Field(..., title="Guest Account ID")
+    event_id: str = Field(..., title="Event ID")
+    start: datetime = Field(..., title="Event Start Time")
+    action: AttendanceAction = Field(..., title="Attendance Action")
+
+
+class CheckInResult(BaseModelWithErrorCodes):
+    pass
+
+
+class BulkAttendEventsRequest(BaseModel):
+    check_ins: list[CheckIn] = Field(..., title="Check-ins", max_length=1000)
+
+
+class BulkAttendEventsResponse(BaseModelWithErrorCodes):
+    results: list[CheckInResult] = Field(..., title="Check-in Results")
+
+
 class UpdateAttendancesRequest(BaseModel):
     attendances: list[Attendance] = Field(..., title="Attendances")
 
@@ -102,18 +153,58 @@ class GetGuestAttendanceStatusResponse(BaseModelWithErrorCodes):
     attend: bool = Field(..., title="Is Attending")
 
 
+class GuestAttendanceStatus(BaseModel):
+    event_id: str = Field(..., title="Event ID")
+    start: datetime = Field(..., title="Start")
+    attend: bool = Field(..., title="Is Attending")
+
+
+class GetGuestAttendanceStatusesResponse(BaseModelWithErrorCodes):
+    statuses: list[GuestAttendanceStatus] = Field(..., title="Guest Attendance Statuses")
+
+
+class GuestAttendance(BaseModel):
+    account_id: str = Field(..., title="Account ID")
+    username: str = Field(..., title="Username")
+    state: AttendanceState = Field(..., title="Attendance State")
+
+
+class GetAttendanceSnapshotResponse(BaseModelWithErrorCodes):
+    guest_attendances: list[GuestAttendance] = Field(..., title="Guest Attendances")
+
+
 class ForecastAttendanceTimeResponse(BaseModelWithErrorCodes):
     attendance_time_forecasts: dict[int, dict[str, list[AttendanceTimeForecast]]] = Field(
         ..., title="Attendance Time Forecasts"
     )
 
 
+class EnqueueForecastJobResponse(BaseModelWithErrorCodes):
+    job: ForecastJob | None = Field(None, title="Queued or Running Job")
+
+
+class GetForecastJobResponse(BaseModelWithErrorCodes):
+    job: ForecastJob | None = Field(None, title="Job")
+
+
+class CancelForecastJobResponse(BaseModelWithErrorCodes):
+    job: ForecastJob | None = Field(None, title="Job")
+
+
 class GetAttendanceTimeForecastsResponse(BaseModelWithErrorCodes):
     attendance_time_forecasts_with_username: dict[str, dict[int, AttendanceTimeForecastsWithUsername]] = Field(
         ..., title="Attendance Time Forecasts with Username"
     )
 
 
+class RegenerateFeedTokenResponse(BaseModelWithErrorCodes):
+    feed_token: str | None = Field(None, title="Feed Token")
+
+
+class RevokeFeedTokenResponse(BaseModelWithErrorCodes):
+    pass
+
+
 class CreateOrUpdateGoalRequest(BaseModel):
     goal_text: str = Field(..., title="Goal Text")
 
@@ -0,0 +1,234 @@
+"""Columnar wire format of the attendance forecast request and response.
+
+Both directions are streams of app.core.utils.columnar frames: ids are 16 bytes, timestamps are int64 microseconds
+since the epoch in UTC and enums are their values. The request carries one meta row followed by the four data tables;
+the response carries the forecast table only.
+"""
+
+from collections import defaultdict
+from typing import Any, Iterable, Iterator
+
+from pydantic import TypeAdapter
+
+from app.core.dtos.event import AttendanceTimeForecast, ForecastAttendanceTimeResponse
+from app.core.dtos.ml_dto.account import UserAccount
+from app.core.dtos.ml_dto.event import Event, EventAttendanceActionLog, Recurrence, RecurrenceRule
+from app.core.dtos.ml_dto.forecast import ForecastAttendanceTimeRequest
+from app.core.features.account import Gender
+from app.core.features.event import Frequency
+from app.core.utils.columnar import DEFAULT_FRAME_ROWS, Column, ColumnType, StreamDecoder, Table, encode_stream
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.tend-attend.columnar"
+
+_ACTION_LOG_COLUMNS = (
+    Column("id", ColumnType.UUID),
+    Column("user_id", ColumnType.INT64),
+    Column("event_id", ColumnType.UUID),
+    Column("start", ColumnType.TIMESTAMP),
+    Column("action", ColumnType.STRING),
+    Column("acted_at", ColumnType.TIMESTAMP),
+)
+
+META_TABLE = Table(
+    1,
+    "meta",
+    (Column("is_delta", ColumnType.INT64), Column("context_len", ColumnType.INT64, nullable=True)),
+)
+EARLIEST_ATTEND_TABLE = Table(2, "earliest_attend", _ACTION_LOG_COLUMNS)
+LATEST_LEAVE_TABLE = Table(3, "latest_leave", _ACTION_LOG_COLUMNS)
+EVENT_TABLE = Table(
+    4,
+    "event",
+    (
+        Column("id", ColumnType.UUID),
+        Column("user_id", ColumnType.INT64),
+        Column("dtstart", ColumnType.TIMESTAMP),
+        Column("dtend", ColumnType.TIMESTAMP),
+        Column("timezone", ColumnType.STRING),
+        Column("recurrence_id", ColumnType.UUID, nullable=True),
+        Column("rrule_id", ColumnType.UUID, nullable=True),
+        Column("freq", ColumnType.STRING, nullable=True),
+    ),
+)
+USER_TABLE = Table(
+    5,
+    "user",
+    (
+        Column("id", ColumnType.UUID),
+        Column("user_id", ColumnType.INT64),
+        Column("birth_date", ColumnType.TIMESTAMP),
+        Column("gender", ColumnType.STRING),
+    ),
+)
+FORECAST_TABLE = Table(
+    16,
+    "forecast",
+    (
+        Column("user_id", ColumnType.INT64),
+        Column("event_id", ColumnType.UUID),
+        Column("start", ColumnType.TIMESTAMP),
+        Column("attended_at", ColumnType.TIMESTAMP),
+        Column("duration", ColumnType.FLOAT64),
+    ),
+)
+REQUEST_TABLES = (META_TABLE, EARLIEST_ATTEND_TABLE, LATEST_LEAVE_TABLE, EVENT_TABLE, USER_TABLE)
+
+# Validating whole lists at once is noticeably cheaper than building the models one by one
+_ACTION_LOGS_ADAPTER = TypeAdapter(list[EventAttendanceActionLog])
+_FORECASTS_ADAPTER = TypeAdapter(dict[int, dict[str, list[AttendanceTimeForecast]]])
+
+
+def _action_log_columns(logs: list[EventAttendanceActionLog]) -> list[list[Any]]:
+    return [
+        [log.id for log in logs],
+        [log.user_id for log in logs],
+        [log.event_id for log in logs],
+        [log.start for log in logs],
+        [log.action.value for log in logs],
+        [log.acted_at for log in logs],
+    ]
+
+
+def _action_logs(columns: list[list[Any]]) -> list[EventAttendanceActionLog]:
+    return _ACTION_LOGS_ADAPTER.validate_python(
+        [
+            {
+                "id": id_,
+                "user_id": user_id,
+                "event_id": event_id,
+                "start": start,
+                "action": action,
+                "acted_at": acted_at,
+            }
+            for id_, user_id, event_id, start, action, acted_at in zip(*columns)
+        ]
+    )
+
+
+def encode_forecast_attendance_time_request(
+    request: ForecastAttendanceTimeRequest, frame_rows: int = DEFAULT_FRAME_ROWS
+) -> Iterator[bytes]:
+    events = request.event_data
+    users = request.user_data
+    return encode_stream(
+        [
+            (META_TABLE, [[int(request.is_delta)], [request.context_len]]),
+            (EARLIEST_ATTEND_TABLE, _action_log_columns(request.earliest_attend_data)),
+            (LATEST_LEAVE_TABLE, _action_log_columns(request.latest_leave_data)),
+            (
+                EVENT_TABLE,
+                [
+                    [event.id for event in events],
+                    [event.user_id for event in events],
+                    [event.dtstart for event in events],
+                    [event.dtend for event in events],
+                    [event.timezone for event in events],
+                    [event.recurrence.id if event.recurrence else None for event in events],
+                    [event.recurrence.rrule.id if event.recurrence else None for event in events],
+                    [event.recurrence.rrule.freq.value if event.recurrence else None for event in events],
+                ],
+            ),
+            (
+                USER_TABLE,
+                [
+                    [user.id for user in users],
+                    [user.user_id for user in users],
+                    [user.birth_date for user in users],
+                    [user.gender.value for user in users],
+                ],
+            ),
+        ],
+        frame_rows,
+    )
+
+
+def decode_forecast_attendance_time_request(chunks: Iterable[bytes]) -> ForecastAttendanceTimeRequest:
+    """Counterpart of encode_forecast_attendance_time_request for the receiving side."""
+    decoder = StreamDecoder(REQUEST_TABLES)
+    meta: list[list[Any]] = [[0], [None]]
+    rows: defaultdict[int, list[list[Any]]] = defaultdict(list)
+    for chunk in chunks:
+        for table, columns in decoder.feed(chunk):
+            if table is META_TABLE:
+                meta = columns
+            else:
+                rows[table.tag].append(columns)
+    decoder.close()
+
+    def concat(table: Table) -> list[list[Any]]:
+        merged: list[list[Any]] = [[] for _ in table.columns]
+        for columns in rows[table.tag]:
+            for values, more in zip(merged, columns):
+                values.extend(more)
+        return merged
+
+    return ForecastAttendanceTimeRequest(
+        is_delta=bool(meta[0][0]),
+        context_len=meta[1][0],
+        earliest_attend_data=_action_logs(concat(EARLIEST_ATTEND_TABLE)),
+        latest_leave_data=_action_logs(concat(LATEST_LEAVE_TABLE)),
+        event_data=[
+            Event(
+                id=id_,
+                user_id=user_id,
+                dtstart=dtstart,
+                dtend=dtend,
+                timezone=timezone,
+                recurrence=Recurrence(
+                    id=recurrence_id,
+                    rrule=RecurrenceRule(id=rrule_id, freq=Frequency(freq)),
+                )
+                if recurrence_id is not None
+                else None,
+            )
+            for id_, user_id, dtstart, dtend, timezone, recurrence_id, rrule_id, freq in zip(*concat(EVENT_TABLE))
+        ],
+        user_data=[
+            UserAccount(id=id_, user_id=user_id, birth_date=birth_date, gender=Gender(gender))
+            for id_, user_id, birth_date, gender in zip(*concat(USER_TABLE))
+        ],
+    )
+
+
+def encode_forecast_attendance_time_response(
+    response: ForecastAttendanceTimeResponse, frame_rows: int = DEFAULT_FRAME_ROWS
+) -> Iterator[bytes]:
+    """Counterpart of ForecastAttendanceTimeResponseDecoder for the sending side."""
+    columns: list[list[Any]] = [[], [], [], [], []]
+    for user_id, events in response.attendance_time_forecasts.items():
+        for event_id, forecasts in events.items():
+            for forecast in forecasts:
+                columns[0].append(user_id)
+                columns[1].append(event_id)
+                columns[2].append(forecast.start)
+                columns[3].append(forecast.attended_at)
+                columns[4].append(forecast.duration)
+    return encode_stream([(FORECAST_TABLE, columns)], frame_rows)
+
+
+class ForecastAttendanceTimeResponseDecoder:
+    """Builds a ForecastAttendanceTimeResponse from a streamed columnar response body, frame by frame."""
+
+    def __init__(self) -> None:
+        self._decoder = StreamDecoder((FORECAST_TABLE,))
+        self._forecasts: defaultdict[int, defaultdict[str, list[dict[str, Any]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        for _, columns in self._decoder.feed(chunk):
+            # The forecasts of a series are contiguous, so the series list is only looked up when it changes
+            series_key = None
+            series: list[dict[str, Any]] = []
+            for user_id, event_id, start, attended_at, duration in zip(*columns):
+                if (user_id, event_id) != series_key:
+                    series_key = (user_id, event_id)
+                    series = self._forecasts[user_id][event_id]
+                series.append({"start": start, "attended_at": attended_at, "duration": duration})
+
+    def close(self) -> ForecastAttendanceTimeResponse:
+        self._decoder.close()
+        return ForecastAttendanceTimeResponse.model_construct(
+            attendance_time_forecasts=_FORECASTS_ADAPTER.validate_python(self._forecasts),
+            error_codes=[],
+        )
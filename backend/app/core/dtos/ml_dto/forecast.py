@@ -5,6 +5,17 @@ from app.core.dtos.ml_dto.event import Event, EventAttendanceActionLog
 
 
 class ForecastAttendanceTimeRequest(BaseModel):
+    """Attendance history sent to the ML server.
+
+    A full request (is_delta false) carries every series and replaces whatever the ML server has accumulated. A delta
+    request only carries the (user_id, event_id) series that got action logs since the previous export, each cut to
+    the logs of its last context_len occurrences, plus the events and users those series refer to or that changed.
+    The ML server merges a delta into its accumulated data, upserting logs, events and users by id, and answers with
+    the complete forecasts of every series it re-forecast; the backend replaces exactly those series.
+    """
+
+    is_delta: bool
+    context_len: int | None
     earliest_attend_data: list[EventAttendanceActionLog]
     latest_leave_data: list[EventAttendanceActionLog]
     event_data: list[Event]
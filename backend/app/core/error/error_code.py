@@ -23,9 +23,18 @@ class ErrorCode(IntEnum):
     EVENT_NOT_ATTENDABLE = 4002
     EVENT_NOT_LEAVEABLE = 4003
     EVENT_ACCESS_DENIED = 4004
+    EVENT_OCCURRENCE_NOT_FOUND = 4005
+    EVENT_INVALID = 4006
+    EVENT_SUMMARY_ALREADY_EXISTS = 4007
+    CALENDAR_FILE_INVALID = 4008
 
     ML_SERVER_ERROR = 5001
     ML_SERVER_TIMEOUT = 5002
+    FORECAST_JOB_NOT_FOUND = 5003
+    FORECAST_JOB_ALREADY_FINISHED = 5004
+    FORECAST_JOB_ABANDONED = 5005
+    FORECAST_JOB_EXPIRED = 5006
+    FORECAST_JOB_ALREADY_RUNNING = 5007
 
     GOOGLE_CALENDAR_NOT_FOUND = 6001
     GOOGLE_CALENDAR_ALREADY_CONNECTED = 6002
@@ -31,3 +31,11 @@ class Account:
     username: str
     group: Group
     disabled: bool
+
+
+@dataclass(frozen=True)
+class AccountIdentity:
+    account_id: UUID
+    user_id: int
+    username: str
+    group: Group
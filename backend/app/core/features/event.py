@@ -135,3 +135,27 @@ class AttendanceState(IntEnum):
     UNEXCUSED_ABSENCE = 2
     # TARDY = 3
     # EARLY_DEPARTURE = 4
+
+
+class ForecastJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_active(self) -> bool:
+        return self in {ForecastJobStatus.QUEUED, ForecastJobStatus.RUNNING}
+
+
+class ForecastJobStage(str, Enum):
+    READING = "reading"
+    FORECASTING = "forecasting"
+    STORING = "storing"
+
+
+class ForecastGenerationStatus(str, Enum):
+    STAGED = "staged"
+    ACTIVE = "active"
+    RETIRED = "retired"
@@ -0,0 +1,41 @@
+from app.core.domain.cache.event import CachedEventList, IEventListCache
+from app.core.domain.cache.follow import IFollowGraphCache
+from app.core.utils.cache import LRUCache
+
+
+class InMemoryEventListCache(IEventListCache):
+    """Per-process host event list cache, suitable for local development and a single worker."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache: LRUCache[int, CachedEventList] = LRUCache(maxsize=maxsize)
+
+    async def get_many_async(self, user_ids: set[int]) -> dict[int, CachedEventList]:
+        event_lists = {}
+        for user_id in user_ids:
+            event_list = self._cache.get(user_id)
+            if event_list is not None:
+                event_lists[user_id] = event_list
+        return event_lists
+
+    async def set_many_async(self, event_lists: dict[int, CachedEventList]) -> None:
+        for user_id, event_list in event_lists.items():
+            self._cache.set(user_id, event_list)
+
+    async def invalidate_async(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+
+class InMemoryFollowGraphCache(IFollowGraphCache):
+    """Per-process adjacency sets of followee user IDs keyed by follower user ID."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache: LRUCache[int, frozenset[int]] = LRUCache(maxsize=maxsize)
+
+    async def get_followees_async(self, user_id: int) -> frozenset[int] | None:
+        return self._cache.get(user_id)
+
+    async def set_followees_async(self, user_id: int, followee_user_ids: frozenset[int]) -> None:
+        self._cache.set(user_id, followee_user_ids)
+
+    async def invalidate_async(self, user_id: int) -> None:
+        self._cache.pop(user_id)
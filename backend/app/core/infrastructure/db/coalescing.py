@@ -0,0 +1,142 @@
+import asyncio
+import inspect
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.domain.usecase.base import IUsecase
+from app.core.utils.cache import LRUCache
+
+
+def coalesced[T](
+    ttl: float = 0.0, maxsize: int = 1024
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Share one in-flight call among concurrent identical calls, keyed by the normalized arguments.
+
+    Only wrap reads whose result does not depend on who is asking; authorize before calling them.
+    With ttl > 0, results are also reused for ttl seconds after they complete.
+    """
+
+    def decorator(f: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(f)
+        in_flight: dict[Hashable, asyncio.Future[T]] = {}
+        recent: LRUCache[Hashable, tuple[float, T]] = LRUCache(maxsize=maxsize)
+
+        @wraps(f)
+        async def wrapper(self: IUsecase, *args: Any, **kwargs: Any) -> T:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(list(bound.arguments.items())[1:])
+
+            if ttl > 0:
+                cached = recent.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    return cached[1]
+
+            future = in_flight.get(key)
+            if future is not None:
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # Only recompute when the leader was cancelled, not this caller
+                    task = asyncio.current_task()
+                    if not future.cancelled() or (task is not None and task.cancelling()):
+                        raise
+                    return await wrapper(self, *args, **kwargs)
+
+            future = asyncio.get_running_loop().create_future()
+            in_flight[key] = future
+            try:
+                result = await f(self, *args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Mark the exception as retrieved when nobody else is waiting
+                future.exception()
+                raise
+            finally:
+                del in_flight[key]
+            future.set_result(result)
+            if ttl > 0:
+                recent.set(key, (time.monotonic() + ttl, result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def coalesced_by_key[K: Hashable, V](
+    ttl: float = 0.0, maxsize: int = 1024
+) -> Callable[
+    [Callable[[Any, frozenset[K]], Awaitable[dict[K, V]]]], Callable[[Any, frozenset[K]], Awaitable[dict[K, V]]]
+]:
+    """Like coalesced, for a batch read that maps each of the given keys to a value of its own.
+
+    Concurrent calls share the in-flight and, with ttl > 0, the recent value of each key, so calls with overlapping
+    keys share the reads of the common ones; the keys that no other call is reading are read in one batch. The wrapped
+    read must return a value for every key it is given.
+    """
+
+    def decorator(
+        f: Callable[[Any, frozenset[K]], Awaitable[dict[K, V]]],
+    ) -> Callable[[Any, frozenset[K]], Awaitable[dict[K, V]]]:
+        in_flight: dict[K, asyncio.Future[V]] = {}
+        recent: LRUCache[K, tuple[float, V]] = LRUCache(maxsize=maxsize)
+
+        @wraps(f)
+        async def wrapper(self: IUsecase, keys: frozenset[K]) -> dict[K, V]:
+            results: dict[K, V] = {}
+            waiting: dict[K, asyncio.Future[V]] = {}
+            missing: set[K] = set()
+            now = time.monotonic()
+            for key in keys:
+                cached = recent.get(key) if ttl > 0 else None
+                if cached is not None and cached[0] > now:
+                    results[key] = cached[1]
+                elif key in in_flight:
+                    waiting[key] = in_flight[key]
+                else:
+                    missing.add(key)
+
+            if missing:
+                futures = {key: asyncio.get_running_loop().create_future() for key in missing}
+                in_flight.update(futures)
+                try:
+                    loaded = await f(self, frozenset(missing))
+                except asyncio.CancelledError:
+                    for future in futures.values():
+                        future.cancel()
+                    raise
+                except BaseException as e:
+                    for future in futures.values():
+                        future.set_exception(e)
+                        # Mark the exception as retrieved when nobody else is waiting
+                        future.exception()
+                    raise
+                finally:
+                    for key in missing:
+                        del in_flight[key]
+                expires_at = time.monotonic() + ttl
+                for key in missing:
+                    futures[key].set_result(loaded[key])
+                    results[key] = loaded[key]
+                    if ttl > 0:
+                        recent.set(key, (expires_at, loaded[key]))
+
+            for key, future in waiting.items():
+                try:
+                    results[key] = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # Only read again when the leader was cancelled, not this caller
+                    task = asyncio.current_task()
+                    if not future.cancelled() or (task is not None and task.cancelling()):
+                        raise
+                    results |= await wrapper(self, frozenset({key}))
+            return results
+
+        return wrapper
+
+    return decorator
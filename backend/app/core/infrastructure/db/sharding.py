@@ -61,3 +61,7 @@ class DbShardResolver:
 
 
 db_shard_resolver = DbShardResolver(shard_count=DB_SHARD_COUNT)
+
+
+def resolve_shard_connection_key(user_id: int) -> str:
+    return SHARD_DB_CONNECTION_KEYS[db_shard_resolver.resolve_shard_id(user_id)]
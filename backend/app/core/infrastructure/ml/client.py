@@ -0,0 +1,315 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Callable
+
+import httpx
+
+from app.core.constants.constants import (
+    ML_SERVER_BACKOFF_BASE_MS,
+    ML_SERVER_BACKOFF_MAX_MS,
+    ML_SERVER_BREAKER_FAILURE_THRESHOLD,
+    ML_SERVER_BREAKER_RESET_MS,
+    ML_SERVER_CONNECT_TIMEOUT_MS,
+    ML_SERVER_HEDGE_AFTER_MS,
+    ML_SERVER_HTTP2,
+    ML_SERVER_KEEPALIVE_EXPIRY_MS,
+    ML_SERVER_MAX_CONNECTIONS,
+    ML_SERVER_MAX_KEEPALIVE_CONNECTIONS,
+    ML_SERVER_MAX_RETRIES,
+    ML_SERVER_URL,
+)
+from app.core.utils.metrics import LatencyMetrics, ml_server_metrics
+
+_RETRYABLE_STATUS_CODES = frozenset(
+    {httpx.codes.BAD_GATEWAY, httpx.codes.SERVICE_UNAVAILABLE, httpx.codes.GATEWAY_TIMEOUT}
+)
+
+RequestContent = bytes | Callable[[], AsyncIterator[bytes]]
+
+
+class MlServerUnavailableError(Exception):
+    """Raised without contacting the ML server while the circuit breaker is open."""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failed attempts and then rejects every call for reset_ms. After that
+    a single probe call is let through, which closes the breaker when it succeeds and opens it again when it fails."""
+
+    def __init__(self, failure_threshold: int, reset_ms: int) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset = reset_ms / 1000
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._probing or time.monotonic() - self._opened_at >= self._reset:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def acquire(self) -> None:
+        state = self.state
+        if state == CircuitState.OPEN or (state == CircuitState.HALF_OPEN and self._probing):
+            raise MlServerUnavailableError()
+        if state == CircuitState.HALF_OPEN:
+            self._probing = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """For an attempt that ended without an outcome, e.g. because it was cancelled; the next call probes again."""
+        self._probing = False
+
+
+class MlServerClient:
+    """Process-wide client of the ML server on top of one pooled httpx.AsyncClient.
+
+    Connections are kept alive and reused across calls. Each call has a deadline that covers all of its attempts,
+    including reading the response, and each attempt times out after an even share of what is left of it, so one hung
+    attempt cannot use up the time for its retries. An idempotent call is retried on timeouts, transport errors and 502/503/504 with
+    exponential backoff and full jitter, and with hedge_after_ms it also starts a second attempt when the first has
+    not answered by then, keeping whichever answers first. Attempts of all calls share one circuit breaker, so while
+    the ML server is down calls fail fast with MlServerUnavailableError instead of waiting for their deadline.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        http2: bool,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry_ms: int,
+        connect_timeout_ms: int,
+        max_retries: int,
+        backoff_base_ms: int,
+        backoff_max_ms: int,
+        hedge_after_ms: int,
+        breaker: CircuitBreaker,
+        metrics: LatencyMetrics,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._base_url = base_url
+        self._http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_ms / 1000,
+        )
+        self._connect_timeout = connect_timeout_ms / 1000
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base_ms / 1000
+        self._backoff_max = backoff_max_ms / 1000
+        self._hedge_after = hedge_after_ms / 1000 if hedge_after_ms > 0 else None
+        self._breaker = breaker
+        self._metrics = metrics
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        return self._breaker.state
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use so that it belongs to the event loop serving the app
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                http2=self._http2,  # Needs the h2 package
+                limits=self._limits,
+                timeout=httpx.Timeout(None, connect=self._connect_timeout),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose_async(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def stream_async(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        content: RequestContent,
+        headers: dict[str, str],
+        deadline_ms: int,
+        idempotent: bool,
+    ) -> AsyncIterator[httpx.Response]:
+        """Send the request and yield the response with its body still to be read.
+
+        A callable content is called once per attempt, so a streamed body can be sent again. The response is yielded
+        whatever its status, so check it before reading the body. Raises MlServerUnavailableError when the breaker is
+        open, TimeoutError when the deadline passes and httpx.TransportError when the last attempt fails.
+        """
+        started = time.perf_counter()
+        deadline = asyncio.get_running_loop().time() + deadline_ms / 1000
+        try:
+            async with asyncio.timeout_at(deadline):
+                response = await self._send_with_retries_async(
+                    name, method, path, content, headers, idempotent, deadline
+                )
+                try:
+                    yield response
+                finally:
+                    await response.aclose()
+        except MlServerUnavailableError:
+            self._metrics.record_rejected(name)
+            raise
+        except BaseException:
+            self._metrics.record(name, (time.perf_counter() - started) * 1000, error=True)
+            raise
+        self._metrics.record(name, (time.perf_counter() - started) * 1000, error=response.is_error)
+
+    async def _send_with_retries_async(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        content: RequestContent,
+        headers: dict[str, str],
+        idempotent: bool,
+        deadline: float,
+    ) -> httpx.Response:
+        attempts = self._max_retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            if attempt > 0:
+                self._metrics.record_retry(name)
+                await asyncio.sleep(random.uniform(0, min(self._backoff_max, self._backoff_base * 2 ** (attempt - 1))))
+            is_last = attempt == attempts - 1
+            timeout = (deadline - asyncio.get_running_loop().time()) / (attempts - attempt)
+            try:
+                if idempotent and self._hedge_after is not None:
+                    response = await self._send_hedged_async(name, method, path, content, headers, deadline, timeout)
+                else:
+                    response = await self._send_once_async(method, path, content, headers, deadline, timeout)
+            except httpx.TransportError:
+                if is_last:
+                    raise
+                continue
+            if response.status_code in _RETRYABLE_STATUS_CODES and not is_last:
+                await response.aclose()
+                continue
+            return response
+        raise AssertionError("unreachable")
+
+    async def _send_once_async(
+        self,
+        method: str,
+        path: str,
+        content: RequestContent,
+        headers: dict[str, str],
+        deadline: float,
+        timeout: float,
+    ) -> httpx.Response:
+        self._breaker.acquire()
+        client = self._get_client()
+        request = client.build_request(
+            method,
+            path,
+            content=content() if callable(content) else content,
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=min(self._connect_timeout, timeout)),
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except (httpx.TransportError, TimeoutError):
+            # httpx.TimeoutException is a TransportError
+            self._breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Cancelled by the call's deadline, the attempt timed out; otherwise it ended without an outcome
+            if asyncio.get_running_loop().time() >= deadline:
+                self._breaker.record_failure()
+            else:
+                self._breaker.release()
+            raise
+        except BaseException:
+            self._breaker.release()
+            raise
+        if response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    async def _send_hedged_async(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        content: RequestContent,
+        headers: dict[str, str],
+        deadline: float,
+        timeout: float,
+    ) -> httpx.Response:
+        """Return the first usable response of up to two concurrent attempts; the other attempt is cancelled or
+        closed."""
+        pending = {asyncio.create_task(self._send_once_async(method, path, content, headers, deadline, timeout))}
+        finished: list[asyncio.Task[httpx.Response]] = []
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_after)
+            if not done:
+                self._metrics.record_hedge(name)
+                pending.add(
+                    asyncio.create_task(self._send_once_async(method, path, content, headers, deadline, timeout))
+                )
+            finished.extend(done)
+            while True:
+                for task in finished:
+                    if task.exception() is None and task.result().status_code not in _RETRYABLE_STATUS_CODES:
+                        finished.remove(task)
+                        return task.result()
+                if not pending:
+                    # Every attempt failed; report the last one like a single attempt would
+                    return finished.pop().result()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished.extend(done)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in [*finished, *pending]:
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+
+
+ml_server_client = MlServerClient(
+    base_url=ML_SERVER_URL or "",
+    http2=ML_SERVER_HTTP2,
+    max_connections=ML_SERVER_MAX_CONNECTIONS,
+    max_keepalive_connections=ML_SERVER_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry_ms=ML_SERVER_KEEPALIVE_EXPIRY_MS,
+    connect_timeout_ms=ML_SERVER_CONNECT_TIMEOUT_MS,
+    max_retries=ML_SERVER_MAX_RETRIES,
+    backoff_base_ms=ML_SERVER_BACKOFF_BASE_MS,
+    backoff_max_ms=ML_SERVER_BACKOFF_MAX_MS,
+    hedge_after_ms=ML_SERVER_HEDGE_AFTER_MS,
+    breaker=CircuitBreaker(
+        failure_threshold=ML_SERVER_BREAKER_FAILURE_THRESHOLD,
+        reset_ms=ML_SERVER_BREAKER_RESET_MS,
+    ),
+    metrics=ml_server_metrics,
+)
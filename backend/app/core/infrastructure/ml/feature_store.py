@@ -0,0 +1,287 @@
+"""On-disk feature store of the attendance series, materialized from the action logs and read by the ML package.
+
+Every (user_id, event_id) series is stored as dense arrays of its occurrences, one per attended start, so the export
+and LitDataset read columns instead of rebuilding them from logs. Each save writes a new version directory of .npy
+files, which are memory-mapped when loaded, and then points CURRENT at it:
+
+    directory/
+    ├── CURRENT                 name of the current version directory
+    └── <version>/
+        ├── manifest.json       format_version, export watermarks per shard, series and occurrence counts
+        ├── user_id.npy         int64, per series, series sorted by (user_id, event_id)
+        ├── event_id.npy        unicode, per series
+        ├── updated_at.npy      int64, per series, seconds since the epoch; not older than its latest log
+        ├── offsets.npy         int64, series_count + 1; occurrences of series i are offsets[i]:offsets[i + 1]
+        ├── start.npy           int64, per occurrence, seconds since the epoch, sorted within a series
+        ├── end.npy             int64, per occurrence, seconds since the epoch
+        ├── attended_at.npy     float64, per occurrence, minutes after start of the earliest attend
+        ├── left_at.npy         float64, per occurrence, minutes after start of the latest leave, NaN without one
+        ├── duration.npy        float64, per occurrence, seconds from attend to leave, NaN without a leave
+        └── weekday.npy         int8, per occurrence, weekday of start in the event's timezone, Monday is 0
+
+The layout is mirrored by ml/core/feature_store.py, so FORMAT_VERSION changes with it on both sides.
+"""
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from app.core.domain.entities.event import Event as EventEntity
+from app.core.domain.entities.event import EventAttendanceActionLog as EventAttendanceActionLogEntity
+from app.core.infrastructure.ml.statistical import epoch_seconds, utc_offset_seconds
+from app.core.utils.uuid import UUID, uuid_to_str
+
+FORMAT_VERSION = 1
+_CURRENT = "CURRENT"
+_MANIFEST = "manifest.json"
+_DAY_SECONDS = 24 * 60 * 60
+# The previous version is kept, so a reader that has just read CURRENT can still open it
+_KEPT_VERSIONS = 2
+
+Int64Array = npt.NDArray[np.int64]
+Float64Array = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+
+
+@dataclass(frozen=True)
+class AttendanceFeatures:
+    watermarks: dict[str, datetime]
+    user_id: Int64Array
+    event_id: npt.NDArray[np.str_]
+    updated_at: Int64Array
+    offsets: Int64Array
+    start: Int64Array
+    end: Int64Array
+    attended_at: Float64Array
+    left_at: Float64Array
+    duration: Float64Array
+    weekday: npt.NDArray[np.int8]
+
+    @classmethod
+    def empty(cls) -> "AttendanceFeatures":
+        return cls(
+            watermarks={},
+            user_id=np.empty(0, dtype=np.int64),
+            event_id=np.empty(0, dtype="<U36"),
+            updated_at=np.empty(0, dtype=np.int64),
+            offsets=np.zeros(1, dtype=np.int64),
+            start=np.empty(0, dtype=np.int64),
+            end=np.empty(0, dtype=np.int64),
+            attended_at=np.empty(0, dtype=np.float64),
+            left_at=np.empty(0, dtype=np.float64),
+            duration=np.empty(0, dtype=np.float64),
+            weekday=np.empty(0, dtype=np.int8),
+        )
+
+    def __len__(self) -> int:
+        return len(self.user_id)
+
+    def _series_columns(self) -> dict[str, npt.NDArray[np.generic]]:
+        return {"user_id": self.user_id, "event_id": self.event_id, "updated_at": self.updated_at}
+
+    def _occurrence_columns(self) -> dict[str, npt.NDArray[np.generic]]:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "attended_at": self.attended_at,
+            "left_at": self.left_at,
+            "duration": self.duration,
+            "weekday": self.weekday,
+        }
+
+    def occurrence_indices(self, series: BoolArray, context_len: int | None) -> Int64Array:
+        """Return the indices of the last context_len occurrences, or all of them, of the selected series."""
+        counts = np.diff(self.offsets)[series]
+        if context_len is not None:
+            counts = np.minimum(counts, context_len)
+        firsts = self.offsets[1:][series] - counts
+        block_starts = np.cumsum(counts) - counts
+        indices: Int64Array = np.repeat(firsts - block_starts, counts) + np.arange(counts.sum(), dtype=np.int64)
+        return indices
+
+    def merge(self, changed: "AttendanceFeatures", watermarks: dict[str, datetime]) -> "AttendanceFeatures":
+        """Return the features with the series in changed replaced or added, stamped with the given watermarks."""
+        changed_keys = set(zip(changed.user_id.tolist(), changed.event_id.tolist()))
+        kept = np.fromiter(
+            (key not in changed_keys for key in zip(self.user_id.tolist(), self.event_id.tolist())), bool, len(self)
+        )
+        kept_occurrences = self.occurrence_indices(kept, None)
+
+        series = {
+            name: np.concatenate([column[kept], changed._series_columns()[name]])
+            for name, column in self._series_columns().items()
+        }
+        occurrences = {
+            name: np.concatenate([column[kept_occurrences], changed._occurrence_columns()[name]])
+            for name, column in self._occurrence_columns().items()
+        }
+        counts = np.concatenate([np.diff(self.offsets)[kept], np.diff(changed.offsets)])
+        firsts = np.cumsum(counts) - counts
+
+        # Restore the (user_id, event_id) order, moving the occurrences of each series along with it
+        order = np.lexsort((series["event_id"], series["user_id"]))
+        counts = counts[order]
+        block_starts = np.cumsum(counts) - counts
+        occurrence_order = np.repeat(firsts[order] - block_starts, counts) + np.arange(counts.sum(), dtype=np.int64)
+        return AttendanceFeatures(
+            watermarks=watermarks,
+            offsets=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            **{name: column[order] for name, column in series.items()},
+            **{name: column[occurrence_order] for name, column in occurrences.items()},
+        )
+
+
+def build_attendance_features(
+    earliest_attend_data: Iterable[EventAttendanceActionLogEntity],
+    latest_leave_data: Iterable[EventAttendanceActionLogEntity],
+    event_data: Iterable[EventEntity],
+    updated_at: datetime,
+) -> AttendanceFeatures:
+    """Build the features of every series with an attend, from its earliest attend and latest leave per occurrence.
+
+    The logs of a series have to cover all of its occurrences, as the series replaces the stored one when merged.
+    Every series is stamped with updated_at, which must not be older than its latest log.
+    """
+    attends = list(earliest_attend_data)
+    leaves = list(latest_leave_data)
+    event_codes: dict[UUID, int] = {}
+    for log in (*attends, *leaves):
+        event_codes.setdefault(log.event_id, len(event_codes))
+    event_count = max(len(event_codes), 1)
+
+    # Events are numbered by their id string, so the series keys sort like (user_id, event_id)
+    event_ids = np.array([uuid_to_str(event_id) for event_id in event_codes], dtype="<U36")
+    event_ranks = np.empty(len(event_ids), dtype=np.int64)
+    event_ranks[np.argsort(event_ids)] = np.arange(len(event_ids))
+    length_by_event = np.zeros(event_count, dtype=np.int64)
+    utc_offset_by_event = np.zeros(event_count, dtype=np.int64)
+    for event in event_data:
+        event_code = event_codes.get(event.id)
+        if event_code is not None:
+            length_by_event[event_code] = int((event.dtend - event.dtstart).total_seconds())
+            utc_offset_by_event[event_code] = utc_offset_seconds(event.timezone, event.dtstart)
+
+    def pack(logs: list[EventAttendanceActionLogEntity]) -> tuple[Int64Array, Int64Array, Int64Array, Int64Array]:
+        """Return the series keys, event codes, starts and acted_ats of the logs."""
+        codes = np.fromiter((event_codes[log.event_id] for log in logs), np.int64, len(logs))
+        users = np.fromiter((log.user_id for log in logs), np.int64, len(logs))
+        return (
+            users * event_count + event_ranks[codes],
+            codes,
+            epoch_seconds([log.start for log in logs]),
+            epoch_seconds([log.acted_at for log in logs]),
+        )
+
+    attend_keys, attend_codes, attend_starts, attend_acted = pack(attends)
+    leave_keys, _, leave_starts, leave_acted = pack(leaves)
+    series_keys, attend_series = np.unique(attend_keys, return_inverse=True)
+    if len(series_keys) == 0:
+        return AttendanceFeatures.empty()
+
+    # One occurrence per (series, start): the earliest attend
+    order = np.lexsort((attend_acted, attend_starts, attend_series))
+    attend_series, attend_starts = attend_series[order], attend_starts[order]
+    attend_acted, attend_codes = attend_acted[order], attend_codes[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (attend_series[1:] != attend_series[:-1]) | (attend_starts[1:] != attend_starts[:-1])
+    series, starts, attended = attend_series[first], attend_starts[first], attend_acted[first]
+    codes = attend_codes[first]
+    occurrence_keys = (series << 32) + starts
+
+    # The latest leave of each occurrence; leaves of unknown series or starts are dropped
+    leave_series = np.searchsorted(series_keys, leave_keys)
+    known = leave_series < len(series_keys)
+    known[known] = series_keys[leave_series[known]] == leave_keys[known]
+    leave_occurrence_keys = (leave_series[known] << 32) + leave_starts[known]
+    occurrences = np.searchsorted(occurrence_keys, leave_occurrence_keys)
+    matched = occurrences < len(occurrence_keys)
+    matched[matched] = occurrence_keys[occurrences[matched]] == leave_occurrence_keys[matched]
+    left = np.full(len(occurrence_keys), np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(left, occurrences[matched], leave_acted[known][matched])
+    has_left = left != np.iinfo(np.int64).min
+
+    counts = np.bincount(series, minlength=len(series_keys)).astype(np.int64)
+    firsts = np.cumsum(counts) - counts
+    series_codes = codes[firsts]
+    return AttendanceFeatures(
+        watermarks={},
+        user_id=series_keys // event_count,
+        event_id=event_ids[series_codes],
+        updated_at=np.full(len(series_keys), epoch_seconds([updated_at])[0], dtype=np.int64),
+        offsets=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+        start=starts,
+        end=starts + length_by_event[codes],
+        attended_at=(attended - starts) / 60,
+        left_at=np.where(has_left, (left - starts) / 60, np.nan),
+        duration=np.where(has_left, np.maximum(left - attended, 0), np.nan).astype(np.float64),
+        weekday=(((starts + utc_offset_by_event[codes]) // _DAY_SECONDS + 3) % 7).astype(np.int8),
+    )
+
+
+def save_attendance_features(directory: Path, features: AttendanceFeatures) -> None:
+    """Write the features as a new version and make it the current one; readers of older versions are unaffected."""
+    directory.mkdir(parents=True, exist_ok=True)
+    version = f"v{time.time_ns()}"
+    version_dir = directory / version
+    version_dir.mkdir()
+    for name, column in {
+        **features._series_columns(),
+        "offsets": features.offsets,
+        **features._occurrence_columns(),
+    }.items():
+        np.save(version_dir / f"{name}.npy", np.ascontiguousarray(column))
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "watermarks": {shard_id: watermark.isoformat() for shard_id, watermark in features.watermarks.items()},
+        "series_count": len(features),
+        "occurrence_count": len(features.start),
+    }
+    (version_dir / _MANIFEST).write_text(json.dumps(manifest))
+
+    current = directory / _CURRENT
+    current_tmp = directory / f"{_CURRENT}.tmp"
+    current_tmp.write_text(version)
+    os.replace(current_tmp, current)
+
+    versions = sorted(path for path in directory.iterdir() if path.is_dir())
+    for stale in versions[:-_KEPT_VERSIONS]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def load_attendance_features(directory: Path) -> AttendanceFeatures | None:
+    """Memory-map the current version of the features, or return None when none was saved yet."""
+    current = directory / _CURRENT
+    if not current.exists():
+        return None
+    version_dir = directory / current.read_text().strip()
+    manifest = json.loads((version_dir / _MANIFEST).read_text())
+    if manifest["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported feature store format version: {manifest['format_version']}")
+
+    def load(name: str) -> npt.NDArray[np.generic]:
+        column: npt.NDArray[np.generic] = np.load(version_dir / f"{name}.npy", mmap_mode="r")
+        return column
+
+    return AttendanceFeatures(
+        watermarks={
+            shard_id: datetime.fromisoformat(watermark) for shard_id, watermark in manifest["watermarks"].items()
+        },
+        user_id=load("user_id").astype(np.int64, copy=False),
+        event_id=load("event_id").astype(np.str_, copy=False),
+        updated_at=load("updated_at").astype(np.int64, copy=False),
+        offsets=load("offsets").astype(np.int64, copy=False),
+        start=load("start").astype(np.int64, copy=False),
+        end=load("end").astype(np.int64, copy=False),
+        attended_at=load("attended_at").astype(np.float64, copy=False),
+        left_at=load("left_at").astype(np.float64, copy=False),
+        duration=load("duration").astype(np.float64, copy=False),
+        weekday=load("weekday").astype(np.int8, copy=False),
+    )
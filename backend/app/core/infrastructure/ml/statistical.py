@@ -0,0 +1,214 @@
+"""Statistical attendance forecaster that runs in-process, as a fallback for the ML server or instead of it.
+
+All (user_id, event_id) series are forecast at once over flat arrays of their occurrences, so the cost grows with the
+number of action logs and there is no Python loop per series except to build the response. Each occurrence is the
+earliest attend of a start, with the latest leave of that start giving its duration. The next horizon_len starts are
+spaced by the median gap between the observed ones, or by the event's recurrence frequency for a single occurrence.
+For each of them the attended_at offset from the start and the duration are the EWMA over the series' occurrences on
+the same local weekday, which makes it a smoothed seasonal-naive forecast, and the EWMA over all its occurrences when
+it has none on that weekday.
+"""
+
+from collections import defaultdict
+from datetime import UTC, datetime
+from itertools import repeat
+from operator import attrgetter, sub
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import TypeAdapter
+
+from app.core.dtos.event import AttendanceTimeForecast, ForecastAttendanceTimeResponse
+from app.core.dtos.ml_dto.event import EventAttendanceActionLog
+from app.core.dtos.ml_dto.forecast import ForecastAttendanceTimeRequest
+from app.core.features.event import Frequency
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_DAY_SECONDS = 24 * 60 * 60
+_STEP_SECONDS_BY_FREQUENCY = {
+    Frequency.DAILY: _DAY_SECONDS,
+    Frequency.WEEKLY: 7 * _DAY_SECONDS,
+    Frequency.MONTHLY: 30 * _DAY_SECONDS,
+    Frequency.YEARLY: 365 * _DAY_SECONDS,
+}
+_DEFAULT_STEP_SECONDS = 7 * _DAY_SECONDS
+_FORECASTS_ADAPTER = TypeAdapter(dict[int, dict[str, list[AttendanceTimeForecast]]])
+
+Int64Array = npt.NDArray[np.int64]
+Float64Array = npt.NDArray[np.float64]
+
+
+def epoch_seconds(datetimes: list[datetime]) -> Int64Array:
+    """Return the datetimes in seconds since the epoch; naive ones read from MySQL are in UTC."""
+    count = len(datetimes)
+    epoch = _EPOCH if count and datetimes[0].tzinfo is not None else _EPOCH.replace(tzinfo=None)
+    try:
+        # Subtraction and attribute access mapped in C, as a Python call per datetime dominates the forecast
+        deltas = list(map(sub, datetimes, repeat(epoch)))
+    except TypeError:
+        # Naive and aware datetimes mixed
+        deltas = [dt.replace(tzinfo=UTC) - _EPOCH if dt.tzinfo is None else dt - _EPOCH for dt in datetimes]
+    days = np.fromiter(map(attrgetter("days"), deltas), np.int64, count)
+    return days * _DAY_SECONDS + np.fromiter(map(attrgetter("seconds"), deltas), np.int64, count)
+
+
+def utc_offset_seconds(timezone: str, dtstart: datetime) -> int:
+    """Return the UTC offset of the timezone at the wall time of dtstart, 0 for an unknown timezone."""
+    try:
+        utc_offset = ZoneInfo(timezone).utcoffset(dtstart.replace(tzinfo=None))
+    except (ZoneInfoNotFoundError, ValueError):
+        return 0
+    return int(utc_offset.total_seconds()) if utc_offset is not None else 0
+
+
+def _pack_logs(
+    logs: list[EventAttendanceActionLog], event_codes: dict[str, int]
+) -> tuple[Int64Array, Int64Array, Int64Array, Int64Array]:
+    """Return the user ids, event codes, starts and acted_ats of the logs, with times in seconds since the epoch."""
+    count = len(logs)
+    event_ids = list(map(attrgetter("event_id"), logs))
+    for event_id in dict.fromkeys(event_ids):
+        event_codes.setdefault(event_id, len(event_codes))
+    return (
+        np.fromiter(map(attrgetter("user_id"), logs), np.int64, count),
+        np.fromiter(map(event_codes.__getitem__, event_ids), np.int64, count),
+        epoch_seconds(list(map(attrgetter("start"), logs))),
+        epoch_seconds(list(map(attrgetter("acted_at"), logs))),
+    )
+
+
+def _group_bounds(groups: Int64Array, group_count: int) -> tuple[Int64Array, Int64Array]:
+    """Return the number of rows of each group and the index of its first row, for rows sorted by group."""
+    counts = np.bincount(groups, minlength=group_count).astype(np.int64)
+    return counts, np.cumsum(counts) - counts
+
+
+def _group_ewma(groups: Int64Array, values: Float64Array, group_count: int, alpha: float) -> Float64Array:
+    """EWMA of each group's values, NaN for a group without any.
+
+    Rows must be sorted by group and in time order within a group; NaN values are skipped. The latest value has weight
+    1 and every older one (1 - alpha) times the weight of the next, normalized by the sum of the weights.
+    """
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+    counts, firsts = _group_bounds(groups, group_count)
+    age = (firsts + counts - 1)[groups] - np.arange(len(groups))
+    weights = (1 - alpha) ** age
+    weighted_sums = np.bincount(groups, weights=weights * values, minlength=group_count)
+    weight_sums = np.bincount(groups, weights=weights, minlength=group_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ewma: Float64Array = weighted_sums / weight_sums
+    return ewma
+
+
+def _weekday_ewma(
+    series: Int64Array, local_starts: Int64Array, values: Float64Array, series_count: int, alpha: float
+) -> tuple[Float64Array, Float64Array]:
+    """Return the EWMA of each series by local weekday, of shape (series_count, 7), and over all weekdays."""
+    weekdays = (local_starts // _DAY_SECONDS + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0
+    groups = series * 7 + weekdays
+    order = np.argsort(groups, kind="stable")
+    by_weekday = _group_ewma(groups[order], values[order], series_count * 7, alpha).reshape(series_count, 7)
+    return by_weekday, _group_ewma(series, values, series_count, alpha)
+
+
+def forecast_attendance_time_statistically(
+    request: ForecastAttendanceTimeRequest, horizon_len: int, alpha: float
+) -> ForecastAttendanceTimeResponse:
+    """Forecast the next horizon_len occurrences of every series in the request.
+
+    CPU-bound, so run it in a worker thread from async code. Answers like the ML server does, so the result can be
+    stored with store_attendance_time_forecasts_async; after a delta request it only holds the series in the request.
+    """
+    event_codes: dict[str, int] = {}
+    attend_users, attend_events, attend_starts, attend_acted = _pack_logs(request.earliest_attend_data, event_codes)
+    leave_users, leave_events, leave_starts, leave_acted = _pack_logs(request.latest_leave_data, event_codes)
+    event_count = max(len(event_codes), 1)
+
+    # Per-event step and UTC offset, looked up by event code
+    step_by_event = np.full(event_count, _DEFAULT_STEP_SECONDS, dtype=np.int64)
+    utc_offset_by_event = np.zeros(event_count, dtype=np.int64)
+    for event in request.event_data:
+        event_code = event_codes.get(event.id)
+        if event_code is None:
+            continue
+        if event.recurrence is not None:
+            step_by_event[event_code] = _STEP_SECONDS_BY_FREQUENCY.get(
+                event.recurrence.rrule.freq, _DEFAULT_STEP_SECONDS
+            )
+        utc_offset_by_event[event_code] = utc_offset_seconds(event.timezone, event.dtstart)
+
+    # Series are the (user_id, event_id) pairs with an attend, numbered in key order
+    series_keys, attend_series = np.unique(attend_users * event_count + attend_events, return_inverse=True)
+    series_count = len(series_keys)
+    if series_count == 0:
+        return ForecastAttendanceTimeResponse(attendance_time_forecasts={}, error_codes=[])
+
+    # One occurrence per (series, start): the earliest attend
+    order = np.lexsort((attend_acted, attend_starts, attend_series))
+    attend_series, attend_starts, attend_acted = attend_series[order], attend_starts[order], attend_acted[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (attend_series[1:] != attend_series[:-1]) | (attend_starts[1:] != attend_starts[:-1])
+    series, starts, attended_at = attend_series[first], attend_starts[first], attend_acted[first]
+    occurrence_keys = (series << 32) + starts
+
+    # Durations from the latest leave of each occurrence; leaves of unknown series or starts are dropped
+    leave_keys = leave_users * event_count + leave_events
+    leave_series = np.searchsorted(series_keys, leave_keys)
+    known = leave_series < series_count
+    known[known] = series_keys[leave_series[known]] == leave_keys[known]
+    leave_occurrence_keys = (leave_series[known] << 32) + leave_starts[known]
+    leave_acted = leave_acted[known]
+    occurrences = np.searchsorted(occurrence_keys, leave_occurrence_keys)
+    matched = occurrences < len(occurrence_keys)
+    matched[matched] = occurrence_keys[occurrences[matched]] == leave_occurrence_keys[matched]
+    left_at = np.full(len(occurrence_keys), np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(left_at, occurrences[matched], leave_acted[matched])
+    durations = np.where(left_at == np.iinfo(np.int64).min, np.nan, (left_at - attended_at).astype(np.float64))
+
+    series_events = series_keys % event_count
+    local_starts = starts + utc_offset_by_event[series_events][series]
+    offset_by_weekday, offset = _weekday_ewma(
+        series, local_starts, (attended_at - starts).astype(np.float64), series_count, alpha
+    )
+    duration_by_weekday, duration = _weekday_ewma(series, local_starts, durations, series_count, alpha)
+    duration = np.nan_to_num(duration)
+
+    # Lower median of the gaps between consecutive starts of each series
+    counts, firsts = _group_bounds(series, series_count)
+    last_starts = starts[firsts + counts - 1]
+    has_gap = series[1:] == series[:-1]
+    gap_series, gaps = series[1:][has_gap], np.diff(starts)[has_gap]
+    gap_order = np.lexsort((gaps, gap_series))
+    gap_counts, gap_firsts = _group_bounds(gap_series, series_count)
+    steps = step_by_event[series_events]
+    with_gaps = gap_counts > 0
+    steps[with_gaps] = gaps[gap_order][(gap_firsts + (gap_counts - 1) // 2)[with_gaps]]
+
+    # Shape (series_count, horizon_len)
+    future_starts = last_starts[:, None] + steps[:, None] * np.arange(1, horizon_len + 1)
+    future_weekdays = ((future_starts + utc_offset_by_event[series_events][:, None]) // _DAY_SECONDS + 3) % 7
+    rows = np.arange(series_count)[:, None]
+    future_offsets = offset_by_weekday[rows, future_weekdays]
+    future_offsets = np.where(np.isnan(future_offsets), offset[:, None], future_offsets)
+    future_durations = duration_by_weekday[rows, future_weekdays]
+    future_durations = np.maximum(np.where(np.isnan(future_durations), duration[:, None], future_durations), 0.0)
+
+    # Times are left in seconds since the epoch, which the adapter parses into UTC datetimes
+    event_ids = list(event_codes)
+    attendance_time_forecasts: defaultdict[int, dict[str, list[dict[str, float]]]] = defaultdict(dict)
+    for user_id, event_code, start_row, offset_row, duration_row in zip(
+        (series_keys // event_count).tolist(),
+        series_events.tolist(),
+        future_starts.tolist(),
+        future_offsets.tolist(),
+        future_durations.tolist(),
+    ):
+        attendance_time_forecasts[user_id][event_ids[event_code]] = [
+            {"start": start, "attended_at": start + offset, "duration": duration}
+            for start, offset, duration in zip(start_row, offset_row, duration_row)
+        ]
+    return ForecastAttendanceTimeResponse.model_construct(
+        attendance_time_forecasts=_FORECASTS_ADAPTER.validate_python(attendance_time_forecasts), error_codes=[]
+    )
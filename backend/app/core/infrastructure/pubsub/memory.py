@@ -0,0 +1,35 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.core.domain.pubsub.broker import IBroker
+
+
+class InMemoryBroker(IBroker):
+    """Per-process pub/sub; each subscriber gets a bounded queue and drops its oldest message when it falls behind."""
+
+    def __init__(self, subscriber_queue_size: int = 256) -> None:
+        self._subscriber_queue_size = subscriber_queue_size
+        self._subscribers: defaultdict[str, set[asyncio.Queue[str]]] = defaultdict(set)
+
+    async def publish_async(self, channel: str, message: str) -> None:
+        for queue in self._subscribers.get(channel, set()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[AsyncIterator[str]]:
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self._subscriber_queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            yield self._iterate(queue)
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    async def _iterate(self, queue: asyncio.Queue[str]) -> AsyncIterator[str]:
+        while True:
+            yield await queue.get()
@@ -0,0 +1,32 @@
+from app.core.domain.cache.follow import IFollowGraphCache
+from app.core.domain.unit_of_work.base import IUnitOfWork
+from app.core.infrastructure.cache.memory import InMemoryFollowGraphCache
+from app.core.infrastructure.sqlalchemy.repositories.account import UserAccountRepository
+
+
+class FollowGraph:
+    """Answers follow questions from cached adjacency sets of user IDs, loading each follower's set on first use.
+
+    Invalidate a follower after committing any change to the accounts they follow.
+    """
+
+    def __init__(self, cache: IFollowGraphCache) -> None:
+        self._cache = cache
+
+    async def followees_of_async(self, uow: IUnitOfWork, user_id: int) -> frozenset[int]:
+        followee_user_ids = await self._cache.get_followees_async(user_id)
+        if followee_user_ids is None:
+            followee_user_ids = frozenset(
+                await UserAccountRepository(uow).read_followee_user_ids_by_user_id_async(user_id)
+            )
+            await self._cache.set_followees_async(user_id, followee_user_ids)
+        return followee_user_ids
+
+    async def is_follower_async(self, uow: IUnitOfWork, follower_user_id: int, followee_user_id: int) -> bool:
+        return followee_user_id in await self.followees_of_async(uow, follower_user_id)
+
+    async def invalidate_async(self, user_id: int) -> None:
+        await self._cache.invalidate_async(user_id)
+
+
+follow_graph = FollowGraph(cache=InMemoryFollowGraphCache(maxsize=16384))
@@ -1,2 +1,3 @@
-from .account import FollowAssociation, UserAccount, UserGroup  # noqa: F401
+from .account import FeedToken, FollowAssociation, UserAccount, UserGroup  # noqa: F401
+from .forecast import ForecastGeneration, ForecastJob  # noqa: F401
 from .verify import EmailVerification  # noqa: F401
@@ -7,6 +7,7 @@ from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.orm.base import Mapped
 from sqlalchemy.sql.schema import ForeignKey
 
+from app.core.domain.entities.account import FeedToken as FeedTokenEntity
 from app.core.domain.entities.account import UserAccount as UserAccountEntity
 from app.core.features.account import Gender, Group
 from app.core.infrastructure.sqlalchemy.models.commons.base import (
@@ -93,3 +94,26 @@ class FollowAssociation(AbstractCommonBase):
     follower_id: Mapped[bytes] = mapped_column(
         BINARY(16), ForeignKey("user_account.id", ondelete="CASCADE"), primary_key=True
     )
+
+
+class FeedToken(AbstractCommonDynamicBase):
+    account_id: Mapped[bytes] = mapped_column(
+        BINARY(16), ForeignKey("user_account.id", ondelete="CASCADE"), unique=True, nullable=False, comment="Account ID"
+    )
+    # Only the SHA-256 of the token is stored, so the table does not give away feed URLs
+    token_hash: Mapped[bytes] = mapped_column(BINARY(32), unique=True, nullable=False, comment="Token Hash")
+
+    def to_entity(self) -> FeedTokenEntity:
+        return FeedTokenEntity(
+            entity_id=bin_to_uuid(self.id),
+            account_id=bin_to_uuid(self.account_id),
+            token_hash=self.token_hash,
+        )
+
+    @classmethod
+    def from_entity(cls, entity: FeedTokenEntity) -> "FeedToken":
+        return cls(
+            id=uuid_to_bin(entity.id),
+            account_id=uuid_to_bin(entity.account_id),
+            token_hash=entity.token_hash,
+        )
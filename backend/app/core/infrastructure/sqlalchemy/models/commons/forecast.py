@@ -0,0 +1,112 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.mysql import BOOLEAN, DATETIME, ENUM, INTEGER, JSON, TINYINT
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm.base import Mapped
+
+from app.core.domain.entities.forecast import ForecastGeneration as ForecastGenerationEntity
+from app.core.domain.entities.forecast import ForecastJob as ForecastJobEntity
+from app.core.features.event import ForecastGenerationStatus, ForecastJobStage, ForecastJobStatus
+from app.core.infrastructure.sqlalchemy.models.commons.base import (
+    AbstractCommonDynamicBase,
+)
+from app.core.utils.uuid import bin_to_uuid, uuid_to_bin
+
+
+class ForecastJob(AbstractCommonDynamicBase):
+    status: Mapped[ForecastJobStatus] = mapped_column(ENUM(ForecastJobStatus), nullable=False, comment="Job Status")
+    # TRUE while the job is queued or running and NULL afterwards, so the unique key allows one active job at a time
+    is_active: Mapped[bool | None] = mapped_column(BOOLEAN, unique=True, nullable=True, comment="Active Job Slot")
+    stage: Mapped[ForecastJobStage | None] = mapped_column(ENUM(ForecastJobStage), nullable=True, comment="Stage")
+    progress: Mapped[int] = mapped_column(TINYINT(unsigned=True), nullable=False, comment="Progress Percentage")
+    cancel_requested: Mapped[bool] = mapped_column(BOOLEAN, nullable=False, comment="Cancel Requested")
+    error_code: Mapped[int | None] = mapped_column(INTEGER, nullable=True, comment="Error Code")
+    forecast_count: Mapped[int | None] = mapped_column(
+        INTEGER(unsigned=True), nullable=True, comment="Stored Forecast Count"
+    )
+    enqueued_at: Mapped[datetime] = mapped_column(DATETIME(timezone=True), nullable=False, comment="Enqueued At")
+    started_at: Mapped[datetime | None] = mapped_column(DATETIME(timezone=True), nullable=True, comment="Started At")
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DATETIME(timezone=True), nullable=True, comment="Heartbeat At"
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DATETIME(timezone=True), nullable=True, comment="Finished At")
+    # ISO 8601 max(updated_at) per connection key as of the export that a successful job sent to the ML server
+    export_watermarks: Mapped[dict[str, str] | None] = mapped_column(JSON, nullable=True, comment="Export Watermarks")
+
+    def to_entity(self) -> ForecastJobEntity:
+        return ForecastJobEntity(
+            entity_id=bin_to_uuid(self.id),
+            status=self.status,
+            stage=self.stage,
+            progress=self.progress,
+            cancel_requested=self.cancel_requested,
+            error_code=self.error_code,
+            forecast_count=self.forecast_count,
+            enqueued_at=self.enqueued_at,
+            started_at=self.started_at,
+            heartbeat_at=self.heartbeat_at,
+            finished_at=self.finished_at,
+            export_watermarks={
+                connection_key: datetime.fromisoformat(watermark)
+                for connection_key, watermark in self.export_watermarks.items()
+            }
+            if self.export_watermarks is not None
+            else None,
+        )
+
+    @classmethod
+    def from_entity(cls, entity: ForecastJobEntity) -> "ForecastJob":
+        return cls(
+            id=uuid_to_bin(entity.id),
+            status=entity.status,
+            is_active=True if entity.status.is_active else None,
+            stage=entity.stage,
+            progress=entity.progress,
+            cancel_requested=entity.cancel_requested,
+            error_code=entity.error_code,
+            forecast_count=entity.forecast_count,
+            enqueued_at=entity.enqueued_at,
+            started_at=entity.started_at,
+            heartbeat_at=entity.heartbeat_at,
+            finished_at=entity.finished_at,
+            export_watermarks={
+                connection_key: watermark.isoformat() for connection_key, watermark in entity.export_watermarks.items()
+            }
+            if entity.export_watermarks is not None
+            else None,
+        )
+
+
+class ForecastGeneration(AbstractCommonDynamicBase):
+    status: Mapped[ForecastGenerationStatus] = mapped_column(
+        ENUM(ForecastGenerationStatus), nullable=False, comment="Generation Status"
+    )
+    # TRUE for the generation readers see and NULL otherwise, so the unique key allows one active generation
+    is_active: Mapped[bool | None] = mapped_column(
+        BOOLEAN, unique=True, nullable=True, comment="Active Generation Slot"
+    )
+    forecast_count: Mapped[int | None] = mapped_column(INTEGER(unsigned=True), nullable=True, comment="Forecast Count")
+    activated_at: Mapped[datetime | None] = mapped_column(
+        DATETIME(timezone=True), nullable=True, comment="Activated At"
+    )
+    retired_at: Mapped[datetime | None] = mapped_column(DATETIME(timezone=True), nullable=True, comment="Retired At")
+
+    def to_entity(self) -> ForecastGenerationEntity:
+        return ForecastGenerationEntity(
+            entity_id=bin_to_uuid(self.id),
+            status=self.status,
+            forecast_count=self.forecast_count,
+            activated_at=self.activated_at,
+            retired_at=self.retired_at,
+        )
+
+    @classmethod
+    def from_entity(cls, entity: ForecastGenerationEntity) -> "ForecastGeneration":
+        return cls(
+            id=uuid_to_bin(entity.id),
+            status=entity.status,
+            is_active=True if entity.status == ForecastGenerationStatus.ACTIVE else None,
+            forecast_count=entity.forecast_count,
+            activated_at=entity.activated_at,
+            retired_at=entity.retired_at,
+        )
@@ -1,5 +1,7 @@
 from datetime import datetime
+from functools import lru_cache, partial
 
+from sqlalchemy import inspect
 from sqlalchemy.dialects.mysql import (
     BINARY,
     BOOLEAN,
@@ -14,6 +16,7 @@ from sqlalchemy.dialects.mysql import (
 from sqlalchemy.exc import StatementError
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.orm.base import Mapped
+from sqlalchemy.sql import text
 from sqlalchemy.sql.schema import ForeignKey, Index, UniqueConstraint
 
 from app.core.domain.entities.event import Event as EventEntity
@@ -38,7 +41,19 @@ from app.core.infrastructure.sqlalchemy.models.shards.base import (
     AbstractShardDynamicBase,
     AbstractShardStaticBase,
 )
-from app.core.utils.uuid import bin_to_uuid, uuid_to_bin
+from app.core.utils.uuid import UUID, bin_to_uuid, str_to_uuid, uuid_to_bin, uuid_to_str
+
+_PACKED_UNTIL_FORMAT = "%Y%m%dT%H%M%S"
+_PACKED_INT_LIST_PARTS = (
+    "BYSECOND",
+    "BYMINUTE",
+    "BYHOUR",
+    "BYMONTHDAY",
+    "BYYEARDAY",
+    "BYWEEKNO",
+    "BYMONTH",
+    "BYSETPOS",
+)
 
 
 class RecurrenceRule(AbstractShardStaticBase):
@@ -132,6 +147,102 @@ class Recurrence(AbstractShardStaticBase):
         )
 
 
+def pack_recurrence(recurrence: RecurrenceEntity) -> str:
+    """Encode a recurrence and its rule as the text stored in event.packed_recurrence.
+
+    The layout is one line each for RRULE-ID, RRULE, RDATE and EXDATE. Unlike serialize_recurrence it is lossless:
+    list parts that are None are omitted while empty lists are kept, UNTIL is the stored naive value, BYDAY always
+    carries its ordinal and RDATE/EXDATE keep their UTC offsets.
+    """
+    rrule = recurrence.rrule
+    rrule_parts = [f"FREQ={rrule.freq.value}"]
+    if rrule.until is not None:
+        rrule_parts.append(f"UNTIL={rrule.until.strftime(_PACKED_UNTIL_FORMAT)}")
+    if rrule.count is not None:
+        rrule_parts.append(f"COUNT={rrule.count}")
+    rrule_parts.append(f"INTERVAL={rrule.interval}")
+    for name, values in zip(
+        _PACKED_INT_LIST_PARTS,
+        (
+            rrule.bysecond,
+            rrule.byminute,
+            rrule.byhour,
+            rrule.bymonthday,
+            rrule.byyearday,
+            rrule.byweekno,
+            rrule.bymonth,
+            rrule.bysetpos,
+        ),
+    ):
+        if values is not None:
+            rrule_parts.append(f"{name}={','.join(map(str, values))}")
+    if rrule.byday is not None:
+        rrule_parts.append(f"BYDAY={','.join(f'{n}{weekday.value}' for n, weekday in rrule.byday)}")
+    if rrule.wkst is not None:
+        rrule_parts.append(f"WKST={rrule.wkst.value}")
+
+    return "\n".join(
+        (
+            f"RRULE-ID:{uuid_to_str(recurrence.rrule_id)}",
+            f"RRULE:{';'.join(rrule_parts)}",
+            f"RDATE:{','.join(dt.isoformat() for dt in recurrence.rdate)}",
+            f"EXDATE:{','.join(dt.isoformat() for dt in recurrence.exdate)}",
+        )
+    )
+
+
+@lru_cache(maxsize=16384)
+def _parse_packed_recurrence(
+    packed: str,
+) -> tuple[UUID, dict[str, str], tuple[datetime, ...], tuple[datetime, ...]]:
+    lines = dict(line.split(":", 1) for line in packed.split("\n"))
+    rrule_parts = dict(part.split("=", 1) for part in lines["RRULE"].split(";"))
+    rdate = tuple(datetime.fromisoformat(dt_str) for dt_str in lines["RDATE"].split(",") if dt_str)
+    exdate = tuple(datetime.fromisoformat(dt_str) for dt_str in lines["EXDATE"].split(",") if dt_str)
+    return str_to_uuid(lines["RRULE-ID"]), rrule_parts, rdate, exdate
+
+
+def _unpack_int_list(rrule_parts: dict[str, str], name: str) -> list[int] | None:
+    if name not in rrule_parts:
+        return None
+    return [int(value) for value in rrule_parts[name].split(",") if value]
+
+
+def unpack_recurrence(packed: str, recurrence_id: UUID, user_id: int) -> RecurrenceEntity:
+    """Decode text written by pack_recurrence. Parsing is cached per packed value; entities are built fresh."""
+    rrule_id, rrule_parts, rdate, exdate = _parse_packed_recurrence(packed)
+    rrule = RecurrenceRuleEntity(
+        entity_id=rrule_id,
+        user_id=user_id,
+        freq=Frequency(rrule_parts["FREQ"]),
+        until=datetime.strptime(rrule_parts["UNTIL"], _PACKED_UNTIL_FORMAT) if "UNTIL" in rrule_parts else None,
+        count=int(rrule_parts["COUNT"]) if "COUNT" in rrule_parts else None,
+        interval=int(rrule_parts["INTERVAL"]),
+        bysecond=_unpack_int_list(rrule_parts, "BYSECOND"),
+        byminute=_unpack_int_list(rrule_parts, "BYMINUTE"),
+        byhour=_unpack_int_list(rrule_parts, "BYHOUR"),
+        byday=(
+            [(int(value[:-2]), Weekday(value[-2:])) for value in rrule_parts["BYDAY"].split(",") if value]
+            if "BYDAY" in rrule_parts
+            else None
+        ),
+        bymonthday=_unpack_int_list(rrule_parts, "BYMONTHDAY"),
+        byyearday=_unpack_int_list(rrule_parts, "BYYEARDAY"),
+        byweekno=_unpack_int_list(rrule_parts, "BYWEEKNO"),
+        bymonth=_unpack_int_list(rrule_parts, "BYMONTH"),
+        bysetpos=_unpack_int_list(rrule_parts, "BYSETPOS"),
+        wkst=Weekday(rrule_parts["WKST"]) if "WKST" in rrule_parts else None,
+    )
+    return RecurrenceEntity(
+        entity_id=recurrence_id,
+        user_id=user_id,
+        rrule_id=rrule_id,
+        rrule=rrule,
+        rdate=list(rdate),
+        exdate=list(exdate),
+    )
+
+
 class Event(AbstractShardDynamicBase):
     summary: Mapped[str] = mapped_column(VARCHAR(63), unique=True, nullable=False, comment="Summary")
     location: Mapped[str | None] = mapped_column(VARCHAR(63), nullable=True, comment="Location")
@@ -145,12 +256,25 @@ class Event(AbstractShardDynamicBase):
     )
     timezone: Mapped[str] = mapped_column(VARCHAR(63), nullable=False, comment="Timezone")
     recurrence: Mapped[Recurrence | None] = relationship(uselist=False)
+    packed_recurrence: Mapped[str | None] = mapped_column(TEXT, nullable=True, comment="Packed Recurrence")
+    # Microseconds, so that (max(updated_at), count) versions a host's events even across edits within one second
+    updated_at: Mapped[datetime] = mapped_column(
+        DATETIME(timezone=True, fsp=6),
+        server_default=text("CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+        nullable=False,
+    )
 
     def to_entity(self) -> EventEntity:
-        try:
-            recurrence = self.recurrence.to_entity() if self.recurrence else None
-        except StatementError:
-            recurrence = None
+        recurrence_id = bin_to_uuid(self.recurrence_id) if self.recurrence_id else None
+        recurrence: RecurrenceEntity | None = None
+        load_recurrence = None
+        if "recurrence" not in inspect(self).unloaded:
+            try:
+                recurrence = self.recurrence.to_entity() if self.recurrence else None
+            except StatementError:
+                recurrence = None
+        elif recurrence_id is not None and self.packed_recurrence is not None:
+            load_recurrence = partial(unpack_recurrence, self.packed_recurrence, recurrence_id, self.user_id)
 
         return EventEntity(
             entity_id=bin_to_uuid(self.id),
@@ -160,9 +284,11 @@ class Event(AbstractShardDynamicBase):
             dtstart=self.dtstart,
             dtend=self.dtend,
             is_all_day=self.is_all_day,
-            recurrence_id=(bin_to_uuid(self.recurrence_id) if self.recurrence_id else None),
+            recurrence_id=recurrence_id,
             timezone=self.timezone,
             recurrence=recurrence,
+            updated_at=self.updated_at,
+            load_recurrence=load_recurrence,
         )
 
     @classmethod
@@ -177,10 +303,11 @@ class Event(AbstractShardDynamicBase):
             is_all_day=entity.is_all_day,
             recurrence_id=(uuid_to_bin(entity.recurrence_id) if entity.recurrence_id else None),
             timezone=entity.timezone,
+            packed_recurrence=pack_recurrence(entity.recurrence) if entity.recurrence is not None else None,
         )
 
 
-Index(None, Event.user_id)
+Index(None, Event.user_id, Event.updated_at)
 
 
 class EventAttendance(AbstractShardDynamicBase):
@@ -213,6 +340,7 @@ class EventAttendance(AbstractShardDynamicBase):
 
 
 UniqueConstraint(EventAttendance.user_id, EventAttendance.event_id, EventAttendance.start)
+Index(None, EventAttendance.user_id, EventAttendance.start)
 
 
 class EventAttendanceActionLog(AbstractShardDynamicBase):
@@ -255,6 +383,8 @@ Index(
     EventAttendanceActionLog.event_id,
     EventAttendanceActionLog.start,
 )
+# Finds the series that got logs since the previous forecast export
+Index(None, EventAttendanceActionLog.updated_at)
 
 
 class EventAttendanceForecast(AbstractShardDynamicBase):
@@ -263,6 +393,8 @@ class EventAttendanceForecast(AbstractShardDynamicBase):
         nullable=False,
         comment="Event ID",
     )
+    # Rows of a run are written under a new generation and only read once the common DB marks it active
+    generation_id: Mapped[bytes] = mapped_column(BINARY(16), nullable=False, comment="Forecast Generation ID")
     start: Mapped[datetime] = mapped_column(DATETIME(timezone=True), nullable=False, comment="Event Start Time")
     forecasted_attended_at: Mapped[datetime] = mapped_column(
         DATETIME(timezone=True), nullable=False, comment="Forecasted Attendance Time"
@@ -277,6 +409,7 @@ class EventAttendanceForecast(AbstractShardDynamicBase):
             start=self.start,
             forecasted_attended_at=self.forecasted_attended_at,
             forecasted_duration=self.forecasted_duration,
+            generation_id=bin_to_uuid(self.generation_id),
         )
 
     @classmethod
@@ -288,14 +421,17 @@ class EventAttendanceForecast(AbstractShardDynamicBase):
             start=entity.start,
             forecasted_attended_at=entity.forecasted_attended_at,
             forecasted_duration=entity.forecasted_duration,
+            generation_id=uuid_to_bin(entity.generation_id),
         )
 
 
 UniqueConstraint(
+    EventAttendanceForecast.generation_id,
     EventAttendanceForecast.user_id,
     EventAttendanceForecast.event_id,
     EventAttendanceForecast.start,
 )
+Index(None, EventAttendanceForecast.generation_id, EventAttendanceForecast.event_id)
 
 
 class EventGoal(AbstractShardDynamicBase):
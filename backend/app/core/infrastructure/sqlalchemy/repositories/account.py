@@ -1,15 +1,23 @@
 from datetime import datetime
 
 from pydantic.networks import EmailStr
+from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.strategy_options import joinedload
-from sqlalchemy.sql import select
+from sqlalchemy.sql import or_, select
+from sqlalchemy.sql.functions import func
 
+from app.core.domain.entities.account import FeedToken as FeedTokenEntity
 from app.core.domain.entities.account import UserAccount as UserAccountEntity
-from app.core.features.account import Gender, Group
-from app.core.infrastructure.sqlalchemy.models.commons.account import UserAccount
+from app.core.features.account import AccountIdentity, Gender, Group
+from app.core.infrastructure.sqlalchemy.models.commons.account import FeedToken, FollowAssociation, UserAccount
 from app.core.infrastructure.sqlalchemy.repositories.base import AbstractRepository
-from app.core.utils.uuid import UUID, uuid_to_bin
+from app.core.utils.uuid import UUID, bin_to_uuid, uuid_to_bin
+
+
+def _to_identity(row: Row[tuple[bytes, int, str, str]]) -> AccountIdentity:
+    return AccountIdentity(account_id=bin_to_uuid(row[0]), user_id=row[1], username=row[2], group=Group(row[3]))
 
 
 class UserAccountRepository(AbstractRepository[UserAccountEntity, UserAccount]):
@@ -71,6 +79,48 @@ class UserAccountRepository(AbstractRepository[UserAccountEntity, UserAccount]):
     async def read_by_user_ids_async(self, user_ids: set[int]) -> set[UserAccountEntity]:
         return await self.read_all_async(where=[self._model.user_id.in_(user_ids)])
 
+    async def read_by_user_ids_or_updated_since_async(
+        self, user_ids: set[int], updated_since: datetime | None
+    ) -> set[UserAccountEntity]:
+        if updated_since is None:
+            return await self.read_all_async(where=[])
+        return await self.read_all_async(
+            where=[or_(self._model.user_id.in_(user_ids), self._model.updated_at >= updated_since)]
+        )
+
+    async def read_max_updated_at_async(self) -> datetime | None:
+        stmt = select(func.max(self._model.updated_at))
+        result = await self._uow.execute_async(stmt)
+        max_updated_at: datetime | None = result.scalar_one()
+        return max_updated_at
+
+    async def read_identity_by_id_async(self, record_id: UUID) -> AccountIdentity | None:
+        stmt = select(self._model.id, self._model.user_id, self._model.username, self._model.group).where(
+            self._model.id == uuid_to_bin(record_id)
+        )
+        result = await self._uow.execute_async(stmt)
+        row = result.one_or_none()
+        return _to_identity(row) if row is not None else None
+
+    async def read_identities_by_ids_async(self, record_ids: set[UUID]) -> set[AccountIdentity]:
+        stmt = select(self._model.id, self._model.user_id, self._model.username, self._model.group).where(
+            self._model.id.in_(uuid_to_bin(record_id) for record_id in record_ids)
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(_to_identity(row) for row in result.all())
+
+    async def read_identities_by_user_ids_async(self, user_ids: set[int]) -> set[AccountIdentity]:
+        stmt = select(self._model.id, self._model.user_id, self._model.username, self._model.group).where(
+            self._model.user_id.in_(user_ids)
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(_to_identity(row) for row in result.all())
+
+    async def read_usernames_by_user_ids_async(self, user_ids: set[int]) -> dict[int, str]:
+        stmt = select(self._model.user_id, self._model.username).where(self._model.user_id.in_(user_ids))
+        result = await self._uow.execute_async(stmt)
+        return {user_id: username for user_id, username in result.all()}
+
     async def read_by_username_or_none_async(self, username: str) -> UserAccountEntity | None:
         return await self.read_one_or_none_async(
             where=[self._model.username == username],
@@ -101,3 +151,40 @@ class UserAccountRepository(AbstractRepository[UserAccountEntity, UserAccount]):
         result = await self._uow.execute_async(stmt)
         record = result.unique().scalar_one_or_none()
         return record.to_entity() if record is not None else None
+
+    async def read_followee_user_ids_by_user_id_async(self, user_id: int) -> set[int]:
+        follower = aliased(UserAccount)
+        followee = aliased(UserAccount)
+        stmt = (
+            select(followee.user_id)
+            .select_from(FollowAssociation)
+            .join(follower, follower.id == FollowAssociation.follower_id)
+            .join(followee, followee.id == FollowAssociation.followee_id)
+            .where(follower.user_id == user_id)
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(result.scalars().all())
+
+
+class FeedTokenRepository(AbstractRepository[FeedTokenEntity, FeedToken]):
+    @property
+    def _model(self) -> type[FeedToken]:
+        return FeedToken
+
+    async def replace_feed_token_async(
+        self, entity_id: UUID, account_id: UUID, token_hash: bytes
+    ) -> FeedTokenEntity | None:
+        """Replace the account's feed token, which revokes the previous one."""
+        await self.delete_by_account_id_async(account_id)
+        feed_token = FeedTokenEntity(
+            entity_id=entity_id,
+            account_id=account_id,
+            token_hash=token_hash,
+        )
+        return await self.create_async(feed_token)
+
+    async def read_by_token_hash_or_none_async(self, token_hash: bytes) -> FeedTokenEntity | None:
+        return await self.read_one_or_none_async(where=[self._model.token_hash == token_hash])
+
+    async def delete_by_account_id_async(self, account_id: UUID) -> None:
+        await self.delete_all_async(where=[self._model.account_id == uuid_to_bin(account_id)])
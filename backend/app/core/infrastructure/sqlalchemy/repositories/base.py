@@ -1,13 +1,17 @@
 from abc import abstractmethod
-from typing import Any
+from collections import defaultdict
+from typing import Any, Sequence
 
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.sql import delete, select, update
+from sqlalchemy.ext.horizontal_shard import set_shard_id
+from sqlalchemy.sql import delete, insert, select, update
 from sqlalchemy.sql.elements import UnaryExpression
 
 from app.core.domain.entities.base import IEntity
 from app.core.domain.repositories.base import IRepository, ModelProtocol
 from app.core.domain.unit_of_work.base import IUnitOfWork
+from app.core.infrastructure.db.sharding import shard_chooser
 from app.core.utils.uuid import UUID, uuid_to_bin
 
 
@@ -42,6 +46,21 @@ class AbstractRepository[TEntity: IEntity, TModel: ModelProtocol[Any]](IReposito
                 await savepoint.rollback()
                 return None
 
+    async def bulk_insert_async(self, entities: Sequence[TEntity], batch_rows: int | None = None) -> None:
+        """Insert entities with one multi-row INSERT per shard, or one per batch_rows rows, without adding them to the
+        session. A row that violates a unique key raises IntegrityError for its whole statement."""
+        values_by_shard: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        mapper = inspect(self._model)
+        for entity in entities:
+            model = self._model.from_entity(entity)
+            values = {key: value for key, value in model.__dict__.items() if key != "_sa_instance_state"}
+            values_by_shard[shard_chooser(mapper, model)].append(values)
+        for shard_id, values_list in values_by_shard.items():
+            step = batch_rows or len(values_list)
+            for offset in range(0, len(values_list), step):
+                stmt = insert(self._model).values(values_list[offset : offset + step]).options(set_shard_id(shard_id))
+                await self._uow.execute_async(stmt)
+
     async def read_by_id_async(self, record_id: UUID) -> TEntity:
         stmt = select(self._model).where(self._model.id == uuid_to_bin(record_id))
         result = await self._uow.execute_async(stmt)
@@ -1,10 +1,18 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import Any
+from typing import Any, Sequence, cast
 
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.engine.cursor import CursorResult
+from sqlalchemy.engine.row import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.horizontal_shard import set_shard_id
 from sqlalchemy.orm.strategy_options import joinedload
-from sqlalchemy.sql import select
+from sqlalchemy.sql import case, delete, literal, or_, select, tuple_, update
+from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.functions import func
 
+from app.core.constants.constants import EVENT_PACKED_RECURRENCE_READS
 from app.core.domain.entities.event import Event as EventEntity
 from app.core.domain.entities.event import EventAttendance as EventAttendanceEntity
 from app.core.domain.entities.event import (
@@ -23,6 +31,8 @@ from app.core.features.event import (
     Frequency,
     Weekday,
 )
+from app.core.infrastructure.db.settings import SHARD_DB_CONNECTION_KEYS
+from app.core.infrastructure.db.sharding import resolve_shard_connection_key
 from app.core.infrastructure.sqlalchemy.models.shards.event import (
     Event,
     EventAttendance,
@@ -34,7 +44,14 @@ from app.core.infrastructure.sqlalchemy.models.shards.event import (
     RecurrenceRule,
 )
 from app.core.infrastructure.sqlalchemy.repositories.base import AbstractRepository
-from app.core.utils.uuid import UUID, uuid_to_bin
+from app.core.utils.uuid import UUID, bin_to_uuid, uuid_to_bin
+
+
+def _merge_shard_versions(rows: Sequence[Row[tuple[datetime | None, int]]]) -> tuple[datetime | None, int]:
+    """Combine per-shard (max(updated_at), count) rows into a single version."""
+    latest_updated_at = max((row[0] for row in rows if row[0] is not None), default=None)
+    count = sum(row[1] for row in rows)
+    return latest_updated_at, count
 
 
 class RecurrenceRuleRepository(
@@ -180,10 +197,36 @@ class RecurrenceRepository(
 
 
 class EventRepository(AbstractRepository[EventEntity, Event]):
+    _packed_recurrence_reads = EVENT_PACKED_RECURRENCE_READS
+
     @property
     def _model(self) -> type[Event]:
         return Event
 
+    def _recurrence_options(self) -> list[ExecutableOption]:
+        """Join the recurrence tables, unless recurrences are decoded lazily from event.packed_recurrence."""
+        if self._packed_recurrence_reads:
+            return []
+        return [joinedload(Event.recurrence).joinedload(Recurrence.rrule)]
+
+    async def _to_entities_async(self, records: Sequence[Event]) -> list[EventEntity]:
+        """Build entities, first joining the recurrence of rows whose packed_recurrence has not been written yet."""
+        if self._packed_recurrence_reads:
+            unpacked_ids = [
+                record.id for record in records if record.recurrence_id is not None and record.packed_recurrence is None
+            ]
+            if unpacked_ids:
+                # populate_existing loads the relationship onto the same instances, so to_entity sees it as loaded
+                stmt = (
+                    select(self._model)
+                    .where(self._model.id.in_(unpacked_ids))
+                    .options(joinedload(Event.recurrence).joinedload(Recurrence.rrule))
+                    .execution_options(populate_existing=True)
+                )
+                result = await self._uow.execute_async(stmt)
+                result.unique().scalars().all()
+        return [record.to_entity() for record in records]
+
     async def create_event_async(
         self,
         entity_id: UUID,
@@ -195,6 +238,7 @@ class EventRepository(AbstractRepository[EventEntity, Event]):
         is_all_day: bool,
         recurrence_id: UUID | None,
         timezone: str,
+        recurrence: RecurrenceEntity | None = None,
     ) -> EventEntity | None:
         event = EventEntity(
             entity_id=entity_id,
@@ -206,9 +250,46 @@ class EventRepository(AbstractRepository[EventEntity, Event]):
             is_all_day=is_all_day,
             recurrence_id=recurrence_id,
             timezone=timezone,
+            recurrence=recurrence,
         )
         return await self.create_async(event)
 
+    async def bulk_insert_events_async(self, event_entities: Sequence[EventEntity]) -> list[EventEntity | None]:
+        """Insert events and their recurrences with one multi-row INSERT per table.
+
+        If a concurrent insert takes one of the summaries first, the batch is rolled back to its savepoint and the events
+        are inserted one per savepoint instead, so that only the conflicting ones get None in place of their entity.
+        """
+        if not event_entities:
+            return []
+        async with self._uow.begin_nested() as savepoint:
+            try:
+                await self._bulk_insert_with_recurrences_async(event_entities)
+                return list(event_entities)
+            except IntegrityError:
+                await savepoint.rollback()
+
+        inserted_event_entities: list[EventEntity | None] = []
+        for event_entity in event_entities:
+            async with self._uow.begin_nested() as savepoint:
+                try:
+                    await self._bulk_insert_with_recurrences_async([event_entity])
+                    inserted_event_entities.append(event_entity)
+                except IntegrityError:
+                    await savepoint.rollback()
+                    inserted_event_entities.append(None)
+        return inserted_event_entities
+
+    async def _bulk_insert_with_recurrences_async(self, event_entities: Sequence[EventEntity]) -> None:
+        recurrence_entities = [
+            event_entity.recurrence for event_entity in event_entities if event_entity.recurrence is not None
+        ]
+        await RecurrenceRuleRepository(self._uow).bulk_insert_async(
+            [recurrence_entity.rrule for recurrence_entity in recurrence_entities]
+        )
+        await RecurrenceRepository(self._uow).bulk_insert_async(recurrence_entities)
+        await self.bulk_insert_async(event_entities)
+
     async def update_event_async(
         self,
         entity_id: UUID,
@@ -219,6 +300,7 @@ class EventRepository(AbstractRepository[EventEntity, Event]):
         is_all_day: bool,
         recurrence_id: UUID | None,
         timezone: str,
+        recurrence: RecurrenceEntity | None = None,
     ) -> EventEntity | None:
         existing_event = await self.read_by_id_or_none_async(entity_id)
         if existing_event is None:
@@ -234,32 +316,86 @@ class EventRepository(AbstractRepository[EventEntity, Event]):
             is_all_day=is_all_day,
             recurrence_id=recurrence_id,
             timezone=timezone,
+            recurrence=recurrence,
         )
-        return await self.update_async(updated_event)
+        await self.update_async(updated_event)
+        # Recurrence edits only touch the recurrence tables, so bump updated_at explicitly for caches keyed on it
+        stmt = update(self._model).where(self._model.id == uuid_to_bin(entity_id)).values(updated_at=func.now())
+        await self._uow.execute_async(stmt)
+        return updated_event
 
     async def read_with_recurrence_by_id_or_none_async(self, record_id: UUID) -> EventEntity | None:
+        stmt = select(self._model).where(self._model.id == uuid_to_bin(record_id)).options(*self._recurrence_options())
+        result = await self._uow.execute_async(stmt)
+        record = result.unique().scalar_one_or_none()
+        if record is None:
+            return None
+        (event,) = await self._to_entities_async([record])
+        return event
+
+    async def read_with_recurrence_by_ids_async(self, record_ids: set[UUID]) -> set[EventEntity]:
         stmt = (
             select(self._model)
-            .where(self._model.id == uuid_to_bin(record_id))
-            .options(joinedload(Event.recurrence).joinedload(Recurrence.rrule))
+            .where(self._model.id.in_(uuid_to_bin(record_id) for record_id in record_ids))
+            .options(*self._recurrence_options())
         )
         result = await self._uow.execute_async(stmt)
-        record = result.unique().scalar_one_or_none()
-        return record.to_entity() if record is not None else None
+        return set(await self._to_entities_async(result.unique().scalars().all()))
 
     async def read_with_recurrence_by_user_ids_async(self, user_ids: set[int]) -> set[EventEntity]:
+        stmt = select(self._model).where(self._model.user_id.in_(user_ids)).options(*self._recurrence_options())
+        result = await self._uow.execute_async(stmt)
+        return set(await self._to_entities_async(result.unique().scalars().all()))
+
+    async def read_summaries_by_user_id_async(self, user_id: int, summaries: set[str]) -> set[str]:
+        """Return which of the summaries are taken on the user's shard, where event summaries are unique."""
         stmt = (
-            select(self._model)
+            select(self._model.summary)
+            .where(self._model.summary.in_(summaries))
+            .options(set_shard_id(resolve_shard_connection_key(user_id)))
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(result.scalars().all())
+
+    async def read_version_by_user_ids_async(self, user_ids: set[int]) -> tuple[datetime | None, int]:
+        stmt = select(func.max(self._model.updated_at), func.count()).where(self._model.user_id.in_(user_ids))
+        result = await self._uow.execute_async(stmt)
+        return _merge_shard_versions(result.all())
+
+    async def read_versions_by_user_ids_async(self, user_ids: set[int]) -> dict[int, tuple[datetime | None, int]]:
+        stmt = (
+            select(self._model.user_id, func.max(self._model.updated_at), func.count())
             .where(self._model.user_id.in_(user_ids))
-            .options(joinedload(Event.recurrence).joinedload(Recurrence.rrule))
+            .group_by(self._model.user_id)
         )
         result = await self._uow.execute_async(stmt)
-        return set(record.to_entity() for record in result.unique().scalars().all())
+        return {row[0]: (row[1], row[2]) for row in result.all()}
 
     async def read_all_with_recurrence_async(self, where: list[Any]) -> set[EventEntity]:
-        stmt = select(self._model).where(*where).options(joinedload(Event.recurrence).joinedload(Recurrence.rrule))
+        stmt = select(self._model).where(*where).options(*self._recurrence_options())
         result = await self._uow.execute_async(stmt)
-        return set(record.to_entity() for record in result.unique().scalars().all())
+        return set(await self._to_entities_async(result.unique().scalars().all()))
+
+    async def read_with_recurrence_by_ids_or_updated_since_async(
+        self, event_ids: set[UUID], updated_since: datetime | None
+    ) -> set[EventEntity]:
+        if updated_since is None:
+            return await self.read_all_with_recurrence_async(where=[])
+        return await self.read_all_with_recurrence_async(
+            where=[
+                or_(
+                    self._model.id.in_(uuid_to_bin(event_id) for event_id in event_ids),
+                    self._model.updated_at >= updated_since,
+                )
+            ]
+        )
+
+    async def read_max_updated_at_by_shard_async(self) -> dict[str, datetime | None]:
+        max_updated_at: dict[str, datetime | None] = {}
+        for shard_id in SHARD_DB_CONNECTION_KEYS:
+            stmt = select(func.max(self._model.updated_at)).options(set_shard_id(shard_id))
+            max_updated_at[shard_id] = (await self._uow.execute_async(stmt)).scalar_one()
+        return max_updated_at
 
 
 class EventAttendanceRepository(
@@ -280,6 +416,30 @@ class EventAttendanceRepository(
             ],
         )
 
+    async def read_by_event_id_and_start_async(self, event_id: UUID, start: datetime) -> set[EventAttendanceEntity]:
+        return await self.read_all_async(
+            where=[
+                self._model.event_id == uuid_to_bin(event_id),
+                self._model.start == start,
+            ],
+        )
+
+    async def read_by_user_id_and_start_range_async(
+        self, user_id: int, start_from: datetime, start_to: datetime
+    ) -> set[EventAttendanceEntity]:
+        """Read the user's attendances whose start is in [start_from, start_to) from the user's shard only."""
+        stmt = (
+            select(self._model)
+            .where(
+                self._model.user_id == user_id,
+                self._model.start >= start_from,
+                self._model.start < start_to,
+            )
+            .options(set_shard_id(resolve_shard_connection_key(user_id)))
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(record.to_entity() for record in result.scalars().all())
+
     async def create_or_update_event_attendance_async(
         self,
         entity_id: UUID,
@@ -303,6 +463,24 @@ class EventAttendanceRepository(
         )
         return await self.create_async(event_attendance)
 
+    async def bulk_upsert_event_attendances_async(self, event_attendances: list[EventAttendanceEntity]) -> None:
+        """Insert or update attendances with one multi-row INSERT ... ON DUPLICATE KEY UPDATE per shard."""
+        values_by_shard: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        for event_attendance in event_attendances:
+            values_by_shard[resolve_shard_connection_key(event_attendance.user_id)].append(
+                {
+                    "id": uuid_to_bin(event_attendance.id),
+                    "user_id": event_attendance.user_id,
+                    "event_id": uuid_to_bin(event_attendance.event_id),
+                    "start": event_attendance.start,
+                    "state": event_attendance.state,
+                }
+            )
+        for shard_id, values in values_by_shard.items():
+            stmt = insert(self._model).values(values)
+            stmt = stmt.on_duplicate_key_update(state=stmt.inserted.state).options(set_shard_id(shard_id))
+            await self._uow.execute_async(stmt)
+
 
 class EventAttendanceActionLogRepository(
     AbstractRepository[EventAttendanceActionLogEntity, EventAttendanceActionLog],
@@ -336,6 +514,27 @@ class EventAttendanceActionLogRepository(
     ) -> set[EventAttendanceActionLogEntity] | None:
         return await self.bulk_create_async(event_attendance_action_logs)
 
+    async def bulk_insert_ignore_event_attendance_action_logs_async(
+        self,
+        event_attendance_action_logs: list[EventAttendanceActionLogEntity],
+    ) -> None:
+        """Insert logs with one multi-row INSERT IGNORE per shard, so replaying already written logs is a no-op."""
+        values_by_shard: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        for event_attendance_action_log in event_attendance_action_logs:
+            values_by_shard[resolve_shard_connection_key(event_attendance_action_log.user_id)].append(
+                {
+                    "id": uuid_to_bin(event_attendance_action_log.id),
+                    "user_id": event_attendance_action_log.user_id,
+                    "event_id": uuid_to_bin(event_attendance_action_log.event_id),
+                    "start": event_attendance_action_log.start,
+                    "action": event_attendance_action_log.action,
+                    "acted_at": event_attendance_action_log.acted_at,
+                }
+            )
+        for shard_id, values in values_by_shard.items():
+            stmt = insert(self._model).values(values).prefix_with("IGNORE").options(set_shard_id(shard_id))
+            await self._uow.execute_async(stmt)
+
     async def read_by_user_id_and_event_id_and_start_async(
         self, user_id: int, event_id: UUID, start: datetime
     ) -> set[EventAttendanceActionLogEntity]:
@@ -446,6 +645,115 @@ class EventAttendanceActionLogRepository(
             ],
         )
 
+    async def read_max_updated_at_by_shard_async(self) -> dict[str, datetime | None]:
+        max_updated_at: dict[str, datetime | None] = {}
+        for shard_id in SHARD_DB_CONNECTION_KEYS:
+            stmt = select(func.max(self._model.updated_at)).options(set_shard_id(shard_id))
+            max_updated_at[shard_id] = (await self._uow.execute_async(stmt)).scalar_one()
+        return max_updated_at
+
+    async def read_recent_edges_of_changed_series_async(
+        self,
+        shard_id: str,
+        changed_since: datetime | None,
+        action: AttendanceAction,
+        context_len: int | None,
+    ) -> set[EventAttendanceActionLogEntity]:
+        """Read the earliest attend (or latest leave) per occurrence for the last context_len occurrences, or all of
+        them, of every (user_id, event_id) series on the shard that got a log on or after changed_since, or of every
+        series."""
+        changed_series = (
+            select(self._model.user_id, self._model.event_id)
+            .where(*([self._model.updated_at >= changed_since] if changed_since is not None else []))
+            .distinct()
+            .subquery()
+        )
+        acted_at_order = (
+            self._model.acted_at.asc() if action == AttendanceAction.ATTEND else self._model.acted_at.desc()
+        )
+        edges = (
+            select(
+                self._model.id,
+                self._model.user_id,
+                self._model.event_id,
+                self._model.start,
+                func.row_number()
+                .over(
+                    partition_by=[self._model.user_id, self._model.event_id, self._model.start],
+                    order_by=acted_at_order,
+                )
+                .label("rn"),
+            )
+            .join(
+                changed_series,
+                (self._model.user_id == changed_series.c.user_id) & (self._model.event_id == changed_series.c.event_id),
+            )
+            .where(self._model.action == action)
+            .subquery()
+        )
+        recent_edges = (
+            select(
+                edges.c.id,
+                func.row_number()
+                .over(partition_by=[edges.c.user_id, edges.c.event_id], order_by=edges.c.start.desc())
+                .label("recency"),
+            )
+            .where(edges.c.rn == 1)
+            .subquery()
+        )
+        stmt = (
+            select(self._model)
+            .join(recent_edges, self._model.id == recent_edges.c.id)
+            .where(*([recent_edges.c.recency <= context_len] if context_len is not None else []))
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(record.to_entity() for record in result.scalars().all())
+
+    async def read_series_page_async(
+        self, shard_id: str, after: tuple[int, UUID] | None, limit: int
+    ) -> list[tuple[int, UUID]]:
+        """Read up to limit (user_id, event_id) series keys on the shard that come after the given one, in order."""
+        series = tuple_(self._model.user_id, self._model.event_id)
+        stmt = (
+            select(self._model.user_id, self._model.event_id)
+            .where(*([series > tuple_(literal(after[0]), literal(uuid_to_bin(after[1])))] if after is not None else []))
+            .distinct()
+            .order_by(self._model.user_id, self._model.event_id)
+            .limit(limit)
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return [(user_id, bin_to_uuid(event_id)) for user_id, event_id in result.all()]
+
+    async def read_occurrence_edges_by_series_range_async(
+        self, shard_id: str, first: tuple[int, UUID], last: tuple[int, UUID]
+    ) -> list[tuple[int, UUID, datetime, datetime | None, datetime | None]]:
+        """Read (user_id, event_id, start, earliest attend, latest leave) per occurrence of the series from first to
+        last on the shard, ordered by series and start; an occurrence without an attend or a leave has None there."""
+        series = tuple_(self._model.user_id, self._model.event_id)
+        stmt = (
+            select(
+                self._model.user_id,
+                self._model.event_id,
+                self._model.start,
+                func.min(case((self._model.action == AttendanceAction.ATTEND, self._model.acted_at))),
+                func.max(case((self._model.action == AttendanceAction.LEAVE, self._model.acted_at))),
+            )
+            .where(
+                series >= tuple_(literal(first[0]), literal(uuid_to_bin(first[1]))),
+                series <= tuple_(literal(last[0]), literal(uuid_to_bin(last[1]))),
+            )
+            .group_by(self._model.user_id, self._model.event_id, self._model.start)
+            .order_by(self._model.user_id, self._model.event_id, self._model.start)
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return [
+            (user_id, bin_to_uuid(event_id), start, attended_at, left_at)
+            for user_id, event_id, start, attended_at, left_at in result.all()
+        ]
+
 
 class EventAttendanceForecastRepository(
     AbstractRepository[EventAttendanceForecastEntity, EventAttendanceForecast],
@@ -454,21 +762,74 @@ class EventAttendanceForecastRepository(
     def _model(self) -> type[EventAttendanceForecast]:
         return EventAttendanceForecast
 
-    async def bulk_delete_insert_event_attendance_forecasts_async(
-        self,
-        event_attendance_forecasts: set[EventAttendanceForecastEntity],
-    ) -> set[EventAttendanceForecastEntity] | None:
-        await self.delete_all_async(where=[])
-
-        return await self.bulk_create_async(event_attendance_forecasts)
+    async def copy_generation_async(
+        self, shard_id: str, from_generation_id: UUID, to_generation_id: UUID, excluded_series: set[tuple[int, UUID]]
+    ) -> int:
+        """Copy the forecasts of one generation into another on one shard with a single INSERT ... SELECT, skipping
+        the (user_id, event_id) series in excluded_series, and return how many were copied."""
+        # MySQL has no UUIDv7 function, so copies get time-ordered UUIDv1 ids with their timestamp bytes swapped first
+        stmt = (
+            insert(self._model)
+            .from_select(
+                [
+                    "id",
+                    "user_id",
+                    "event_id",
+                    "generation_id",
+                    "start",
+                    "forecasted_attended_at",
+                    "forecasted_duration",
+                ],
+                select(
+                    func.uuid_to_bin(func.uuid(), 1),
+                    self._model.user_id,
+                    self._model.event_id,
+                    literal(uuid_to_bin(to_generation_id)),
+                    self._model.start,
+                    self._model.forecasted_attended_at,
+                    self._model.forecasted_duration,
+                ).where(
+                    self._model.generation_id == uuid_to_bin(from_generation_id),
+                    *(
+                        [
+                            tuple_(self._model.user_id, self._model.event_id).not_in(
+                                [
+                                    tuple_(literal(user_id), literal(uuid_to_bin(event_id)))
+                                    for user_id, event_id in excluded_series
+                                ]
+                            )
+                        ]
+                        if excluded_series
+                        else []
+                    ),
+                ),
+            )
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return cast(CursorResult[Any], result).rowcount
 
-    async def read_all_by_event_ids_async(self, event_ids: set[UUID]) -> set[EventAttendanceForecastEntity]:
+    async def read_all_by_event_ids_async(
+        self, event_ids: set[UUID], generation_id: UUID
+    ) -> set[EventAttendanceForecastEntity]:
         return await self.read_all_async(
             where=[
+                self._model.generation_id == uuid_to_bin(generation_id),
                 self._model.event_id.in_(uuid_to_bin(event_id) for event_id in event_ids),
             ],
         )
 
+    async def delete_generation_batch_async(self, shard_id: str, generation_id: UUID, batch_rows: int) -> int:
+        """Delete up to batch_rows forecasts of the generation on one shard and return how many were deleted."""
+        stmt = (
+            delete(self._model)
+            .where(self._model.generation_id == uuid_to_bin(generation_id))
+            .with_dialect_options(mysql_limit=batch_rows)
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return cast(CursorResult[Any], result).rowcount
+
 
 class EventGoalRepository(
     AbstractRepository[EventGoalEntity, EventGoal],
@@ -530,6 +891,22 @@ class EventGoalRepository(
             ],
         )
 
+    async def read_by_series_range_async(
+        self, shard_id: str, first: tuple[int, UUID], last: tuple[int, UUID]
+    ) -> set[EventGoalEntity]:
+        """Read the goals of the (user_id, event_id) series from first to last on the shard."""
+        series = tuple_(self._model.user_id, self._model.event_id)
+        stmt = (
+            select(self._model)
+            .where(
+                series >= tuple_(literal(first[0]), literal(uuid_to_bin(first[1]))),
+                series <= tuple_(literal(last[0]), literal(uuid_to_bin(last[1]))),
+            )
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(record.to_entity() for record in result.scalars().all())
+
 
 class EventReviewRepository(
     AbstractRepository[EventReviewEntity, EventReview],
@@ -590,3 +967,19 @@ class EventReviewRepository(
                 self._model.start == start,
             ],
         )
+
+    async def read_by_series_range_async(
+        self, shard_id: str, first: tuple[int, UUID], last: tuple[int, UUID]
+    ) -> set[EventReviewEntity]:
+        """Read the reviews of the (user_id, event_id) series from first to last on the shard."""
+        series = tuple_(self._model.user_id, self._model.event_id)
+        stmt = (
+            select(self._model)
+            .where(
+                series >= tuple_(literal(first[0]), literal(uuid_to_bin(first[1]))),
+                series <= tuple_(literal(last[0]), literal(uuid_to_bin(last[1]))),
+            )
+            .options(set_shard_id(shard_id))
+        )
+        result = await self._uow.execute_async(stmt)
+        return set(record.to_entity() for record in result.scalars().all())
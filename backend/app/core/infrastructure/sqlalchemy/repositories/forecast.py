@@ -0,0 +1,185 @@
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy.engine.cursor import CursorResult
+from sqlalchemy.ext.horizontal_shard import set_shard_id
+from sqlalchemy.sql import or_, update
+
+from app.core.domain.entities.forecast import ForecastGeneration as ForecastGenerationEntity
+from app.core.domain.entities.forecast import ForecastJob as ForecastJobEntity
+from app.core.features.event import ForecastGenerationStatus, ForecastJobStage, ForecastJobStatus
+from app.core.infrastructure.db.settings import COMMON_DB_CONNECTION_KEY
+from app.core.infrastructure.sqlalchemy.models.commons.forecast import ForecastGeneration, ForecastJob
+from app.core.infrastructure.sqlalchemy.repositories.base import AbstractRepository
+from app.core.utils.uuid import UUID, uuid_to_bin
+
+
+class ForecastJobRepository(AbstractRepository[ForecastJobEntity, ForecastJob]):
+    """Job rows change state only through conditional updates, so concurrent workers and cancel requests never
+    overwrite each other; each transition reports whether it was applied."""
+
+    @property
+    def _model(self) -> type[ForecastJob]:
+        return ForecastJob
+
+    async def create_forecast_job_async(self, entity_id: UUID, enqueued_at: datetime) -> ForecastJobEntity | None:
+        """Return None when another job is already queued or running."""
+        forecast_job = ForecastJobEntity(
+            entity_id=entity_id,
+            status=ForecastJobStatus.QUEUED,
+            stage=None,
+            progress=0,
+            cancel_requested=False,
+            error_code=None,
+            forecast_count=None,
+            enqueued_at=enqueued_at,
+            started_at=None,
+            heartbeat_at=None,
+            finished_at=None,
+            export_watermarks=None,
+        )
+        return await self.create_async(forecast_job)
+
+    async def read_active_or_none_async(self) -> ForecastJobEntity | None:
+        return await self.read_one_or_none_async(where=[self._model.is_active.is_(True)])
+
+    async def read_latest_succeeded_or_none_async(self) -> ForecastJobEntity | None:
+        forecast_jobs = await self.read_order_by_limit_async(
+            where=[self._model.status == ForecastJobStatus.SUCCEEDED],
+            order_by=self._model.finished_at.desc(),
+            limit=1,
+        )
+        return forecast_jobs[0] if forecast_jobs else None
+
+    async def claim_async(self, job_id: UUID, started_at: datetime) -> bool:
+        return await self._transition_async(
+            job_id,
+            where=[self._model.status == ForecastJobStatus.QUEUED, self._model.cancel_requested.is_(False)],
+            values={"status": ForecastJobStatus.RUNNING, "started_at": started_at, "heartbeat_at": started_at},
+        )
+
+    async def record_progress_async(
+        self, job_id: UUID, stage: ForecastJobStage, progress: int, heartbeat_at: datetime
+    ) -> bool:
+        return await self._transition_async(
+            job_id,
+            where=[self._model.status == ForecastJobStatus.RUNNING],
+            values={"stage": stage, "progress": progress, "heartbeat_at": heartbeat_at},
+        )
+
+    async def heartbeat_async(self, job_id: UUID, heartbeat_at: datetime) -> bool:
+        return await self._transition_async(
+            job_id,
+            where=[self._model.status == ForecastJobStatus.RUNNING],
+            values={"heartbeat_at": heartbeat_at},
+        )
+
+    async def request_cancel_async(self, job_id: UUID) -> bool:
+        return await self._transition_async(
+            job_id,
+            where=[self._model.status == ForecastJobStatus.RUNNING],
+            values={"cancel_requested": True},
+        )
+
+    async def finish_async(
+        self,
+        job_id: UUID,
+        from_status: ForecastJobStatus,
+        status: ForecastJobStatus,
+        finished_at: datetime,
+        error_code: int | None = None,
+        forecast_count: int | None = None,
+        export_watermarks: dict[str, datetime] | None = None,
+        heartbeat_before: datetime | None = None,
+        enqueued_before: datetime | None = None,
+    ) -> bool:
+        where = [self._model.status == from_status]
+        if heartbeat_before is not None:
+            where.append(self._model.heartbeat_at < heartbeat_before)
+        if enqueued_before is not None:
+            where.append(self._model.enqueued_at < enqueued_before)
+        values: dict[str, Any] = {
+            "status": status,
+            "is_active": None,
+            "error_code": error_code,
+            "forecast_count": forecast_count,
+            "finished_at": finished_at,
+            "export_watermarks": {
+                connection_key: watermark.isoformat() for connection_key, watermark in export_watermarks.items()
+            }
+            if export_watermarks is not None
+            else None,
+        }
+        if status == ForecastJobStatus.SUCCEEDED:
+            values["progress"] = 100
+        return await self._transition_async(job_id, where=where, values=values)
+
+    async def _transition_async(self, job_id: UUID, where: list[Any], values: dict[str, Any]) -> bool:
+        stmt = (
+            update(self._model)
+            .where(self._model.id == uuid_to_bin(job_id), *where)
+            .values(values)
+            .options(set_shard_id(COMMON_DB_CONNECTION_KEY))
+        )
+        result = await self._uow.execute_async(stmt)
+        return cast(CursorResult[Any], result).rowcount == 1
+
+
+class ForecastGenerationRepository(AbstractRepository[ForecastGenerationEntity, ForecastGeneration]):
+    """A generation is staged before its forecasts are written to the shards, so a run that dies halfway still leaves
+    a row for the garbage collector to find, and it becomes visible only when activate_async flips it active."""
+
+    @property
+    def _model(self) -> type[ForecastGeneration]:
+        return ForecastGeneration
+
+    async def create_forecast_generation_async(self, entity_id: UUID) -> ForecastGenerationEntity | None:
+        forecast_generation = ForecastGenerationEntity(
+            entity_id=entity_id,
+            status=ForecastGenerationStatus.STAGED,
+            forecast_count=None,
+            activated_at=None,
+            retired_at=None,
+        )
+        return await self.create_async(forecast_generation)
+
+    async def read_active_or_none_async(self) -> ForecastGenerationEntity | None:
+        return await self.read_one_or_none_async(where=[self._model.is_active.is_(True)])
+
+    async def read_collectable_async(self, staged_before: datetime) -> set[ForecastGenerationEntity]:
+        """Retired generations, plus staged ones old enough that the run writing them must have died."""
+        return await self.read_all_async(
+            where=[
+                or_(
+                    self._model.status == ForecastGenerationStatus.RETIRED,
+                    (self._model.status == ForecastGenerationStatus.STAGED) & (self._model.created_at < staged_before),
+                ),
+            ],
+        )
+
+    async def activate_async(self, generation_id: UUID, forecast_count: int, activated_at: datetime) -> bool:
+        """Retire the active generation and activate the staged one in the same transaction, so readers switch from
+        one complete generation to the next on commit. Return False when the generation is no longer staged."""
+        retire_stmt = (
+            update(self._model)
+            .where(self._model.is_active.is_(True))
+            .values(status=ForecastGenerationStatus.RETIRED, is_active=None, retired_at=activated_at)
+            .options(set_shard_id(COMMON_DB_CONNECTION_KEY))
+        )
+        await self._uow.execute_async(retire_stmt)
+        activate_stmt = (
+            update(self._model)
+            .where(
+                self._model.id == uuid_to_bin(generation_id),
+                self._model.status == ForecastGenerationStatus.STAGED,
+            )
+            .values(
+                status=ForecastGenerationStatus.ACTIVE,
+                is_active=True,
+                forecast_count=forecast_count,
+                activated_at=activated_at,
+            )
+            .options(set_shard_id(COMMON_DB_CONNECTION_KEY))
+        )
+        result = await self._uow.execute_async(activate_stmt)
+        return cast(CursorResult[Any], result).rowcount == 1
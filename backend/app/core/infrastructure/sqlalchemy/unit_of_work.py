@@ -1,4 +1,5 @@
-from typing import Any, Iterable, Mapping, Sequence
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence
 
 from sqlalchemy.engine.result import Result
 from sqlalchemy.ext.asyncio.session import AsyncSession, AsyncSessionTransaction
@@ -6,10 +7,13 @@ from sqlalchemy.sql.base import Executable
 
 from app.core.domain.unit_of_work.base import IUnitOfWork
 
+logger = logging.getLogger(__name__)
+
 
 class SqlalchemyUnitOfWork(IUnitOfWork):
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        self._on_commit_callbacks: list[Callable[[], Awaitable[None]]] = []
 
     def begin_nested(self) -> AsyncSessionTransaction:
         return self._session.begin_nested()
@@ -25,9 +29,20 @@ class SqlalchemyUnitOfWork(IUnitOfWork):
 
     async def commit_async(self) -> None:
         await self._session.commit()
+        callbacks, self._on_commit_callbacks = self._on_commit_callbacks, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                # The transaction is already committed, so a failed side effect must not fail the request
+                logger.exception("on_commit callback failed")
 
     async def rollback_async(self) -> None:
         await self._session.rollback()
+        self._on_commit_callbacks = []
+
+    def on_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self._on_commit_callbacks.append(callback)
 
     async def delete_async(self, record: object) -> None:
         await self._session.delete(record)
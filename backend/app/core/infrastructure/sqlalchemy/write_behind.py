@@ -0,0 +1,361 @@
+import asyncio
+import fcntl
+import glob
+import itertools
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
+
+from app.core.constants.constants import (
+    ACTION_LOG_FLUSH_INTERVAL_MS,
+    ACTION_LOG_FLUSH_RETRIES,
+    ACTION_LOG_FLUSH_ROWS,
+    ACTION_LOG_QUEUE_SIZE,
+    ACTION_LOG_SPOOL_PATH,
+    ACTION_LOG_WRITE_BEHIND,
+)
+from app.core.domain.entities.event import (
+    EventAttendanceActionLog as EventAttendanceActionLogEntity,
+)
+from app.core.features.event import AttendanceAction
+from app.core.infrastructure.sqlalchemy.db import async_session
+from app.core.infrastructure.sqlalchemy.repositories.event import EventAttendanceActionLogRepository
+from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
+from app.core.utils.uuid import UUID, str_to_uuid, uuid_to_str
+
+logger = logging.getLogger(__name__)
+
+type _OccurrenceKey = tuple[int, UUID, datetime]
+
+
+def _occurrence_key(event_attendance_action_log: EventAttendanceActionLogEntity) -> _OccurrenceKey:
+    return (
+        event_attendance_action_log.user_id,
+        event_attendance_action_log.event_id,
+        event_attendance_action_log.start,
+    )
+
+
+def _encode(event_attendance_action_log: EventAttendanceActionLogEntity) -> str:
+    return json.dumps(
+        {
+            "id": uuid_to_str(event_attendance_action_log.id),
+            "user_id": event_attendance_action_log.user_id,
+            "event_id": uuid_to_str(event_attendance_action_log.event_id),
+            "start": event_attendance_action_log.start.isoformat(),
+            "action": event_attendance_action_log.action.value,
+            "acted_at": event_attendance_action_log.acted_at.isoformat(),
+        }
+    )
+
+
+def _encode_fence(key: _OccurrenceKey) -> str:
+    user_id, event_id, start = key
+    return json.dumps(
+        {"fence": True, "user_id": user_id, "event_id": uuid_to_str(event_id), "start": start.isoformat()}
+    )
+
+
+def _decode(record: dict[str, Any]) -> EventAttendanceActionLogEntity:
+    return EventAttendanceActionLogEntity(
+        entity_id=str_to_uuid(record["id"]),
+        user_id=record["user_id"],
+        event_id=str_to_uuid(record["event_id"]),
+        start=datetime.fromisoformat(record["start"]),
+        action=AttendanceAction(record["action"]),
+        acted_at=datetime.fromisoformat(record["acted_at"]),
+    )
+
+
+def _segment_path(spool_path: Path, segment: int) -> Path:
+    return spool_path.with_name(f"{spool_path.name}.{segment}")
+
+
+def _spooled_segments(spool_path: Path) -> list[int]:
+    prefix = f"{spool_path.name}."
+    suffixes = (path.name.removeprefix(prefix) for path in spool_path.parent.glob(f"{glob.escape(prefix)}*"))
+    return sorted(int(suffix) for suffix in suffixes if suffix.isdigit())
+
+
+def _read_segments(spool_path: Path, segments: list[int]) -> list[EventAttendanceActionLogEntity]:
+    """Read spooled logs in order, leaving out the logs spooled before a fence on their occurrence."""
+    event_attendance_action_logs: list[EventAttendanceActionLogEntity] = []
+    for segment in segments:
+        with _segment_path(spool_path, segment).open() as spool:
+            for line in spool:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not record.get("fence"):
+                    event_attendance_action_logs.append(_decode(record))
+                    continue
+                key = (record["user_id"], str_to_uuid(record["event_id"]), datetime.fromisoformat(record["start"]))
+                event_attendance_action_logs = [
+                    log for log in event_attendance_action_logs if _occurrence_key(log) != key
+                ]
+    return event_attendance_action_logs
+
+
+def _append_segment(path: Path, lines: list[str]) -> None:
+    with path.open("a") as spool:
+        spool.writelines(line + "\n" for line in lines)
+
+
+def _claim_spool(spool_path: Path) -> tuple[Path, IO[str]]:
+    """Lock the first spool slot that no other process holds, so that each worker process spools to its own files.
+
+    Slots are numbered from 0, so a restarted process takes over, and replays, the spool of one that exited.
+    """
+    for slot in itertools.count():
+        lock = spool_path.with_name(f"{spool_path.name}-{slot}.lock").open("a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            continue
+        return spool_path.with_name(f"{spool_path.name}-{slot}"), lock
+    raise AssertionError("unreachable")
+
+
+def _remove_segments(spool_path: Path, segments: list[int]) -> None:
+    for segment in segments:
+        _segment_path(spool_path, segment).unlink(missing_ok=True)
+
+
+class ActionLogWriteBehind:
+    """Buffers committed attendance action logs in a bounded queue and flushes them per shard in multi-row batches.
+
+    A batch is flushed every flush_interval_ms or as soon as flush_rows logs are buffered, and a batch that still fails
+    after flush_retries retries is dropped and logged. put_async never waits for the flusher: logs that do not fit in
+    the queue are inserted right away instead. With a spool path, logs are appended to the current spool segment
+    before they are queued. The segment is rotated for every batch and deleted once all its logs are flushed, so the
+    spool only holds unflushed logs under any load. Segments left by a crash are replayed on start. Each process
+    spools to its own slot next to the spool path, locked while it runs.
+
+    fence_async drops the buffered logs of an occurrence whose history is about to be replaced.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        queue_size: int,
+        flush_interval_ms: int,
+        flush_rows: int,
+        flush_retries: int,
+        spool_path: Path | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._queue: asyncio.Queue[tuple[int, EventAttendanceActionLogEntity]] = asyncio.Queue(maxsize=queue_size)
+        self._flush_interval = flush_interval_ms / 1000
+        self._flush_rows = flush_rows
+        self._flush_retries = flush_retries
+        self._spool_root = spool_path
+        self._spool_path: Path | None = None
+        self._spool_slot_lock: IO[str] | None = None
+        self._spool_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        # Spool segments written to since they were opened, with their number of unflushed logs
+        self._segment = 0
+        self._unflushed: dict[int, int] = {}
+        # Spool segments holding a fence, each counted as unflushed until no older segment is left
+        self._fences: list[int] = []
+        self._batch: list[tuple[int, EventAttendanceActionLogEntity]] = []
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start_async(self) -> None:
+        if self._spool_root is not None:
+            spool_path, self._spool_slot_lock = await asyncio.to_thread(_claim_spool, self._spool_root)
+            self._spool_path = spool_path
+            segments = await asyncio.to_thread(_spooled_segments, spool_path)
+            if segments:
+                self._segment = segments[-1] + 1
+                spooled = await asyncio.to_thread(_read_segments, spool_path, segments)
+                try:
+                    await self._flush_async(spooled)
+                except Exception:
+                    # Keep the segments to replay them on the next start
+                    logger.exception("Failed to replay %d spooled action logs", len(spooled))
+                else:
+                    await asyncio.to_thread(_remove_segments, spool_path, segments)
+        self._task = asyncio.create_task(self._run_async())
+
+    async def stop_async(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        remaining, self._batch = self._batch, []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        if remaining:
+            await self._flush_with_retries_async(remaining)
+        await self._rotate_async()
+        if self._spool_slot_lock is not None:
+            self._spool_slot_lock.close()
+            self._spool_path = self._spool_slot_lock = None
+
+    async def put_async(self, event_attendance_action_logs: list[EventAttendanceActionLogEntity]) -> None:
+        """Queue committed action logs; call it after the transaction that created them commits."""
+        segment = self._segment
+        if self._spool_path is not None:
+            async with self._spool_lock:
+                segment = self._segment
+                await asyncio.to_thread(
+                    _append_segment,
+                    _segment_path(self._spool_path, segment),
+                    [_encode(log) for log in event_attendance_action_logs],
+                )
+                self._unflushed[segment] = self._unflushed.get(segment, 0) + len(event_attendance_action_logs)
+
+        overflow: list[tuple[int, EventAttendanceActionLogEntity]] = []
+        for event_attendance_action_log in event_attendance_action_logs:
+            if self._task is None:
+                overflow.append((segment, event_attendance_action_log))
+                continue
+            try:
+                self._queue.put_nowait((segment, event_attendance_action_log))
+            except asyncio.QueueFull:
+                overflow.append((segment, event_attendance_action_log))
+        if overflow:
+            try:
+                await self._flush_async([log for _, log in overflow])
+            except Exception:
+                # Spooled logs stay in their segment and are replayed on the next start
+                logger.exception(
+                    "Failed to insert %d action logs that did not fit in the queue: %s",
+                    len(overflow),
+                    [_encode(log) for _, log in overflow],
+                )
+                return
+            await self._release_async(overflow)
+
+    async def fence_async(self, user_id: int, event_id: UUID, start: datetime) -> None:
+        """Drop the buffered logs of an occurrence and wait out a flush in flight; call it before deleting its logs.
+
+        Otherwise a log queued before the delete would be flushed after it and bring the deleted history back.
+        """
+        key = (user_id, event_id, start)
+        dropped: list[tuple[int, EventAttendanceActionLogEntity]] = []
+        kept: list[tuple[int, EventAttendanceActionLogEntity]] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            (dropped if _occurrence_key(item[1]) == key else kept).append(item)
+        for item in kept:
+            self._queue.put_nowait(item)
+        if self._flush_lock.locked():
+            # The batch is being inserted; the delete that follows removes what it inserts
+            async with self._flush_lock:
+                pass
+        else:
+            dropped.extend(item for item in self._batch if _occurrence_key(item[1]) == key)
+            self._batch[:] = [item for item in self._batch if _occurrence_key(item[1]) != key]
+        if not dropped:
+            return
+
+        if self._spool_path is not None:
+            async with self._spool_lock:
+                segment = self._segment
+                await asyncio.to_thread(_append_segment, _segment_path(self._spool_path, segment), [_encode_fence(key)])
+                self._unflushed[segment] = self._unflushed.get(segment, 0) + 1
+                self._fences.append(segment)
+        await self._release_async(dropped)
+
+    async def _run_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._batch = [await self._queue.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._flush_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            async with self._flush_lock:
+                await self._rotate_async()
+                await self._flush_with_retries_async(batch)
+                self._batch = []
+
+    async def _rotate_async(self) -> None:
+        """Seal the current spool segment, so that it can be deleted once the logs in it are flushed."""
+        if self._spool_path is None:
+            return
+        async with self._spool_lock:
+            sealed = self._segment
+            if sealed not in self._unflushed:
+                return
+            self._segment += 1
+        if self._unflushed[sealed] == 0:
+            del self._unflushed[sealed]
+            await asyncio.to_thread(_remove_segments, self._spool_path, [sealed])
+
+    async def _flush_with_retries_async(self, batch: list[tuple[int, EventAttendanceActionLogEntity]]) -> None:
+        for attempt in range(self._flush_retries + 1):
+            try:
+                await self._flush_async([log for _, log in batch])
+                break
+            except Exception:
+                if attempt == self._flush_retries:
+                    logger.exception(
+                        "Dropped %d action logs after %d failed flushes: %s",
+                        len(batch),
+                        attempt + 1,
+                        [_encode(log) for _, log in batch],
+                    )
+                    break
+                await asyncio.sleep(self._flush_interval)
+        await self._release_async(batch)
+
+    async def _flush_async(self, batch: list[EventAttendanceActionLogEntity]) -> None:
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            await EventAttendanceActionLogRepository(uow).bulk_insert_ignore_event_attendance_action_logs_async(batch)
+            await uow.commit_async()
+
+    async def _release_async(self, batch: list[tuple[int, EventAttendanceActionLogEntity]]) -> None:
+        """Forget flushed or dropped logs and delete the sealed spool segments that have no unflushed log left."""
+        if self._spool_path is None:
+            return
+        segments = [segment for segment, _ in batch]
+        while segments:
+            for segment in segments:
+                self._unflushed[segment] -= 1
+            flushed = [
+                segment for segment in set(segments) if segment != self._segment and self._unflushed[segment] == 0
+            ]
+            for segment in flushed:
+                del self._unflushed[segment]
+            if flushed:
+                await asyncio.to_thread(_remove_segments, self._spool_path, flushed)
+            # A fence is only needed while older segments may still be replayed
+            segments = [fence for fence in self._fences if all(segment >= fence for segment in self._unflushed)]
+            for fence in segments:
+                self._fences.remove(fence)
+
+
+action_log_write_behind = (
+    ActionLogWriteBehind(
+        session_factory=async_session,
+        queue_size=ACTION_LOG_QUEUE_SIZE,
+        flush_interval_ms=ACTION_LOG_FLUSH_INTERVAL_MS,
+        flush_rows=ACTION_LOG_FLUSH_ROWS,
+        flush_retries=ACTION_LOG_FLUSH_RETRIES,
+        spool_path=Path(ACTION_LOG_SPOOL_PATH) if ACTION_LOG_SPOOL_PATH is not None else None,
+    )
+    if ACTION_LOG_WRITE_BEHIND
+    else None
+)
@@ -9,6 +9,7 @@ from app.core.dtos.account import FollowerInfo as FollowerInfoDto
 from app.core.error.error_code import ErrorCode
 from app.core.features.account import Gender, Group
 from app.core.infrastructure.db.transaction import rollbackable
+from app.core.infrastructure.sqlalchemy.follow_graph import FollowGraph, follow_graph
 from app.core.infrastructure.sqlalchemy.models.sequences.sequence import SequenceUserId
 from app.core.infrastructure.sqlalchemy.repositories.account import (
     UserAccountRepository,
@@ -18,6 +19,7 @@ from app.core.utils.uuid import UUID, generate_uuid, uuid_to_str
 
 class AccountUsecase(IUsecase):
     _password_hasher = PasswordHasher()
+    _follow_graph: FollowGraph = follow_graph
 
     @rollbackable
     async def create_user_account_async(
@@ -57,6 +59,7 @@ class AccountUsecase(IUsecase):
             return CreateUserAccountResponse(
                 error_codes=[ErrorCode.USERNAME_OR_EMAIL_ALREADY_REGISTERED],
             )
+        self.uow.on_commit(lambda: self._follow_graph.invalidate_async(user_id))
 
         return CreateUserAccountResponse(error_codes=[])
 
@@ -32,7 +32,7 @@ class AuthUsecase(IUsecase):
         if account_id is None:
             return None
 
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if user_account is None:
             raise ValueError("User account not found")
 
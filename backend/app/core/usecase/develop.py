@@ -67,7 +67,7 @@ class DevelopUsecase(IUsecase):
         assert recurrence_rule is not None
 
         recurrence_id = generate_uuid()
-        await recurrence_repository.create_recurrence_async(
+        recurrence = await recurrence_repository.create_recurrence_async(
             entity_id=recurrence_id,
             user_id=0,
             rrule_id=recurrence_rule_id,
@@ -75,6 +75,7 @@ class DevelopUsecase(IUsecase):
             rdate=[],
             exdate=[],
         )
+        assert recurrence is not None
 
         event_id = generate_uuid()
         await event_repository.create_event_async(
@@ -87,6 +88,7 @@ class DevelopUsecase(IUsecase):
             is_all_day=True,
             recurrence_id=recurrence_id,
             timezone="UTC",
+            recurrence=recurrence,
         )
 
         # Users depending on the potential weekly event
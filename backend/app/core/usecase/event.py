@@ -1,17 +1,47 @@
+import asyncio
+import codecs
+import hashlib
+import logging
+import math
+import secrets
+import time
 from collections import defaultdict
-from datetime import datetime
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator
 from zoneinfo import ZoneInfo
 
 import httpx
-
-from app.core.constants.constants import ML_SERVER_URL
+import numpy as np
+
+from app.core.constants.constants import (
+    FORECAST_EXPORT_OVERLAP_SECONDS,
+    FORECAST_GC_BATCH_ROWS,
+    FORECAST_INSERT_BATCH_ROWS,
+    FORECAST_JOB_LEASE_MS,
+    FORECAST_JOB_QUEUE_TTL_MS,
+    FORECAST_STATISTICAL_ALPHA,
+    FORECAST_STATISTICAL_FALLBACK,
+    FORECAST_STATISTICAL_HORIZON_LEN,
+    FORECASTER,
+    ML_SERVER_FORECAST_DEADLINE_MS,
+    ML_WIRE_FORMAT,
+)
+from app.core.domain.cache.event import CachedEventList, IEventListCache
+from app.core.domain.entities.account import UserAccount as UserAccountEntity
 from app.core.domain.entities.event import Event as EventEntity
+from app.core.domain.entities.event import EventAttendance as EventAttendanceEntity
 from app.core.domain.entities.event import (
     EventAttendanceActionLog as EventAttendanceActionLogEntity,
 )
 from app.core.domain.entities.event import (
     EventAttendanceForecast as EventAttendanceForecastEntity,
 )
+from app.core.domain.entities.event import Recurrence as RecurrenceEntity
+from app.core.domain.entities.event import RecurrenceRule as RecurrenceRuleEntity
+from app.core.domain.entities.forecast import ForecastJob as ForecastJobEntity
+from app.core.domain.pubsub.broker import IBroker
 from app.core.domain.usecase.base import IUsecase
 from app.core.dtos.event import Attendance as AttendanceDto
 from app.core.dtos.event import AttendancesWithUsername as AttendancesWithUsernameDto
@@ -21,27 +51,48 @@ from app.core.dtos.event import (
 )
 from app.core.dtos.event import (
     AttendEventResponse,
+    BulkAttendEventsResponse,
+    BulkCreateEventsResponse,
+    CancelForecastJobResponse,
     CreateEventResponse,
     CreateOrUpdateGoalResponse,
     CreateOrUpdateReviewResponse,
+    EnqueueForecastJobResponse,
     ForecastAttendanceTimeResponse,
     GetAttendanceHistoryResponse,
+    GetAttendanceSnapshotResponse,
     GetAttendanceTimeForecastsResponse,
     GetEventGoalsResponse,
     GetEventReviewsResponse,
     GetFollowingEventsResponse,
+    GetForecastJobResponse,
+    GetGuestAttendanceStatusesResponse,
     GetGuestAttendanceStatusResponse,
     GetGuestGoalResponse,
     GetGuestReviewResponse,
     GetMyEventsResponse,
+    ImportEventsResponse,
+    RegenerateFeedTokenResponse,
+    RevokeFeedTokenResponse,
     UpdateAttendancesResponse,
     UpdateEventResponse,
 )
+from app.core.dtos.event import CheckIn as CheckInDto
+from app.core.dtos.event import CheckInResult as CheckInResultDto
+from app.core.dtos.event import CreateEventResult as CreateEventResultDto
 from app.core.dtos.event import Event as EventDto
 from app.core.dtos.event import EventWithId as EventWithIdDto
+from app.core.dtos.event import ForecastJob as ForecastJobDto
 from app.core.dtos.event import GoalInfo as GoalInfoDto
+from app.core.dtos.event import GuestAttendance as GuestAttendanceDto
+from app.core.dtos.event import GuestAttendanceStatus as GuestAttendanceStatusDto
 from app.core.dtos.event import ReviewInfo as ReviewInfoDto
 from app.core.dtos.ml_dto.account import UserAccount as UserAccountMLDto
+from app.core.dtos.ml_dto.columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    ForecastAttendanceTimeResponseDecoder,
+    encode_forecast_attendance_time_request,
+)
 from app.core.dtos.ml_dto.event import Event as EventMLDto
 from app.core.dtos.ml_dto.event import (
     EventAttendanceActionLog as EventAttendanceActionLogMLDto,
@@ -52,16 +103,33 @@ from app.core.dtos.ml_dto.forecast import (
     ForecastAttendanceTimeRequest,
 )
 from app.core.error.error_code import ErrorCode
+from app.core.features.account import AccountIdentity
 from app.core.features.event import (
     AttendanceAction,
     AttendanceState,
     Event,
+    ForecastJobStatus,
     Recurrence,
     RecurrenceRule,
     Weekday,
 )
+from app.core.infrastructure.cache.memory import InMemoryEventListCache
+from app.core.infrastructure.db.coalescing import coalesced, coalesced_by_key
+from app.core.infrastructure.db.settings import COMMON_DB_CONNECTION_KEY, SHARD_DB_CONNECTION_KEYS
+from app.core.infrastructure.db.sharding import resolve_shard_connection_key
 from app.core.infrastructure.db.transaction import rollbackable
+from app.core.infrastructure.ml.client import MlServerUnavailableError, ml_server_client
+from app.core.infrastructure.ml.feature_store import (
+    AttendanceFeatures,
+    build_attendance_features,
+    load_attendance_features,
+    save_attendance_features,
+)
+from app.core.infrastructure.ml.statistical import epoch_seconds, forecast_attendance_time_statistically
+from app.core.infrastructure.pubsub.memory import InMemoryBroker
+from app.core.infrastructure.sqlalchemy.follow_graph import FollowGraph, follow_graph
 from app.core.infrastructure.sqlalchemy.repositories.account import (
+    FeedTokenRepository,
     UserAccountRepository,
 )
 from app.core.infrastructure.sqlalchemy.repositories.event import (
@@ -74,36 +142,84 @@ from app.core.infrastructure.sqlalchemy.repositories.event import (
     RecurrenceRepository,
     RecurrenceRuleRepository,
 )
+from app.core.infrastructure.sqlalchemy.repositories.forecast import (
+    ForecastGenerationRepository,
+    ForecastJobRepository,
+)
+from app.core.infrastructure.sqlalchemy.write_behind import action_log_write_behind
+from app.core.utils.cache import LRUCache
 from app.core.utils.datetime import validate_date
-from app.core.utils.icalendar import parse_recurrence, serialize_recurrence
-from app.core.utils.uuid import UUID, generate_uuid, str_to_uuid, uuid_to_str
+from app.core.utils.etag import build_etag
+from app.core.utils.icalendar import (
+    ContentLine,
+    IcsEventReader,
+    parse_recurrence,
+    serialize_recurrence,
+    serialize_vcalendar_footer,
+    serialize_vcalendar_header,
+    serialize_vevent,
+)
+from app.core.utils.recurrence import get_compiled_recurrence
+from app.core.utils.uuid import UUID, generate_uuid, str_to_uuid, str_to_uuid_or_none, uuid_to_str
+
+logger = logging.getLogger(__name__)
+
+
+def to_recurrence(recurrence_entity: RecurrenceEntity) -> Recurrence:
+    return Recurrence(
+        rrule=RecurrenceRule(
+            freq=recurrence_entity.rrule.freq,
+            until=recurrence_entity.rrule.until,
+            count=recurrence_entity.rrule.count,
+            interval=recurrence_entity.rrule.interval,
+            bysecond=recurrence_entity.rrule.bysecond,
+            byminute=recurrence_entity.rrule.byminute,
+            byhour=recurrence_entity.rrule.byhour,
+            byday=recurrence_entity.rrule.byday,
+            bymonthday=recurrence_entity.rrule.bymonthday,
+            byyearday=recurrence_entity.rrule.byyearday,
+            byweekno=recurrence_entity.rrule.byweekno,
+            bymonth=recurrence_entity.rrule.bymonth,
+            bysetpos=recurrence_entity.rrule.bysetpos,
+            wkst=recurrence_entity.rrule.wkst or Weekday.MO,
+        ),
+        rdate=recurrence_entity.rdate,
+        exdate=recurrence_entity.exdate,
+    )
+
+
+_recurrence_list_cache: LRUCache[UUID, tuple[tuple[UUID, datetime], tuple[str, ...]]] = LRUCache(maxsize=16384)
+# Usernames never change once an account is created, so entries need no invalidation
+_username_cache: LRUCache[int, str] = LRUCache(maxsize=65536)
+# Serialized VEVENTs of a host's .ics feed, served while the host's (max(updated_at), count) version is unchanged
+_ics_feed_cache: LRUCache[int, tuple[tuple[datetime | None, int], tuple[str, ...]]] = LRUCache(maxsize=1024)
+
+ICS_FEED_CHUNK_EVENTS = 64
+ICS_IMPORT_BATCH_SIZE = 1000
+# Widths of the event.summary, event.location and event.timezone columns
+EVENT_TEXT_MAX_LENGTH = 63
+
+
+def serialize_recurrence_list(event: EventEntity) -> list[str]:
+    """Serialize the event's recurrence, reusing the cached result while (rrule_id, updated_at) is unchanged."""
+    if event.recurrence is None:
+        return []
+    if event.updated_at is None:
+        return serialize_recurrence(to_recurrence(event.recurrence), event.dtstart, event.is_all_day, event.timezone)
+    version = (event.recurrence.rrule_id, event.updated_at)
+    cached = _recurrence_list_cache.get(event.recurrence.id)
+    if cached is not None and cached[0] == version:
+        return list(cached[1])
+    recurrence_list = serialize_recurrence(
+        to_recurrence(event.recurrence), event.dtstart, event.is_all_day, event.timezone
+    )
+    _recurrence_list_cache.set(event.recurrence.id, (version, tuple(recurrence_list)))
+    return recurrence_list
 
 
 def serialize_events(events: set[EventEntity]) -> list[EventWithIdDto]:
     event_dto_list = []
     for event in events:
-        recurrence: Recurrence | None = None
-        if event.recurrence is not None:
-            recurrence = Recurrence(
-                rrule=RecurrenceRule(
-                    freq=event.recurrence.rrule.freq,
-                    until=event.recurrence.rrule.until,
-                    count=event.recurrence.rrule.count,
-                    interval=event.recurrence.rrule.interval,
-                    bysecond=event.recurrence.rrule.bysecond,
-                    byminute=event.recurrence.rrule.byminute,
-                    byhour=event.recurrence.rrule.byhour,
-                    byday=event.recurrence.rrule.byday,
-                    bymonthday=event.recurrence.rrule.bymonthday,
-                    byyearday=event.recurrence.rrule.byyearday,
-                    byweekno=event.recurrence.rrule.byweekno,
-                    bymonth=event.recurrence.rrule.bymonth,
-                    bysetpos=event.recurrence.rrule.bysetpos,
-                    wkst=event.recurrence.rrule.wkst or Weekday.MO,
-                ),
-                rdate=event.recurrence.rdate,
-                exdate=event.recurrence.exdate,
-            )
         event_dto_list.append(
             EventWithIdDto(
                 id=uuid_to_str(event.id),
@@ -112,14 +228,339 @@ def serialize_events(events: set[EventEntity]) -> list[EventWithIdDto]:
                 dtstart=event.dtstart,
                 dtend=event.dtend,
                 is_all_day=event.is_all_day,
-                recurrence_list=serialize_recurrence(recurrence, event.dtstart, event.is_all_day, event.timezone),
+                recurrence_list=serialize_recurrence_list(event),
                 timezone=event.timezone,
             )
         )
     return event_dto_list
 
 
+def validate_event(event: Event) -> None:
+    """Raise ValueError unless the event, with its start and end in UTC, can be stored as is."""
+    if event.dtstart.tzname() != "UTC" or event.dtend.tzname() != "UTC":
+        raise ValueError("DTSTART and DTEND must be in UTC")
+    if max(len(event.summary), len(event.location or ""), len(event.timezone)) > EVENT_TEXT_MAX_LENGTH:
+        raise ValueError("Summary, location or timezone is too long")
+    validate_date(is_all_day=event.is_all_day, date_value=event.dtstart, timezone=event.timezone)
+    validate_date(is_all_day=event.is_all_day, date_value=event.dtend, timezone=event.timezone)
+
+
+def build_event_entity(user_id: int, event: Event) -> EventEntity:
+    """Build an event entity with new IDs, along with its recurrence and recurrence rule entities."""
+    recurrence_entity: RecurrenceEntity | None = None
+    if event.recurrence is not None:
+        recurrence_rule_entity = RecurrenceRuleEntity(
+            entity_id=generate_uuid(),
+            user_id=user_id,
+            freq=event.recurrence.rrule.freq,
+            until=event.recurrence.rrule.until,
+            count=event.recurrence.rrule.count,
+            interval=event.recurrence.rrule.interval,
+            bysecond=event.recurrence.rrule.bysecond,
+            byminute=event.recurrence.rrule.byminute,
+            byhour=event.recurrence.rrule.byhour,
+            byday=event.recurrence.rrule.byday,
+            bymonthday=event.recurrence.rrule.bymonthday,
+            byyearday=event.recurrence.rrule.byyearday,
+            byweekno=event.recurrence.rrule.byweekno,
+            bymonth=event.recurrence.rrule.bymonth,
+            bysetpos=event.recurrence.rrule.bysetpos,
+            wkst=event.recurrence.rrule.wkst or Weekday.MO,
+        )
+        recurrence_entity = RecurrenceEntity(
+            entity_id=generate_uuid(),
+            user_id=user_id,
+            rrule_id=recurrence_rule_entity.id,
+            rrule=recurrence_rule_entity,
+            rdate=event.recurrence.rdate,
+            exdate=event.recurrence.exdate,
+        )
+    return EventEntity(
+        entity_id=generate_uuid(),
+        user_id=user_id,
+        summary=event.summary,
+        location=event.location,
+        dtstart=event.dtstart,
+        dtend=event.dtend,
+        is_all_day=event.is_all_day,
+        recurrence_id=recurrence_entity.id if recurrence_entity is not None else None,
+        timezone=event.timezone,
+        recurrence=recurrence_entity,
+    )
+
+
+def serialize_vevents(user_id: int, version: tuple[datetime | None, int], events: set[EventEntity]) -> Iterator[str]:
+    """Serialize the host's events one VEVENT at a time, caching the feed once every event has been serialized."""
+    vevents = []
+    for event in sorted(events, key=lambda event: event.dtstart):
+        vevent = serialize_vevent(
+            uid=f"{uuid_to_str(event.id)}@tend-attend",
+            summary=event.summary,
+            location=event.location,
+            dtstart=event.dtstart,
+            dtend=event.dtend,
+            is_all_day=event.is_all_day,
+            timezone=event.timezone,
+            recurrence=to_recurrence(event.recurrence) if event.recurrence is not None else None,
+            dtstamp=event.updated_at or datetime.now(ZoneInfo("UTC")),
+        )
+        vevents.append(vevent)
+        yield vevent
+    _ics_feed_cache.set(user_id, (version, tuple(vevents)))
+
+
+async def stream_ics_feed(calendar_name: str, vevents: Iterable[str]) -> AsyncIterator[str]:
+    yield serialize_vcalendar_header(calendar_name)
+    chunk: list[str] = []
+    for vevent in vevents:
+        chunk.append(vevent)
+        if len(chunk) == ICS_FEED_CHUNK_EVENTS:
+            yield "".join(chunk)
+            chunk = []
+    yield "".join(chunk) + serialize_vcalendar_footer()
+
+
+def hash_feed_token(feed_token: str) -> bytes:
+    return hashlib.sha256(feed_token.encode()).digest()
+
+
+def attendance_channel(event_id: UUID, start: datetime) -> str:
+    return f"attendance:{uuid_to_str(event_id)}:{start.astimezone(ZoneInfo('UTC')).isoformat()}"
+
+
+def is_occurrence(event: EventEntity, start: datetime) -> bool:
+    """Check that start is an actual occurrence of the event, using the event's compiled recurrence."""
+    compiled_recurrence = get_compiled_recurrence(
+        event_id=event.id,
+        dtstart=event.dtstart,
+        timezone=event.timezone,
+        is_all_day=event.is_all_day,
+        recurrence=to_recurrence(event.recurrence) if event.recurrence is not None else None,
+    )
+    return compiled_recurrence.contains(start)
+
+
+def build_event_ml_dtos(event_data: Iterable[EventEntity]) -> list[EventMLDto]:
+    return [
+        EventMLDto(
+            id=uuid_to_str(event.id),
+            user_id=event.user_id,
+            dtstart=event.dtstart,
+            dtend=event.dtend,
+            timezone=event.timezone,
+            recurrence=RecurrenceMLDto(
+                id=uuid_to_str(event.recurrence.id),
+                rrule=RecurrenceRuleMLDto(
+                    id=uuid_to_str(event.recurrence.rrule.id),
+                    freq=event.recurrence.rrule.freq,
+                ),
+            )
+            if event.recurrence
+            else None,
+        )
+        for event in event_data
+    ]
+
+
+def build_user_ml_dtos(user_data: Iterable[UserAccountEntity]) -> list[UserAccountMLDto]:
+    return [
+        UserAccountMLDto(
+            id=uuid_to_str(user.id),
+            user_id=user.user_id,
+            birth_date=user.birth_date,
+            gender=user.gender,
+        )
+        for user in user_data
+    ]
+
+
+def build_forecast_attendance_time_request(
+    earliest_attend_data: Iterable[EventAttendanceActionLogEntity],
+    latest_leave_data: Iterable[EventAttendanceActionLogEntity],
+    event_data: Iterable[EventEntity],
+    user_data: Iterable[UserAccountEntity],
+    is_delta: bool,
+    context_len: int | None,
+) -> ForecastAttendanceTimeRequest:
+    earliest_attend_dtos = [
+        EventAttendanceActionLogMLDto(
+            id=uuid_to_str(log.id),
+            user_id=log.user_id,
+            event_id=uuid_to_str(log.event_id),
+            start=log.start,
+            action=log.action,
+            acted_at=log.acted_at,
+        )
+        for log in earliest_attend_data
+    ]
+    latest_leave_dtos = [
+        EventAttendanceActionLogMLDto(
+            id=uuid_to_str(log.id),
+            user_id=log.user_id,
+            event_id=uuid_to_str(log.event_id),
+            start=log.start,
+            action=log.action,
+            acted_at=log.acted_at,
+        )
+        for log in latest_leave_data
+    ]
+    event_dtos = build_event_ml_dtos(event_data)
+    user_dtos = build_user_ml_dtos(user_data)
+    return ForecastAttendanceTimeRequest(
+        is_delta=is_delta,
+        context_len=context_len,
+        earliest_attend_data=earliest_attend_dtos,
+        latest_leave_data=latest_leave_dtos,
+        event_data=event_dtos,
+        user_data=user_dtos,
+    )
+
+
+def serialize_forecast_job(forecast_job: ForecastJobEntity) -> ForecastJobDto:
+    return ForecastJobDto(
+        id=uuid_to_str(forecast_job.id),
+        status=forecast_job.status,
+        stage=forecast_job.stage,
+        progress=forecast_job.progress,
+        cancel_requested=forecast_job.cancel_requested,
+        error_code=forecast_job.error_code,
+        forecast_count=forecast_job.forecast_count,
+        enqueued_at=forecast_job.enqueued_at,
+        started_at=forecast_job.started_at,
+        finished_at=forecast_job.finished_at,
+    )
+
+
+async def _post_columnar_forecast_request_async(
+    request: ForecastAttendanceTimeRequest,
+) -> ForecastAttendanceTimeResponse | None:
+    async def content() -> AsyncIterator[bytes]:
+        for chunk in encode_forecast_attendance_time_request(request):
+            yield chunk
+
+    async with ml_server_client.stream_async(
+        "forecast_attendance",
+        "POST",
+        "/forecast/attendance",
+        content=content,
+        headers={"Content-Type": COLUMNAR_MEDIA_TYPE, "Accept": f"{COLUMNAR_MEDIA_TYPE}, application/json"},
+        deadline_ms=ML_SERVER_FORECAST_DEADLINE_MS,
+        idempotent=True,
+    ) as response:
+        if response.status_code in {httpx.codes.NOT_ACCEPTABLE, httpx.codes.UNSUPPORTED_MEDIA_TYPE}:
+            return None
+        response.raise_for_status()
+        if not response.headers.get("Content-Type", "").startswith(COLUMNAR_MEDIA_TYPE):
+            return ForecastAttendanceTimeResponse.model_validate_json(await response.aread())
+        decoder = ForecastAttendanceTimeResponseDecoder()
+        async for chunk in response.aiter_bytes():
+            decoder.feed(chunk)
+        return decoder.close()
+
+
+async def request_attendance_time_forecast_async(
+    request: ForecastAttendanceTimeRequest,
+) -> ForecastAttendanceTimeResponse:
+    """Post the attendance history to the ML server; no database transaction should be open while this waits.
+
+    With ML_WIRE_FORMAT=columnar the request is streamed as columnar frames and JSON is only used when the ML server
+    answers 406 or 415. The ML server merges requests by id, so the call is retried as idempotent.
+    """
+    try:
+        if ML_WIRE_FORMAT == "columnar":
+            forecast_result = await _post_columnar_forecast_request_async(request)
+            if forecast_result is not None:
+                return forecast_result
+        async with ml_server_client.stream_async(
+            "forecast_attendance",
+            "POST",
+            "/forecast/attendance",
+            content=request.model_dump_json().encode(),
+            headers={"Content-Type": "application/json"},
+            deadline_ms=ML_SERVER_FORECAST_DEADLINE_MS,
+            idempotent=True,
+        ) as response:
+            response.raise_for_status()  # Raise exception for 4xx/5xx status codes
+            return ForecastAttendanceTimeResponse.model_validate_json(await response.aread())
+    except (httpx.TransportError, TimeoutError, MlServerUnavailableError):
+        # Handle timeouts, connection errors and calls rejected by the open circuit breaker
+        return ForecastAttendanceTimeResponse(
+            attendance_time_forecasts={},
+            error_codes=[ErrorCode.ML_SERVER_TIMEOUT],
+        )
+    except httpx.HTTPStatusError:
+        # Handle HTTP errors (4xx, 5xx responses)
+        return ForecastAttendanceTimeResponse(
+            attendance_time_forecasts={},
+            error_codes=[ErrorCode.ML_SERVER_ERROR],
+        )
+    except ValueError:
+        # Handle validation errors from model_validate
+        return ForecastAttendanceTimeResponse(
+            attendance_time_forecasts={},
+            error_codes=[ErrorCode.ML_SERVER_ERROR],
+        )
+
+
+async def run_attendance_time_forecast_async(
+    request: ForecastAttendanceTimeRequest,
+) -> tuple[ForecastAttendanceTimeResponse, bool]:
+    """Forecast with the configured forecaster and return the result and whether the statistical fallback answered.
+
+    With FORECASTER=statistical the ML server is not called. Otherwise, when the ML server fails and
+    FORECAST_STATISTICAL_FALLBACK is set, the statistical forecaster answers instead of the error.
+    """
+    if FORECASTER == "statistical":
+        return await _forecast_attendance_time_statistically_async(request), False
+    forecast_result = await request_attendance_time_forecast_async(request)
+    if not forecast_result.error_codes or not FORECAST_STATISTICAL_FALLBACK:
+        return forecast_result, False
+    logger.warning("ML server failed with %s, forecasting statistically", forecast_result.error_codes)
+    return await _forecast_attendance_time_statistically_async(request), True
+
+
+async def _forecast_attendance_time_statistically_async(
+    request: ForecastAttendanceTimeRequest,
+) -> ForecastAttendanceTimeResponse:
+    return await asyncio.to_thread(
+        forecast_attendance_time_statistically, request, FORECAST_STATISTICAL_HORIZON_LEN, FORECAST_STATISTICAL_ALPHA
+    )
+
+
 class EventUsecase(IUsecase):
+    _event_list_cache: IEventListCache = InMemoryEventListCache(maxsize=1024)
+    _attendance_broker: IBroker = InMemoryBroker()
+    _follow_graph: FollowGraph = follow_graph
+
+    async def _read_serialized_events_by_user_ids_async(self, user_ids: set[int]) -> list[EventWithIdDto]:
+        """Compose the serialized events of the given hosts, reloading only hosts whose cached version is stale."""
+        event_repository = EventRepository(self.uow)
+
+        versions = await event_repository.read_versions_by_user_ids_async(user_ids)
+        cached_event_lists = await self._event_list_cache.get_many_async(user_ids)
+
+        event_lists = {
+            user_id: event_list
+            for user_id, event_list in cached_event_lists.items()
+            if event_list.version == versions.get(user_id, (None, 0))
+        }
+        stale_user_ids = user_ids - event_lists.keys()
+        if stale_user_ids:
+            events_by_user_id: defaultdict[int, set[EventEntity]] = defaultdict(set)
+            for event in await event_repository.read_with_recurrence_by_user_ids_async(stale_user_ids):
+                events_by_user_id[event.user_id].add(event)
+            loaded_event_lists = {
+                user_id: CachedEventList(
+                    version=versions.get(user_id, (None, 0)),
+                    events=tuple(serialize_events(events_by_user_id[user_id])),
+                )
+                for user_id in stale_user_ids
+            }
+            await self._event_list_cache.set_many_async(loaded_event_lists)
+            event_lists |= loaded_event_lists
+
+        return [event for event_list in event_lists.values() for event in event_list.events]
+
     @rollbackable
     async def create_event_async(
         self,
@@ -155,15 +596,17 @@ class EventUsecase(IUsecase):
             is_all_day=event_dto.is_all_day,
         )
 
-        host = await user_account_repository.read_by_id_or_none_async(host_id)
+        host = await user_account_repository.read_identity_by_id_async(host_id)
         if host is None:
             return CreateEventResponse(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         user_id = host.user_id
 
         recurrence_id: UUID | None
+        recurrence_entity: RecurrenceEntity | None
         if event.recurrence is None:
             recurrence_id = None
+            recurrence_entity = None
         else:
             recurrence_rule = await recurrence_rule_repository.create_recurrence_rule_async(
                 entity_id=generate_uuid(),
@@ -209,12 +652,177 @@ class EventUsecase(IUsecase):
             is_all_day=event.is_all_day,
             recurrence_id=recurrence_id,
             timezone=event.timezone,
+            recurrence=recurrence_entity,
         )
         if event_entity is None:
             raise ValueError("Failed to create event")
 
+        await self._event_list_cache.invalidate_async(user_id)
+
         return CreateEventResponse(error_codes=[])
 
+    async def _bulk_insert_events_async(self, user_id: int, events: list[Event]) -> list[EventEntity | None]:
+        """Insert the events with one multi-row INSERT per table on the host shard.
+
+        Event summaries are unique per shard, so an event whose summary is taken, or repeats an earlier one in the
+        list, is skipped and gets None in place of its entity. So does one whose summary a concurrent insert takes.
+        """
+        event_repository = EventRepository(self.uow)
+
+        if not events:
+            return []
+
+        taken_summaries = await event_repository.read_summaries_by_user_id_async(
+            user_id=user_id,
+            summaries={event.summary for event in events},
+        )
+
+        event_entities: list[EventEntity | None] = []
+        for event in events:
+            if event.summary in taken_summaries:
+                event_entities.append(None)
+                continue
+            taken_summaries.add(event.summary)
+            event_entities.append(build_event_entity(user_id, event))
+
+        inserted_event_entities = iter(
+            await event_repository.bulk_insert_events_async(
+                [event_entity for event_entity in event_entities if event_entity is not None]
+            )
+        )
+        return [next(inserted_event_entities) if event_entity is not None else None for event_entity in event_entities]
+
+    @rollbackable
+    async def bulk_create_events_async(
+        self,
+        host_id: UUID,
+        event_dtos: list[EventDto],
+    ) -> BulkCreateEventsResponse:
+        user_account_repository = UserAccountRepository(self.uow)
+
+        host = await user_account_repository.read_identity_by_id_async(host_id)
+        if host is None:
+            return BulkCreateEventsResponse(results=[], error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
+
+        user_id = host.user_id
+
+        # Imported events tend to share recurrence lists, so parse each distinct one once
+        recurrences: dict[tuple[tuple[str, ...], bool], Recurrence | None] = {}
+
+        parsed_events: list[Event | None] = []
+        for event_dto in event_dtos:
+            try:
+                key = (tuple(event_dto.recurrence_list), event_dto.is_all_day)
+                if key not in recurrences:
+                    recurrences[key] = parse_recurrence(event_dto.recurrence_list, event_dto.is_all_day)
+                event = Event(
+                    summary=event_dto.summary,
+                    location=event_dto.location,
+                    dtstart=event_dto.dtstart,
+                    dtend=event_dto.dtend,
+                    timezone=event_dto.timezone,
+                    recurrence=recurrences[key],
+                    is_all_day=event_dto.is_all_day,
+                )
+                validate_event(event)
+            except (ValueError, KeyError):
+                parsed_events.append(None)
+                continue
+            parsed_events.append(event)
+
+        inserted_event_entities = iter(
+            await self._bulk_insert_events_async(user_id, [event for event in parsed_events if event is not None])
+        )
+        results: list[CreateEventResultDto] = []
+        for parsed_event in parsed_events:
+            if parsed_event is None:
+                results.append(CreateEventResultDto(event_id=None, error_codes=[ErrorCode.EVENT_INVALID]))
+                continue
+            event_entity = next(inserted_event_entities)
+            if event_entity is None:
+                results.append(
+                    CreateEventResultDto(event_id=None, error_codes=[ErrorCode.EVENT_SUMMARY_ALREADY_EXISTS])
+                )
+                continue
+            results.append(CreateEventResultDto(event_id=uuid_to_str(event_entity.id), error_codes=[]))
+
+        await self._event_list_cache.invalidate_async(user_id)
+
+        return BulkCreateEventsResponse(results=results, error_codes=[])
+
+    @rollbackable
+    async def import_events_async(
+        self,
+        host_id: UUID,
+        chunks: AsyncIterator[bytes],
+    ) -> ImportEventsResponse:
+        user_account_repository = UserAccountRepository(self.uow)
+
+        host = await user_account_repository.read_identity_by_id_async(host_id)
+        if host is None:
+            return ImportEventsResponse(
+                imported_count=0,
+                invalid_count=0,
+                duplicate_count=0,
+                events_per_second=0.0,
+                error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
+            )
+
+        user_id = host.user_id
+        started_at = time.perf_counter()
+        reader = IcsEventReader()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        imported_count = invalid_count = duplicate_count = 0
+        batch: list[Event] = []
+
+        def stage(properties: tuple[ContentLine, ...]) -> None:
+            nonlocal invalid_count
+            try:
+                event = reader.to_event(properties)
+                validate_event(event)
+            except (ValueError, KeyError):
+                invalid_count += 1
+                return
+            batch.append(event)
+
+        async def flush_async() -> None:
+            nonlocal imported_count, duplicate_count
+            event_entities = await self._bulk_insert_events_async(user_id, batch)
+            inserted_count = sum(event_entity is not None for event_entity in event_entities)
+            imported_count += inserted_count
+            duplicate_count += len(event_entities) - inserted_count
+            batch.clear()
+
+        try:
+            async for chunk in chunks:
+                for properties in reader.feed(decoder.decode(chunk)):
+                    stage(properties)
+                    if len(batch) >= ICS_IMPORT_BATCH_SIZE:
+                        await flush_async()
+            for properties in reader.feed(decoder.decode(b"", final=True)) + reader.close():
+                stage(properties)
+        except ValueError:
+            return ImportEventsResponse(
+                imported_count=0,
+                invalid_count=0,
+                duplicate_count=0,
+                events_per_second=0.0,
+                error_codes=[ErrorCode.CALENDAR_FILE_INVALID],
+            )
+        if batch:
+            await flush_async()
+
+        await self._event_list_cache.invalidate_async(user_id)
+
+        elapsed = time.perf_counter() - started_at
+        return ImportEventsResponse(
+            imported_count=imported_count,
+            invalid_count=invalid_count,
+            duplicate_count=duplicate_count,
+            events_per_second=imported_count / elapsed if elapsed > 0 else 0.0,
+            error_codes=[],
+        )
+
     @rollbackable
     async def update_event_async(
         self,
@@ -242,7 +850,7 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        host = await user_account_repository.read_by_id_or_none_async(host_id)
+        host = await user_account_repository.read_identity_by_id_async(host_id)
         if host is None:
             return UpdateEventResponse(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
@@ -257,11 +865,12 @@ class EventUsecase(IUsecase):
         recurrence = parse_recurrence(event_dto.recurrence_list, event_dto.is_all_day)
 
         recurrence_id: UUID | None = None
+        recurrence_entity: RecurrenceEntity | None = None
         if recurrence is not None:
             if existing_event.recurrence_id is not None:
                 existing_recurrence = existing_event.recurrence
                 if existing_recurrence is not None:
-                    await recurrence_rule_repository.update_recurrence_rule_async(
+                    recurrence_rule = await recurrence_rule_repository.update_recurrence_rule_async(
                         entity_id=existing_recurrence.rrule_id,
                         freq=recurrence.rrule.freq,
                         until=recurrence.rrule.until,
@@ -278,12 +887,23 @@ class EventUsecase(IUsecase):
                         bysetpos=recurrence.rrule.bysetpos,
                         wkst=recurrence.rrule.wkst or Weekday.MO,
                     )
+                    if recurrence_rule is None:
+                        raise ValueError("Failed to update recurrence rule")
+
                     await recurrence_repository.update_recurrence_async(
                         entity_id=existing_event.recurrence_id,
                         rdate=recurrence.rdate,
                         exdate=recurrence.exdate,
                     )
                     recurrence_id = existing_event.recurrence_id
+                    recurrence_entity = RecurrenceEntity(
+                        entity_id=recurrence_id,
+                        user_id=user_id,
+                        rrule_id=recurrence_rule.id,
+                        rrule=recurrence_rule,
+                        rdate=recurrence.rdate,
+                        exdate=recurrence.exdate,
+                    )
                 else:
                     raise ValueError("Although recurrence_id is not None, recurrence is None")
             else:
@@ -330,7 +950,11 @@ class EventUsecase(IUsecase):
             is_all_day=event_dto.is_all_day,
             recurrence_id=recurrence_id,
             timezone=event_dto.timezone,
+            recurrence=recurrence_entity,
         )
+        if existing_event.recurrence_id is not None:
+            _recurrence_list_cache.pop(existing_event.recurrence_id)
+        await self._event_list_cache.invalidate_async(user_id)
 
         return UpdateEventResponse(error_codes=[])
 
@@ -349,15 +973,17 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return AttendEventResponse(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         user_id = guest.user_id
 
-        event = await event_repository.read_by_id_or_none_async(event_id)
+        event = await event_repository.read_with_recurrence_by_id_or_none_async(event_id)
         if event is None:
             return AttendEventResponse(error_codes=[ErrorCode.EVENT_NOT_FOUND])
+        if not is_occurrence(event, start):
+            return AttendEventResponse(error_codes=[ErrorCode.EVENT_OCCURRENCE_NOT_FOUND])
 
         if action == AttendanceAction.ATTEND:
             if not event.is_attendable(start, datetime.now(ZoneInfo("UTC"))):
@@ -372,6 +998,7 @@ class EventUsecase(IUsecase):
                 start=start,
                 state=AttendanceState.PRESENT,
             )
+            self._publish_attendance_on_commit(guest, event.id, start, AttendanceState.PRESENT)
         elif action == AttendanceAction.LEAVE:
             if not event.is_leaveable(start, datetime.now(ZoneInfo("UTC"))):
                 return AttendEventResponse(error_codes=[ErrorCode.EVENT_NOT_LEAVEABLE])
@@ -383,18 +1010,148 @@ class EventUsecase(IUsecase):
                 start=start,
                 state=AttendanceState.EXCUSED_ABSENCE,
             )
-
-        await event_attendance_action_log_repository.create_event_attendance_action_log_async(
-            entity_id=generate_uuid(),
-            user_id=user_id,
-            event_id=event.id,
-            start=start,
-            action=action,
-            acted_at=datetime.now(ZoneInfo("UTC")),
-        )
+            self._publish_attendance_on_commit(guest, event.id, start, AttendanceState.EXCUSED_ABSENCE)
+
+        if action_log_write_behind is not None and action_log_write_behind.is_running:
+            self._put_action_logs_on_commit(
+                [
+                    EventAttendanceActionLogEntity(
+                        entity_id=generate_uuid(),
+                        user_id=user_id,
+                        event_id=event.id,
+                        start=start,
+                        action=action,
+                        acted_at=datetime.now(ZoneInfo("UTC")),
+                    )
+                ]
+            )
+        else:
+            await event_attendance_action_log_repository.create_event_attendance_action_log_async(
+                entity_id=generate_uuid(),
+                user_id=user_id,
+                event_id=event.id,
+                start=start,
+                action=action,
+                acted_at=datetime.now(ZoneInfo("UTC")),
+            )
 
         return AttendEventResponse(error_codes=[])
 
+    @rollbackable
+    async def bulk_attend_events_async(
+        self,
+        host_id: UUID,
+        check_ins: list[CheckInDto],
+    ) -> BulkAttendEventsResponse:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+        event_attendance_repository = EventAttendanceRepository(self.uow)
+        event_attendance_action_log_repository = EventAttendanceActionLogRepository(self.uow)
+
+        host = await user_account_repository.read_identity_by_id_async(host_id)
+        if host is None:
+            return BulkAttendEventsResponse(results=[], error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
+
+        # Malformed IDs fail their own check-in only, as IDs that match no account or event
+        guest_ids = [str_to_uuid_or_none(check_in.guest_id) for check_in in check_ins]
+        event_ids = [str_to_uuid_or_none(check_in.event_id) for check_in in check_ins]
+        guests = {
+            guest.account_id: guest
+            for guest in await user_account_repository.read_identities_by_ids_async(
+                {guest_id for guest_id in guest_ids if guest_id is not None}
+            )
+        }
+        events = {
+            event.id: event
+            for event in await event_repository.read_with_recurrence_by_ids_async(
+                {event_id for event_id in event_ids if event_id is not None}
+            )
+        }
+
+        now = datetime.now(ZoneInfo("UTC"))
+        # Occurrence and window checks depend only on (event, start, action), so run them once per key
+        window_error_codes: dict[tuple[UUID, datetime, AttendanceAction], list[int]] = {}
+        # Only the host and their followers may attend; the follow check runs once per guest
+        may_attend: dict[int, bool] = {}
+
+        results: list[CheckInResultDto] = []
+        event_attendances: list[EventAttendanceEntity] = []
+        event_attendance_action_logs: set[EventAttendanceActionLogEntity] = set()
+        for check_in, guest_id, event_id in zip(check_ins, guest_ids, event_ids):
+            guest = guests.get(guest_id) if guest_id is not None else None
+            if guest is None:
+                results.append(CheckInResultDto(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND]))
+                continue
+            event = events.get(event_id) if event_id is not None else None
+            if event is None:
+                results.append(CheckInResultDto(error_codes=[ErrorCode.EVENT_NOT_FOUND]))
+                continue
+            if event.user_id != host.user_id:
+                results.append(CheckInResultDto(error_codes=[ErrorCode.EVENT_ACCESS_DENIED]))
+                continue
+            if guest.user_id not in may_attend:
+                may_attend[guest.user_id] = guest.user_id == host.user_id or await self._follow_graph.is_follower_async(
+                    self.uow, guest.user_id, host.user_id
+                )
+            if not may_attend[guest.user_id]:
+                results.append(CheckInResultDto(error_codes=[ErrorCode.EVENT_ACCESS_DENIED]))
+                continue
+
+            key = (event.id, check_in.start, check_in.action)
+            if key not in window_error_codes:
+                if not is_occurrence(event, check_in.start):
+                    window_error_codes[key] = [ErrorCode.EVENT_OCCURRENCE_NOT_FOUND]
+                elif check_in.action == AttendanceAction.ATTEND and not event.is_attendable(check_in.start, now):
+                    window_error_codes[key] = [ErrorCode.EVENT_NOT_ATTENDABLE]
+                elif check_in.action == AttendanceAction.LEAVE and not event.is_leaveable(check_in.start, now):
+                    window_error_codes[key] = [ErrorCode.EVENT_NOT_LEAVEABLE]
+                else:
+                    window_error_codes[key] = []
+            if window_error_codes[key]:
+                results.append(CheckInResultDto(error_codes=window_error_codes[key]))
+                continue
+
+            state = (
+                AttendanceState.PRESENT
+                if check_in.action == AttendanceAction.ATTEND
+                else AttendanceState.EXCUSED_ABSENCE
+            )
+            event_attendances.append(
+                EventAttendanceEntity(
+                    entity_id=generate_uuid(),
+                    user_id=guest.user_id,
+                    event_id=event.id,
+                    start=check_in.start,
+                    state=state,
+                )
+            )
+            self._publish_attendance_on_commit(guest, event.id, check_in.start, state)
+            event_attendance_action_logs.add(
+                EventAttendanceActionLogEntity(
+                    entity_id=generate_uuid(),
+                    user_id=guest.user_id,
+                    event_id=event.id,
+                    start=check_in.start,
+                    action=check_in.action,
+                    acted_at=now,
+                )
+            )
+            results.append(CheckInResultDto(error_codes=[]))
+
+        if event_attendances:
+            await event_attendance_repository.bulk_upsert_event_attendances_async(event_attendances)
+            if action_log_write_behind is not None and action_log_write_behind.is_running:
+                self._put_action_logs_on_commit(list(event_attendance_action_logs))
+            elif (
+                await event_attendance_action_log_repository.bulk_create_event_attendance_action_logs_async(
+                    event_attendance_action_logs
+                )
+                is None
+            ):
+                raise ValueError("Failed to create attendance action logs")
+
+        return BulkAttendEventsResponse(results=results, error_codes=[])
+
     @rollbackable
     async def update_attendances_async(
         self,
@@ -410,16 +1167,20 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return UpdateAttendancesResponse(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         user_id = guest.user_id
 
-        event = await event_repository.read_by_id_or_none_async(event_id)
+        event = await event_repository.read_with_recurrence_by_id_or_none_async(event_id)
         if event is None:
             return UpdateAttendancesResponse(error_codes=[ErrorCode.EVENT_NOT_FOUND])
+        if not is_occurrence(event, start):
+            return UpdateAttendancesResponse(error_codes=[ErrorCode.EVENT_OCCURRENCE_NOT_FOUND])
 
+        if action_log_write_behind is not None and action_log_write_behind.is_running:
+            await action_log_write_behind.fence_async(user_id=user_id, event_id=event.id, start=start)
         await event_attendance_action_log_repository.delete_by_user_id_and_event_id_and_start_async(
             user_id=user_id, event_id=event.id, start=start
         )
@@ -448,6 +1209,7 @@ class EventUsecase(IUsecase):
                 start=start,
                 state=AttendanceState.PRESENT,
             )
+            self._publish_attendance_on_commit(guest, event.id, start, AttendanceState.PRESENT)
         elif latest_log.action == AttendanceAction.LEAVE:
             await event_attendance_repository.create_or_update_event_attendance_async(
                 entity_id=generate_uuid(),
@@ -456,9 +1218,75 @@ class EventUsecase(IUsecase):
                 start=start,
                 state=AttendanceState.EXCUSED_ABSENCE,
             )
+            self._publish_attendance_on_commit(guest, event.id, start, AttendanceState.EXCUSED_ABSENCE)
 
         return UpdateAttendancesResponse(error_codes=[])
 
+    @rollbackable
+    async def get_attendance_snapshot_async(
+        self, host_id: UUID, event_id_str: str, start: datetime
+    ) -> GetAttendanceSnapshotResponse:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+        event_attendance_repository = EventAttendanceRepository(self.uow)
+
+        event_id = str_to_uuid(event_id_str)
+
+        host = await user_account_repository.read_identity_by_id_async(host_id)
+        if host is None:
+            return GetAttendanceSnapshotResponse(guest_attendances=[], error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
+
+        event = await event_repository.read_with_recurrence_by_id_or_none_async(event_id)
+        if event is None:
+            return GetAttendanceSnapshotResponse(guest_attendances=[], error_codes=[ErrorCode.EVENT_NOT_FOUND])
+        if event.user_id != host.user_id:
+            return GetAttendanceSnapshotResponse(guest_attendances=[], error_codes=[ErrorCode.EVENT_ACCESS_DENIED])
+        if not is_occurrence(event, start):
+            return GetAttendanceSnapshotResponse(
+                guest_attendances=[], error_codes=[ErrorCode.EVENT_OCCURRENCE_NOT_FOUND]
+            )
+
+        event_attendances = await event_attendance_repository.read_by_event_id_and_start_async(
+            event_id=event.id, start=start
+        )
+        guests = {
+            guest.user_id: guest
+            for guest in await user_account_repository.read_identities_by_user_ids_async(
+                {event_attendance.user_id for event_attendance in event_attendances}
+            )
+        }
+
+        return GetAttendanceSnapshotResponse(
+            guest_attendances=[
+                GuestAttendanceDto(
+                    account_id=uuid_to_str(guests[event_attendance.user_id].account_id),
+                    username=guests[event_attendance.user_id].username,
+                    state=event_attendance.state,
+                )
+                for event_attendance in event_attendances
+                if event_attendance.user_id in guests
+            ],
+            error_codes=[],
+        )
+
+    def subscribe_attendance(
+        self, event_id_str: str, start: datetime
+    ) -> AbstractAsyncContextManager[AsyncIterator[str]]:
+        """Subscribe to committed attendance changes of an occurrence, as GuestAttendance JSON messages."""
+        return self._attendance_broker.subscribe(attendance_channel(str_to_uuid(event_id_str), start))
+
+    def _publish_attendance_on_commit(
+        self, guest: AccountIdentity, event_id: UUID, start: datetime, state: AttendanceState
+    ) -> None:
+        channel = attendance_channel(event_id, start)
+        message = GuestAttendanceDto(account_id=uuid_to_str(guest.account_id), username=guest.username, state=state)
+        self.uow.on_commit(lambda: self._attendance_broker.publish_async(channel, message.model_dump_json()))
+
+    def _put_action_logs_on_commit(self, event_attendance_action_logs: list[EventAttendanceActionLogEntity]) -> None:
+        assert action_log_write_behind is not None
+        write_behind = action_log_write_behind
+        self.uow.on_commit(lambda: write_behind.put_async(event_attendance_action_logs))
+
     @rollbackable
     async def get_attendance_history_async(
         self, guest_id: UUID, event_id_str: str, start: datetime
@@ -469,7 +1297,7 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return GetAttendanceHistoryResponse(
                 attendances_with_username=AttendancesWithUsernameDto(username="", attendances=[]),
@@ -496,12 +1324,23 @@ class EventUsecase(IUsecase):
             error_codes=[],
         )
 
+    async def get_my_events_etag_async(self, account_id: UUID) -> str | None:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
+        if user_account is None:
+            return None
+
+        latest_updated_at, count = await event_repository.read_version_by_user_ids_async({user_account.user_id})
+
+        return build_etag("mine", user_account.user_id, latest_updated_at, count)
+
     @rollbackable
     async def get_my_events_async(self, account_id: UUID) -> GetMyEventsResponse:
         user_account_repository = UserAccountRepository(self.uow)
-        event_repository = EventRepository(self.uow)
 
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if user_account is None:
             return GetMyEventsResponse(
                 events=[],
@@ -510,31 +1349,134 @@ class EventUsecase(IUsecase):
 
         user_id = user_account.user_id
 
-        events = await event_repository.read_with_recurrence_by_user_ids_async({user_id})
+        events = await self._read_serialized_events_by_user_ids_async({user_id})
+
+        return GetMyEventsResponse(events=events, error_codes=[])
+
+    async def get_following_events_etag_async(self, follower_id: UUID) -> str | None:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+
+        follower = await user_account_repository.read_identity_by_id_async(follower_id)
+        if follower is None:
+            return None
 
-        return GetMyEventsResponse(events=serialize_events(events), error_codes=[])
+        user_ids = {follower.user_id} | await self._follow_graph.followees_of_async(self.uow, follower.user_id)
+        latest_updated_at, count = await event_repository.read_version_by_user_ids_async(user_ids)
+
+        return build_etag("following", sorted(user_ids), latest_updated_at, count)
 
     @rollbackable
     async def get_following_events_async(self, follower_id: UUID) -> GetFollowingEventsResponse:
         user_account_repository = UserAccountRepository(self.uow)
-        event_repository = EventRepository(self.uow)
 
-        follower = await user_account_repository.read_with_followees_by_id_or_none_async(follower_id)
+        follower = await user_account_repository.read_identity_by_id_async(follower_id)
         if follower is None:
             return GetFollowingEventsResponse(
                 events=[],
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
             )
 
-        user_ids = {followee.user_id for followee in follower.followees} | {follower.user_id}
+        user_ids = {follower.user_id} | await self._follow_graph.followees_of_async(self.uow, follower.user_id)
 
-        events = await event_repository.read_with_recurrence_by_user_ids_async(user_ids)
+        events = await self._read_serialized_events_by_user_ids_async(user_ids)
 
         return GetFollowingEventsResponse(
-            events=serialize_events(events),
+            events=events,
             error_codes=[],
         )
 
+    async def _read_visible_host_or_none_async(self, requester_id: UUID, host_id_str: str) -> AccountIdentity | None:
+        """Return the host when the requester is the host or one of their followers."""
+        user_account_repository = UserAccountRepository(self.uow)
+
+        requester = await user_account_repository.read_identity_by_id_async(requester_id)
+        host = await user_account_repository.read_identity_by_id_async(str_to_uuid(host_id_str))
+        if requester is None or host is None:
+            return None
+
+        is_host = requester.user_id == host.user_id
+        if not is_host and not await self._follow_graph.is_follower_async(self.uow, requester.user_id, host.user_id):
+            return None
+
+        return host
+
+    async def _read_feed_subscriber_id_or_none_async(self, feed_token: str) -> UUID | None:
+        feed_token_repository = FeedTokenRepository(self.uow)
+
+        token = await feed_token_repository.read_by_token_hash_or_none_async(hash_feed_token(feed_token))
+        return token.account_id if token is not None else None
+
+    @rollbackable
+    async def regenerate_feed_token_async(self, account_id: UUID) -> RegenerateFeedTokenResponse:
+        """Issue a feed token for the account's .ics feed URLs, revoking the previous one.
+
+        Only the hash of the token is stored, so it can only be read from this response.
+        """
+        feed_token_repository = FeedTokenRepository(self.uow)
+
+        feed_token = secrets.token_urlsafe(32)
+        if (
+            await feed_token_repository.replace_feed_token_async(
+                entity_id=generate_uuid(), account_id=account_id, token_hash=hash_feed_token(feed_token)
+            )
+            is None
+        ):
+            return RegenerateFeedTokenResponse(feed_token=None, error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
+
+        return RegenerateFeedTokenResponse(feed_token=feed_token, error_codes=[])
+
+    @rollbackable
+    async def revoke_feed_token_async(self, account_id: UUID) -> RevokeFeedTokenResponse:
+        feed_token_repository = FeedTokenRepository(self.uow)
+
+        await feed_token_repository.delete_by_account_id_async(account_id)
+
+        return RevokeFeedTokenResponse(error_codes=[])
+
+    async def get_ics_feed_validators_async(
+        self, feed_token: str, host_id_str: str
+    ) -> tuple[str, datetime | None] | None:
+        """Return the ETag and the last modification time of the host's .ics feed, or None if the feed token is
+        invalid or its account cannot see the host."""
+        event_repository = EventRepository(self.uow)
+
+        subscriber_id = await self._read_feed_subscriber_id_or_none_async(feed_token)
+        if subscriber_id is None:
+            return None
+        host = await self._read_visible_host_or_none_async(subscriber_id, host_id_str)
+        if host is None:
+            return None
+
+        latest_updated_at, count = await event_repository.read_version_by_user_ids_async({host.user_id})
+
+        return build_etag("feed", host.user_id, latest_updated_at, count), latest_updated_at
+
+    async def get_ics_feed_async(self, feed_token: str, host_id_str: str) -> AsyncIterator[str] | None:
+        """Load the host's events and return a stream of the .ics feed, or None if the feed token is invalid or its
+        account cannot see the host.
+
+        Events are read up front and the stream only serializes them, so it can be consumed after the session is
+        closed.
+        """
+        event_repository = EventRepository(self.uow)
+
+        subscriber_id = await self._read_feed_subscriber_id_or_none_async(feed_token)
+        if subscriber_id is None:
+            return None
+        host = await self._read_visible_host_or_none_async(subscriber_id, host_id_str)
+        if host is None:
+            return None
+
+        version = await event_repository.read_version_by_user_ids_async({host.user_id})
+        cached = _ics_feed_cache.get(host.user_id)
+        if cached is not None and cached[0] == version:
+            return stream_ics_feed(host.username, cached[1])
+
+        events = await event_repository.read_with_recurrence_by_user_ids_async({host.user_id})
+
+        return stream_ics_feed(host.username, serialize_vevents(host.user_id, version, events))
+
     @rollbackable
     async def get_guest_attendance_status_async(
         self, guest_id: UUID, event_id_str: str, start: datetime
@@ -545,7 +1487,7 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return GetGuestAttendanceStatusResponse(
                 attend=False,
@@ -575,104 +1517,262 @@ class EventUsecase(IUsecase):
         )
 
     @rollbackable
-    async def forecast_attendance_time_async(
-        self,
-    ) -> ForecastAttendanceTimeResponse:
+    async def get_guest_attendance_statuses_async(
+        self, guest_id: UUID, start_from: datetime, start_to: datetime
+    ) -> GetGuestAttendanceStatusesResponse:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_attendance_repository = EventAttendanceRepository(self.uow)
+
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
+        if guest is None:
+            return GetGuestAttendanceStatusesResponse(statuses=[], error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
+
+        event_attendances = await event_attendance_repository.read_by_user_id_and_start_range_async(
+            user_id=guest.user_id, start_from=start_from, start_to=start_to
+        )
+
+        return GetGuestAttendanceStatusesResponse(
+            statuses=[
+                GuestAttendanceStatusDto(
+                    event_id=uuid_to_str(event_attendance.event_id),
+                    start=event_attendance.start,
+                    attend=event_attendance.state == AttendanceState.PRESENT,
+                )
+                for event_attendance in sorted(event_attendances, key=lambda a: a.start)
+            ],
+            error_codes=[],
+        )
+
+    async def read_forecast_attendance_time_request_async(self) -> ForecastAttendanceTimeRequest:
         event_attendance_action_log_repository = EventAttendanceActionLogRepository(self.uow)
         event_repository = EventRepository(self.uow)
         user_account_repository = UserAccountRepository(self.uow)
-        event_attendance_forecast_repository = EventAttendanceForecastRepository(self.uow)
 
         earliest_attend_data = await event_attendance_action_log_repository.read_all_earliest_attend_async()
         latest_leave_data = await event_attendance_action_log_repository.read_all_latest_leave_async()
         event_data = await event_repository.read_all_with_recurrence_async(where=[])
         user_data = await user_account_repository.read_all_async(where=[])
 
-        try:
-            earliest_attend_dtos = [
-                EventAttendanceActionLogMLDto(
-                    id=uuid_to_str(log.id),
-                    user_id=log.user_id,
-                    event_id=uuid_to_str(log.event_id),
-                    start=log.start,
-                    action=log.action,
-                    acted_at=log.acted_at,
-                )
-                for log in earliest_attend_data
-            ]
-            latest_leave_dtos = [
-                EventAttendanceActionLogMLDto(
-                    id=uuid_to_str(log.id),
-                    user_id=log.user_id,
-                    event_id=uuid_to_str(log.event_id),
-                    start=log.start,
-                    action=log.action,
-                    acted_at=log.acted_at,
-                )
-                for log in latest_leave_data
-            ]
-            event_dtos = [
-                EventMLDto(
-                    id=uuid_to_str(event.id),
-                    user_id=event.user_id,
-                    dtstart=event.dtstart,
-                    dtend=event.dtend,
-                    timezone=event.timezone,
-                    recurrence=RecurrenceMLDto(
-                        id=uuid_to_str(event.recurrence.id),
-                        rrule=RecurrenceRuleMLDto(
-                            id=uuid_to_str(event.recurrence.rrule.id),
-                            freq=event.recurrence.rrule.freq,
-                        ),
-                    )
-                    if event.recurrence
-                    else None,
-                )
-                for event in event_data
-            ]
-            user_dtos = [
-                UserAccountMLDto(
-                    id=uuid_to_str(user.id),
-                    user_id=user.user_id,
-                    birth_date=user.birth_date,
-                    gender=user.gender,
+        return build_forecast_attendance_time_request(
+            earliest_attend_data, latest_leave_data, event_data, user_data, is_delta=False, context_len=None
+        )
+
+    async def read_forecast_export_watermarks_async(self) -> dict[str, datetime]:
+        """Return max(updated_at) per shard over action logs and events, and over user accounts on the common DB."""
+        event_attendance_action_log_repository = EventAttendanceActionLogRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+        user_account_repository = UserAccountRepository(self.uow)
+
+        watermarks: dict[str, datetime] = {}
+        for max_updated_at_by_shard in (
+            await event_attendance_action_log_repository.read_max_updated_at_by_shard_async(),
+            await event_repository.read_max_updated_at_by_shard_async(),
+        ):
+            for shard_id, max_updated_at in max_updated_at_by_shard.items():
+                if max_updated_at is not None:
+                    watermarks[shard_id] = max(watermarks.get(shard_id, max_updated_at), max_updated_at)
+        common_max_updated_at = await user_account_repository.read_max_updated_at_async()
+        if common_max_updated_at is not None:
+            watermarks[COMMON_DB_CONNECTION_KEY] = common_max_updated_at
+        return watermarks
+
+    async def read_forecast_attendance_time_delta_request_async(
+        self, watermarks: dict[str, datetime], context_len: int
+    ) -> ForecastAttendanceTimeRequest:
+        """Build a delta request with the series changed since the watermarks of the previous export.
+
+        Rows are compared against the watermarks minus FORECAST_EXPORT_OVERLAP_SECONDS, because a transaction can
+        commit after a later one; the ML server merges by id, so rows sent twice are harmless.
+        """
+        event_attendance_action_log_repository = EventAttendanceActionLogRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+        user_account_repository = UserAccountRepository(self.uow)
+
+        overlap = timedelta(seconds=FORECAST_EXPORT_OVERLAP_SECONDS)
+        changed_since = {
+            connection_key: watermarks[connection_key] - overlap if connection_key in watermarks else None
+            for connection_key in (*SHARD_DB_CONNECTION_KEYS, COMMON_DB_CONNECTION_KEY)
+        }
+
+        earliest_attend_data: set[EventAttendanceActionLogEntity] = set()
+        latest_leave_data: set[EventAttendanceActionLogEntity] = set()
+        for shard_id in SHARD_DB_CONNECTION_KEYS:
+            earliest_attend_data |= (
+                await event_attendance_action_log_repository.read_recent_edges_of_changed_series_async(
+                    shard_id, changed_since[shard_id], AttendanceAction.ATTEND, context_len
                 )
-                for user in user_data
-            ]
-            request = ForecastAttendanceTimeRequest(
-                earliest_attend_data=earliest_attend_dtos,
-                latest_leave_data=latest_leave_dtos,
-                event_data=event_dtos,
-                user_data=user_dtos,
-            )
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{ML_SERVER_URL}/forecast/attendance",
-                    json=request.model_dump(),
-                    timeout=600,  # Set reasonable timeout
+            )
+            latest_leave_data |= await event_attendance_action_log_repository.read_recent_edges_of_changed_series_async(
+                shard_id, changed_since[shard_id], AttendanceAction.LEAVE, context_len
+            )
+        logs = earliest_attend_data | latest_leave_data
+
+        # Events live on their hosts' shards, so one cutoff has to cover every shard
+        shard_changed_since = [changed_since[shard_id] for shard_id in SHARD_DB_CONNECTION_KEYS]
+        event_data = await event_repository.read_with_recurrence_by_ids_or_updated_since_async(
+            {log.event_id for log in logs},
+            None if None in shard_changed_since else min(filter(None, shard_changed_since)),
+        )
+        user_data = await user_account_repository.read_by_user_ids_or_updated_since_async(
+            {log.user_id for log in logs} | {event.user_id for event in event_data},
+            changed_since[COMMON_DB_CONNECTION_KEY],
+        )
+
+        return build_forecast_attendance_time_request(
+            earliest_attend_data, latest_leave_data, event_data, user_data, is_delta=True, context_len=context_len
+        )
+
+    async def materialize_attendance_features_async(self, directory: Path) -> AttendanceFeatures:
+        """Update the feature store with the series that got a log since its watermarks and return the new features.
+
+        Changed series are read with their whole history and replace the stored ones, so logs deleted with an
+        occurrence's attendances are dropped as well. The store is written as a new version, which readers pick up
+        the next time they load it.
+        """
+        event_attendance_action_log_repository = EventAttendanceActionLogRepository(self.uow)
+        event_repository = EventRepository(self.uow)
+
+        features = await asyncio.to_thread(load_attendance_features, directory) or AttendanceFeatures.empty()
+        # Read the watermarks first, so logs written while the store is updated are read again next time
+        watermarks = {
+            shard_id: max_updated_at
+            for shard_id, max_updated_at in (
+                await event_attendance_action_log_repository.read_max_updated_at_by_shard_async()
+            ).items()
+            if max_updated_at is not None
+        }
+        if not watermarks:
+            return features
+
+        overlap = timedelta(seconds=FORECAST_EXPORT_OVERLAP_SECONDS)
+        earliest_attend_data: set[EventAttendanceActionLogEntity] = set()
+        latest_leave_data: set[EventAttendanceActionLogEntity] = set()
+        for shard_id in SHARD_DB_CONNECTION_KEYS:
+            changed_since = features.watermarks[shard_id] - overlap if shard_id in features.watermarks else None
+            earliest_attend_data |= (
+                await event_attendance_action_log_repository.read_recent_edges_of_changed_series_async(
+                    shard_id, changed_since, AttendanceAction.ATTEND, None
                 )
-                response.raise_for_status()  # Raise exception for 4xx/5xx status codes
-                forecast_result = ForecastAttendanceTimeResponse.model_validate(response.json())
-        except (httpx.TimeoutException, httpx.NetworkError):
-            # Handle network timeouts and connection errors
-            return ForecastAttendanceTimeResponse(
-                attendance_time_forecasts={},
-                error_codes=[ErrorCode.ML_SERVER_TIMEOUT],
-            )
-        except httpx.HTTPStatusError:
-            # Handle HTTP errors (4xx, 5xx responses)
-            return ForecastAttendanceTimeResponse(
-                attendance_time_forecasts={},
-                error_codes=[ErrorCode.ML_SERVER_ERROR],
             )
-        except ValueError:
-            # Handle validation errors from model_validate
-            return ForecastAttendanceTimeResponse(
-                attendance_time_forecasts={},
-                error_codes=[ErrorCode.ML_SERVER_ERROR],
+            latest_leave_data |= await event_attendance_action_log_repository.read_recent_edges_of_changed_series_async(
+                shard_id, changed_since, AttendanceAction.LEAVE, None
             )
+        event_data = await event_repository.read_with_recurrence_by_ids_async(
+            {log.event_id for log in earliest_attend_data | latest_leave_data}
+        )
 
-        forecasts = {
+        def update() -> AttendanceFeatures:
+            changed = build_attendance_features(
+                earliest_attend_data, latest_leave_data, event_data, updated_at=max(watermarks.values())
+            )
+            merged = features.merge(changed, watermarks)
+            save_attendance_features(directory, merged)
+            return merged
+
+        return await asyncio.to_thread(update)
+
+    async def read_forecast_attendance_time_request_from_features_async(
+        self, features: AttendanceFeatures, watermarks: dict[str, datetime] | None, context_len: int | None
+    ) -> ForecastAttendanceTimeRequest:
+        """Build a request from the feature store instead of the action logs.
+
+        Without watermarks every series is sent. With them it is a delta request like
+        read_forecast_attendance_time_delta_request_async, with the series updated since the watermarks cut to their
+        last context_len occurrences. Each occurrence is sent as an attend log and, when it has one, a leave log,
+        with ids derived from the occurrence so they stay the same across requests.
+        """
+        event_repository = EventRepository(self.uow)
+        user_account_repository = UserAccountRepository(self.uow)
+
+        if watermarks is None:
+            series = np.ones(len(features), dtype=bool)
+            event_data = await event_repository.read_all_with_recurrence_async(where=[])
+            user_data = await user_account_repository.read_all_async(where=[])
+        else:
+            overlap = timedelta(seconds=FORECAST_EXPORT_OVERLAP_SECONDS)
+            changed_since = {
+                connection_key: watermarks[connection_key] - overlap if connection_key in watermarks else None
+                for connection_key in (*SHARD_DB_CONNECTION_KEYS, COMMON_DB_CONNECTION_KEY)
+            }
+            # Series of shards without a watermark are all sent
+            changed_since_seconds = dict.fromkeys(SHARD_DB_CONNECTION_KEYS, int(np.iinfo(np.int64).min))
+            for shard_id in SHARD_DB_CONNECTION_KEYS:
+                shard_changed_since = changed_since[shard_id]
+                if shard_changed_since is not None:
+                    changed_since_seconds[shard_id] = int(epoch_seconds([shard_changed_since])[0])
+            changed_since_by_series = np.fromiter(
+                (changed_since_seconds[resolve_shard_connection_key(user_id)] for user_id in features.user_id.tolist()),
+                np.int64,
+                len(features),
+            )
+            series = features.updated_at >= changed_since_by_series
+            # Events live on their hosts' shards, so one cutoff has to cover every shard
+            shards_changed_since = [changed_since[shard_id] for shard_id in SHARD_DB_CONNECTION_KEYS]
+            event_data = await event_repository.read_with_recurrence_by_ids_or_updated_since_async(
+                {str_to_uuid(event_id) for event_id in features.event_id[series].tolist()},
+                None if None in shards_changed_since else min(filter(None, shards_changed_since)),
+            )
+            user_data = await user_account_repository.read_by_user_ids_or_updated_since_async(
+                set(features.user_id[series].tolist()) | {event.user_id for event in event_data},
+                changed_since[COMMON_DB_CONNECTION_KEY],
+            )
+
+        occurrences = features.occurrence_indices(series, context_len)
+        earliest_attend_data: list[EventAttendanceActionLogMLDto] = []
+        latest_leave_data: list[EventAttendanceActionLogMLDto] = []
+        for series_index, start_seconds, attended_at, left_at in zip(
+            (np.searchsorted(features.offsets, occurrences, side="right") - 1).tolist(),
+            features.start[occurrences].tolist(),
+            features.attended_at[occurrences].tolist(),
+            features.left_at[occurrences].tolist(),
+        ):
+            user_id = int(features.user_id[series_index])
+            event_id = str(features.event_id[series_index])
+            start = datetime.fromtimestamp(start_seconds, ZoneInfo("UTC"))
+            for action, minutes, logs in (
+                (AttendanceAction.ATTEND, attended_at, earliest_attend_data),
+                (AttendanceAction.LEAVE, left_at, latest_leave_data),
+            ):
+                if math.isnan(minutes):  # The occurrence has no leave
+                    continue
+                logs.append(
+                    EventAttendanceActionLogMLDto(
+                        id=f"{event_id}:{user_id}:{start_seconds}:{action.value}",
+                        user_id=user_id,
+                        event_id=event_id,
+                        start=start,
+                        action=action,
+                        acted_at=start + timedelta(minutes=minutes),
+                    )
+                )
+
+        return ForecastAttendanceTimeRequest(
+            is_delta=watermarks is not None,
+            context_len=context_len,
+            earliest_attend_data=earliest_attend_data,
+            latest_leave_data=latest_leave_data,
+            event_data=build_event_ml_dtos(event_data),
+            user_data=build_user_ml_dtos(user_data),
+        )
+
+    async def store_attendance_time_forecasts_async(
+        self, forecast_result: ForecastAttendanceTimeResponse, is_delta: bool
+    ) -> int:
+        """Publish the forecasts as a new generation and return how many it holds.
+
+        After a delta request the generation also carries over the active generation's forecasts of every series that
+        is not in forecast_result, copied on each shard without reading them back. This commits three times: the
+        staged generation, its forecasts on the shards, and the flip that makes it active, so readers never see a
+        partially written generation. The previous generation is left for collect_forecast_generation_garbage_async.
+        """
+        event_attendance_forecast_repository = EventAttendanceForecastRepository(self.uow)
+        forecast_generation_repository = ForecastGenerationRepository(self.uow)
+
+        generation_id = generate_uuid()
+        await forecast_generation_repository.create_forecast_generation_async(generation_id)
+        await self.uow.commit_async()
+
+        forecasts = [
             EventAttendanceForecastEntity(
                 entity_id=generate_uuid(),
                 user_id=user_id,
@@ -680,39 +1780,223 @@ class EventUsecase(IUsecase):
                 start=forecast.start,
                 forecasted_attended_at=forecast.attended_at,
                 forecasted_duration=forecast.duration,
+                generation_id=generation_id,
             )
             for user_id, events in forecast_result.attendance_time_forecasts.items()
             for event_id, forecasts in events.items()
             for forecast in forecasts
-        }
-        await event_attendance_forecast_repository.bulk_delete_insert_event_attendance_forecasts_async(forecasts)
+        ]
+        await event_attendance_forecast_repository.bulk_insert_async(forecasts, batch_rows=FORECAST_INSERT_BATCH_ROWS)
+        forecast_count = len(forecasts)
+        active_generation = await forecast_generation_repository.read_active_or_none_async() if is_delta else None
+        if active_generation is not None:
+            series_by_shard: defaultdict[str, set[tuple[int, UUID]]] = defaultdict(set)
+            for user_id, events in forecast_result.attendance_time_forecasts.items():
+                for event_id in events:
+                    series_by_shard[resolve_shard_connection_key(user_id)].add((user_id, str_to_uuid(event_id)))
+            for shard_id in SHARD_DB_CONNECTION_KEYS:
+                forecast_count += await event_attendance_forecast_repository.copy_generation_async(
+                    shard_id, active_generation.id, generation_id, series_by_shard[shard_id]
+                )
+        await self.uow.commit_async()
+
+        if not await forecast_generation_repository.activate_async(
+            generation_id, forecast_count=forecast_count, activated_at=datetime.now(ZoneInfo("UTC"))
+        ):
+            raise RuntimeError(f"Forecast generation {generation_id} was collected before it could be activated")
+        await self.uow.commit_async()
+        return forecast_count
+
+    async def collect_forecast_generation_garbage_async(self, staged_before: datetime) -> int:
+        """Delete the forecasts of retired and abandoned generations in batches, committing after each batch so that
+        no transaction builds a large undo log, and then the generations themselves. Return how many were deleted."""
+        event_attendance_forecast_repository = EventAttendanceForecastRepository(self.uow)
+        forecast_generation_repository = ForecastGenerationRepository(self.uow)
+
+        forecast_generations = await forecast_generation_repository.read_collectable_async(staged_before)
+        await self.uow.commit_async()
+        for forecast_generation in forecast_generations:
+            for shard_id in SHARD_DB_CONNECTION_KEYS:
+                while (
+                    await event_attendance_forecast_repository.delete_generation_batch_async(
+                        shard_id, forecast_generation.id, FORECAST_GC_BATCH_ROWS
+                    )
+                    == FORECAST_GC_BATCH_ROWS
+                ):
+                    await self.uow.commit_async()
+                await self.uow.commit_async()
+            await forecast_generation_repository.delete_by_id_async(forecast_generation.id)
+            await self.uow.commit_async()
+        return len(forecast_generations)
+
+    @rollbackable
+    async def enqueue_forecast_job_async(self) -> EnqueueForecastJobResponse:
+        forecast_job_repository = ForecastJobRepository(self.uow)
 
-        return forecast_result
+        # At most one job is queued or running; a second enqueue gets that job back instead of a new one
+        for _ in range(2):
+            now = datetime.now(ZoneInfo("UTC"))
+            forecast_job = await forecast_job_repository.create_forecast_job_async(
+                entity_id=generate_uuid(),
+                enqueued_at=now,
+            )
+            if forecast_job is None:
+                forecast_job = await forecast_job_repository.read_active_or_none_async()
+                if forecast_job is not None and await self._expire_stale_forecast_job_async(forecast_job, now):
+                    continue
+            if forecast_job is not None:
+                return EnqueueForecastJobResponse(
+                    job=serialize_forecast_job(forecast_job),
+                    error_codes=[],
+                )
+        # The active job kept finishing between the insert and the read
+        return EnqueueForecastJobResponse(
+            job=None,
+            error_codes=[ErrorCode.FORECAST_JOB_NOT_FOUND],
+        )
+
+    async def _expire_stale_forecast_job_async(self, forecast_job: ForecastJobEntity, now: datetime) -> bool:
+        """Fail the job when it has been queued for FORECAST_JOB_QUEUE_TTL_MS, e.g. because no worker runs, or has
+        been running without a heartbeat for FORECAST_JOB_LEASE_MS, so it no longer holds the single active slot."""
+        forecast_job_repository = ForecastJobRepository(self.uow)
+
+        if forecast_job.status == ForecastJobStatus.QUEUED:
+            return await forecast_job_repository.finish_async(
+                forecast_job.id,
+                from_status=ForecastJobStatus.QUEUED,
+                status=ForecastJobStatus.FAILED,
+                finished_at=now,
+                error_code=ErrorCode.FORECAST_JOB_EXPIRED,
+                enqueued_before=now - timedelta(milliseconds=FORECAST_JOB_QUEUE_TTL_MS),
+            )
+        return await forecast_job_repository.finish_async(
+            forecast_job.id,
+            from_status=ForecastJobStatus.RUNNING,
+            status=ForecastJobStatus.FAILED,
+            finished_at=now,
+            error_code=ErrorCode.FORECAST_JOB_ABANDONED,
+            heartbeat_before=now - timedelta(milliseconds=FORECAST_JOB_LEASE_MS),
+        )
+
+    async def get_forecast_job_async(self, job_id_str: str) -> GetForecastJobResponse:
+        forecast_job_repository = ForecastJobRepository(self.uow)
+
+        forecast_job = await forecast_job_repository.read_by_id_or_none_async(str_to_uuid(job_id_str))
+        if forecast_job is None:
+            return GetForecastJobResponse(
+                job=None,
+                error_codes=[ErrorCode.FORECAST_JOB_NOT_FOUND],
+            )
+
+        return GetForecastJobResponse(
+            job=serialize_forecast_job(forecast_job),
+            error_codes=[],
+        )
 
     @rollbackable
-    async def get_attendance_time_forecasts_async(self, account_id: UUID) -> GetAttendanceTimeForecastsResponse:
+    async def cancel_forecast_job_async(self, job_id_str: str) -> CancelForecastJobResponse:
+        forecast_job_repository = ForecastJobRepository(self.uow)
+
+        job_id = str_to_uuid(job_id_str)
+        forecast_job = await forecast_job_repository.read_by_id_or_none_async(job_id)
+        if forecast_job is None:
+            return CancelForecastJobResponse(
+                job=None,
+                error_codes=[ErrorCode.FORECAST_JOB_NOT_FOUND],
+            )
+
+        # A queued job is cancelled right away; a running one is stopped by the worker at its next heartbeat
+        if forecast_job.status == ForecastJobStatus.QUEUED and await forecast_job_repository.finish_async(
+            job_id,
+            from_status=ForecastJobStatus.QUEUED,
+            status=ForecastJobStatus.CANCELLED,
+            finished_at=datetime.now(ZoneInfo("UTC")),
+        ):
+            forecast_job = await forecast_job_repository.read_by_id_async(job_id)
+        elif await forecast_job_repository.request_cancel_async(job_id):
+            forecast_job = await forecast_job_repository.read_by_id_async(job_id)
+        else:
+            return CancelForecastJobResponse(
+                job=serialize_forecast_job(forecast_job),
+                error_codes=[ErrorCode.FORECAST_JOB_ALREADY_FINISHED],
+            )
+
+        return CancelForecastJobResponse(
+            job=serialize_forecast_job(forecast_job),
+            error_codes=[],
+        )
+
+    async def get_attendance_time_forecasts_etag_async(self, account_id: UUID) -> str | None:
         user_account_repository = UserAccountRepository(self.uow)
         event_repository = EventRepository(self.uow)
-        event_attendance_forecast_repository = EventAttendanceForecastRepository(self.uow)
+        forecast_generation_repository = ForecastGenerationRepository(self.uow)
 
-        user_account = await user_account_repository.read_with_followees_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
+        if user_account is None:
+            return None
+
+        user_ids = {user_account.user_id} | await self._follow_graph.followees_of_async(self.uow, user_account.user_id)
+        event_version = await event_repository.read_version_by_user_ids_async(user_ids)
+        # Every run publishes a new generation, so the active generation versions all forecasts
+        forecast_generation = await forecast_generation_repository.read_active_or_none_async()
+
+        return build_etag(
+            "forecasts",
+            sorted(user_ids),
+            *event_version,
+            uuid_to_str(forecast_generation.id) if forecast_generation is not None else None,
+        )
+
+    @rollbackable
+    async def get_attendance_time_forecasts_async(self, account_id: UUID) -> GetAttendanceTimeForecastsResponse:
+        user_account_repository = UserAccountRepository(self.uow)
+
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if user_account is None:
             return GetAttendanceTimeForecastsResponse(
                 attendance_time_forecasts_with_username={},
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
             )
 
-        user_ids = {followee.user_id for followee in user_account.followees} | {user_account.user_id}
-        events = await event_repository.read_with_recurrence_by_user_ids_async(user_ids)
+        user_ids = {user_account.user_id} | await self._follow_graph.followees_of_async(self.uow, user_account.user_id)
+
+        attendance_time_forecasts_with_username: dict[str, dict[int, AttendanceTimeForecastsWithUsernameDto]] = {}
+        for host_forecasts in (await self._read_attendance_time_forecasts_by_hosts_async(frozenset(user_ids))).values():
+            attendance_time_forecasts_with_username |= host_forecasts
+
+        return GetAttendanceTimeForecastsResponse(
+            attendance_time_forecasts_with_username=attendance_time_forecasts_with_username,
+            error_codes=[],
+        )
+
+    # Coalesced per host, so guests following the same hosts share their reads; the hosts that no concurrent request
+    # is reading are read in one batch
+    @coalesced_by_key(ttl=0.5)
+    async def _read_attendance_time_forecasts_by_hosts_async(
+        self, host_user_ids: frozenset[int]
+    ) -> dict[int, dict[str, dict[int, AttendanceTimeForecastsWithUsernameDto]]]:
+        event_repository = EventRepository(self.uow)
+        event_attendance_forecast_repository = EventAttendanceForecastRepository(self.uow)
+        forecast_generation_repository = ForecastGenerationRepository(self.uow)
+
+        host_forecasts: dict[int, dict[str, dict[int, AttendanceTimeForecastsWithUsernameDto]]] = {
+            host_user_id: {} for host_user_id in host_user_ids
+        }
+        events = await event_repository.read_with_recurrence_by_user_ids_async(set(host_user_ids))
+        if not events:
+            return host_forecasts
+        forecast_generation = await forecast_generation_repository.read_active_or_none_async()
+        if forecast_generation is None:
+            return host_forecasts
         forecasts = await event_attendance_forecast_repository.read_all_by_event_ids_async(
-            {event.id for event in events}
+            {event.id for event in events}, forecast_generation.id
         )
 
-        attendance_time_forecasts: defaultdict[str, defaultdict[int, list[AttendanceTimeForecastDto]]] = defaultdict(
+        attendance_time_forecasts: defaultdict[UUID, defaultdict[int, list[AttendanceTimeForecastDto]]] = defaultdict(
             lambda: defaultdict(list)
         )
         for forecast in forecasts:
-            attendance_time_forecasts[uuid_to_str(forecast.event_id)][forecast.user_id].append(
+            attendance_time_forecasts[forecast.event_id][forecast.user_id].append(
                 AttendanceTimeForecastDto(
                     start=forecast.start,
                     attended_at=forecast.forecasted_attended_at,
@@ -720,27 +2004,36 @@ class EventUsecase(IUsecase):
                 )
             )
 
-        username_dict = {
-            ua.user_id: ua.username
-            for ua in await user_account_repository.read_all_async(
-                where=[],
-            )  # TODO: read_all_async for user_account table is probably bad
-        }
-        attendance_time_forecasts_with_username = {
-            event_id: {
+        username_dict = await self._read_usernames_async({forecast.user_id for forecast in forecasts})
+        for event in events:
+            if event.id not in attendance_time_forecasts:
+                continue
+            host_forecasts[event.user_id][uuid_to_str(event.id)] = {
                 user_id: AttendanceTimeForecastsWithUsernameDto(
                     username=username_dict[user_id],
                     attendance_time_forecasts=forecasts,
                 )
-                for user_id, forecasts in user_forecasts.items()
+                for user_id, forecasts in attendance_time_forecasts[event.id].items()
             }
-            for event_id, user_forecasts in attendance_time_forecasts.items()
-        }
+        return host_forecasts
 
-        return GetAttendanceTimeForecastsResponse(
-            attendance_time_forecasts_with_username=attendance_time_forecasts_with_username,
-            error_codes=[],
-        )
+    async def _read_usernames_async(self, user_ids: set[int]) -> dict[int, str]:
+        user_account_repository = UserAccountRepository(self.uow)
+
+        usernames: dict[int, str] = {}
+        missing_user_ids: set[int] = set()
+        for user_id in user_ids:
+            username = _username_cache.get(user_id)
+            if username is None:
+                missing_user_ids.add(user_id)
+            else:
+                usernames[user_id] = username
+        if missing_user_ids:
+            read_usernames = await user_account_repository.read_usernames_by_user_ids_async(missing_user_ids)
+            for user_id, username in read_usernames.items():
+                _username_cache.set(user_id, username)
+            usernames |= read_usernames
+        return usernames
 
     @rollbackable
     async def create_or_update_goal_async(
@@ -756,7 +2049,7 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return CreateOrUpdateGoalResponse(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
@@ -796,17 +2089,17 @@ class EventUsecase(IUsecase):
         if event is None:
             return GetGuestGoalResponse(goal_text="", error_codes=[ErrorCode.EVENT_NOT_FOUND])
 
-        requester = await user_account_repository.read_with_followees_by_id_or_none_async(requester_id)
+        requester = await user_account_repository.read_identity_by_id_async(requester_id)
         if requester is None:
             return GetGuestGoalResponse(goal_text="", error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         is_host = event.user_id == requester.user_id
-        is_follower = any(followee.user_id == event.user_id for followee in requester.followees)
+        is_follower = await self._follow_graph.is_follower_async(self.uow, requester.user_id, event.user_id)
 
         if not is_host and not is_follower:
             return GetGuestGoalResponse(goal_text="", error_codes=[ErrorCode.EVENT_ACCESS_DENIED])
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return GetGuestGoalResponse(goal_text="", error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
@@ -830,7 +2123,6 @@ class EventUsecase(IUsecase):
     ) -> GetEventGoalsResponse:
         event_repository = EventRepository(self.uow)
         user_account_repository = UserAccountRepository(self.uow)
-        event_goal_repository = EventGoalRepository(self.uow)
 
         event_id = str_to_uuid(event_id_str)
 
@@ -838,23 +2130,32 @@ class EventUsecase(IUsecase):
         if event is None:
             return GetEventGoalsResponse(goals=[], error_codes=[ErrorCode.EVENT_NOT_FOUND])
 
-        requester = await user_account_repository.read_with_followees_by_id_or_none_async(requester_id)
+        requester = await user_account_repository.read_identity_by_id_async(requester_id)
         if requester is None:
             return GetEventGoalsResponse(goals=[], error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         is_host = event.user_id == requester.user_id
-        is_follower = any(followee.user_id == event.user_id for followee in requester.followees)
+        is_follower = await self._follow_graph.is_follower_async(self.uow, requester.user_id, event.user_id)
 
         if not is_host and not is_follower:
             return GetEventGoalsResponse(goals=[], error_codes=[ErrorCode.EVENT_ACCESS_DENIED])
 
+        goals = await self._read_event_goals_async(event_id=event.id, start=start)
+
+        return GetEventGoalsResponse(goals=goals, error_codes=[])
+
+    @coalesced(ttl=0.5)
+    async def _read_event_goals_async(self, event_id: UUID, start: datetime) -> list[GoalInfoDto]:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_goal_repository = EventGoalRepository(self.uow)
+
         goal_entities = await event_goal_repository.read_by_event_id_and_start_async(
-            event_id=event.id,
+            event_id=event_id,
             start=start,
         )
 
         guest_ids = {goal_entity.user_id for goal_entity in goal_entities}
-        guests = await user_account_repository.read_by_user_ids_async(guest_ids)
+        guests = await user_account_repository.read_identities_by_user_ids_async(guest_ids)
         guest_account_map = {g.user_id: g for g in guests}
 
         goals: list[GoalInfoDto] = []
@@ -863,13 +2164,13 @@ class EventUsecase(IUsecase):
             if guest is not None:
                 goals.append(
                     GoalInfoDto(
-                        account_id=uuid_to_str(guest.id),
+                        account_id=uuid_to_str(guest.account_id),
                         username=guest.username,
                         goal_text=goal_entity.goal_text,
                     )
                 )
 
-        return GetEventGoalsResponse(goals=goals, error_codes=[])
+        return goals
 
     @rollbackable
     async def create_or_update_review_async(
@@ -885,7 +2186,7 @@ class EventUsecase(IUsecase):
 
         event_id = str_to_uuid(event_id_str)
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return CreateOrUpdateReviewResponse(error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
@@ -925,17 +2226,17 @@ class EventUsecase(IUsecase):
         if event is None:
             return GetGuestReviewResponse(review_text="", error_codes=[ErrorCode.EVENT_NOT_FOUND])
 
-        requester = await user_account_repository.read_with_followees_by_id_or_none_async(requester_id)
+        requester = await user_account_repository.read_identity_by_id_async(requester_id)
         if requester is None:
             return GetGuestReviewResponse(review_text="", error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         is_host = event.user_id == requester.user_id
-        is_follower = any(followee.user_id == event.user_id for followee in requester.followees)
+        is_follower = await self._follow_graph.is_follower_async(self.uow, requester.user_id, event.user_id)
 
         if not is_host and not is_follower:
             return GetGuestReviewResponse(review_text="", error_codes=[ErrorCode.EVENT_ACCESS_DENIED])
 
-        guest = await user_account_repository.read_by_id_or_none_async(guest_id)
+        guest = await user_account_repository.read_identity_by_id_async(guest_id)
         if guest is None:
             return GetGuestReviewResponse(review_text="", error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
@@ -959,7 +2260,6 @@ class EventUsecase(IUsecase):
     ) -> GetEventReviewsResponse:
         event_repository = EventRepository(self.uow)
         user_account_repository = UserAccountRepository(self.uow)
-        event_review_repository = EventReviewRepository(self.uow)
 
         event_id = str_to_uuid(event_id_str)
 
@@ -967,23 +2267,32 @@ class EventUsecase(IUsecase):
         if event is None:
             return GetEventReviewsResponse(reviews=[], error_codes=[ErrorCode.EVENT_NOT_FOUND])
 
-        requester = await user_account_repository.read_with_followees_by_id_or_none_async(requester_id)
+        requester = await user_account_repository.read_identity_by_id_async(requester_id)
         if requester is None:
             return GetEventReviewsResponse(reviews=[], error_codes=[ErrorCode.ACCOUNT_NOT_FOUND])
 
         is_host = event.user_id == requester.user_id
-        is_follower = any(followee.user_id == event.user_id for followee in requester.followees)
+        is_follower = await self._follow_graph.is_follower_async(self.uow, requester.user_id, event.user_id)
 
         if not is_host and not is_follower:
             return GetEventReviewsResponse(reviews=[], error_codes=[ErrorCode.EVENT_ACCESS_DENIED])
 
+        reviews = await self._read_event_reviews_async(event_id=event.id, start=start)
+
+        return GetEventReviewsResponse(reviews=reviews, error_codes=[])
+
+    @coalesced(ttl=0.5)
+    async def _read_event_reviews_async(self, event_id: UUID, start: datetime) -> list[ReviewInfoDto]:
+        user_account_repository = UserAccountRepository(self.uow)
+        event_review_repository = EventReviewRepository(self.uow)
+
         review_entities = await event_review_repository.read_by_event_id_and_start_async(
-            event_id=event.id,
+            event_id=event_id,
             start=start,
         )
 
         guest_ids = {review_entity.user_id for review_entity in review_entities}
-        guests = await user_account_repository.read_by_user_ids_async(guest_ids)
+        guests = await user_account_repository.read_identities_by_user_ids_async(guest_ids)
         guest_account_map = {g.user_id: g for g in guests}
 
         reviews: list[ReviewInfoDto] = []
@@ -992,10 +2301,10 @@ class EventUsecase(IUsecase):
             if guest is not None:
                 reviews.append(
                     ReviewInfoDto(
-                        account_id=uuid_to_str(guest.id),
+                        account_id=uuid_to_str(guest.account_id),
                         username=guest.username,
                         review_text=review_entity.review_text,
                     )
                 )
 
-        return GetEventReviewsResponse(reviews=reviews, error_codes=[])
+        return reviews
@@ -0,0 +1,288 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
+
+from app.core.constants.constants import (
+    FEATURE_STORE_DIR,
+    FORECAST_CONTEXT_LEN,
+    FORECAST_DELTA_EXPORT,
+    FORECAST_GENERATION_STAGING_TTL_MS,
+    FORECAST_JOB_HEARTBEAT_INTERVAL_MS,
+    FORECAST_JOB_LEASE_MS,
+    FORECAST_JOB_POLL_INTERVAL_MS,
+)
+from app.core.dtos.event import ForecastAttendanceTimeResponse
+from app.core.error.error_code import ErrorCode
+from app.core.features.event import ForecastJobStage, ForecastJobStatus
+from app.core.infrastructure.sqlalchemy.db import async_session
+from app.core.infrastructure.sqlalchemy.repositories.forecast import ForecastJobRepository
+from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
+from app.core.usecase.event import EventUsecase, run_attendance_time_forecast_async
+from app.core.utils.uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(ZoneInfo("UTC"))
+
+
+@dataclass(frozen=True)
+class _RunOutcome:
+    status: ForecastJobStatus
+    error_code: int | None = None
+    forecast_count: int | None = None
+    export_watermarks: dict[str, datetime] | None = None
+    forecast_result: ForecastAttendanceTimeResponse | None = None
+
+
+class ForecastJobWorker:
+    """Runs queued attendance forecast jobs outside of any request.
+
+    Every poll_interval_ms the worker looks for the active job and claims it with a conditional update, so only one
+    worker runs it. The read, forecast and store steps each use their own short transaction and record their stage and
+    progress on the job; no transaction stays open while the ML server works. During a step the worker sends a
+    heartbeat every heartbeat_interval_ms and stops the run when a cancel is requested, up to the point where the
+    forecasts start being stored. A running job whose heartbeat is older than lease_ms is failed, so a crashed worker
+    does not hold the single-run lock forever.
+
+    With delta_export, a run after a successful one only sends the series that changed since the export watermarks
+    stored on that job, cut to their last context_len occurrences; otherwise every run sends the full history. A run
+    answered by the statistical fallback stores no watermarks, as the ML server did not merge its series.
+
+    With feature_store_dir, each run first updates the feature store there and builds its request from it rather
+    than from the action logs.
+
+    A process that does not start the worker can still run a job within a request through run_now_async, which
+    holds the job's active slot like a claimed job, so it never publishes concurrently with another run.
+
+    Every successful run publishes a new forecast generation. Whenever the worker is idle after a run, and once after
+    it starts, it deletes the generations that were replaced and those staged more than staging_ttl_ms ago.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        poll_interval_ms: int,
+        heartbeat_interval_ms: int,
+        lease_ms: int,
+        delta_export: bool,
+        context_len: int,
+        staging_ttl_ms: int,
+        feature_store_dir: Path | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._poll_interval = poll_interval_ms / 1000
+        self._heartbeat_interval = heartbeat_interval_ms / 1000
+        self._lease = timedelta(milliseconds=lease_ms)
+        self._delta_export = delta_export
+        self._context_len = context_len
+        self._staging_ttl = timedelta(milliseconds=staging_ttl_ms)
+        self._feature_store_dir = feature_store_dir
+        self._has_garbage = True
+        self._interruptible = True
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start_async(self) -> None:
+        self._task = asyncio.create_task(self._run_async())
+
+    async def stop_async(self) -> None:
+        # A job interrupted here stays running until its lease runs out
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_now_async(self) -> ForecastAttendanceTimeResponse:
+        """Enqueue a job, or take over the queued one, and run it in the calling task."""
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            await EventUsecase(uow=uow).enqueue_forecast_job_async()
+        job_id = await self._claim_or_none_async()
+        if job_id is None:
+            return ForecastAttendanceTimeResponse(
+                attendance_time_forecasts={},
+                error_codes=[ErrorCode.FORECAST_JOB_ALREADY_RUNNING],
+            )
+        outcome = await self._execute_async(job_id)
+        if outcome.forecast_result is not None:
+            return outcome.forecast_result
+        return ForecastAttendanceTimeResponse(
+            attendance_time_forecasts={},
+            error_codes=[outcome.error_code if outcome.error_code is not None else ErrorCode.ML_SERVER_ERROR],
+        )
+
+    async def _run_async(self) -> None:
+        while True:
+            try:
+                job_id = await self._claim_or_none_async()
+                if job_id is not None:
+                    self._has_garbage = True
+                    await self._execute_async(job_id)
+                    continue
+                if self._has_garbage:
+                    await self._collect_garbage_async()
+                    self._has_garbage = False
+            except Exception:
+                logger.exception("Failed to poll forecast jobs")
+            await asyncio.sleep(self._poll_interval)
+
+    async def _claim_or_none_async(self) -> UUID | None:
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            forecast_job_repository = ForecastJobRepository(uow)
+            forecast_job = await forecast_job_repository.read_active_or_none_async()
+            if forecast_job is None:
+                return None
+            now = _now()
+            if forecast_job.status == ForecastJobStatus.RUNNING:
+                # Only applies when the owner's lease has run out; the next poll picks up new jobs
+                await forecast_job_repository.finish_async(
+                    forecast_job.id,
+                    from_status=ForecastJobStatus.RUNNING,
+                    status=ForecastJobStatus.FAILED,
+                    finished_at=now,
+                    error_code=ErrorCode.FORECAST_JOB_ABANDONED,
+                    heartbeat_before=now - self._lease,
+                )
+                await uow.commit_async()
+                return None
+            claimed = await forecast_job_repository.claim_async(forecast_job.id, started_at=now)
+            await uow.commit_async()
+            return forecast_job.id if claimed else None
+
+    async def _execute_async(self, job_id: UUID) -> _RunOutcome:
+        self._interruptible = True
+        run = asyncio.create_task(self._forecast_async(job_id))
+        try:
+            while not (await asyncio.wait({run}, timeout=self._heartbeat_interval))[0]:
+                if not await self._heartbeat_async(job_id) and self._interruptible:
+                    run.cancel()
+        finally:
+            if not run.done():
+                # Cancelled, or the heartbeat failed: never leave the run going without an owner
+                run.cancel()
+                await asyncio.gather(run, return_exceptions=True)
+
+        try:
+            outcome = run.result()
+        except asyncio.CancelledError:
+            outcome = _RunOutcome(ForecastJobStatus.CANCELLED)
+        except Exception:
+            logger.exception("Forecast job %s failed", job_id)
+            outcome = _RunOutcome(ForecastJobStatus.FAILED)
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            await ForecastJobRepository(uow).finish_async(
+                job_id,
+                from_status=ForecastJobStatus.RUNNING,
+                status=outcome.status,
+                finished_at=_now(),
+                error_code=outcome.error_code,
+                forecast_count=outcome.forecast_count,
+                export_watermarks=outcome.export_watermarks,
+            )
+            await uow.commit_async()
+        return outcome
+
+    async def _forecast_async(self, job_id: UUID) -> _RunOutcome:
+        if not await self._record_progress_async(job_id, ForecastJobStage.READING, 10):
+            return _RunOutcome(ForecastJobStatus.CANCELLED)
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            usecase = EventUsecase(uow=uow)
+            previous_job = (
+                await ForecastJobRepository(uow).read_latest_succeeded_or_none_async() if self._delta_export else None
+            )
+            # Read the watermarks first, so rows changed while the request is built are sent again next time
+            export_watermarks = await usecase.read_forecast_export_watermarks_async()
+            previous_watermarks = previous_job.export_watermarks if previous_job is not None else None
+            if self._feature_store_dir is not None:
+                features = await usecase.materialize_attendance_features_async(self._feature_store_dir)
+                request = await usecase.read_forecast_attendance_time_request_from_features_async(
+                    features, previous_watermarks, self._context_len if previous_watermarks is not None else None
+                )
+            elif previous_watermarks is not None:
+                request = await usecase.read_forecast_attendance_time_delta_request_async(
+                    previous_watermarks, self._context_len
+                )
+            else:
+                request = await usecase.read_forecast_attendance_time_request_async()
+
+        if not await self._record_progress_async(job_id, ForecastJobStage.FORECASTING, 30):
+            return _RunOutcome(ForecastJobStatus.CANCELLED)
+        forecast_result, fell_back = await run_attendance_time_forecast_async(request)
+        if forecast_result.error_codes:
+            return _RunOutcome(ForecastJobStatus.FAILED, error_code=forecast_result.error_codes[0])
+
+        # Past this point the forecasts are written and the run is no longer interrupted
+        self._interruptible = False
+        if not await self._record_progress_async(job_id, ForecastJobStage.STORING, 90):
+            return _RunOutcome(ForecastJobStatus.CANCELLED)
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            forecast_count = await EventUsecase(uow=uow).store_attendance_time_forecasts_async(
+                forecast_result, is_delta=request.is_delta
+            )
+        # The ML server did not merge the series of a run answered by the fallback, so the next run sends them all
+        return _RunOutcome(
+            ForecastJobStatus.SUCCEEDED,
+            forecast_count=forecast_count,
+            export_watermarks=None if fell_back else export_watermarks,
+            forecast_result=forecast_result,
+        )
+
+    async def _collect_garbage_async(self) -> None:
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            collected = await EventUsecase(uow=uow).collect_forecast_generation_garbage_async(
+                staged_before=_now() - self._staging_ttl
+            )
+        if collected:
+            logger.info("Collected %d forecast generations", collected)
+
+    async def _record_progress_async(self, job_id: UUID, stage: ForecastJobStage, progress: int) -> bool:
+        """Return False when the run should stop because the job was cancelled or is no longer running."""
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            forecast_job_repository = ForecastJobRepository(uow)
+            running = await forecast_job_repository.record_progress_async(job_id, stage, progress, heartbeat_at=_now())
+            forecast_job = await forecast_job_repository.read_by_id_async(job_id)
+            await uow.commit_async()
+        return running and not forecast_job.cancel_requested
+
+    async def _heartbeat_async(self, job_id: UUID) -> bool:
+        """Return False when the run should stop because the job was cancelled or is no longer running."""
+        async with self._session_factory() as session:
+            uow = SqlalchemyUnitOfWork(session=session)
+            forecast_job_repository = ForecastJobRepository(uow)
+            running = await forecast_job_repository.heartbeat_async(job_id, heartbeat_at=_now())
+            forecast_job = await forecast_job_repository.read_by_id_async(job_id)
+            await uow.commit_async()
+        return running and not forecast_job.cancel_requested
+
+
+# Only started when FORECAST_JOB_WORKER is set; otherwise jobs are run by run_now_async
+forecast_job_worker = ForecastJobWorker(
+    session_factory=async_session,
+    poll_interval_ms=FORECAST_JOB_POLL_INTERVAL_MS,
+    heartbeat_interval_ms=FORECAST_JOB_HEARTBEAT_INTERVAL_MS,
+    lease_ms=FORECAST_JOB_LEASE_MS,
+    delta_export=FORECAST_DELTA_EXPORT,
+    context_len=FORECAST_CONTEXT_LEN,
+    staging_ttl_ms=FORECAST_GENERATION_STAGING_TTL_MS,
+    feature_store_dir=Path(FEATURE_STORE_DIR) if FEATURE_STORE_DIR is not None else None,
+)
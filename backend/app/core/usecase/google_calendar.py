@@ -46,7 +46,7 @@ class GoogleCalendarUsecase(IUsecase):
         user_account_repository = UserAccountRepository(self.uow)
 
         # Verify account exists
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if not user_account:
             return GetGoogleCalendarAuthUrlResponse(
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
@@ -65,7 +65,7 @@ class GoogleCalendarUsecase(IUsecase):
         google_calendar_repository = GoogleCalendarIntegrationRepository(self.uow)
 
         # Get user_id from account_id
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if not user_account:
             return HandleGoogleCalendarOAuthCallbackResponse(
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
@@ -144,7 +144,7 @@ class GoogleCalendarUsecase(IUsecase):
         google_calendar_repository = GoogleCalendarIntegrationRepository(self.uow)
 
         # Get user_id from account_id
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if not user_account:
             return GetGoogleCalendarStatusResponse(
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
@@ -186,7 +186,7 @@ class GoogleCalendarUsecase(IUsecase):
         google_calendar_repository = GoogleCalendarIntegrationRepository(self.uow)
 
         # Get user_id from account_id
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if not user_account:
             return DisconnectGoogleCalendarResponse(
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
@@ -217,7 +217,7 @@ class GoogleCalendarUsecase(IUsecase):
         mapping_repository = GoogleCalendarEventMappingRepository(self.uow)
 
         # Get user_id from account_id
-        user_account = await user_account_repository.read_by_id_or_none_async(account_id)
+        user_account = await user_account_repository.read_identity_by_id_async(account_id)
         if not user_account:
             return SyncGoogleCalendarResponse(
                 error_codes=[ErrorCode.ACCOUNT_NOT_FOUND],
@@ -0,0 +1,204 @@
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from itertools import accumulate
+from typing import Any, Iterable, Iterator, Sequence
+from uuid import UUID
+
+STREAM_MAGIC = b"TAC1"
+DEFAULT_FRAME_ROWS = 1 << 16
+
+_FRAME_HEADER = struct.Struct("<BII")
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_NULL_UUID = bytes(16)
+_SWAP_BYTES = sys.byteorder == "big"
+
+
+class ColumnType(Enum):
+    UUID = "uuid"
+    INT64 = "int64"
+    FLOAT64 = "float64"
+    TIMESTAMP = "timestamp"
+    STRING = "string"
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: ColumnType
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class Table:
+    tag: int
+    name: str
+    columns: tuple[Column, ...]
+
+
+def to_epoch_micros(value: datetime) -> int:
+    """Naive datetimes are taken as UTC, which is how the database returns them."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _uuid_bytes(value: str | UUID | bytes) -> bytes:
+    if isinstance(value, str):
+        # Much cheaper than going through UUID for the canonical form every id here is in
+        return bytes.fromhex(value.replace("-", ""))
+    if isinstance(value, UUID):
+        return value.bytes
+    return value
+
+
+def _typed_array(typecode: str, values: Iterable[Any]) -> bytes:
+    typed = array(typecode, values)
+    if _SWAP_BYTES:
+        typed.byteswap()
+    return typed.tobytes()
+
+
+def _read_array(typecode: str, buffer: memoryview, offset: int, length: int) -> tuple[array[Any], int]:
+    typed = array(typecode)
+    end = offset + length * typed.itemsize
+    typed.frombytes(buffer[offset:end])
+    if _SWAP_BYTES:
+        typed.byteswap()
+    return typed, end
+
+
+def _encode_column(column: Column, values: Sequence[Any]) -> bytes:
+    parts = []
+    if column.nullable:
+        parts.append(bytes(value is not None for value in values))
+    if column.type == ColumnType.UUID:
+        parts.append(b"".join(_NULL_UUID if value is None else _uuid_bytes(value) for value in values))
+    elif column.type == ColumnType.INT64:
+        parts.append(_typed_array("q", (0 if value is None else value for value in values)))
+    elif column.type == ColumnType.FLOAT64:
+        parts.append(_typed_array("d", (0.0 if value is None else value for value in values)))
+    elif column.type == ColumnType.TIMESTAMP:
+        parts.append(_typed_array("q", (0 if value is None else to_epoch_micros(value) for value in values)))
+    else:
+        encoded = [b"" if value is None else value.encode() for value in values]
+        parts.append(_typed_array("I", map(len, encoded)))
+        parts.append(b"".join(encoded))
+    return b"".join(parts)
+
+
+def _decode_column(column: Column, buffer: memoryview, offset: int, row_count: int) -> tuple[list[Any], int]:
+    validity = None
+    if column.nullable:
+        validity = bytes(buffer[offset : offset + row_count])
+        offset += row_count
+    values: list[Any]
+    if column.type == ColumnType.UUID:
+        end = offset + 16 * row_count
+        digits = buffer[offset:end].hex()
+        values = [
+            f"{digits[i : i + 8]}-{digits[i + 8 : i + 12]}-{digits[i + 12 : i + 16]}-{digits[i + 16 : i + 20]}-"
+            f"{digits[i + 20 : i + 32]}"
+            for i in range(0, 32 * row_count, 32)
+        ]
+        offset = end
+    elif column.type == ColumnType.INT64:
+        typed, offset = _read_array("q", buffer, offset, row_count)
+        values = typed.tolist()
+    elif column.type == ColumnType.FLOAT64:
+        typed, offset = _read_array("d", buffer, offset, row_count)
+        values = typed.tolist()
+    elif column.type == ColumnType.TIMESTAMP:
+        typed, offset = _read_array("q", buffer, offset, row_count)
+        values = [_EPOCH + timedelta(0, 0, value) for value in typed]
+    else:
+        lengths, offset = _read_array("I", buffer, offset, row_count)
+        blob = bytes(buffer[offset : offset + sum(lengths)])
+        ends = list(accumulate(lengths))
+        values = [blob[end - length : end].decode() for end, length in zip(ends, lengths)]
+        offset += len(blob)
+    if validity is not None:
+        values = [value if valid else None for value, valid in zip(values, validity)]
+    return values, offset
+
+
+def encode_frame(table: Table, columns: Sequence[Sequence[Any]], level: int = 1) -> bytes:
+    """Encode equally long columns, in the order of table.columns, as one compressed frame."""
+    row_count = len(columns[0]) if columns else 0
+    body = zlib.compress(
+        b"".join(_encode_column(column, values) for column, values in zip(table.columns, columns, strict=True)),
+        level,
+    )
+    return _FRAME_HEADER.pack(table.tag, row_count, len(body)) + body
+
+
+def encode_stream(
+    tables: Iterable[tuple[Table, Sequence[Sequence[Any]]]],
+    frame_rows: int = DEFAULT_FRAME_ROWS,
+    level: int = 1,
+) -> Iterator[bytes]:
+    """Yield the stream magic and then one frame per frame_rows rows of every table, so the stream can be sent while
+    it is being encoded. Tables without rows still get an empty frame."""
+    yield STREAM_MAGIC
+    for table, columns in tables:
+        row_count = len(columns[0]) if columns else 0
+        for start in range(0, max(row_count, 1), frame_rows):
+            yield encode_frame(table, [values[start : start + frame_rows] for values in columns], level)
+
+
+class StreamDecoder:
+    """Incrementally decodes a stream produced by encode_stream from chunks of any size.
+
+    Tables larger than one frame arrive as several frames with the same tag, in order. Ids are decoded to their
+    canonical string form and timestamps to aware UTC datetimes.
+    """
+
+    def __init__(self, tables: Iterable[Table]) -> None:
+        self._tables = {table.tag: table for table in tables}
+        self._buffer = bytearray()
+        self._started = False
+
+    def feed(self, data: bytes) -> list[tuple[Table, list[list[Any]]]]:
+        self._buffer += data
+        if not self._started:
+            if len(self._buffer) < len(STREAM_MAGIC):
+                return []
+            if self._buffer[: len(STREAM_MAGIC)] != STREAM_MAGIC:
+                raise ValueError("Not a columnar stream")
+            del self._buffer[: len(STREAM_MAGIC)]
+            self._started = True
+
+        frames = []
+        offset = 0
+        while len(self._buffer) - offset >= _FRAME_HEADER.size:
+            tag, row_count, body_length = _FRAME_HEADER.unpack_from(self._buffer, offset)
+            end = offset + _FRAME_HEADER.size + body_length
+            if len(self._buffer) < end:
+                break
+            table = self._tables.get(tag)
+            if table is None:
+                raise ValueError(f"Unknown table tag: {tag}")
+            try:
+                body = memoryview(zlib.decompress(self._buffer[offset + _FRAME_HEADER.size : end]))
+            except zlib.error as e:
+                raise ValueError("Corrupt columnar frame") from e
+            columns = []
+            position = 0
+            for column in table.columns:
+                values, position = _decode_column(column, body, position, row_count)
+                columns.append(values)
+            if position != len(body):
+                raise ValueError(f"Malformed {table.name} frame")
+            frames.append((table, columns))
+            offset = end
+        del self._buffer[:offset]
+        return frames
+
+    def close(self) -> None:
+        if not self._started or self._buffer:
+            raise ValueError("Truncated columnar stream")
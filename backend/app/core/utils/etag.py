@@ -0,0 +1,16 @@
+from hashlib import sha256
+
+
+def build_etag(*parts: object) -> str:
+    """Build a strong ETag from the validator parts of a resource."""
+    digest = sha256("|".join(map(str, parts)).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag using weak comparison (RFC 9110)."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -1,8 +1,11 @@
 import re
-from datetime import datetime
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
-from app.core.features.event import Frequency, Recurrence, RecurrenceRule, Weekday
+from app.core.features.event import Event, Frequency, Recurrence, RecurrenceRule, Weekday
 
 
 def _parse_datetime_with_tzid(datetime_str: str, tzid: str | None) -> datetime:
@@ -29,7 +32,8 @@ def _parse_datetime_with_tzid(datetime_str: str, tzid: str | None) -> datetime:
             return dt.replace(tzinfo=ZoneInfo("UTC"))
 
 
-def _parse_rdate_exdate_line(line: str, is_all_day: bool) -> list[datetime]:
+@lru_cache(maxsize=4096)
+def _parse_rdate_exdate_line(line: str, is_all_day: bool) -> tuple[datetime, ...]:
     """Parse RDATE or EXDATE line with proper TZID handling."""
     # Extract TZID parameter if present
     tzid = None
@@ -43,10 +47,12 @@ def _parse_rdate_exdate_line(line: str, is_all_day: bool) -> list[datetime]:
     # Extract the value part after the colon
     value_part = line.split(":")[1]
 
-    return [_parse_datetime_with_tzid(dt_str, None if is_all_day else tzid) for dt_str in value_part.split(",")]
+    return tuple(_parse_datetime_with_tzid(dt_str, None if is_all_day else tzid) for dt_str in value_part.split(","))
 
 
+@lru_cache(maxsize=4096)
 def parse_rrule(rrule_str: str, is_all_day: bool) -> RecurrenceRule:
+    """Parse an RRULE line. Results are interned per (rrule_str, is_all_day), so callers must not mutate them."""
     rrule_str = rrule_str.replace("RRULE:", "")
     rrules = dict(pair.split("=") for pair in rrule_str.split(";"))
     freq = Frequency(rrules["FREQ"])
@@ -177,3 +183,405 @@ def serialize_recurrence(
         recurrence_list.append(exdate_str)
 
     return recurrence_list
+
+
+def _to_local(value: datetime, timezone: str) -> datetime:
+    # Naive datetimes read back from the database are in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=ZoneInfo("UTC"))
+    return value.astimezone(ZoneInfo(timezone))
+
+
+def _escape_text(value: str) -> str:
+    """Escape a TEXT property value (RFC 5545 3.3.11)."""
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold_line(line: str) -> str:
+    """Fold a content line into CRLF-terminated lines of at most 75 octets (RFC 5545 3.1)."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    chunks = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a multi-byte UTF-8 sequence
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        chunks.append(encoded[start:end].decode())
+        start = end
+        # Continuation lines start with a space
+        limit = 74
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+def serialize_vcalendar_header(name: str) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Tend Attend//Event Feed//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape_text(name)}",
+    ]
+    return "".join(_fold_line(line) for line in lines)
+
+
+def serialize_vcalendar_footer() -> str:
+    return _fold_line("END:VCALENDAR")
+
+
+def serialize_vevent(
+    uid: str,
+    summary: str,
+    location: str | None,
+    dtstart: datetime,
+    dtend: datetime,
+    is_all_day: bool,
+    timezone: str,
+    recurrence: Recurrence | None,
+    dtstamp: datetime,
+) -> str:
+    """Serialize an event as a VEVENT component, with times in the event's timezone."""
+    local_dtstart = _to_local(dtstart, timezone)
+    local_dtend = _to_local(dtend, timezone)
+    if is_all_day:
+        dtstart_line = f"DTSTART;VALUE=DATE:{local_dtstart.strftime('%Y%m%d')}"
+        dtend_line = f"DTEND;VALUE=DATE:{local_dtend.strftime('%Y%m%d')}"
+    else:
+        dtstart_line = f"DTSTART;TZID={timezone}:{local_dtstart.strftime('%Y%m%dT%H%M%S')}"
+        dtend_line = f"DTEND;TZID={timezone}:{local_dtend.strftime('%Y%m%dT%H%M%S')}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_to_local(dtstamp, 'UTC').strftime('%Y%m%dT%H%M%SZ')}",
+        dtstart_line,
+        dtend_line,
+        f"SUMMARY:{_escape_text(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_escape_text(location)}")
+    if recurrence is not None:
+        if not is_all_day:
+            # All-day RDATE and EXDATE values are dates, so only timed ones are moved into the event's timezone
+            recurrence = Recurrence(
+                rrule=recurrence.rrule,
+                rdate=[_to_local(rdate, timezone) for rdate in recurrence.rdate],
+                exdate=[_to_local(exdate, timezone) for exdate in recurrence.exdate],
+            )
+        # serialize_recurrence leads with a DTSTART line equal to dtstart_line, which is already emitted
+        lines.extend(serialize_recurrence(recurrence, local_dtstart, is_all_day, timezone)[1:])
+    lines.append("END:VEVENT")
+    return "".join(_fold_line(line) for line in lines)
+
+
+# Longest logical line and most properties per VEVENT the reader buffers, which together bound its memory
+ICS_MAX_LINE_LENGTH = 1 << 20
+ICS_MAX_EVENT_PROPERTIES = 1000
+
+_DURATION_PATTERN = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$",
+)
+
+
+@dataclass(frozen=True)
+class ContentLine:
+    name: str
+    params: dict[str, str]
+    value: str
+
+
+def _split_unquoted(text: str, separator: str, maxsplit: int = -1) -> list[str]:
+    parts = []
+    start = 0
+    in_quotes = False
+    for i, char in enumerate(text):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == separator and not in_quotes and maxsplit != 0:
+            parts.append(text[start:i])
+            start = i + 1
+            maxsplit -= 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_content_line(line: str) -> ContentLine:
+    """Split an unfolded content line into its name, parameters and value (RFC 5545 3.1)."""
+    head, separator, value = line.partition(":")
+    if '"' in head:
+        # Quoted parameter values may contain ":" and ";", so only then scan character by character
+        parts = _split_unquoted(line, ":", maxsplit=1)
+        if len(parts) != 2:
+            raise ValueError(f"Invalid content line: {line[:64]}")
+        head, value = parts
+        name, *raw_params = _split_unquoted(head, ";")
+    elif separator:
+        name, *raw_params = head.split(";")
+    else:
+        raise ValueError(f"Invalid content line: {line[:64]}")
+    params = {}
+    for raw_param in raw_params:
+        key, _, param_value = raw_param.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return ContentLine(name=name.upper(), params=params, value=value)
+
+
+def _unescape_text(value: str) -> str:
+    """Reverse _escape_text."""
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _parse_duration(value: str) -> timedelta:
+    match = _DURATION_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f"Invalid duration: {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0),
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=int(seconds or 0),
+    )
+    return -duration if sign == "-" else duration
+
+
+def _is_iana_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ValueError, KeyError):
+        return False
+    return True
+
+
+def _offset_to_iana_timezone(offset: str) -> str | None:
+    """Map a whole-hour UTC offset such as +0900 to an Etc/GMT zone, whose signs are inverted by convention."""
+    match = re.fullmatch(r"([+-])(\d{2})(\d{2})(\d{2})?", offset)
+    if match is None or match.group(3) != "00" or match.group(4) not in (None, "00"):
+        return None
+    hours = int(match.group(2))
+    if hours == 0:
+        return "UTC"
+    return f"Etc/GMT{'-' if match.group(1) == '+' else '+'}{hours}"
+
+
+class IcsEventReader:
+    """Incrementally read VEVENTs from iCalendar text fed in arbitrary chunks.
+
+    Only the current line and the current component are buffered, so memory is bounded by ICS_MAX_LINE_LENGTH and
+    ICS_MAX_EVENT_PROPERTIES rather than by the file; input that exceeds either raises ValueError. VTIMEZONE components are resolved to IANA zones as they are read, which is why they have to
+    precede the events that use them, as they do in calendar exports.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pending_line: str | None = None
+        self._stack: list[str] = []
+        self._properties: list[ContentLine] = []
+        self._events: list[tuple[ContentLine, ...]] = []
+        self._tzid: str | None = None
+        self._tz_location: str | None = None
+        self._tz_standard_offset: str | None = None
+        self.timezones: dict[str, str] = {}
+        self.default_timezone = "UTC"
+
+    def feed(self, text: str) -> list[tuple[ContentLine, ...]]:
+        """Consume a chunk of text and return the properties of every VEVENT it completes."""
+        *lines, self._buffer = (self._buffer + text).split("\n")
+        if len(self._buffer) > ICS_MAX_LINE_LENGTH:
+            raise ValueError("Content line too long")
+        for line in lines:
+            self._feed_line(line.rstrip("\r"))
+        events, self._events = self._events, []
+        return events
+
+    def close(self) -> list[tuple[ContentLine, ...]]:
+        """Flush the last line and return the remaining VEVENTs."""
+        self._feed_line(self._buffer.rstrip("\r"))
+        self._buffer = ""
+        if self._pending_line is not None:
+            self._handle_line(self._pending_line)
+            self._pending_line = None
+        if self._stack:
+            raise ValueError(f"Unterminated component: {self._stack[-1]}")
+        events, self._events = self._events, []
+        return events
+
+    def _feed_line(self, line: str) -> None:
+        if line.startswith((" ", "\t")):
+            # Continuation of a folded line
+            if self._pending_line is not None:
+                self._pending_line += line[1:]
+                if len(self._pending_line) > ICS_MAX_LINE_LENGTH:
+                    raise ValueError("Content line too long")
+            return
+        if self._pending_line is not None:
+            self._handle_line(self._pending_line)
+        self._pending_line = line if line else None
+
+    def _handle_line(self, line: str) -> None:
+        content_line = parse_content_line(line)
+        if content_line.name == "BEGIN":
+            self._begin(content_line.value.upper())
+        elif content_line.name == "END":
+            self._end(content_line.value.upper())
+        elif self._stack == ["VCALENDAR", "VEVENT"]:
+            if len(self._properties) >= ICS_MAX_EVENT_PROPERTIES:
+                raise ValueError("Too many properties in VEVENT")
+            self._properties.append(content_line)
+        elif self._stack == ["VCALENDAR"]:
+            if content_line.name == "X-WR-TIMEZONE" and _is_iana_timezone(content_line.value):
+                self.default_timezone = content_line.value
+        elif self._stack == ["VCALENDAR", "VTIMEZONE"]:
+            if content_line.name == "TZID":
+                self._tzid = content_line.value
+            elif content_line.name == "X-LIC-LOCATION":
+                self._tz_location = content_line.value
+        elif self._stack == ["VCALENDAR", "VTIMEZONE", "STANDARD"]:
+            if content_line.name == "TZOFFSETTO":
+                self._tz_standard_offset = content_line.value
+
+    def _begin(self, component: str) -> None:
+        if not self._stack and component != "VCALENDAR":
+            raise ValueError(f"Unexpected component outside VCALENDAR: {component}")
+        self._stack.append(component)
+        if self._stack == ["VCALENDAR", "VEVENT"]:
+            self._properties = []
+        elif self._stack == ["VCALENDAR", "VTIMEZONE"]:
+            self._tzid = self._tz_location = self._tz_standard_offset = None
+
+    def _end(self, component: str) -> None:
+        if not self._stack or self._stack[-1] != component:
+            raise ValueError(f"Unexpected END:{component}")
+        if self._stack == ["VCALENDAR", "VEVENT"]:
+            self._events.append(tuple(self._properties))
+            self._properties = []
+        elif self._stack == ["VCALENDAR", "VTIMEZONE"] and self._tzid is not None:
+            self._register_timezone(self._tzid, self._tz_location, self._tz_standard_offset)
+        self._stack.pop()
+
+    def _register_timezone(self, tzid: str, location: str | None, standard_offset: str | None) -> None:
+        if _is_iana_timezone(tzid):
+            self.timezones[tzid] = tzid
+        elif location is not None and _is_iana_timezone(location):
+            self.timezones[tzid] = location
+        elif standard_offset is not None:
+            # Custom zones such as Windows names fall back to their standard offset, ignoring daylight saving time
+            timezone = _offset_to_iana_timezone(standard_offset)
+            if timezone is not None:
+                self.timezones[tzid] = timezone
+
+    def _resolve_timezone(self, content_line: ContentLine, default: str) -> str:
+        """Return the IANA zone of a date-time property, or default when it has no TZID."""
+        tzid = content_line.params.get("TZID")
+        if tzid is None:
+            return default
+        if tzid in self.timezones:
+            return self.timezones[tzid]
+        if _is_iana_timezone(tzid):
+            return tzid
+        raise ValueError(f"Unknown TZID: {tzid}")
+
+    @staticmethod
+    def _parse_value(value: str, timezone: str, is_date: bool) -> datetime:
+        # Slicing is several times faster than strptime, which dominates large imports; int() still rejects non-digits
+        year, month, day = int(value[0:4]), int(value[4:6]), int(value[6:8])
+        if is_date:
+            return datetime(year, month, day, tzinfo=ZoneInfo(timezone))
+        if value[8:9] != "T" or len(value) != (16 if value.endswith("Z") else 15):
+            raise ValueError(f"Invalid date-time: {value}")
+        return datetime(
+            year,
+            month,
+            day,
+            int(value[9:11]),
+            int(value[11:13]),
+            int(value[13:15]),
+            tzinfo=ZoneInfo("UTC" if value.endswith("Z") else timezone),
+        )
+
+    def _parse_dates(self, content_lines: list[ContentLine], timezone: str, is_all_day: bool) -> list[datetime]:
+        dates = []
+        for content_line in content_lines:
+            zone = "UTC" if is_all_day else self._resolve_timezone(content_line, timezone)
+            for value in content_line.value.split(","):
+                # Periods (VALUE=PERIOD) cannot be represented and are skipped
+                if "/" in value:
+                    continue
+                date = self._parse_value(value, zone, is_all_day or len(value) == 8)
+                # All-day dates are kept at UTC midnight, as parse_recurrence does
+                dates.append(date if is_all_day else date.astimezone(ZoneInfo(timezone)))
+        return dates
+
+    def _normalize_rrule(self, value: str, timezone: str, is_all_day: bool) -> str:
+        """Rewrite UNTIL into the local form parse_rrule expects."""
+        parts = []
+        for part in value.split(";"):
+            key, _, until = part.partition("=")
+            if key.upper() == "UNTIL":
+                if is_all_day:
+                    until = until[:8]
+                elif len(until) == 8:
+                    until = f"{until}T235959"
+                elif until.endswith("Z"):
+                    until = (
+                        self._parse_value(until, "UTC", False).astimezone(ZoneInfo(timezone)).strftime("%Y%m%dT%H%M%S")
+                    )
+                part = f"UNTIL={until}"
+            parts.append(part)
+        return ";".join(parts)
+
+    def to_event(self, properties: tuple[ContentLine, ...]) -> Event:
+        """Convert the properties of a VEVENT into an event with UTC start and end times.
+
+        Raises ValueError or KeyError for events that cannot be represented.
+        """
+        by_name: defaultdict[str, list[ContentLine]] = defaultdict(list)
+        for content_line in properties:
+            by_name[content_line.name].append(content_line)
+
+        if by_name["RECURRENCE-ID"]:
+            raise ValueError("Modified occurrences of a recurring event are not supported")
+        if not by_name["DTSTART"]:
+            raise ValueError("Missing DTSTART")
+        if not by_name["SUMMARY"]:
+            raise ValueError("Missing SUMMARY")
+
+        dtstart_line = by_name["DTSTART"][0]
+        is_all_day = dtstart_line.params.get("VALUE") == "DATE" or len(dtstart_line.value) == 8
+        timezone = self.default_timezone if is_all_day else self._resolve_timezone(dtstart_line, self.default_timezone)
+        dtstart = self._parse_value(dtstart_line.value, timezone, is_all_day).astimezone(ZoneInfo(timezone))
+
+        if by_name["DTEND"]:
+            dtend_line = by_name["DTEND"][0]
+            dtend_timezone = timezone if is_all_day else self._resolve_timezone(dtend_line, timezone)
+            dtend = self._parse_value(dtend_line.value, dtend_timezone, is_all_day)
+        elif by_name["DURATION"]:
+            dtend = dtstart + _parse_duration(by_name["DURATION"][0].value)
+        else:
+            dtend = dtstart + timedelta(days=1) if is_all_day else dtstart
+
+        recurrence: Recurrence | None = None
+        if by_name["RRULE"]:
+            rrule = parse_rrule(self._normalize_rrule(by_name["RRULE"][0].value, timezone, is_all_day), is_all_day)
+            recurrence = Recurrence(
+                rrule=rrule,
+                rdate=self._parse_dates(by_name["RDATE"], timezone, is_all_day),
+                exdate=self._parse_dates(by_name["EXDATE"], timezone, is_all_day),
+            )
+
+        return Event(
+            summary=_unescape_text(by_name["SUMMARY"][0].value),
+            location=_unescape_text(by_name["LOCATION"][0].value) if by_name["LOCATION"] else None,
+            dtstart=dtstart.astimezone(ZoneInfo("UTC")),
+            dtend=dtend.astimezone(ZoneInfo("UTC")),
+            timezone=timezone,
+            recurrence=recurrence,
+            is_all_day=is_all_day,
+        )
@@ -0,0 +1,99 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class HitRatio:
+    hits: int = 0
+    requests: int = 0
+
+    @property
+    def ratio(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+
+class HitRatioMetrics:
+    """In-process hit/request counters keyed by name, e.g. 304 responses per endpoint."""
+
+    def __init__(self) -> None:
+        self._counters: defaultdict[str, HitRatio] = defaultdict(HitRatio)
+
+    def record(self, name: str, hit: bool) -> None:
+        counter = self._counters[name]
+        counter.requests += 1
+        if hit:
+            counter.hits += 1
+
+    def snapshot(self) -> dict[str, HitRatio]:
+        return {
+            name: HitRatio(hits=counter.hits, requests=counter.requests) for name, counter in self._counters.items()
+        }
+
+
+@dataclass
+class Latency:
+    requests: int = 0
+    errors: int = 0
+    rejected: int = 0
+    retries: int = 0
+    hedges: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    recent_ms: deque[float] = field(default_factory=lambda: deque(maxlen=LatencyMetrics.WINDOW))
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.requests if self.requests else 0.0
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Nearest-rank percentile over the latest LatencyMetrics.WINDOW requests."""
+        if not self.recent_ms:
+            return 0.0
+        ordered = sorted(self.recent_ms)
+        return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+class LatencyMetrics:
+    """In-process latency and error counters keyed by name, e.g. calls to the ML server per endpoint."""
+
+    WINDOW = 1024
+
+    def __init__(self) -> None:
+        self._latencies: defaultdict[str, Latency] = defaultdict(Latency)
+
+    def record(self, name: str, elapsed_ms: float, error: bool) -> None:
+        latency = self._latencies[name]
+        latency.requests += 1
+        latency.total_ms += elapsed_ms
+        latency.max_ms = max(latency.max_ms, elapsed_ms)
+        latency.recent_ms.append(elapsed_ms)
+        if error:
+            latency.errors += 1
+
+    def record_rejected(self, name: str) -> None:
+        self._latencies[name].rejected += 1
+
+    def record_retry(self, name: str) -> None:
+        self._latencies[name].retries += 1
+
+    def record_hedge(self, name: str) -> None:
+        self._latencies[name].hedges += 1
+
+    def snapshot(self) -> dict[str, Latency]:
+        return {
+            name: Latency(
+                requests=latency.requests,
+                errors=latency.errors,
+                rejected=latency.rejected,
+                retries=latency.retries,
+                hedges=latency.hedges,
+                total_ms=latency.total_ms,
+                max_ms=latency.max_ms,
+                recent_ms=deque(latency.recent_ms, maxlen=self.WINDOW),
+            )
+            for name, latency in self._latencies.items()
+        }
+
+
+not_modified_metrics = HitRatioMetrics()
+ml_server_metrics = LatencyMetrics()
@@ -0,0 +1,387 @@
+from calendar import isleap, monthrange
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import cached_property
+from itertools import product
+from math import gcd
+from typing import Iterator
+from zoneinfo import ZoneInfo
+
+from app.core.features.event import Frequency, Recurrence, RecurrenceRule, Weekday
+from app.core.utils.cache import LRUCache
+from app.core.utils.uuid import UUID
+
+# Index matches date.weekday()
+_WEEKDAYS = (Weekday.MO, Weekday.TU, Weekday.WE, Weekday.TH, Weekday.FR, Weekday.SA, Weekday.SU)
+
+_SUBDAILY_SECONDS = {
+    Frequency.HOURLY: 3600,
+    Frequency.MINUTELY: 60,
+    Frequency.SECONDLY: 1,
+}
+
+# A COUNT rule is only expanded this far past DTSTART, so a far-future start or a rule that never yields an
+# occurrence cannot make one check walk centuries of periods.
+_COUNT_EXPANSION_HORIZON = timedelta(days=3660)
+
+# Sub-daily COUNT rules step through every instant, so their horizon is also capped at this many steps.
+_SUBDAILY_COUNT_EXPANSION_STEPS = 20_000
+
+
+def _resolve_ordinals(values: list[int], size: int) -> frozenset[int]:
+    """Resolve 1-based ordinals where negative values count from the end."""
+    return frozenset(value if value > 0 else size + 1 + value for value in values)
+
+
+def _days_in_year(year: int) -> int:
+    return 366 if isleap(year) else 365
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    total = year * 12 + (month - 1) + months
+    return total // 12, total % 12 + 1
+
+
+@dataclass(frozen=True)
+class CompiledRecurrence:
+    """Occurrence membership test for a single event.
+
+    Occurrences are compared in the event's local wall-clock time (or by date for all-day events),
+    which is how RRULE BYxxx values and UNTIL are interpreted throughout this project.
+    """
+
+    dtstart: datetime
+    timezone: str
+    is_all_day: bool
+    rrule: RecurrenceRule | None
+    rdates: frozenset[datetime | date]
+    exdates: frozenset[datetime | date]
+    is_arithmetic: bool
+
+    def contains(self, start: datetime) -> bool:
+        local_start = start.astimezone(ZoneInfo(self.timezone)).replace(tzinfo=None)
+        key: datetime | date = local_start.date() if self.is_all_day else local_start
+
+        if key in self.exdates:
+            return False
+        if key in self.rdates:
+            return True
+        if self.rrule is None:
+            return key == self._key(self.dtstart)
+        if not self.is_all_day and local_start.time() != self.dtstart.time() and self.is_arithmetic:
+            return False
+
+        candidate = datetime.combine(local_start.date(), self.dtstart.time()) if self.is_all_day else local_start
+        if candidate < self.dtstart:
+            return False
+        if self.rrule.until is not None and self._key(candidate) > self._key(self.rrule.until):
+            return False
+
+        if self.is_arithmetic:
+            return self._matches_arithmetically(candidate)
+        try:
+            return self._matches_by_expansion(candidate)
+        except (ValueError, OverflowError):
+            # Periods that run past year 9999 hold no occurrence
+            return False
+
+    def _key(self, value: datetime) -> datetime | date:
+        return value.date() if self.is_all_day else value
+
+    def _week_start(self, day: date) -> date:
+        assert self.rrule is not None
+        wkst = _WEEKDAYS.index(self.rrule.wkst or Weekday.MO)
+        return day - timedelta(days=(day.weekday() - wkst) % 7)
+
+    def _period_index(self, day: date) -> int:
+        """Number of FREQ periods between DTSTART and the period containing day."""
+        assert self.rrule is not None
+        origin = self.dtstart.date()
+        match self.rrule.freq:
+            case Frequency.DAILY:
+                return (day - origin).days
+            case Frequency.WEEKLY:
+                return (self._week_start(day) - self._week_start(origin)).days // 7
+            case Frequency.MONTHLY:
+                return (day.year - origin.year) * 12 + day.month - origin.month
+            case Frequency.YEARLY:
+                return day.year - origin.year
+        raise ValueError(f"Frequency {self.rrule.freq} has no day-based period")
+
+    def _matches_arithmetically(self, candidate: datetime) -> bool:
+        assert self.rrule is not None
+        rule = self.rrule
+        day = candidate.date()
+
+        periods = self._period_index(day)
+        if periods % rule.interval != 0:
+            return False
+        if rule.count is not None and periods // rule.interval >= rule.count:
+            return False
+        if not self._matches_day(day):
+            return False
+        return True
+
+    def _matches_day(self, day: date) -> bool:
+        """Apply BYMONTH/BYWEEKNO/BYYEARDAY/BYMONTHDAY/BYDAY to a single day, including DTSTART defaults."""
+        assert self.rrule is not None
+        rule = self.rrule
+        origin = self.dtstart.date()
+
+        if rule.bymonth and day.month not in rule.bymonth:
+            return False
+        if rule.byweekno and not self._matches_weekno(day, rule.byweekno):
+            return False
+        if rule.byyearday and day.timetuple().tm_yday not in _resolve_ordinals(rule.byyearday, _days_in_year(day.year)):
+            return False
+        if rule.bymonthday and day.day not in _resolve_ordinals(rule.bymonthday, monthrange(day.year, day.month)[1]):
+            return False
+        if rule.byday and not any(self._matches_byday(day, ordinal, weekday) for ordinal, weekday in rule.byday):
+            return False
+
+        # Parts that were not specified are taken from DTSTART
+        has_day_part = bool(rule.byday or rule.bymonthday or rule.byyearday or rule.byweekno)
+        if has_day_part or rule.freq not in (Frequency.WEEKLY, Frequency.MONTHLY, Frequency.YEARLY):
+            return True
+        if rule.freq == Frequency.WEEKLY:
+            return day.weekday() == origin.weekday()
+        if rule.freq == Frequency.MONTHLY:
+            return day.day == origin.day
+        return day.day == origin.day and (bool(rule.bymonth) or day.month == origin.month)
+
+    def _matches_byday(self, day: date, ordinal: int, weekday: Weekday) -> bool:
+        assert self.rrule is not None
+        if _WEEKDAYS[day.weekday()] != weekday:
+            return False
+        if ordinal == 0:
+            return True
+        # The ordinal is relative to the month unless the rule is YEARLY without BYMONTH
+        if self.rrule.freq == Frequency.YEARLY and not self.rrule.bymonth:
+            day_of_year = day.timetuple().tm_yday
+            if ordinal > 0:
+                return (day_of_year - 1) // 7 + 1 == ordinal
+            return (_days_in_year(day.year) - day_of_year) // 7 + 1 == -ordinal
+        if ordinal > 0:
+            return (day.day - 1) // 7 + 1 == ordinal
+        return (monthrange(day.year, day.month)[1] - day.day) // 7 + 1 == -ordinal
+
+    def _first_week_start(self, year: int) -> date:
+        """Week 1 is the first week containing at least four days of the year (RFC 5545)."""
+        jan1 = date(year, 1, 1)
+        week_start = self._week_start(jan1)
+        return week_start if (jan1 - week_start).days <= 3 else week_start + timedelta(days=7)
+
+    def _matches_weekno(self, day: date, byweekno: list[int]) -> bool:
+        first = self._first_week_start(day.year)
+        weeks_in_year = (self._first_week_start(day.year + 1) - first).days // 7
+        weekno = (self._week_start(day) - first).days // 7 + 1
+        return weekno in _resolve_ordinals(byweekno, weeks_in_year)
+
+    def _times(self) -> list[tuple[int, int, int]]:
+        assert self.rrule is not None
+        return sorted(
+            product(
+                self.rrule.byhour or [self.dtstart.hour],
+                self.rrule.byminute or [self.dtstart.minute],
+                self.rrule.bysecond or [self.dtstart.second],
+            )
+        )
+
+    def _period_days(self, period: int) -> list[date]:
+        assert self.rrule is not None
+        origin = self.dtstart.date()
+        offset = period * self.rrule.interval
+        match self.rrule.freq:
+            case Frequency.DAILY:
+                return [origin + timedelta(days=offset)]
+            case Frequency.WEEKLY:
+                week_start = self._week_start(origin) + timedelta(weeks=offset)
+                return [week_start + timedelta(days=i) for i in range(7)]
+            case Frequency.MONTHLY:
+                year, month = _add_months(origin.year, origin.month, offset)
+                return [date(year, month, d) for d in range(1, monthrange(year, month)[1] + 1)]
+            case Frequency.YEARLY:
+                jan1 = date(origin.year + offset, 1, 1)
+                return [jan1 + timedelta(days=i) for i in range(_days_in_year(jan1.year))]
+        raise ValueError(f"Frequency {self.rrule.freq} has no day-based period")
+
+    def _first_step_at_or_after(self, at: datetime) -> datetime:
+        assert self.rrule is not None
+        if at <= self.dtstart:
+            return self.dtstart
+        step = timedelta(seconds=_SUBDAILY_SECONDS[self.rrule.freq] * self.rrule.interval)
+        return self.dtstart + -((self.dtstart - at) // step) * step
+
+    @cached_property
+    def _has_reachable_time(self) -> bool:
+        """Whether a time of day allowed by BYHOUR/BYMINUTE/BYSECOND is a whole number of sub-daily steps away from
+        DTSTART; otherwise the rule never yields an occurrence."""
+        assert self.rrule is not None
+        rule = self.rrule
+        modulus = gcd(_SUBDAILY_SECONDS[rule.freq] * rule.interval, 86400)
+        origin = self.dtstart.hour * 3600 + self.dtstart.minute * 60 + self.dtstart.second
+        return any(
+            (hour * 3600 + minute * 60 + second - origin) % modulus == 0
+            for hour in rule.byhour or range(24)
+            for minute in rule.byminute or range(60)
+            for second in rule.bysecond or range(60)
+        )
+
+    def _iter_subdaily_occurrences(self, first: datetime, last: datetime) -> Iterator[datetime]:
+        """Expand a sub-daily rule in chronological order from first to last, skipping whole days and hours that
+        BYxxx rules out instead of stepping through them."""
+        assert self.rrule is not None
+        rule = self.rrule
+        if not self._has_reachable_time:
+            return
+        step = timedelta(seconds=_SUBDAILY_SECONDS[rule.freq] * rule.interval)
+        cursor = self._first_step_at_or_after(first)
+        while cursor <= last:
+            if not self._matches_day(cursor.date()):
+                cursor = self._first_step_at_or_after(datetime.combine(cursor.date() + timedelta(days=1), time()))
+            elif rule.byhour and cursor.hour not in rule.byhour:
+                cursor = self._first_step_at_or_after(cursor.replace(minute=0, second=0) + timedelta(hours=1))
+            elif rule.byminute and cursor.minute not in rule.byminute:
+                cursor = self._first_step_at_or_after(cursor.replace(second=0) + timedelta(minutes=1))
+            else:
+                if not rule.bysecond or cursor.second in rule.bysecond:
+                    yield cursor
+                cursor += step
+
+    def _iter_period_occurrences(self, first_period: int, last: datetime) -> Iterator[datetime]:
+        """Expand a rule in chronological order from the given period up to last."""
+        assert self.rrule is not None
+        rule = self.rrule
+        times = self._times()
+        period = first_period
+        while True:
+            days = self._period_days(period)
+            if days[0] > last.date():
+                return
+            occurrences = [
+                datetime(day.year, day.month, day.day, hour, minute, second)
+                for day in days
+                if self._matches_day(day)
+                for hour, minute, second in times
+            ]
+            if rule.bysetpos:
+                positions = _resolve_ordinals(rule.bysetpos, len(occurrences))
+                occurrences = [occ for i, occ in enumerate(occurrences, start=1) if i in positions]
+            for occurrence in occurrences:
+                if occurrence > last:
+                    return
+                if occurrence >= self.dtstart:
+                    yield occurrence
+            period += 1
+
+    def _matches_by_expansion(self, candidate: datetime) -> bool:
+        assert self.rrule is not None
+        rule = self.rrule
+        target = self._key(candidate)
+        # Every occurrence sharing the candidate's key lies in [first, last]
+        first = datetime.combine(candidate.date(), time()) if self.is_all_day else candidate
+        last = datetime.combine(candidate.date(), time.max) if self.is_all_day else candidate
+        is_subdaily = rule.freq in _SUBDAILY_SECONDS
+
+        if rule.count is None:
+            # Without COUNT no earlier period affects the candidate's, so expansion starts there
+            occurrences = (
+                self._iter_subdaily_occurrences(first, last)
+                if is_subdaily
+                else self._iter_period_occurrences(self._period_index(first.date()) // rule.interval, last)
+            )
+            return any(self._key(occurrence) == target for occurrence in occurrences)
+
+        horizon = _COUNT_EXPANSION_HORIZON
+        if is_subdaily:
+            step = timedelta(seconds=_SUBDAILY_SECONDS[rule.freq] * rule.interval)
+            horizon = min(horizon, step * _SUBDAILY_COUNT_EXPANSION_STEPS)
+        if candidate - self.dtstart > horizon:
+            return False
+        occurrences = (
+            self._iter_subdaily_occurrences(self.dtstart, last)
+            if is_subdaily
+            else self._iter_period_occurrences(0, last)
+        )
+        return any(self._key(occurrence) == target for _, occurrence in zip(range(rule.count), occurrences))
+
+
+def _is_arithmetic(rrule: RecurrenceRule, dtstart: datetime) -> bool:
+    """Whether membership can be decided without enumerating occurrences."""
+    if rrule.freq not in (Frequency.DAILY, Frequency.WEEKLY, Frequency.MONTHLY, Frequency.YEARLY):
+        return False
+    if rrule.bysecond or rrule.byminute or rrule.byhour or rrule.bysetpos or rrule.byyearday or rrule.byweekno:
+        return False
+    if rrule.byday and any(ordinal != 0 for ordinal, _ in rrule.byday) and rrule.freq != Frequency.MONTHLY:
+        return False
+    if rrule.count is not None:
+        # COUNT maps to a period index only when every period yields exactly one occurrence
+        if rrule.byday or rrule.bymonthday or rrule.bymonth:
+            return False
+        if rrule.freq == Frequency.MONTHLY and dtstart.day > 28:
+            return False
+        if rrule.freq == Frequency.YEARLY and (dtstart.month, dtstart.day) == (2, 29):
+            return False
+    return True
+
+
+def compile_recurrence(
+    dtstart: datetime,
+    timezone: str,
+    is_all_day: bool,
+    recurrence: Recurrence | None,
+) -> CompiledRecurrence:
+    tz = ZoneInfo(timezone)
+    local_dtstart = dtstart.astimezone(tz).replace(tzinfo=None)
+
+    def to_key(value: datetime) -> datetime | date:
+        # All-day RDATE/EXDATE values carry no TZID, so their own date is the occurrence date
+        if is_all_day:
+            return value.date()
+        return value.astimezone(tz).replace(tzinfo=None)
+
+    if recurrence is None:
+        return CompiledRecurrence(
+            dtstart=local_dtstart,
+            timezone=timezone,
+            is_all_day=is_all_day,
+            rrule=None,
+            rdates=frozenset(),
+            exdates=frozenset(),
+            is_arithmetic=True,
+        )
+
+    return CompiledRecurrence(
+        dtstart=local_dtstart,
+        timezone=timezone,
+        is_all_day=is_all_day,
+        rrule=recurrence.rrule,
+        rdates=frozenset(to_key(rdate) for rdate in recurrence.rdate),
+        exdates=frozenset(to_key(exdate) for exdate in recurrence.exdate),
+        is_arithmetic=_is_arithmetic(recurrence.rrule, local_dtstart),
+    )
+
+
+type _CompiledRecurrenceSource = tuple[datetime, str, bool, Recurrence | None]
+
+_compiled_recurrence_cache: LRUCache[UUID, tuple[_CompiledRecurrenceSource, CompiledRecurrence]] = LRUCache(
+    maxsize=4096
+)
+
+
+def get_compiled_recurrence(
+    event_id: UUID,
+    dtstart: datetime,
+    timezone: str,
+    is_all_day: bool,
+    recurrence: Recurrence | None,
+) -> CompiledRecurrence:
+    """Return the compiled recurrence of an event, recompiling only when the event has changed."""
+    source = (dtstart, timezone, is_all_day, recurrence)
+    cached = _compiled_recurrence_cache.get(event_id)
+    if cached is not None and cached[0] == source:
+        return cached[1]
+
+    compiled = compile_recurrence(dtstart, timezone, is_all_day, recurrence)
+    _compiled_recurrence_cache.set(event_id, (source, compiled))
+    return compiled
@@ -24,3 +24,10 @@ def str_to_uuid(s: str) -> UUID:
         return uuid6.UUID(s)
     except ValueError:
         raise ValueError(f"Invalid UUID string format: {s}")
+
+
+def str_to_uuid_or_none(s: str) -> UUID | None:
+    try:
+        return uuid6.UUID(s)
+    except ValueError:
+        return None
@@ -1,19 +1,40 @@
-from typing import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
 
 from fastapi import FastAPI, Request, Response, status
 from mangum import Mangum
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api.main import api_router
+from app.core.constants.constants import FORECAST_JOB_WORKER
+from app.core.infrastructure.ml.client import ml_server_client
+from app.core.infrastructure.sqlalchemy.write_behind import action_log_write_behind
+from app.core.usecase.forecast_job import forecast_job_worker
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if action_log_write_behind is not None:
+        await action_log_write_behind.start_async()
+    if FORECAST_JOB_WORKER:
+        await forecast_job_worker.start_async()
+    yield
+    await forecast_job_worker.stop_async()
+    if action_log_write_behind is not None:
+        await action_log_write_behind.stop_async()
+    await ml_server_client.aclose_async()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 class CORSMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
         if request.method == "OPTIONS":
             response = Response(status_code=status.HTTP_204_NO_CONTENT)
-            response.headers["Access-Control-Allow-Headers"] = "content-type, x-amz-content-sha256, x-basic-auth"
+            response.headers["Access-Control-Allow-Headers"] = (
+                "content-type, if-none-match, x-amz-content-sha256, x-basic-auth"
+            )
             response.headers["Access-Control-Allow-Methods"] = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
         else:
             response = await call_next(request)
@@ -22,6 +43,7 @@ class CORSMiddleware(BaseHTTPMiddleware):
         if is_localhost:
             response.headers["Access-Control-Allow-Credentials"] = "true"
             response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Expose-Headers"] = "ETag"
         return response
 
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark creating recurring events one by one against bulk_create_events_async.
+
+Both paths run inside a transaction on the configured database for an existing host account and everything is rolled
+back afterwards. Run from the backend directory with the usual database environment, e.g.
+`uv run python -m scripts.benchmark_bulk_create_events --host-id <account id>`.
+"""
+
+import argparse
+import asyncio
+import inspect
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from app.core.dtos.event import Event as EventDto
+from app.core.infrastructure.sqlalchemy.db import async_engines, async_session
+from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
+from app.core.usecase.event import EventUsecase
+from app.core.utils.uuid import generate_uuid, str_to_uuid, uuid_to_str
+
+# Call the usecases without @rollbackable so that nothing is committed
+create_event_async: Callable[..., Awaitable[Any]] = inspect.unwrap(EventUsecase.create_event_async)
+bulk_create_events_async: Callable[..., Awaitable[Any]] = inspect.unwrap(EventUsecase.bulk_create_events_async)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark creating recurring events one by one and in bulk")
+
+    parser.add_argument(
+        "--host-id",
+        type=str,
+        required=True,
+        help="Account ID of an existing host that owns the created events",
+    )
+
+    parser.add_argument(
+        "--num-events",
+        type=int,
+        default=1_000,
+        help="Number of recurring events to create per run",
+    )
+
+    parser.add_argument(
+        "--distinct-rules",
+        type=int,
+        default=20,
+        help="Number of distinct recurrence lists shared by the events",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for event generation",
+    )
+
+    return parser.parse_args()
+
+
+def build_event_dtos(num_events: int, distinct_rules: int, rng: random.Random) -> list[EventDto]:
+    """Build weekly recurring events in the request shape, drawing their recurrence lists from a small pool."""
+    weekdays = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+    recurrence_lists = [
+        [
+            f"RRULE:FREQ=WEEKLY;COUNT={rng.randrange(1, 52)};INTERVAL={rng.randrange(1, 3)};"
+            f"BYDAY={','.join(rng.sample(weekdays, rng.randrange(1, 4)))};WKST=MO"
+        ]
+        for _ in range(distinct_rules)
+    ]
+    event_dtos = []
+    for _ in range(num_events):
+        dtstart = datetime(2025, 1, 1, tzinfo=UTC) + timedelta(days=rng.randrange(365), hours=rng.randrange(24))
+        event_dtos.append(
+            EventDto(
+                summary=f"Benchmark {uuid_to_str(generate_uuid())}",
+                location=None,
+                dtstart=dtstart,
+                dtend=dtstart + timedelta(hours=1),
+                is_all_day=False,
+                recurrence_list=rng.choice(recurrence_lists),
+                timezone="UTC",
+            )
+        )
+    return event_dtos
+
+
+async def time_one_by_one_async(usecase: EventUsecase, host_id: str, event_dtos: list[EventDto]) -> float:
+    start = time.perf_counter()
+    for event_dto in event_dtos:
+        response = await create_event_async(usecase, host_id=str_to_uuid(host_id), event_dto=event_dto)
+        assert not response.error_codes, response.error_codes
+    await usecase.uow.flush_async()
+    return time.perf_counter() - start
+
+
+async def time_bulk_async(usecase: EventUsecase, host_id: str, event_dtos: list[EventDto]) -> float:
+    start = time.perf_counter()
+    response = await bulk_create_events_async(usecase, host_id=str_to_uuid(host_id), event_dtos=event_dtos)
+    assert not response.error_codes, response.error_codes
+    assert all(not result.error_codes for result in response.results)
+    return time.perf_counter() - start
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for engine in async_engines.values():
+        engine.echo = False
+
+    rng = random.Random(args.seed)
+    print(f"create {args.num_events} recurring events ({args.distinct_rules} distinct recurrence lists)")
+    async with async_session() as session:
+        usecase = EventUsecase(uow=SqlalchemyUnitOfWork(session=session))
+        try:
+            one_by_one = await time_one_by_one_async(
+                usecase, args.host_id, build_event_dtos(args.num_events, args.distinct_rules, rng)
+            )
+            print(f"  create_event_async x{args.num_events}: {one_by_one * 1000:8.1f} ms")
+        finally:
+            await session.rollback()
+        try:
+            bulk = await time_bulk_async(
+                usecase, args.host_id, build_event_dtos(args.num_events, args.distinct_rules, rng)
+            )
+            print(f"  bulk_create_events_async:      {bulk * 1000:8.1f} ms  ({one_by_one / bulk:.1f}x)")
+        finally:
+            await session.rollback()
+
+
+def main() -> int:
+    """Main benchmark function."""
+    asyncio.run(main_async(parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark parsing an .ics export with IcsEventReader, as import_events_async does before inserting.
+
+Writes a synthetic calendar of the requested size to a temporary file, streams it through the reader in fixed-size
+chunks and reports throughput in events/sec along with the peak traced memory. No database is needed. Run from the
+backend directory, e.g. `uv run python -m scripts.benchmark_ics_import --size-mb 50`.
+"""
+
+import argparse
+import codecs
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TextIO
+
+from app.core.usecase.event import validate_event
+from app.core.utils.icalendar import IcsEventReader
+
+TIMEZONE_BLOCK = """BEGIN:VTIMEZONE\r
+TZID:Tokyo Standard Time\r
+BEGIN:STANDARD\r
+DTSTART:16010101T000000\r
+TZOFFSETFROM:+0900\r
+TZOFFSETTO:+0900\r
+END:STANDARD\r
+END:VTIMEZONE\r
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming .ics parsing for event import")
+
+    parser.add_argument(
+        "--size-mb",
+        type=int,
+        default=50,
+        help="Approximate size of the generated calendar in megabytes",
+    )
+
+    parser.add_argument(
+        "--chunk-bytes",
+        type=int,
+        default=1 << 16,
+        help="Size of the chunks fed to the reader",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for event generation",
+    )
+
+    return parser.parse_args()
+
+
+def write_calendar(file: TextIO, size_bytes: int, rng: random.Random) -> int:
+    """Write VEVENTs until the file reaches size_bytes and return how many were written."""
+    file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Benchmark//EN\r\nX-WR-TIMEZONE:Asia/Tokyo\r\n")
+    file.write(TIMEZONE_BLOCK)
+    weekdays = ["MO", "TU", "WE", "TH", "FR"]
+    written = 0
+    count = 0
+    while written < size_bytes:
+        dtstart = datetime(2025, 1, 1, 9, tzinfo=UTC) + timedelta(days=rng.randrange(365), hours=rng.randrange(8))
+        description = "Agenda: " + " ".join(f"item {i}" for i in range(rng.randrange(5, 40)))
+        vevent = (
+            "BEGIN:VEVENT\r\n"
+            f"UID:{count}@benchmark\r\n"
+            f"DTSTAMP:{dtstart.strftime('%Y%m%dT%H%M%SZ')}\r\n"
+            f"DTSTART;TZID=Tokyo Standard Time:{dtstart.strftime('%Y%m%dT%H%M%S')}\r\n"
+            "DURATION:PT1H\r\n"
+            f"SUMMARY:Meeting {count}\\, weekly\r\n"
+            "LOCATION:Room 1\r\n"
+            f"DESCRIPTION:{description[:70]}\r\n {description[70:]}\r\n"
+            f"RRULE:FREQ=WEEKLY;UNTIL=20251231T000000Z;BYDAY={rng.choice(weekdays)}\r\n"
+            f"EXDATE;TZID=Tokyo Standard Time:{(dtstart + timedelta(weeks=2)).strftime('%Y%m%dT%H%M%S')}\r\n"
+            "BEGIN:VALARM\r\nACTION:DISPLAY\r\nTRIGGER:-PT15M\r\nEND:VALARM\r\n"
+            "END:VEVENT\r\n"
+        )
+        file.write(vevent)
+        written += len(vevent)
+        count += 1
+    file.write("END:VCALENDAR\r\n")
+    return count
+
+
+def parse_calendar(path: Path, chunk_bytes: int) -> tuple[int, int]:
+    """Stream the calendar through the reader and return the numbers of valid and invalid events."""
+    reader = IcsEventReader()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    valid = invalid = 0
+    with path.open("rb") as file:
+        while chunk := file.read(chunk_bytes):
+            for properties in reader.feed(decoder.decode(chunk)):
+                try:
+                    validate_event(reader.to_event(properties))
+                    valid += 1
+                except (ValueError, KeyError):
+                    invalid += 1
+    for properties in reader.feed(decoder.decode(b"", final=True)) + reader.close():
+        try:
+            validate_event(reader.to_event(properties))
+            valid += 1
+        except (ValueError, KeyError):
+            invalid += 1
+    return valid, invalid
+
+
+def main() -> int:
+    """Main benchmark function."""
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "calendar.ics"
+        with path.open("w", newline="") as file:
+            count = write_calendar(file, args.size_mb << 20, random.Random(args.seed))
+        size_mb = path.stat().st_size / (1 << 20)
+
+        start = time.perf_counter()
+        valid, invalid = parse_calendar(path, args.chunk_bytes)
+        elapsed = time.perf_counter() - start
+
+        # Tracing slows parsing down several times, so memory is measured in a separate pass
+        tracemalloc.start()
+        parse_calendar(path, args.chunk_bytes)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"parse {size_mb:.1f} MB calendar ({count} events) in {args.chunk_bytes} byte chunks")
+    print(f"  valid: {valid}, invalid: {invalid}")
+    print(f"  elapsed: {elapsed:.2f} s ({(valid + invalid) / elapsed:,.0f} events/sec, {size_mb / elapsed:.1f} MB/s)")
+    print(f"  peak traced memory: {peak / (1 << 20):.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
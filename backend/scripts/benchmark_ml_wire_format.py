@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Benchmark the JSON and columnar wire formats of the attendance forecast request and response.
+
+Builds a synthetic ForecastAttendanceTimeRequest with the requested number of action logs and a response with one
+forecast per log, then sends both through an in-process httpx transport that decodes them on the other side, as
+request_attendance_time_forecast_async and the ML server do. Reports the payload size and the encode+transfer+decode
+time of each leg. No ML server is needed. Run from the backend directory, e.g.
+`uv run python -m scripts.benchmark_ml_wire_format --rows 1000000`.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import AsyncIterator
+from uuid import UUID
+
+import httpx
+
+from app.core.dtos.event import AttendanceTimeForecast, ForecastAttendanceTimeResponse
+from app.core.dtos.ml_dto.account import UserAccount
+from app.core.dtos.ml_dto.columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    ForecastAttendanceTimeResponseDecoder,
+    decode_forecast_attendance_time_request,
+    encode_forecast_attendance_time_request,
+    encode_forecast_attendance_time_response,
+)
+from app.core.dtos.ml_dto.event import Event, EventAttendanceActionLog
+from app.core.dtos.ml_dto.forecast import ForecastAttendanceTimeRequest
+from app.core.features.account import Gender
+from app.core.features.event import AttendanceAction
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the wire formats of the ML forecast payloads")
+
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1_000_000,
+        help="Number of action logs in the request, split between earliest attends and latest leaves",
+    )
+
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=1_000,
+        help="Number of users the logs belong to",
+    )
+
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=500,
+        help="Number of events the logs belong to",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for payload generation",
+    )
+
+    return parser.parse_args()
+
+
+def random_uuid(rng: random.Random) -> str:
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def build_payloads(
+    rows: int, user_count: int, event_count: int, rng: random.Random
+) -> tuple[ForecastAttendanceTimeRequest, ForecastAttendanceTimeResponse]:
+    """Build a request with rows action logs and a response with one forecast per log."""
+    base = datetime(2025, 1, 1, 9, tzinfo=UTC)
+    users = [
+        UserAccount(
+            id=random_uuid(rng),
+            user_id=user_id,
+            birth_date=datetime.combine(date(1970 + rng.randrange(40), 1, 1), datetime.min.time(), UTC),
+            gender=rng.choice(list(Gender)),
+        )
+        for user_id in range(user_count)
+    ]
+    events = [
+        Event(
+            id=random_uuid(rng),
+            user_id=rng.randrange(user_count),
+            dtstart=base + timedelta(days=rng.randrange(365)),
+            dtend=base + timedelta(days=rng.randrange(365), hours=1),
+            timezone="Asia/Tokyo",
+            recurrence=None,
+        )
+        for _ in range(event_count)
+    ]
+    logs: dict[AttendanceAction, list[EventAttendanceActionLog]] = {
+        AttendanceAction.ATTEND: [],
+        AttendanceAction.LEAVE: [],
+    }
+    forecasts: dict[int, dict[str, list[AttendanceTimeForecast]]] = {}
+    for i in range(rows):
+        action = AttendanceAction.ATTEND if i % 2 == 0 else AttendanceAction.LEAVE
+        user_id = rng.randrange(user_count)
+        event_id = events[rng.randrange(event_count)].id
+        start = base + timedelta(weeks=rng.randrange(52))
+        acted_at = start + timedelta(seconds=rng.randrange(3600))
+        logs[action].append(
+            EventAttendanceActionLog(
+                id=random_uuid(rng), user_id=user_id, event_id=event_id, start=start, action=action, acted_at=acted_at
+            )
+        )
+        forecasts.setdefault(user_id, {}).setdefault(event_id, []).append(
+            AttendanceTimeForecast(start=start, attended_at=acted_at, duration=rng.random() * 3600)
+        )
+    request = ForecastAttendanceTimeRequest(
+        is_delta=False,
+        context_len=None,
+        earliest_attend_data=logs[AttendanceAction.ATTEND],
+        latest_leave_data=logs[AttendanceAction.LEAVE],
+        event_data=events,
+        user_data=users,
+    )
+    response = ForecastAttendanceTimeResponse(attendance_time_forecasts=forecasts, error_codes=[])
+    return request, response
+
+
+async def send_json(
+    request: ForecastAttendanceTimeRequest, response: ForecastAttendanceTimeResponse
+) -> tuple[int, int, float, float]:
+    """Return the request and response sizes and the time of each leg in seconds."""
+    transferred = 0
+
+    async def handler(http_request: httpx.Request) -> httpx.Response:
+        nonlocal transferred
+        body = await http_request.aread()
+        transferred = len(body)
+        ForecastAttendanceTimeRequest.model_validate(json.loads(body))
+        handed_over.set_result(time.perf_counter())
+        return httpx.Response(
+            200, content=response.model_dump_json().encode(), headers={"Content-Type": "application/json"}
+        )
+
+    handed_over: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        start = time.perf_counter()
+        http_response = await client.post("http://ml/forecast/attendance", json=request.model_dump())
+        ForecastAttendanceTimeResponse.model_validate(http_response.json())
+        end = time.perf_counter()
+    return transferred, len(http_response.content), handed_over.result() - start, end - handed_over.result()
+
+
+async def send_columnar(
+    request: ForecastAttendanceTimeRequest, response: ForecastAttendanceTimeResponse
+) -> tuple[int, int, float, float]:
+    """Return the request and response sizes and the time of each leg in seconds."""
+    transferred = 0
+
+    async def content() -> AsyncIterator[bytes]:
+        for chunk in encode_forecast_attendance_time_request(request):
+            yield chunk
+
+    async def handler(http_request: httpx.Request) -> httpx.Response:
+        nonlocal transferred
+        assert isinstance(http_request.stream, httpx.AsyncByteStream)
+        chunks = []
+        async for chunk in http_request.stream:
+            chunks.append(chunk)
+            transferred += len(chunk)
+        decode_forecast_attendance_time_request(chunks)
+        handed_over.set_result(time.perf_counter())
+        return httpx.Response(
+            200,
+            content=b"".join(encode_forecast_attendance_time_response(response)),
+            headers={"Content-Type": COLUMNAR_MEDIA_TYPE},
+        )
+
+    handed_over: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+    received = 0
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        start = time.perf_counter()
+        async with client.stream(
+            "POST",
+            "http://ml/forecast/attendance",
+            content=content(),
+            headers={"Content-Type": COLUMNAR_MEDIA_TYPE, "Accept": COLUMNAR_MEDIA_TYPE},
+        ) as http_response:
+            decoder = ForecastAttendanceTimeResponseDecoder()
+            async for chunk in http_response.aiter_bytes():
+                received += len(chunk)
+                decoder.feed(chunk)
+            decoder.close()
+        end = time.perf_counter()
+    return transferred, received, handed_over.result() - start, end - handed_over.result()
+
+
+async def run(request: ForecastAttendanceTimeRequest, response: ForecastAttendanceTimeResponse) -> None:
+    for name, send in (("json", send_json), ("columnar", send_columnar)):
+        request_bytes, response_bytes, request_leg, response_leg = await send(request, response)
+        print(f"{name}:")
+        print(f"  request:  {request_bytes / (1 << 20):8.1f} MB in {request_leg:6.2f} s")
+        print(f"  response: {response_bytes / (1 << 20):8.1f} MB in {response_leg:6.2f} s")
+
+
+def main() -> int:
+    """Main benchmark function."""
+    args = parse_args()
+    request, response = build_payloads(args.rows, args.users, args.events, random.Random(args.seed))
+    print(f"{args.rows} action logs, {args.events} events, {args.users} users; times are encode+transfer+decode")
+    asyncio.run(run(request, response))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
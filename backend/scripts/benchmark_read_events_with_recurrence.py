@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Benchmark read_with_recurrence_by_user_ids_async under the joined and packed recurrence layouts.
+
+Seeds recurring events for a synthetic user inside a transaction on the configured database, times the read under
+both layouts and rolls everything back. Run from the backend directory with the usual database environment, e.g.
+`uv run python -m scripts.benchmark_read_events_with_recurrence`.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.core.domain.entities.event import Event as EventEntity
+from app.core.domain.entities.event import Recurrence as RecurrenceEntity
+from app.core.domain.entities.event import RecurrenceRule as RecurrenceRuleEntity
+from app.core.features.event import Frequency, Weekday
+from app.core.infrastructure.sqlalchemy.db import async_engines, async_session
+from app.core.infrastructure.sqlalchemy.models.shards.event import Event, Recurrence, RecurrenceRule
+from app.core.infrastructure.sqlalchemy.repositories.event import EventRepository
+from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
+from app.core.utils.uuid import generate_uuid
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark reading events with recurrences under the joined and packed layouts"
+    )
+
+    parser.add_argument(
+        "--num-events",
+        type=int,
+        default=10_000,
+        help="Number of recurring events to seed",
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timed runs per layout",
+    )
+
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=2**62,
+        help="Synthetic user ID that owns the seeded events; it must not belong to a real account",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for event generation",
+    )
+
+    return parser.parse_args()
+
+
+def build_events(num_events: int, user_id: int, rng: random.Random) -> list[EventEntity]:
+    """Build weekly recurring events shaped like the ones produced by create_event_async."""
+    weekdays = list(Weekday)
+    events = []
+    for _ in range(num_events):
+        dtstart = datetime(2025, 1, 1, 9, tzinfo=UTC) + timedelta(days=rng.randrange(365), hours=rng.randrange(12))
+        rrule = RecurrenceRuleEntity(
+            entity_id=generate_uuid(),
+            user_id=user_id,
+            freq=Frequency.WEEKLY,
+            until=None,
+            count=rng.randrange(1, 52),
+            interval=rng.randrange(1, 3),
+            bysecond=None,
+            byminute=None,
+            byhour=None,
+            byday=[(0, weekday) for weekday in rng.sample(weekdays, rng.randrange(1, 4))],
+            bymonthday=None,
+            byyearday=None,
+            byweekno=None,
+            bymonth=None,
+            bysetpos=None,
+            wkst=Weekday.MO,
+        )
+        recurrence = RecurrenceEntity(
+            entity_id=generate_uuid(),
+            user_id=user_id,
+            rrule_id=rrule.id,
+            rrule=rrule,
+            rdate=[],
+            exdate=[dtstart + timedelta(weeks=rng.randrange(1, 10))],
+        )
+        event_id = generate_uuid()
+        events.append(
+            EventEntity(
+                entity_id=event_id,
+                user_id=user_id,
+                summary=f"Benchmark {event_id}",
+                location=None,
+                dtstart=dtstart,
+                dtend=dtstart + timedelta(hours=1),
+                is_all_day=False,
+                recurrence_id=recurrence.id,
+                timezone="Asia/Tokyo",
+                recurrence=recurrence,
+            )
+        )
+    return events
+
+
+async def seed_async(session: AsyncSession, events: list[EventEntity]) -> None:
+    """Insert the events with their recurrences and rules, without committing."""
+    models: list[RecurrenceRule | Recurrence | Event] = []
+    for event in events:
+        assert event.recurrence is not None
+        models.append(RecurrenceRule.from_entity(event.recurrence.rrule))
+        models.append(Recurrence.from_entity(event.recurrence))
+        models.append(Event.from_entity(event))
+    session.add_all(models)
+    await session.flush()
+
+
+async def time_read_async(
+    session: AsyncSession, user_id: int, repeat: int, packed: bool, decode: bool
+) -> tuple[float, int]:
+    """Return the best wall time in seconds and the number of events read."""
+    EventRepository._packed_recurrence_reads = packed
+    event_repository = EventRepository(SqlalchemyUnitOfWork(session=session))
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        # Start from an empty identity map so that every run builds its rows from scratch
+        session.expunge_all()
+        start = time.perf_counter()
+        events = await event_repository.read_with_recurrence_by_user_ids_async({user_id})
+        if decode:
+            for event in events:
+                assert event.recurrence is not None
+        best = min(best, time.perf_counter() - start)
+        count = len(events)
+    return best, count
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for engine in async_engines.values():
+        engine.echo = False
+
+    events = build_events(args.num_events, args.user_id, random.Random(args.seed))
+    async with async_session() as session:
+        try:
+            await seed_async(session, events)
+            print(f"read_with_recurrence_by_user_ids_async ({args.num_events} events)")
+            for decode in (False, True):
+                joined, count = await time_read_async(session, args.user_id, args.repeat, packed=False, decode=decode)
+                packed, _ = await time_read_async(session, args.user_id, args.repeat, packed=True, decode=decode)
+                label = "read + decode" if decode else "read"
+                print(f"  {label} ({count} rows)")
+                print(f"    joined: {joined * 1000:8.1f} ms")
+                print(f"    packed: {packed * 1000:8.1f} ms  ({joined / packed:.1f}x)")
+        finally:
+            await session.rollback()
+
+
+def main() -> int:
+    """Main benchmark function."""
+    asyncio.run(main_async(parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Benchmark serialize_events over recurring events with cold and warm recurrence caches.
+
+Run from the backend directory, e.g. `DB_SHARD_COUNT=1 uv run python -m scripts.benchmark_serialize_events`.
+"""
+
+import argparse
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.core.domain.entities.event import Event as EventEntity
+from app.core.domain.entities.event import Recurrence as RecurrenceEntity
+from app.core.domain.entities.event import RecurrenceRule as RecurrenceRuleEntity
+from app.core.features.event import Frequency, Weekday
+from app.core.usecase.event import _recurrence_list_cache, serialize_events
+from app.core.utils.icalendar import _parse_rdate_exdate_line, parse_recurrence, parse_rrule
+from app.core.utils.uuid import generate_uuid
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark serialize_events with and without the recurrence caches")
+
+    parser.add_argument(
+        "--num-events",
+        type=int,
+        default=10_000,
+        help="Number of recurring events to serialize",
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timed runs per mode",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for event generation",
+    )
+
+    return parser.parse_args()
+
+
+def build_events(num_events: int, rng: random.Random) -> set[EventEntity]:
+    """Build recurring events shaped like the ones produced by create_event_async.
+
+    Args:
+        num_events: Number of events to build.
+        rng: Random number generator.
+
+    Returns:
+        Set of event entities with joined recurrence and recurrence rule.
+    """
+    weekdays = list(Weekday)
+    updated_at = datetime(2025, 1, 1, tzinfo=UTC)
+    events = set()
+    for _ in range(num_events):
+        dtstart = datetime(2025, 1, 1, 9, tzinfo=UTC) + timedelta(days=rng.randrange(365), hours=rng.randrange(12))
+        rrule = RecurrenceRuleEntity(
+            entity_id=generate_uuid(),
+            user_id=0,
+            freq=Frequency.WEEKLY,
+            until=None,
+            count=rng.randrange(1, 52),
+            interval=rng.randrange(1, 3),
+            bysecond=None,
+            byminute=None,
+            byhour=None,
+            byday=[(0, weekday) for weekday in rng.sample(weekdays, rng.randrange(1, 4))],
+            bymonthday=None,
+            byyearday=None,
+            byweekno=None,
+            bymonth=None,
+            bysetpos=None,
+            wkst=Weekday.MO,
+        )
+        recurrence = RecurrenceEntity(
+            entity_id=generate_uuid(),
+            user_id=0,
+            rrule_id=rrule.id,
+            rrule=rrule,
+            rdate=[],
+            exdate=[dtstart + timedelta(weeks=rng.randrange(1, 10))],
+        )
+        events.add(
+            EventEntity(
+                entity_id=generate_uuid(),
+                user_id=0,
+                summary="Benchmark",
+                location=None,
+                dtstart=dtstart,
+                dtend=dtstart + timedelta(hours=1),
+                is_all_day=False,
+                recurrence_id=recurrence.id,
+                timezone="Asia/Tokyo",
+                recurrence=recurrence,
+                updated_at=updated_at,
+            )
+        )
+    return events
+
+
+def time_serialize(events: set[EventEntity], repeat: int, warm: bool) -> float:
+    """Return the best wall time of serialize_events in seconds."""
+    best = float("inf")
+    if warm:
+        serialize_events(events)
+    for _ in range(repeat):
+        if not warm:
+            _recurrence_list_cache.clear()
+        start = time.perf_counter()
+        serialize_events(events)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_parse(recurrence_lists: list[list[str]], repeat: int, warm: bool) -> float:
+    """Return the best wall time of parse_recurrence over all recurrence lists in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        if not warm:
+            parse_rrule.cache_clear()
+            _parse_rdate_exdate_line.cache_clear()
+        start = time.perf_counter()
+        for recurrence_list in recurrence_lists:
+            parse_recurrence(recurrence_list, False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    """Main benchmark function."""
+    args = parse_args()
+    events = build_events(args.num_events, random.Random(args.seed))
+
+    cold = time_serialize(events, args.repeat, warm=False)
+    warm = time_serialize(events, args.repeat, warm=True)
+    print(f"serialize_events ({args.num_events} events)")
+    print(f"  uncached: {cold * 1000:8.1f} ms")
+    print(f"  cached:   {warm * 1000:8.1f} ms  ({cold / warm:.1f}x)")
+
+    recurrence_lists = [dto.recurrence_list for dto in serialize_events(events)]
+    cold = time_parse(recurrence_lists, args.repeat, warm=False)
+    warm = time_parse(recurrence_lists, args.repeat, warm=True)
+    print(f"parse_recurrence ({len(recurrence_lists)} recurrence lists)")
+    print(f"  uncached: {cold * 1000:8.1f} ms")
+    print(f"  cached:   {warm * 1000:8.1f} ms  ({cold / warm:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark the in-process statistical attendance forecaster.
+
+Builds a synthetic ForecastAttendanceTimeRequest of weekly series, one per (user, event) pair, with an earliest attend
+and a latest leave per occurrence, and times forecast_attendance_time_statistically on it. No ML server or database is
+needed. Run from the backend directory, e.g.
+`uv run python -m scripts.benchmark_statistical_forecast --series 100000 --occurrences 16`.
+"""
+
+import argparse
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.core.dtos.ml_dto.event import Event, EventAttendanceActionLog
+from app.core.dtos.ml_dto.forecast import ForecastAttendanceTimeRequest
+from app.core.features.event import AttendanceAction
+from app.core.infrastructure.ml.statistical import forecast_attendance_time_statistically
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the statistical attendance forecaster")
+
+    parser.add_argument(
+        "--series",
+        type=int,
+        default=100_000,
+        help="Number of (user, event) series to forecast",
+    )
+
+    parser.add_argument(
+        "--occurrences",
+        type=int,
+        default=16,
+        help="Number of past occurrences of each series",
+    )
+
+    parser.add_argument(
+        "--horizon-len",
+        type=int,
+        default=4,
+        help="Number of future occurrences forecast per series",
+    )
+
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.3,
+        help="Smoothing factor of the EWMA",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for request generation",
+    )
+
+    return parser.parse_args()
+
+
+def build_request(series: int, occurrences: int, rng: random.Random) -> ForecastAttendanceTimeRequest:
+    """Build a request of series weekly series with occurrences occurrences each; 10 series share an event.
+
+    The logs are built without validation, which would take longer than the forecast.
+    """
+    base = datetime(2025, 1, 6, 9, tzinfo=UTC)
+    events = [
+        Event(
+            id=f"event-{i}",
+            user_id=0,
+            dtstart=base + timedelta(days=i % 7),
+            dtend=base + timedelta(days=i % 7, hours=1),
+            timezone="Asia/Tokyo",
+            recurrence=None,
+        )
+        for i in range((series + 9) // 10)
+    ]
+    attends: list[EventAttendanceActionLog] = []
+    leaves: list[EventAttendanceActionLog] = []
+    for i in range(series):
+        event = events[i // 10]
+        for week in range(occurrences):
+            start = event.dtstart + timedelta(weeks=week)
+            attended_at = start + timedelta(seconds=rng.randrange(-600, 600))
+            for action, acted_at, logs in (
+                (AttendanceAction.ATTEND, attended_at, attends),
+                (AttendanceAction.LEAVE, attended_at + timedelta(seconds=rng.randrange(1800, 5400)), leaves),
+            ):
+                logs.append(
+                    EventAttendanceActionLog.model_construct(
+                        id=f"{i}-{week}-{action.value}",
+                        user_id=i % 10,
+                        event_id=event.id,
+                        start=start,
+                        action=action,
+                        acted_at=acted_at,
+                    )
+                )
+    return ForecastAttendanceTimeRequest.model_construct(
+        is_delta=False,
+        context_len=None,
+        earliest_attend_data=attends,
+        latest_leave_data=leaves,
+        event_data=events,
+        user_data=[],
+    )
+
+
+def main() -> int:
+    """Main benchmark function."""
+    args = parse_args()
+    request = build_request(args.series, args.occurrences, random.Random(args.seed))
+    print(f"{args.series} series, {args.occurrences} occurrences each, horizon length {args.horizon_len}")
+
+    start = time.perf_counter()
+    response = forecast_attendance_time_statistically(request, args.horizon_len, args.alpha)
+    elapsed = time.perf_counter() - start
+
+    forecast_count = sum(
+        len(forecasts) for by_event in response.attendance_time_forecasts.values() for forecasts in by_event.values()
+    )
+    print(f"{forecast_count} forecasts in {elapsed:.2f} s ({args.series / elapsed:.0f} series/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Export the production attendance data as a LiT! dataset.
+
+Every (user_id, event_id) series becomes an entity named <user_id>_<event_id>, as in the ML package's feature store.
+numerical/<entity>.csv has the start_date, end_date, attended_at and left_at of each attended occurrence, with
+attended_at (the earliest attend) and left_at (the latest leave, or attended_at without one) in minutes after the
+start. textual/<entity>.csv has the start_date, end_date and tms of each goal and review of its occurrences. Dates are
+in UTC.
+
+Shards are exported in parallel, a page of series at a time, so memory is bounded by --page-series whatever the size
+of the tables. After each page, <output>/progress/<shard>.json records the last exported series and a rerun resumes
+from there; --restart exports every shard again. Needs the database settings of the app. Run from the backend
+directory, e.g. `uv run python -m scripts.export_lit_dataset --output ../ml/data/lit`.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from app.core.infrastructure.db.settings import SHARD_DB_CONNECTION_KEYS
+from app.core.infrastructure.sqlalchemy.db import async_session
+from app.core.infrastructure.sqlalchemy.repositories.event import (
+    EventAttendanceActionLogRepository,
+    EventGoalRepository,
+    EventRepository,
+    EventReviewRepository,
+)
+from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
+from app.core.utils.uuid import UUID, str_to_uuid
+
+SeriesKey = tuple[int, UUID]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Export the production attendance data as a LiT! dataset")
+
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Directory of the dataset",
+    )
+
+    parser.add_argument(
+        "--page-series",
+        type=int,
+        default=100,
+        help="Number of series read from a shard at a time",
+    )
+
+    parser.add_argument(
+        "--shards",
+        nargs="+",
+        choices=SHARD_DB_CONNECTION_KEYS,
+        default=list(SHARD_DB_CONNECTION_KEYS),
+        help="Shards to export (defaults to all)",
+    )
+
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the recorded progress and export the shards from the beginning",
+    )
+
+    return parser.parse_args()
+
+
+def format_date(value: datetime) -> str:
+    """Format a datetime as a naive UTC date of the dataset."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.isoformat(sep=" ")
+
+
+def minutes_after(value: datetime, start: datetime) -> float:
+    return (value - start).total_seconds() / 60
+
+
+def write_atomically(path: Path, write: Any) -> None:
+    """Write a file through a temporary one, so a killed export never leaves it truncated."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with tmp.open("w", newline="") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def write_csv(path: Path, header: tuple[str, ...], rows: list[tuple[Any, ...]]) -> None:
+    def write(f: Any) -> None:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+    write_atomically(path, write)
+
+
+def read_progress(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {"after": None, "done": False, "entities": 0}
+    progress: dict[str, Any] = json.loads(path.read_text())
+    return progress
+
+
+def write_progress(path: Path, progress: dict[str, Any]) -> None:
+    write_atomically(path, lambda f: json.dump(progress, f))
+
+
+def write_page(
+    output: Path,
+    numerical: dict[SeriesKey, list[tuple[str, str, float, float]]],
+    textual: dict[SeriesKey, list[tuple[str, str, str]]],
+) -> None:
+    """Write the files of the attended series of a page; series that were never attended have no numerical data."""
+    for (user_id, event_id), rows in numerical.items():
+        entity = f"{user_id}_{event_id}"
+        write_csv(output / "numerical" / f"{entity}.csv", ("start_date", "end_date", "attended_at", "left_at"), rows)
+        if (user_id, event_id) in textual:
+            write_csv(
+                output / "textual" / f"{entity}.csv",
+                ("start_date", "end_date", "tms"),
+                sorted(textual[(user_id, event_id)]),
+            )
+
+
+async def export_page_async(
+    output: Path, shard_id: str, after: SeriesKey | None, page_series: int
+) -> tuple[SeriesKey | None, int]:
+    """Export the page of series on the shard that comes after the given one.
+
+    Returns:
+        The last series of the page, or None when there was none left, and the number of entities written.
+    """
+    async with async_session() as session:
+        uow = SqlalchemyUnitOfWork(session=session)
+        action_log_repository = EventAttendanceActionLogRepository(uow)
+        keys = await action_log_repository.read_series_page_async(shard_id, after, page_series)
+        if not keys:
+            return None, 0
+        first, last = keys[0], keys[-1]
+        edges = await action_log_repository.read_occurrence_edges_by_series_range_async(shard_id, first, last)
+        goals = await EventGoalRepository(uow).read_by_series_range_async(shard_id, first, last)
+        reviews = await EventReviewRepository(uow).read_by_series_range_async(shard_id, first, last)
+        events = await EventRepository(uow).read_with_recurrence_by_ids_async({event_id for _, event_id in keys})
+
+    lengths = {event.id: event.dtend - event.dtstart for event in events}
+    numerical: dict[SeriesKey, list[tuple[str, str, float, float]]] = defaultdict(list)
+    for user_id, event_id, start, attended_at, left_at in edges:
+        if attended_at is None:
+            continue
+        numerical[(user_id, event_id)].append(
+            (
+                format_date(start),
+                format_date(start + lengths.get(event_id, timedelta())),
+                minutes_after(attended_at, start),
+                minutes_after(left_at if left_at is not None else attended_at, start),
+            )
+        )
+    textual: dict[SeriesKey, list[tuple[str, str, str]]] = defaultdict(list)
+    texts = [(goal.user_id, goal.event_id, goal.start, goal.goal_text) for goal in goals] + [
+        (review.user_id, review.event_id, review.start, review.review_text) for review in reviews
+    ]
+    for user_id, event_id, text_start, text in texts:
+        textual[(user_id, event_id)].append(
+            (format_date(text_start), format_date(text_start + lengths.get(event_id, timedelta())), text)
+        )
+
+    await asyncio.to_thread(write_page, output, numerical, textual)
+    return last, len(numerical)
+
+
+async def export_shard_async(output: Path, shard_id: str, page_series: int, restart: bool) -> int:
+    """Export the series of a shard from its recorded progress, recording it after every page.
+
+    Returns:
+        The number of entities exported from the shard in total.
+    """
+    progress_path = output / "progress" / f"{shard_id}.json"
+    progress: dict[str, Any] = (
+        {"after": None, "done": False, "entities": 0} if restart else read_progress(progress_path)
+    )
+    after: SeriesKey | None = (
+        (progress["after"][0], str_to_uuid(progress["after"][1])) if progress["after"] is not None else None
+    )
+    while not progress["done"]:
+        last, entities = await export_page_async(output, shard_id, after, page_series)
+        if last is None:
+            progress["done"] = True
+        else:
+            after = last
+            progress["after"] = [last[0], str(last[1])]
+            progress["entities"] += entities
+        await asyncio.to_thread(write_progress, progress_path, progress)
+    entity_count: int = progress["entities"]
+    return entity_count
+
+
+async def export(output: Path, shard_ids: list[str], page_series: int, restart: bool) -> list[int]:
+    for name in ("numerical", "textual", "progress"):
+        (output / name).mkdir(parents=True, exist_ok=True)
+    return await asyncio.gather(*(export_shard_async(output, shard_id, page_series, restart) for shard_id in shard_ids))
+
+
+def main() -> int:
+    """Main export function."""
+    args = parse_args()
+    start = time.perf_counter()
+    entity_counts = asyncio.run(export(args.output, args.shards, args.page_series, args.restart))
+    elapsed = time.perf_counter() - start
+    for shard_id, entity_count in zip(args.shards, entity_counts):
+        print(f"{shard_id}: {entity_count} entities")
+    print(f"{sum(entity_counts)} entities in {args.output} ({elapsed:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Materialize the attendance feature store from the action logs.
+
+Updates the store with the series that got a log since its last update, or builds it from every series the first
+time; the ML package's LitDataset reads it from <data_path>/features. Needs the database settings of the app. Run from
+the backend directory, e.g. `uv run python -m scripts.materialize_attendance_features --directory ./features`.
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from app.core.constants.constants import FEATURE_STORE_DIR
+from app.core.infrastructure.ml.feature_store import AttendanceFeatures
+from app.core.infrastructure.sqlalchemy.db import async_session
+from app.core.infrastructure.sqlalchemy.unit_of_work import SqlalchemyUnitOfWork
+from app.core.usecase.event import EventUsecase
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Materialize the attendance feature store")
+
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        default=Path(FEATURE_STORE_DIR) if FEATURE_STORE_DIR is not None else None,
+        help="Directory of the feature store (defaults to FEATURE_STORE_DIR)",
+    )
+
+    return parser.parse_args()
+
+
+async def materialize(directory: Path) -> AttendanceFeatures:
+    async with async_session() as session:
+        uow = SqlalchemyUnitOfWork(session=session)
+        return await EventUsecase(uow=uow).materialize_attendance_features_async(directory)
+
+
+def main() -> int:
+    """Main materialization function."""
+    args = parse_args()
+    if args.directory is None:
+        print("No feature store directory given and FEATURE_STORE_DIR is not set")
+        return 1
+
+    start = time.perf_counter()
+    features = asyncio.run(materialize(args.directory))
+    elapsed = time.perf_counter() - start
+    print(f"{len(features)} series, {len(features.start)} occurrences in {args.directory} ({elapsed:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Local stand-in for the ML server, for exercising the backend's ML client without the real model.
+
+Serves POST /forecast/attendance in both the JSON and the columnar wire format and answers with a naive forecast:
+one occurrence a week after the latest one of every series, attended at the mean offset and for the mean duration
+seen so far. Latency, failures and JSON-only mode can be injected to see the retries, hedging and circuit breaker at
+work. Run from the backend directory, e.g. `uv run python -m scripts.ml_server_stub --port 8001 --failure-rate 0.3`,
+and point ML_SERVER_URL at it.
+"""
+
+import argparse
+import asyncio
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from statistics import fmean
+
+import uvicorn
+from fastapi import FastAPI, Request, Response, status
+
+from app.core.dtos.event import AttendanceTimeForecast, ForecastAttendanceTimeResponse
+from app.core.dtos.ml_dto.columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    decode_forecast_attendance_time_request,
+    encode_forecast_attendance_time_response,
+)
+from app.core.dtos.ml_dto.forecast import ForecastAttendanceTimeRequest
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run a stub ML server for local testing")
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Host to bind",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8001,
+        help="Port to bind",
+    )
+
+    parser.add_argument(
+        "--latency-ms",
+        type=int,
+        default=0,
+        help="Delay before every response",
+    )
+
+    parser.add_argument(
+        "--jitter-ms",
+        type=int,
+        default=0,
+        help="Random extra delay of up to this many milliseconds",
+    )
+
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests answered with 503 Service Unavailable",
+    )
+
+    parser.add_argument(
+        "--json-only",
+        action="store_true",
+        help="Answer columnar requests with 415 Unsupported Media Type",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for injected latency and failures",
+    )
+
+    return parser.parse_args()
+
+
+def forecast(request: ForecastAttendanceTimeRequest) -> ForecastAttendanceTimeResponse:
+    """Forecast the next weekly occurrence of every series in the request."""
+    attended: defaultdict[tuple[int, str], dict[datetime, datetime]] = defaultdict(dict)
+    for log in request.earliest_attend_data:
+        attended[(log.user_id, log.event_id)][log.start] = log.acted_at
+    durations: defaultdict[tuple[int, str], list[float]] = defaultdict(list)
+    for log in request.latest_leave_data:
+        attended_at = attended.get((log.user_id, log.event_id), {}).get(log.start)
+        if attended_at is not None:
+            durations[(log.user_id, log.event_id)].append((log.acted_at - attended_at).total_seconds())
+
+    forecasts: defaultdict[int, dict[str, list[AttendanceTimeForecast]]] = defaultdict(dict)
+    for (user_id, event_id), attended_at_by_start in attended.items():
+        offset = fmean((acted_at - start).total_seconds() for start, acted_at in attended_at_by_start.items())
+        start = max(attended_at_by_start) + timedelta(weeks=1)
+        forecasts[user_id][event_id] = [
+            AttendanceTimeForecast(
+                start=start,
+                attended_at=start + timedelta(seconds=offset),
+                duration=fmean(durations[(user_id, event_id)]) if durations[(user_id, event_id)] else 0.0,
+            )
+        ]
+    return ForecastAttendanceTimeResponse(attendance_time_forecasts=dict(forecasts), error_codes=[])
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(args.seed)
+
+    @app.post("/forecast/attendance")
+    async def forecast_attendance(request: Request) -> Response:
+        await asyncio.sleep((args.latency_ms + rng.uniform(0, args.jitter_ms)) / 1000)
+        if rng.random() < args.failure_rate:
+            return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        if request.headers.get("Content-Type", "").startswith(COLUMNAR_MEDIA_TYPE):
+            if args.json_only:
+                return Response(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+            forecast_request = decode_forecast_attendance_time_request([chunk async for chunk in request.stream()])
+        else:
+            forecast_request = ForecastAttendanceTimeRequest.model_validate_json(await request.body())
+
+        forecast_response = forecast(forecast_request)
+        if COLUMNAR_MEDIA_TYPE in request.headers.get("Accept", ""):
+            return Response(
+                content=b"".join(encode_forecast_attendance_time_response(forecast_response)),
+                media_type=COLUMNAR_MEDIA_TYPE,
+            )
+        return Response(content=forecast_response.model_dump_json(), media_type="application/json")
+
+    return app
+
+
+def main() -> int:
+    """Main stub server function."""
+    args = parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
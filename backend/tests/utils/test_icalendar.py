@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.core.features.event import Event
+from app.core.utils.icalendar import ICS_MAX_EVENT_PROPERTIES, IcsEventReader
+
+UTC = ZoneInfo("UTC")
+
+
+def read_events(*vevent_lines: str, header: tuple[str, ...] = ()) -> list[Event]:
+    reader = IcsEventReader()
+    lines = ["BEGIN:VCALENDAR", *header, "BEGIN:VEVENT", *vevent_lines, "END:VEVENT", "END:VCALENDAR"]
+    properties = reader.feed("\r\n".join(lines) + "\r\n") + reader.close()
+    return [reader.to_event(event_properties) for event_properties in properties]
+
+
+class TestIcsEventReader(unittest.TestCase):
+    def test_utc_dtstart(self) -> None:
+        (event,) = read_events("SUMMARY:Standup", "DTSTART:20240101T090000Z", "DTEND:20240101T093000Z")
+        self.assertEqual(event.dtstart, datetime(2024, 1, 1, 9, 0, tzinfo=UTC))
+        self.assertEqual(event.dtend, datetime(2024, 1, 1, 9, 30, tzinfo=UTC))
+        self.assertEqual(event.timezone, "UTC")
+        self.assertFalse(event.is_all_day)
+
+    def test_tzid_dtstart(self) -> None:
+        (event,) = read_events(
+            "SUMMARY:Standup",
+            "DTSTART;TZID=Asia/Tokyo:20240101T090000",
+            "DURATION:PT30M",
+        )
+        self.assertEqual(event.dtstart, datetime(2024, 1, 1, 0, 0, tzinfo=UTC))
+        self.assertEqual(event.dtend, datetime(2024, 1, 1, 0, 30, tzinfo=UTC))
+        self.assertEqual(event.timezone, "Asia/Tokyo")
+
+    def test_tzid_from_vtimezone(self) -> None:
+        (event,) = read_events(
+            "SUMMARY:Standup",
+            "DTSTART;TZID=Tokyo Standard Time:20240101T090000",
+            header=(
+                "BEGIN:VTIMEZONE",
+                "TZID:Tokyo Standard Time",
+                "BEGIN:STANDARD",
+                "TZOFFSETTO:+0900",
+                "END:STANDARD",
+                "END:VTIMEZONE",
+            ),
+        )
+        self.assertEqual(event.dtstart, datetime(2024, 1, 1, 0, 0, tzinfo=UTC))
+        self.assertEqual(event.timezone, "Etc/GMT-9")
+
+    def test_all_day_dtstart(self) -> None:
+        (event,) = read_events(
+            "SUMMARY:Holiday",
+            "DTSTART;VALUE=DATE:20240101",
+            header=("X-WR-TIMEZONE:Asia/Tokyo",),
+        )
+        self.assertTrue(event.is_all_day)
+        self.assertEqual(event.timezone, "Asia/Tokyo")
+        self.assertEqual(event.dtstart, datetime(2023, 12, 31, 15, 0, tzinfo=UTC))
+        self.assertEqual(event.dtend, datetime(2024, 1, 1, 15, 0, tzinfo=UTC))
+
+    def test_too_many_properties(self) -> None:
+        with self.assertRaises(ValueError):
+            read_events(
+                "SUMMARY:Spam",
+                "DTSTART:20240101T090000Z",
+                *(f"X-SPAM:{i}" for i in range(ICS_MAX_EVENT_PROPERTIES)),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
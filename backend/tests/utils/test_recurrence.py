@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.core.utils.icalendar import parse_recurrence
+from app.core.utils.recurrence import CompiledRecurrence, compile_recurrence
+
+UTC = ZoneInfo("UTC")
+TOKYO = ZoneInfo("Asia/Tokyo")
+
+# Monday
+DTSTART = datetime(2024, 1, 1, 9, 0, tzinfo=TOKYO)
+
+
+def compile_rrule(rrule: str, dtstart: datetime = DTSTART, is_all_day: bool = False) -> CompiledRecurrence:
+    return compile_recurrence(dtstart, "Asia/Tokyo", is_all_day, parse_recurrence([f"RRULE:{rrule}"], is_all_day))
+
+
+class TestContains(unittest.TestCase):
+    def test_without_recurrence(self) -> None:
+        compiled = compile_recurrence(DTSTART, "Asia/Tokyo", False, None)
+        self.assertTrue(compiled.contains(DTSTART.astimezone(UTC)))
+        self.assertFalse(compiled.contains(DTSTART + timedelta(days=1)))
+
+    def test_count(self) -> None:
+        compiled = compile_rrule("FREQ=DAILY;COUNT=3")
+        self.assertTrue(compiled.contains(DTSTART + timedelta(days=2)))
+        self.assertFalse(compiled.contains(DTSTART + timedelta(days=3)))
+
+    def test_count_by_expansion(self) -> None:
+        compiled = compile_rrule("FREQ=WEEKLY;BYDAY=TU,TH;COUNT=4")
+        self.assertTrue(compiled.contains(DTSTART + timedelta(days=1)))
+        # 4th occurrence: Thursday of the second week
+        self.assertTrue(compiled.contains(DTSTART + timedelta(days=10)))
+        self.assertFalse(compiled.contains(DTSTART + timedelta(days=15)))
+        self.assertFalse(compiled.contains(DTSTART + timedelta(days=2)))
+
+    def test_until(self) -> None:
+        compiled = compile_rrule("FREQ=WEEKLY;UNTIL=20240115T000000")
+        self.assertTrue(compiled.contains(DTSTART + timedelta(weeks=1)))
+        self.assertFalse(compiled.contains(DTSTART + timedelta(weeks=2)))
+
+    def test_until_by_expansion(self) -> None:
+        compiled = compile_rrule("FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1;UNTIL=20240301T000000")
+        self.assertTrue(compiled.contains(datetime(2024, 2, 29, 9, 0, tzinfo=TOKYO)))
+        self.assertFalse(compiled.contains(datetime(2024, 2, 28, 9, 0, tzinfo=TOKYO)))
+        self.assertFalse(compiled.contains(datetime(2024, 3, 29, 9, 0, tzinfo=TOKYO)))
+
+    def test_impossible_rule(self) -> None:
+        for rrule in (
+            "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=30;COUNT=5",
+            "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=30",
+            "FREQ=MINUTELY;INTERVAL=2;BYMINUTE=1;COUNT=5",
+        ):
+            with self.subTest(rrule=rrule):
+                compiled = compile_rrule(rrule)
+                self.assertFalse(compiled.contains(datetime(2024, 2, 29, 9, 0, tzinfo=TOKYO)))
+                self.assertFalse(compiled.contains(datetime(9999, 12, 31, 9, 0, tzinfo=UTC)))
+
+    def test_far_future_start(self) -> None:
+        compiled = compile_rrule("FREQ=MONTHLY;BYDAY=-1FR")
+        self.assertTrue(compiled.contains(datetime(9999, 12, 31, 9, 0, tzinfo=TOKYO)))
+        self.assertFalse(compiled.contains(datetime(9999, 12, 24, 9, 0, tzinfo=TOKYO)))
+        self.assertFalse(
+            compile_rrule("FREQ=WEEKLY;BYDAY=FR;COUNT=3").contains(datetime(9999, 12, 31, 9, 0, tzinfo=TOKYO))
+        )
+
+    def test_all_day(self) -> None:
+        compiled = compile_rrule("FREQ=WEEKLY;BYDAY=MO,FR;COUNT=3", datetime(2024, 1, 1, tzinfo=UTC), is_all_day=True)
+        self.assertTrue(compiled.contains(datetime(2024, 1, 8, tzinfo=UTC)))
+        self.assertFalse(compiled.contains(datetime(2024, 1, 12, tzinfo=UTC)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ from multimodal_timesfm.cross_validation import (
 )
 from torch.utils.data import ConcatDataset, Dataset
 
+from core.feature_store import open_feature_store
 from core.lit_dataset import LitDataset
 
 
@@ -50,7 +51,7 @@ def _lit_dataset_factory(
 
 
 def get_all_entities(data_path: Path) -> list[str]:
-    """Get all available entities from the LiT! dataset.
+    """Get all available entities from the LiT! dataset, including those of its feature store.
 
     Args:
         data_path: Root directory containing LiT! dataset.
@@ -59,16 +60,16 @@ def get_all_entities(data_path: Path) -> list[str]:
         List of entity names.
     """
     numerical_dir = data_path / "numerical"
-    if not numerical_dir.exists():
+    feature_store = open_feature_store(data_path / "features")
+    if not numerical_dir.exists() and feature_store is None:
         raise FileNotFoundError(f"Numerical data directory not found: {numerical_dir}")
 
-    entities = []
+    entities = set(feature_store.entities()) if feature_store is not None else set()
     for csv_file in numerical_dir.glob("*.csv"):
         entity_name = csv_file.stem
-        entities.append(entity_name)
+        entities.add(entity_name)
 
-    entities.sort()  # Sort for consistency
-    return entities
+    return sorted(entities)  # Sort for consistency
 
 
 def get_cross_validation_splits(
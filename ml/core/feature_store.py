@@ -0,0 +1,128 @@
+"""Reader of the attendance feature store materialized by the backend.
+
+The backend (app/core/infrastructure/ml/feature_store.py) writes each version of the store as a directory of .npy
+columns and points the CURRENT file at it. Per series, sorted by (user_id, event_id): user_id, event_id, updated_at
+and offsets, where offsets[i]:offsets[i + 1] are the occurrences of series i. Per occurrence, sorted by start within a
+series: start and end in seconds since the epoch, attended_at and left_at in minutes after start (left_at is NaN
+without a leave), duration in seconds and the local weekday.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+
+_COLUMNS = (
+    "user_id",
+    "event_id",
+    "updated_at",
+    "offsets",
+    "start",
+    "end",
+    "attended_at",
+    "left_at",
+    "duration",
+    "weekday",
+)
+
+
+def entity_name(user_id: int, event_id: str) -> str:
+    """Returns the LiT! entity name of a (user_id, event_id) series.
+
+    Args:
+        user_id: User ID of the series.
+        event_id: Event ID of the series.
+
+    Returns:
+        Entity name.
+    """
+    return f"{user_id}_{event_id}"
+
+
+class AttendanceFeatureStore:
+    """Memory-mapped columns of the current version of a feature store.
+
+    Each (user_id, event_id) series is a LiT! entity named by entity_name. Columns are only read from disk when an
+    entity's data is requested, so opening a large store is cheap.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Opens the current version of a feature store.
+
+        Args:
+            directory: Directory of the feature store.
+
+        Raises:
+            FileNotFoundError: If no version of the store was saved in the directory.
+            ValueError: If the store has an unsupported format version.
+        """
+        current = directory / "CURRENT"
+        if not current.exists():
+            raise FileNotFoundError(f"Feature store not found: {directory}")
+        version_dir = directory / current.read_text().strip()
+        manifest = json.loads((version_dir / "manifest.json").read_text())
+        if manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported feature store format version: {manifest['format_version']}")
+
+        self._columns: dict[str, np.ndarray] = {
+            name: np.load(version_dir / f"{name}.npy", mmap_mode="r") for name in _COLUMNS
+        }
+        self._index = {
+            entity_name(user_id, event_id): i
+            for i, (user_id, event_id) in enumerate(
+                zip(self._columns["user_id"].tolist(), self._columns["event_id"].tolist())
+            )
+        }
+
+    def __contains__(self, entity: str) -> bool:
+        return entity in self._index
+
+    def entities(self) -> list[str]:
+        """Returns the entity names of all series in the store."""
+        return sorted(self._index)
+
+    def numerical_frame(self, entity: str) -> pd.DataFrame:
+        """Returns the numerical data of an entity in the layout of the LiT! numerical CSV files.
+
+        Occurrences without a leave are taken as left when attended, as the serving series are.
+
+        Args:
+            entity: Entity name.
+
+        Returns:
+            Dataframe with start_date, end_date, attended_at and left_at columns, in chronological order.
+
+        Raises:
+            KeyError: If the entity is not in the store.
+        """
+        i = self._index[entity]
+        occurrences = slice(int(self._columns["offsets"][i]), int(self._columns["offsets"][i + 1]))
+        attended_at = np.asarray(self._columns["attended_at"][occurrences])
+        left_at = np.asarray(self._columns["left_at"][occurrences])
+        return pd.DataFrame(
+            {
+                "start_date": pd.to_datetime(np.asarray(self._columns["start"][occurrences]), unit="s"),
+                "end_date": pd.to_datetime(np.asarray(self._columns["end"][occurrences]), unit="s"),
+                "attended_at": attended_at,
+                "left_at": np.where(np.isnan(left_at), attended_at, left_at),
+            }
+        )
+
+
+@lru_cache(maxsize=None)
+def open_feature_store(directory: Path) -> AttendanceFeatureStore | None:
+    """Opens the feature store in a directory once per process.
+
+    Args:
+        directory: Directory of the feature store.
+
+    Returns:
+        The feature store, or None when the directory holds none.
+    """
+    if not (directory / "CURRENT").exists():
+        return None
+    return AttendanceFeatureStore(directory)
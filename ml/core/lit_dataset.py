@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd
 from multimodal_timesfm.multimodal_dataset import MultimodalDatasetBase
 
+from core.feature_store import open_feature_store
+
 
 class LitDataset(MultimodalDatasetBase):
     """Dataset loader for LiT! dataset with time series and text data.
@@ -17,6 +19,8 @@ class LitDataset(MultimodalDatasetBase):
 
     Expected directory structure:
         data_dir/
+        ├── features/
+        │   └── ...
         ├── numerical/
         │   ├── entity1.csv
         │   ├── entity2.csv
@@ -25,6 +29,9 @@ class LitDataset(MultimodalDatasetBase):
             ├── entity1.csv
             ├── entity2.csv
             └── ...
+
+    features/ is an optional feature store materialized by the backend. Numerical data of the entities it holds is
+    read from it instead of numerical/.
     """
 
     def __init__(
@@ -57,12 +64,15 @@ class LitDataset(MultimodalDatasetBase):
         """Loads LiT! dataset from files."""
         numerical_file = self.data_dir / "numerical" / f"{self.entity}.csv"
         textual_file = self.data_dir / "textual" / f"{self.entity}.csv"
-
-        if not numerical_file.exists():
-            raise FileNotFoundError(f"Numerical data file not found: {numerical_file}")
+        feature_store = open_feature_store(self.data_dir / "features")
 
         # Load numerical time series data
-        numerical_df = pd.read_csv(numerical_file)
+        if feature_store is not None and self.entity in feature_store:
+            numerical_df = feature_store.numerical_frame(self.entity)
+        elif numerical_file.exists():
+            numerical_df = pd.read_csv(numerical_file)
+        else:
+            raise FileNotFoundError(f"Numerical data file not found: {numerical_file}")
 
         # Sort numerical_df by start_date to ensure chronological order
         if "start_date" in numerical_df.columns:
@@ -90,35 +100,35 @@ class LitDataset(MultimodalDatasetBase):
         full_start_dates = numerical_df["start_date"]
         full_end_dates = numerical_df["end_date"]
 
+        # Split data based on split_ratio
+        split_idx = int(len(numerical_df) * self.split_ratio)
+        rows = slice(None, split_idx) if self.split == "train" else slice(split_idx, None)
+        start_dates = full_start_dates.iloc[rows]
+        end_dates = full_end_dates.iloc[rows]
+
+        # Skip if insufficient data after split
+        if len(start_dates) < self.context_len + self.horizon_len:
+            return
+
+        # Windows and their text are the same for every column, so they are computed once
+        start_indices = np.arange(0, len(start_dates) - self.context_len - self.horizon_len + 1, self.horizon_len)
+        text_patches_num = self.context_len // self.patch_len
+        window_patched_texts = self._get_patched_texts_for_periods(
+            _to_nanoseconds(start_dates)[start_indices],
+            _to_nanoseconds(end_dates)[start_indices + self.context_len - 1],
+            self._index_texts(textual_data),
+            text_patches_num,
+        )
+
         # Process each numeric column as a separate univariate time series
         numeric_cols = ["attended_at", "left_at"]
 
         for column in numeric_cols:
             # Extract time series from this column
-            time_series_values = numerical_df[column].to_numpy()
-
-            # Split data based on split_ratio
-            split_idx = int(len(time_series_values) * self.split_ratio)
-
-            if self.split == "train":
-                ts_data = time_series_values[:split_idx]
-                start_dates = full_start_dates.iloc[:split_idx]
-                end_dates = full_end_dates.iloc[:split_idx]
-            else:  # test
-                ts_data = time_series_values[split_idx:]
-                start_dates = full_start_dates.iloc[split_idx:]
-                end_dates = full_end_dates.iloc[split_idx:]
-
-            # Skip if insufficient data after split
-            if len(ts_data) < self.context_len + self.horizon_len:
-                continue
+            ts_data = numerical_df[column].to_numpy()[rows]
 
             # Create windowed samples from this univariate time series
-            for start_idx in range(
-                0,
-                len(ts_data) - self.context_len - self.horizon_len + 1,
-                self.horizon_len,
-            ):
+            for start_idx, patched_texts in zip(start_indices.tolist(), window_patched_texts):
                 # Extract context
                 context_end = start_idx + self.context_len
                 context = ts_data[start_idx:context_end].reshape(-1, 1)
@@ -127,20 +137,9 @@ class LitDataset(MultimodalDatasetBase):
                 future_end = context_end + self.horizon_len
                 future = ts_data[context_end:future_end].reshape(-1, 1)
 
-                # Get associated text for this context
-                window_start_date = str(start_dates.iloc[start_idx])
-                window_end_date = str(end_dates.iloc[context_end - 1])
-
                 # Calculate frequency based on interval between start_date values
                 freq = self._calculate_frequency_for_sample(start_dates, start_idx, context_end)
 
-                # Calculate number of text patches based on context_len / patch_len
-                text_patches_num = self.context_len // self.patch_len
-
-                patched_texts = self._get_patched_texts_for_period(
-                    window_start_date, window_end_date, textual_data, text_patches_num
-                )
-
                 sample = {
                     "context": context.astype(np.float32),
                     "future": future.astype(np.float32),
@@ -190,56 +189,83 @@ class LitDataset(MultimodalDatasetBase):
         else:  # Quarterly or higher
             return 2
 
-    def _get_patched_texts_for_period(
-        self,
-        start_date: str,
-        end_date: str,
-        textual_data: dict[str, pd.DataFrame],
-        text_patches_num: int,
-    ) -> list[list[str]]:
-        """Gets patched textual descriptions for a specific time period.
+    def _index_texts(
+        self, textual_data: dict[str, pd.DataFrame]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Indexes the non-empty texts by time, once per entity.
 
         Args:
-            start_date: Start date of the time period (YYYY-MM-DD format).
-            end_date: End date of the time period (YYYY-MM-DD format).
             textual_data: Dictionary containing textual dataframes.
-            text_patches_num: Number of text patches to generate for this period.
 
         Returns:
-            List of lists where each inner list contains text data for one patch period.
-            Returns text_patches_num number of lists.
+            Start and end dates of the texts in nanoseconds since the epoch, sorted by start date, the positions of
+            the texts in that order, and the texts in their order in the file.
         """
-        # Convert dates to pandas datetime for comparison
-        period_start = pd.to_datetime(start_date)
-        period_end = pd.to_datetime(end_date)
-
-        # Divide the time period into equal parts
-        period_duration = period_end - period_start
-        patch_duration = period_duration / text_patches_num
-
-        patches = []
-
-        for i in range(text_patches_num):
-            # Calculate patch time boundaries
-            patch_start = period_start + i * patch_duration
-            patch_end = period_start + (i + 1) * patch_duration
-
-            patch_texts = []
-
-            # Get text that overlaps with this patch period
-            if "tms" in textual_data:
-                tms_df = textual_data["tms"]
-                if "start_date" in tms_df.columns and "end_date" in tms_df.columns:
-                    tms_df = tms_df.copy()
-                    tms_df["start_date"] = pd.to_datetime(tms_df["start_date"])
-                    tms_df["end_date"] = pd.to_datetime(tms_df["end_date"])
-
-                    matching_tms = tms_df[(tms_df["start_date"] <= patch_end) & (tms_df["end_date"] >= patch_start)]
+        tms_df = textual_data.get("tms")
+        if tms_df is None or not {"start_date", "end_date", "tms"}.issubset(tms_df.columns):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, np.empty(0, dtype=object)
+
+        text_starts = pd.to_datetime(tms_df["start_date"])
+        text_ends = pd.to_datetime(tms_df["end_date"])
+        texts = tms_df["tms"]
+        valid = text_starts.notna() & text_ends.notna() & texts.notna()
+        valid &= texts.where(valid, "").astype(str).str.strip() != ""
+
+        starts = _to_nanoseconds(text_starts[valid])
+        order = np.argsort(starts, kind="stable")
+        return starts[order], _to_nanoseconds(text_ends[valid])[order], order, texts[valid].astype(str).to_numpy()
+
+    def _get_patched_texts_for_periods(
+        self,
+        period_starts: np.ndarray,
+        period_ends: np.ndarray,
+        text_index: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        text_patches_num: int,
+    ) -> list[list[list[str]]]:
+        """Gets patched textual descriptions for many time periods at once.
 
-                    for _, row in matching_tms.iterrows():
-                        if "tms" in tms_df.columns and pd.notna(row["tms"]) and str(row["tms"]).strip() != "":
-                            patch_texts.append(str(row["tms"]))
+        Each period is divided into text_patches_num equal patches, and a patch gets every text that overlaps it,
+        boundaries included, in file order. Texts starting before a patch are only looked up as far back as the longest text, so
+        a lookup costs the texts near the patch rather than all of them.
 
-            patches.append(patch_texts)
+        Args:
+            period_starts: Start dates of the time periods in nanoseconds since the epoch.
+            period_ends: End dates of the time periods in nanoseconds since the epoch.
+            text_index: Texts indexed by _index_texts.
+            text_patches_num: Number of text patches to generate for each period.
 
-        return patches
+        Returns:
+            For each period, a list of text_patches_num lists, each containing the texts of one patch period.
+        """
+        text_starts, text_ends, text_positions, texts = text_index
+
+        # Divide the time periods into equal parts
+        patch_durations = ((period_ends - period_starts) / text_patches_num).astype(np.int64)
+        boundaries = period_starts[:, None] + np.arange(text_patches_num + 1) * patch_durations[:, None]
+        patch_starts = boundaries[:, :-1].ravel()
+        patch_ends = boundaries[:, 1:].ravel()
+
+        # Candidates of a patch are the texts starting between its start minus the longest text and its end
+        max_text_len = max(int(np.max(text_ends - text_starts, initial=0)), 0)
+        lo = np.searchsorted(text_starts, patch_starts - max_text_len, side="left")
+        hi = np.searchsorted(text_starts, patch_ends, side="right")
+        counts = hi - lo
+        patch_ids = np.repeat(np.arange(len(patch_starts)), counts)
+        candidates = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+
+        # Keep the candidates that end after the patch starts, in file order within each patch
+        overlapping = text_ends[candidates] >= patch_starts[patch_ids]
+        patch_ids = patch_ids[overlapping]
+        positions = text_positions[candidates[overlapping]]
+        file_order = np.lexsort((positions, patch_ids))
+        patch_texts = texts[positions[file_order]].tolist()
+        bounds = np.searchsorted(patch_ids, np.arange(len(patch_starts) + 1)).tolist()
+
+        patches = [patch_texts[bounds[i] : bounds[i + 1]] for i in range(len(patch_starts))]
+        return [patches[i : i + text_patches_num] for i in range(0, len(patches), text_patches_num)]
+
+
+def _to_nanoseconds(dates: pd.Series) -> np.ndarray:
+    """Converts dates to nanoseconds since the epoch."""
+    return pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]").view(np.int64)
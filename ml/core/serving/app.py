@@ -0,0 +1,47 @@
+"""HTTP app serving the attendance forecast endpoint the backend calls at ML_SERVER_URL."""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from core.serving.batcher import MicroBatcher
+from core.serving.forecaster import AttendanceForecaster
+from core.serving.schemas import ForecastAttendanceTimeRequest
+
+
+def create_app(forecaster: AttendanceForecaster, batcher: MicroBatcher) -> FastAPI:
+    """Create the app; the batcher runs for the lifetime of the app.
+
+    Args:
+        forecaster: Forecaster answering the requests.
+        batcher: Micro-batcher the forecaster sends its series through.
+
+    Returns:
+        FastAPI app.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        await batcher.start_async()
+        yield
+        await batcher.stop_async()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post("/forecast/attendance")
+    async def forecast_attendance(request: Request) -> Response:
+        # Only JSON is served here; the backend falls back to it from the columnar format on 415
+        if not request.headers.get("Content-Type", "application/json").startswith("application/json"):
+            return Response(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        try:
+            forecast_request = ForecastAttendanceTimeRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors()) from e
+
+        forecast_response = await forecaster.forecast_async(forecast_request)
+        return Response(content=forecast_response.model_dump_json(), media_type="application/json")
+
+    return app
@@ -0,0 +1,115 @@
+"""Dynamic micro-batching of forecast inputs across concurrent requests."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+BatchForecastFn = Callable[[list[np.ndarray], list[int]], np.ndarray]
+
+
+@dataclass
+class _PendingSeries:
+    context: np.ndarray
+    freq: int
+    future: asyncio.Future[np.ndarray]
+
+
+class MicroBatcher:
+    """Collects the series of concurrent requests into batches of up to batch_size for one model.
+
+    A batch is sent as soon as it is full, or max_wait_ms after its first series was taken when fewer series are
+    waiting. The model runs on a single worker thread, so the event loop keeps accepting requests and the next batch
+    fills up while the current one is forecast.
+    """
+
+    def __init__(self, forecast_batch: BatchForecastFn, batch_size: int, max_wait_ms: int) -> None:
+        """Initializes the batcher.
+
+        Args:
+            forecast_batch: Function returning one point forecast per context, given the contexts and their
+                            frequency values. It is never called concurrently.
+            batch_size: Maximum number of series per call of forecast_batch.
+            max_wait_ms: How long a partial batch waits for more series.
+        """
+        self._forecast_batch = forecast_batch
+        self._batch_size = batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[_PendingSeries] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def start_async(self) -> None:
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast")
+        self._task = asyncio.create_task(self._run_async())
+
+    async def stop_async(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def forecast_async(self, contexts: list[np.ndarray], freqs: list[int]) -> list[np.ndarray]:
+        """Forecast the contexts together with those of any other request that is waiting.
+
+        Args:
+            contexts: Univariate contexts of any length.
+            freqs: Frequency value of each context.
+
+        Returns:
+            Point forecast of each context, in order.
+        """
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher is not started")
+        loop = asyncio.get_running_loop()
+        pending = [_PendingSeries(context, freq, loop.create_future()) for context, freq in zip(contexts, freqs)]
+        for series in pending:
+            self._queue.put_nowait(series)
+        return list(await asyncio.gather(*(series.future for series in pending)))
+
+    async def _next_batch_async(self, queue: asyncio.Queue[_PendingSeries]) -> list[_PendingSeries]:
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        deadline = loop.time() + self._max_wait
+        while len(batch) < self._batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                break
+        # Series of requests that went away, e.g. because the client disconnected, are not forecast
+        return [series for series in batch if not series.future.done()]
+
+    async def _run_async(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch_async(self._queue)
+            if not batch:
+                continue
+            try:
+                outputs = await loop.run_in_executor(
+                    self._executor,
+                    self._forecast_batch,
+                    [series.context for series in batch],
+                    [series.freq for series in batch],
+                )
+            except Exception as e:
+                for series in batch:
+                    if not series.future.done():
+                        series.future.set_exception(e)
+                continue
+            for series, output in zip(batch, outputs):
+                if not series.future.done():
+                    series.future.set_result(output)
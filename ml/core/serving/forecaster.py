@@ -0,0 +1,45 @@
+"""Attendance forecasts for the backend's requests."""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from core.serving.batcher import MicroBatcher
+from core.serving.schemas import AttendanceTimeForecast, ForecastAttendanceTimeRequest, ForecastAttendanceTimeResponse
+from core.serving.series import SeriesStore
+
+
+class AttendanceForecaster:
+    """Merges requests into the accumulated series and forecasts their next horizon_len occurrences.
+
+    The attended_at and left_at series of every (user_id, event_id) series go through the micro-batcher as two
+    separate inputs, like LitDataset samples them for training.
+    """
+
+    def __init__(self, batcher: MicroBatcher, context_len: int, horizon_len: int) -> None:
+        self._batcher = batcher
+        self._horizon_len = horizon_len
+        self._store = SeriesStore(max_occurrences=context_len)
+
+    async def forecast_async(self, request: ForecastAttendanceTimeRequest) -> ForecastAttendanceTimeResponse:
+        # Merging and building run without awaiting, so concurrent requests never see each other half-merged
+        series_list = [series for key in self._store.merge(request) if (series := self._store.build(key)) is not None]
+
+        outputs = await self._batcher.forecast_async(
+            [values for series in series_list for values in (series.attended_at, series.left_at)],
+            [series.freq for series in series_list for _ in range(2)],
+        )
+
+        forecasts: defaultdict[int, dict[str, list[AttendanceTimeForecast]]] = defaultdict(dict)
+        for i, series in enumerate(series_list):
+            attended_at, left_at = outputs[2 * i], outputs[2 * i + 1]
+            forecasts[series.user_id][series.event_id] = [
+                AttendanceTimeForecast(
+                    start=start,
+                    attended_at=start + timedelta(minutes=float(attended_minutes)),
+                    duration=max(float(left_minutes - attended_minutes), 0.0) * 60,
+                )
+                for start, attended_minutes, left_minutes in zip(
+                    series.future_starts(self._horizon_len), attended_at, left_at
+                )
+            ]
+        return ForecastAttendanceTimeResponse(attendance_time_forecasts=dict(forecasts), error_codes=[])
@@ -0,0 +1,125 @@
+"""Multimodal TimesFM wrapper for serving forecasts."""
+
+from pathlib import Path
+
+import numpy as np
+import torch
+from multimodal_timesfm.multimodal_patched_decoder import MultimodalTimesFMConfig
+from multimodal_timesfm.multimodal_timesfm import MultimodalTimesFM, TimesFmHparams
+
+from configs.model import ModelConfig
+
+
+class ServingMultimodalTimesFM(MultimodalTimesFM):
+    """MultimodalTimesFM that forecasts a batch of any size in one decode call.
+
+    MultimodalTimesFM.forecast splits its inputs into batches of per_core_batch_size and rejects any other number of
+    inputs, so serving builds it with per_core_batch_size=1 and leaves batching to MicroBatcher. Checkpoints are
+    mapped onto the model's device when loaded, so one saved on a GPU also loads on a machine without one.
+    """
+
+    def load_from_checkpoint(self, checkpoint_path: Path | str) -> None:
+        """Load model weights from checkpoint onto the model's device.
+
+        Args:
+            checkpoint_path: Path to the checkpoint file.
+
+        Raises:
+            FileNotFoundError: If checkpoint file doesn't exist.
+        """
+        checkpoint_path = Path(checkpoint_path)
+        if not checkpoint_path.exists():
+            raise FileNotFoundError(f"Checkpoint file not found: {checkpoint_path}")
+        checkpoint = torch.load(checkpoint_path, map_location=self.device, weights_only=True)
+
+        self.model.load_state_dict(checkpoint["model_state_dict"])
+        self.model.to(self.device)
+        self.model.eval()
+
+    def forecast_batch(self, inputs: list[np.ndarray], freq: list[int]) -> np.ndarray:
+        """Generate point forecasts for one batch of series without text descriptions.
+
+        Args:
+            inputs: Univariate contexts, padded or truncated to context_len.
+            freq: Frequency value of each context.
+
+        Returns:
+            Point forecasts of shape (len(inputs), horizon_len).
+        """
+        input_ts, input_padding, inp_freq, _ = self._preprocess(inputs, freq)
+        text_patches_num = self.hparams.context_len // self.hparams.input_patch_len
+
+        with torch.inference_mode():
+            mean_output, _ = self.model.decode(
+                input_ts=torch.Tensor(input_ts).to(self.device),
+                paddings=torch.Tensor(input_padding).to(self.device),
+                freq=torch.LongTensor(inp_freq).to(self.device),
+                horizon_len=self.hparams.horizon_len,
+                text_descriptions=[[[] for _ in range(text_patches_num)] for _ in inputs],
+            )
+
+        forecasts: np.ndarray = mean_output.cpu().numpy()
+        return forecasts
+
+
+def create_multimodal_config(model_config: ModelConfig) -> MultimodalTimesFMConfig:
+    """Create the multimodal TimesFM configuration of a model configuration.
+
+    Args:
+        model_config: Model configuration.
+
+    Returns:
+        Configuration of MultimodalPatchedDecoder.
+    """
+    return MultimodalTimesFMConfig(
+        num_layers=model_config.timesfm.num_layers,
+        num_heads=model_config.timesfm.num_heads,
+        num_kv_heads=model_config.timesfm.num_kv_heads,
+        hidden_size=model_config.timesfm.model_dims,
+        intermediate_size=model_config.timesfm.model_dims,
+        head_dim=model_config.timesfm.model_dims // model_config.timesfm.num_heads,
+        rms_norm_eps=model_config.timesfm.rms_norm_eps,
+        patch_len=model_config.timesfm.input_patch_len,
+        horizon_len=model_config.timesfm.output_patch_len,
+        quantiles=model_config.timesfm.quantiles,
+        pad_val=model_config.timesfm.pad_val,
+        tolerance=model_config.timesfm.tolerance,
+        dtype=model_config.timesfm.dtype,
+        use_positional_embedding=model_config.timesfm.use_positional_embedding,
+        text_encoder_type=model_config.text_encoder.text_encoder_type,
+    )
+
+
+def load_serving_model(
+    model_config: ModelConfig,
+    checkpoint_path: Path,
+    context_len: int,
+    horizon_len: int,
+    device: torch.device | str = "cpu",
+) -> ServingMultimodalTimesFM:
+    """Load a trained multimodal TimesFM checkpoint for serving.
+
+    Args:
+        model_config: Model configuration the checkpoint was trained with.
+        checkpoint_path: Path to the checkpoint file.
+        context_len: Context length for forecasting.
+        horizon_len: Horizon length for forecasting.
+        device: Device to run inference on.
+
+    Returns:
+        Model in evaluation mode.
+    """
+    hparams = TimesFmHparams(
+        context_len=context_len,
+        horizon_len=horizon_len,
+        input_patch_len=model_config.timesfm.input_patch_len,
+        output_patch_len=model_config.timesfm.output_patch_len,
+        num_layers=model_config.timesfm.num_layers,
+        num_heads=model_config.timesfm.num_heads,
+        model_dims=model_config.timesfm.model_dims,
+        per_core_batch_size=1,  # Batches are formed by MicroBatcher
+        backend="cpu" if torch.device(device).type == "cpu" else "gpu",
+        quantiles=model_config.timesfm.quantiles,
+        use_positional_embedding=model_config.timesfm.use_positional_embedding,
+    )
+    return ServingMultimodalTimesFM(hparams, create_multimodal_config(model_config), checkpoint_path, device)
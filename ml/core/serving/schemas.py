@@ -0,0 +1,88 @@
+"""Request and response models of the attendance forecast endpoint.
+
+These mirror the backend's ForecastAttendanceTimeRequest and ForecastAttendanceTimeResponse JSON shapes, so that
+ML_SERVER_URL can point at this service.
+"""
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class AttendanceAction(str, Enum):
+    ATTEND = "attend"
+    LEAVE = "leave"
+
+
+class Frequency(str, Enum):
+    SECONDLY = "SECONDLY"
+    MINUTELY = "MINUTELY"
+    HOURLY = "HOURLY"
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+    YEARLY = "YEARLY"
+
+
+class RecurrenceRule(BaseModel):
+    id: str
+    freq: Frequency
+
+
+class Recurrence(BaseModel):
+    id: str
+    rrule: RecurrenceRule
+
+
+class Event(BaseModel):
+    id: str
+    user_id: int
+    dtstart: datetime
+    dtend: datetime
+    timezone: str
+    recurrence: Recurrence | None
+
+
+class EventAttendanceActionLog(BaseModel):
+    id: str
+    user_id: int
+    event_id: str
+    start: datetime
+    action: AttendanceAction
+    acted_at: datetime
+
+
+class UserAccount(BaseModel):
+    id: str
+    user_id: int
+    birth_date: datetime
+    gender: str
+
+
+class ForecastAttendanceTimeRequest(BaseModel):
+    """Attendance history sent by the backend.
+
+    A full request (is_delta false) replaces everything accumulated so far. A delta request only carries the series
+    that got action logs since the previous export and is merged into the accumulated data by id.
+    """
+
+    is_delta: bool
+    context_len: int | None
+    earliest_attend_data: list[EventAttendanceActionLog]
+    latest_leave_data: list[EventAttendanceActionLog]
+    event_data: list[Event]
+    user_data: list[UserAccount]
+
+
+class AttendanceTimeForecast(BaseModel):
+    start: datetime
+    attended_at: datetime
+    duration: float
+
+
+class ForecastAttendanceTimeResponse(BaseModel):
+    """Complete forecasts of every series that was forecast, by user_id and then event_id."""
+
+    attendance_time_forecasts: dict[int, dict[str, list[AttendanceTimeForecast]]]
+    error_codes: list[int]
@@ -0,0 +1,159 @@
+"""Attendance series accumulated from the backend's requests.
+
+Each (user_id, event_id) series becomes the two univariate series LitDataset trains on, one value per occurrence:
+attended_at and left_at, both in minutes after the start of the occurrence.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+
+import numpy as np
+
+from core.serving.schemas import (
+    AttendanceAction,
+    Event,
+    EventAttendanceActionLog,
+    ForecastAttendanceTimeRequest,
+    Frequency,
+)
+
+SeriesKey = tuple[int, str]
+
+# Only used when a series has a single occurrence, so the spacing of its starts is unknown
+_STEP_BY_FREQUENCY = {
+    Frequency.DAILY: timedelta(days=1),
+    Frequency.WEEKLY: timedelta(weeks=1),
+    Frequency.MONTHLY: timedelta(days=30),
+    Frequency.YEARLY: timedelta(days=365),
+}
+_DEFAULT_STEP = timedelta(weeks=1)
+
+
+def calculate_frequency(starts: list[datetime]) -> int:
+    """Frequency value of the model from the average interval between starts, as LitDataset calculates it.
+
+    Args:
+        starts: Sorted starts of the occurrences.
+
+    Returns:
+        0 for daily or lower granularity, 1 for weekly or monthly granularity and 2 for quarterly or higher.
+    """
+    if len(starts) < 2:
+        return 0
+    avg_days = (starts[-1] - starts[0]).total_seconds() / (len(starts) - 1) / (24 * 3600)
+    if avg_days < 3:
+        return 0
+    elif avg_days < 35:
+        return 1
+    else:
+        return 2
+
+
+@dataclass(frozen=True)
+class AttendanceSeries:
+    user_id: int
+    event_id: str
+    starts: list[datetime]
+    attended_at: np.ndarray
+    left_at: np.ndarray
+    freq: int
+    step: timedelta
+
+    def future_starts(self, horizon_len: int) -> list[datetime]:
+        """Starts of the next horizon_len occurrences, spaced like the observed ones."""
+        return [self.starts[-1] + self.step * (i + 1) for i in range(horizon_len)]
+
+
+class SeriesStore:
+    """Action logs merged from full and delta requests, keeping the last max_occurrences occurrences of each series.
+
+    Logs are upserted by id and reduced per occurrence when a series is built: the earliest attend and the latest
+    leave. An occurrence without a leave is taken as left when attended.
+    """
+
+    def __init__(self, max_occurrences: int) -> None:
+        self._max_occurrences = max_occurrences
+        self._logs: dict[str, EventAttendanceActionLog] = {}
+        self._log_ids: defaultdict[SeriesKey, set[str]] = defaultdict(set)
+        self._events: dict[str, Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._log_ids)
+
+    def merge(self, request: ForecastAttendanceTimeRequest) -> list[SeriesKey]:
+        """Merge the request and return the keys of the series to forecast.
+
+        Args:
+            request: Full request, which replaces everything merged so far, or delta request.
+
+        Returns:
+            Every series after a full request, the series with logs in the request after a delta.
+        """
+        if not request.is_delta:
+            self._logs.clear()
+            self._log_ids.clear()
+            self._events.clear()
+
+        touched: set[SeriesKey] = set()
+        for log in chain(request.earliest_attend_data, request.latest_leave_data):
+            previous = self._logs.get(log.id)
+            if previous is not None:
+                self._log_ids[(previous.user_id, previous.event_id)].discard(log.id)
+            self._logs[log.id] = log
+            self._log_ids[(log.user_id, log.event_id)].add(log.id)
+            touched.add((log.user_id, log.event_id))
+        for event in request.event_data:
+            self._events[event.id] = event
+
+        for key in touched:
+            self._prune(key)
+        return sorted(touched if request.is_delta else self._log_ids)
+
+    def _prune(self, key: SeriesKey) -> None:
+        log_ids = self._log_ids[key]
+        starts = sorted({self._logs[log_id].start for log_id in log_ids})
+        if len(starts) <= self._max_occurrences:
+            return
+        cutoff = starts[-self._max_occurrences]
+        for log_id in [log_id for log_id in log_ids if self._logs[log_id].start < cutoff]:
+            log_ids.discard(log_id)
+            del self._logs[log_id]
+
+    def build(self, key: SeriesKey) -> AttendanceSeries | None:
+        """Model inputs of the series, or None when it has no attended occurrence."""
+        attended: dict[datetime, datetime] = {}
+        left: dict[datetime, datetime] = {}
+        for log_id in self._log_ids.get(key, ()):
+            log = self._logs[log_id]
+            if log.action == AttendanceAction.ATTEND:
+                attended[log.start] = min(attended.get(log.start, log.acted_at), log.acted_at)
+            else:
+                left[log.start] = max(left.get(log.start, log.acted_at), log.acted_at)
+
+        starts = sorted(attended)
+        if not starts:
+            return None
+
+        if len(starts) > 1:
+            gaps = sorted(later - earlier for earlier, later in zip(starts, starts[1:]))
+            step = gaps[len(gaps) // 2]
+        else:
+            event = self._events.get(key[1])
+            recurrence = event.recurrence if event is not None else None
+            step = _STEP_BY_FREQUENCY.get(recurrence.rrule.freq, _DEFAULT_STEP) if recurrence else _DEFAULT_STEP
+
+        return AttendanceSeries(
+            user_id=key[0],
+            event_id=key[1],
+            starts=starts,
+            attended_at=np.array(
+                [(attended[start] - start).total_seconds() / 60 for start in starts], dtype=np.float32
+            ),
+            left_at=np.array(
+                [(left.get(start, attended[start]) - start).total_seconds() / 60 for start in starts], dtype=np.float32
+            ),
+            freq=calculate_frequency(starts),
+            step=step,
+        )
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Throughput benchmark of attendance forecast serving at several batch sizes.
+
+Sends concurrent delta requests of synthetic weekly attendance series through AttendanceForecaster and its
+MicroBatcher, the same path the /forecast/attendance endpoint takes, and reports series/sec for each batch size.
+Each series is forecast as its attended_at and left_at inputs. Without --checkpoint a randomly initialized model is
+used, which is as fast as a trained one. Run from the ml directory, e.g.
+`uv run python -m scripts.benchmark_forecast_serving --batch-sizes 1 8 32 64 --num-threads 4`.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import torch
+from multimodal_timesfm.multimodal_patched_decoder import MultimodalPatchedDecoder
+from multimodal_timesfm.utils.logging import get_logger, setup_logger
+from multimodal_timesfm.utils.seed import set_seed
+
+from configs.model import ModelConfig
+from core.serving.batcher import MicroBatcher
+from core.serving.forecaster import AttendanceForecaster
+from core.serving.model import ServingMultimodalTimesFM, create_multimodal_config, load_serving_model
+from core.serving.schemas import AttendanceAction, EventAttendanceActionLog, ForecastAttendanceTimeRequest
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark attendance forecast serving throughput")
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Path to model checkpoint (if not provided, a randomly initialized model is used)",
+    )
+
+    parser.add_argument(
+        "--model-config",
+        type=str,
+        help="Path to model configuration file",
+    )
+
+    parser.add_argument(
+        "--context-len",
+        type=int,
+        help="Context length for forecasting (defaults to the model configuration)",
+    )
+
+    parser.add_argument(
+        "--horizon-len",
+        type=int,
+        default=4,
+        help="Number of future occurrences forecast per series",
+    )
+
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 8, 16, 32, 64],
+        help="Batch sizes to benchmark",
+    )
+
+    parser.add_argument(
+        "--series",
+        type=int,
+        default=256,
+        help="Number of attendance series forecast per batch size",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent requests the series are split into",
+    )
+
+    parser.add_argument(
+        "--max-wait-ms",
+        type=int,
+        default=10,
+        help="How long a partial batch waits for series of other requests",
+    )
+
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        help="Number of threads for CPU inference (if not provided, PyTorch's default is used)",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for the synthetic series and the random model",
+    )
+
+    return parser.parse_args()
+
+
+def build_requests(
+    series: int, concurrency: int, occurrences: int, rng: random.Random
+) -> list[ForecastAttendanceTimeRequest]:
+    """Build concurrency delta requests that split series weekly series with occurrences occurrences each."""
+    base = datetime(2025, 1, 6, 9, tzinfo=UTC)
+    logs: list[tuple[list[EventAttendanceActionLog], list[EventAttendanceActionLog]]] = [
+        ([], []) for _ in range(concurrency)
+    ]
+    for i in range(series):
+        attends, leaves = logs[i % concurrency]
+        event_id = f"event-{i}"
+        for week in range(occurrences):
+            start = base + timedelta(weeks=week)
+            attended_at = start + timedelta(minutes=rng.gauss(0, 5))
+            for action, acted_at, action_logs in (
+                (AttendanceAction.ATTEND, attended_at, attends),
+                (AttendanceAction.LEAVE, attended_at + timedelta(minutes=rng.gauss(60, 10)), leaves),
+            ):
+                action_logs.append(
+                    EventAttendanceActionLog(
+                        id=f"{event_id}-{week}-{action.value}",
+                        user_id=i % 100,
+                        event_id=event_id,
+                        start=start,
+                        action=action,
+                        acted_at=acted_at,
+                    )
+                )
+    return [
+        ForecastAttendanceTimeRequest(
+            is_delta=True,
+            context_len=occurrences,
+            earliest_attend_data=attends,
+            latest_leave_data=leaves,
+            event_data=[],
+            user_data=[],
+        )
+        for attends, leaves in logs
+    ]
+
+
+async def measure(
+    model: ServingMultimodalTimesFM,
+    batch_size: int,
+    max_wait_ms: int,
+    context_len: int,
+    horizon_len: int,
+    requests: list[ForecastAttendanceTimeRequest],
+) -> float:
+    """Return the seconds it takes to answer all requests concurrently."""
+    batcher = MicroBatcher(model.forecast_batch, batch_size, max_wait_ms)
+    forecaster = AttendanceForecaster(batcher, context_len, horizon_len)
+    await batcher.start_async()
+    try:
+        # Warm up with one request, so that one-off allocations are not measured
+        await forecaster.forecast_async(requests[0])
+        start = time.perf_counter()
+        await asyncio.gather(*(forecaster.forecast_async(request) for request in requests))
+        return time.perf_counter() - start
+    finally:
+        await batcher.stop_async()
+
+
+def main() -> int:
+    """Main benchmark function."""
+    parsed_args = parse_args()
+
+    # Load configurations
+    if parsed_args.model_config:
+        model_config = ModelConfig.from_yaml(Path(parsed_args.model_config))
+    else:
+        model_config = ModelConfig()
+
+    set_seed(parsed_args.seed)
+
+    # Setup logging
+    setup_logger()
+
+    logger = get_logger()
+
+    if parsed_args.num_threads is not None:
+        torch.set_num_threads(parsed_args.num_threads)
+
+    context_len = parsed_args.context_len or model_config.timesfm.context_len
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if parsed_args.checkpoint:
+            checkpoint_path = Path(parsed_args.checkpoint)
+        else:
+            logger.info("Creating randomly initialized model...")
+            checkpoint_path = Path(temp_dir) / "random.pt"
+            decoder = MultimodalPatchedDecoder(create_multimodal_config(model_config), "cpu")
+            torch.save({"model_state_dict": decoder.state_dict()}, checkpoint_path)
+        model = load_serving_model(model_config, checkpoint_path, context_len, parsed_args.horizon_len, "cpu")
+
+    requests = build_requests(parsed_args.series, parsed_args.concurrency, context_len, random.Random(parsed_args.seed))
+
+    logger.info(
+        f"{parsed_args.series} series in {parsed_args.concurrency} concurrent requests, "
+        f"context length {context_len}, horizon length {parsed_args.horizon_len}, {torch.get_num_threads()} threads"
+    )
+    for batch_size in parsed_args.batch_sizes:
+        elapsed = asyncio.run(
+            measure(model, batch_size, parsed_args.max_wait_ms, context_len, parsed_args.horizon_len, requests)
+        )
+        logger.info(f"Batch size {batch_size:4d}: {parsed_args.series / elapsed:10.1f} series/sec ({elapsed:.2f} s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Benchmark of LitDataset construction on a long synthetic entity.
+
+Writes a LiT! dataset of one daily entity, 5 years long by default, with a few goals and reviews per occurrence to a
+temporary directory, and times building the train and test splits of LitDataset from it, which is dominated by
+assigning text to the patches of every sample. Run from the ml directory, e.g.
+`uv run python -m scripts.benchmark_lit_dataset --years 5 --patch-len 4 --context-len 16 --horizon-len 4`.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.lit_dataset import LitDataset
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark LitDataset construction")
+
+    parser.add_argument(
+        "--years",
+        type=int,
+        default=5,
+        help="Number of years of daily occurrences of the entity",
+    )
+
+    parser.add_argument(
+        "--texts-per-day",
+        type=int,
+        default=2,
+        help="Average number of texts per occurrence",
+    )
+
+    parser.add_argument(
+        "--patch-len",
+        type=int,
+        default=32,
+        help="Length of input patches",
+    )
+
+    parser.add_argument(
+        "--context-len",
+        type=int,
+        default=128,
+        help="Length of context window",
+    )
+
+    parser.add_argument(
+        "--horizon-len",
+        type=int,
+        default=32,
+        help="Length of forecasting horizon",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for data generation",
+    )
+
+    return parser.parse_args()
+
+
+def write_entity(data_dir: Path, entity: str, days: int, texts_per_day: int, rng: np.random.Generator) -> int:
+    """Write the numerical and textual data of a daily entity.
+
+    Returns:
+        Number of texts written.
+    """
+    start_dates = pd.date_range("2020-01-01 09:00", periods=days, freq="D")
+    numerical_dir = data_dir / "numerical"
+    textual_dir = data_dir / "textual"
+    numerical_dir.mkdir(parents=True)
+    textual_dir.mkdir(parents=True)
+
+    attended_at = rng.normal(0, 5, days)
+    pd.DataFrame(
+        {
+            "start_date": start_dates,
+            "end_date": start_dates + pd.Timedelta(hours=1),
+            "attended_at": attended_at,
+            "left_at": attended_at + rng.normal(60, 10, days),
+        }
+    ).to_csv(numerical_dir / f"{entity}.csv", index=False)
+
+    text_days = np.repeat(np.arange(days), rng.poisson(texts_per_day, days))
+    text_start_dates = start_dates[text_days]
+    pd.DataFrame(
+        {
+            "start_date": text_start_dates,
+            "end_date": text_start_dates + pd.Timedelta(hours=1),
+            "tms": [f"Goal or review of day {day}" for day in text_days],
+        }
+    ).to_csv(textual_dir / f"{entity}.csv", index=False)
+    return len(text_days)
+
+
+def main() -> int:
+    """Main benchmark function."""
+    args = parse_args()
+    days = args.years * 365
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        text_count = write_entity(data_dir, "entity", days, args.texts_per_day, np.random.default_rng(args.seed))
+        print(f"{days} occurrences, {text_count} texts")
+
+        for split in ("train", "test"):
+            start = time.perf_counter()
+            dataset = LitDataset(
+                data_dir,
+                "entity",
+                split=split,
+                patch_len=args.patch_len,
+                context_len=args.context_len,
+                horizon_len=args.horizon_len,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{split}: {len(dataset)} samples in {elapsed:.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Serving script for attendance forecasts with multimodal TimesFM."""
+
+import argparse
+from pathlib import Path
+
+import torch
+import uvicorn
+from multimodal_timesfm.utils.logging import get_logger, setup_logger
+
+from configs.model import ModelConfig
+from core.serving.app import create_app
+from core.serving.batcher import MicroBatcher
+from core.serving.forecaster import AttendanceForecaster
+from core.serving.model import load_serving_model
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve attendance forecasts with MultimodalTimesFM")
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        required=True,
+        help="Path to model checkpoint",
+    )
+
+    parser.add_argument(
+        "--model-config",
+        type=str,
+        help="Path to model configuration file",
+    )
+
+    parser.add_argument(
+        "--context-len",
+        type=int,
+        help="Context length for forecasting (defaults to the model configuration)",
+    )
+
+    parser.add_argument(
+        "--horizon-len",
+        type=int,
+        default=4,
+        help="Number of future occurrences forecast per series",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Maximum number of series per forward pass (defaults to per_core_batch_size of the model configuration)",
+    )
+
+    parser.add_argument(
+        "--max-wait-ms",
+        type=int,
+        default=10,
+        help="How long a partial batch waits for series of other requests",
+    )
+
+    parser.add_argument(
+        "--device",
+        type=str,
+        default="cpu",
+        help="Device to run inference on",
+    )
+
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        help="Number of threads for CPU inference (if not provided, PyTorch's default is used)",
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Host to bind",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8001,
+        help="Port to bind",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main serving function."""
+    parsed_args = parse_args()
+
+    # Load configurations
+    if parsed_args.model_config:
+        model_config = ModelConfig.from_yaml(Path(parsed_args.model_config))
+    else:
+        model_config = ModelConfig()
+
+    # Setup logging
+    setup_logger()
+
+    logger = get_logger()
+
+    checkpoint_path = Path(parsed_args.checkpoint)
+    if not checkpoint_path.exists():
+        logger.error(f"Checkpoint file not found: {checkpoint_path}")
+        return 1
+
+    if parsed_args.num_threads is not None:
+        torch.set_num_threads(parsed_args.num_threads)
+
+    context_len = parsed_args.context_len or model_config.timesfm.context_len
+    batch_size = parsed_args.batch_size or model_config.timesfm.per_core_batch_size
+
+    logger.info(f"Loading multimodal model from {checkpoint_path} on {parsed_args.device}...")
+    model = load_serving_model(model_config, checkpoint_path, context_len, parsed_args.horizon_len, parsed_args.device)
+
+    logger.info(f"Context length: {context_len}, Horizon length: {parsed_args.horizon_len}, Batch size: {batch_size}")
+    batcher = MicroBatcher(model.forecast_batch, batch_size, parsed_args.max_wait_ms)
+    forecaster = AttendanceForecaster(batcher, context_len, parsed_args.horizon_len)
+
+    uvicorn.run(create_app(forecaster, batcher), host=parsed_args.host, port=parsed_args.port)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())